@@ -46,6 +46,7 @@ from .schema import (
     LeRobotStateActionMetadata,
     StateActionMetadata,
 )
+from .stats import calculate_dataset_statistics
 from .transform import ComposedModalityTransform
 
 LE_ROBOT_MODALITY_FILENAME = "meta/modality.json"
@@ -56,44 +57,6 @@ LE_ROBOT_STATS_FILENAME = "meta/stats.json"
 LE_ROBOT_DATA_FILENAME = "data/*/*.parquet"
 
 
-def calculate_dataset_statistics(parquet_paths: list[Path]) -> dict:
-    """Calculate the dataset statistics of all columns for a list of parquet files."""
-    # Dataset statistics
-    all_low_dim_data_list = []
-    # Collect all the data
-    for parquet_path in tqdm(
-        sorted(list(parquet_paths)),
-        desc="Collecting all parquet files...",
-    ):
-        # Load the parquet file
-        parquet_data = pd.read_parquet(parquet_path)
-        parquet_data = parquet_data
-        all_low_dim_data_list.append(parquet_data)
-    all_low_dim_data = pd.concat(all_low_dim_data_list, axis=0)
-    # Compute dataset statistics
-    dataset_statistics = {}
-    for le_modality in all_low_dim_data.columns:
-        print(f"Computing statistics for {le_modality}...")
-        # check if the data is the modality is actually a list of numbers
-        # skip if it is a string
-        if isinstance(all_low_dim_data[le_modality].iloc[0], str):
-            print(f"Skipping {le_modality} because it is a string")
-            continue
-
-        np_data = np.vstack(
-            [np.asarray(x, dtype=np.float32) for x in all_low_dim_data[le_modality]]
-        )
-        dataset_statistics[le_modality] = {
-            "mean": np.mean(np_data, axis=0).tolist(),
-            "std": np.std(np_data, axis=0).tolist(),
-            "min": np.min(np_data, axis=0).tolist(),
-            "max": np.max(np_data, axis=0).tolist(),
-            "q01": np.quantile(np_data, 0.01, axis=0).tolist(),
-            "q99": np.quantile(np_data, 0.99, axis=0).tolist(),
-        }
-    return dataset_statistics
-
-
 class ModalityConfig(BaseModel):
     """Configuration for a modality."""
 
@@ -0,0 +1,254 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Streaming, mergeable dataset statistics.
+
+Every episode (parquet file) is summarized independently, possibly in a separate process, into a
+`FeatureStatistics` per column: the count, mean, variance, min and max, and a `QuantileSketch` from
+which q01/q99 are estimated. Summaries are merged without going back to the raw data, so episodes and
+datasets can be aggregated while only one episode is ever held in memory.
+"""
+
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Sequence
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+from tqdm import tqdm
+
+DEFAULT_SKETCH_CAPACITY = 2048
+"""Number of items kept per level of a quantile sketch. The rank error is about log2(n / capacity) / capacity."""
+
+DEFAULT_QUANTILES = {"q01": 0.01, "q99": 0.99}
+
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch of a stream of vectors, tracking every dimension at once.
+
+    This is a KLL-style compactor hierarchy: level `i` holds items of weight `2**i`. When a level
+    exceeds `capacity` items, every column is sorted and every other item (starting at a random offset)
+    is promoted to the next level, which keeps the rank estimates unbiased. Merging two sketches
+    concatenates their levels and compacts again, so the result does not depend on how the stream
+    was split.
+    """
+
+    def __init__(
+        self, num_dims: int, capacity: int = DEFAULT_SKETCH_CAPACITY, seed: int | None = None
+    ):
+        self.num_dims = num_dims
+        self.capacity = capacity
+        self.levels: list[np.ndarray] = []
+        self._rng = np.random.default_rng(seed)
+
+    def update(self, values: np.ndarray) -> None:
+        """Add a batch of vectors of shape (N, num_dims)."""
+        values = np.asarray(values, dtype=np.float64).reshape(-1, self.num_dims)
+        self._add_to_level(0, values)
+        self._compact()
+
+    def merge(self, other: "QuantileSketch") -> None:
+        """Merge `other` into this sketch."""
+        assert other.num_dims == self.num_dims, f"{other.num_dims=} != {self.num_dims=}"
+        for level, items in enumerate(other.levels):
+            self._add_to_level(level, items)
+        self._compact()
+
+    def quantile(self, q: float) -> np.ndarray:
+        """
+        Estimate the `q` quantile of every dimension.
+
+        The quantiles are exact, and identical to `np.quantile`, as long as no item was compacted. Past
+        that, the weighted inverted CDF of the retained items is used.
+        """
+        values = np.concatenate(self.levels, axis=0)
+        if len(self.levels) == 1:
+            return np.quantile(values, q, axis=0)
+        weights = np.concatenate(
+            [np.full(len(items), 2.0**level) for level, items in enumerate(self.levels)]
+        )
+        order = np.argsort(values, axis=0, kind="stable")
+        cumulative_weights = np.cumsum(weights[order], axis=0)
+        rank = np.sum(cumulative_weights < q * weights.sum(), axis=0)
+        rows = np.take_along_axis(order, np.minimum(rank, len(values) - 1)[None], axis=0)
+        return np.take_along_axis(values, rows, axis=0)[0]
+
+    def _add_to_level(self, level: int, items: np.ndarray) -> None:
+        while len(self.levels) <= level:
+            self.levels.append(np.empty((0, self.num_dims), dtype=np.float64))
+        self.levels[level] = np.concatenate([self.levels[level], items], axis=0)
+
+    def _compact(self) -> None:
+        level = 0
+        while level < len(self.levels):
+            items = self.levels[level]
+            if len(items) > self.capacity:
+                items = np.sort(items, axis=0)
+                # An odd item stays at this level so that the total weight is preserved
+                num_kept = len(items) % 2
+                offset = self._rng.integers(2)
+                self.levels[level] = items[len(items) - num_kept :]
+                self._add_to_level(level + 1, items[offset : len(items) - num_kept : 2])
+            level += 1
+
+
+class FeatureStatistics:
+    """Streaming statistics of a feature whose samples are vectors of `num_dims` values."""
+
+    def __init__(
+        self, num_dims: int, capacity: int = DEFAULT_SKETCH_CAPACITY, seed: int | None = None
+    ):
+        self.count = 0
+        self.mean = np.zeros(num_dims, dtype=np.float64)
+        self.variance = np.zeros(num_dims, dtype=np.float64)
+        self.min = np.full(num_dims, np.inf)
+        self.max = np.full(num_dims, -np.inf)
+        self.sketch = QuantileSketch(num_dims, capacity=capacity, seed=seed)
+
+    def update(self, values: np.ndarray) -> None:
+        """Add a batch of samples of shape (N, num_dims)."""
+        values = np.asarray(values, dtype=np.float64).reshape(-1, len(self.mean))
+        if len(values) == 0:
+            return
+        batch = FeatureStatistics(len(self.mean), capacity=self.sketch.capacity)
+        batch.count = len(values)
+        batch.mean = values.mean(axis=0)
+        batch.variance = values.var(axis=0)
+        batch.min = values.min(axis=0)
+        batch.max = values.max(axis=0)
+        self._merge_moments(batch)
+        self.sketch.update(values)
+
+    def merge(self, other: "FeatureStatistics") -> None:
+        """Merge the statistics of `other` into these ones."""
+        self._merge_moments(other)
+        self.sketch.merge(other.sketch)
+
+    def _merge_moments(self, other: "FeatureStatistics") -> None:
+        # Same parallel algorithm as lerobot's `aggregate_feature_stats`
+        total_count = self.count + other.count
+        if total_count == 0:
+            return
+        total_mean = (self.mean * self.count + other.mean * other.count) / total_count
+        self.variance = (
+            (self.variance + (self.mean - total_mean) ** 2) * self.count
+            + (other.variance + (other.mean - total_mean) ** 2) * other.count
+        ) / total_count
+        self.mean = total_mean
+        self.count = total_count
+        self.min = np.minimum(self.min, other.min)
+        self.max = np.maximum(self.max, other.max)
+
+    def to_dict(self, quantiles: dict[str, float] = DEFAULT_QUANTILES) -> dict[str, list[float]]:
+        """Return the statistics in the format of `meta/stats.json`."""
+        stats = {
+            "mean": self.mean,
+            "std": np.sqrt(self.variance),
+            "min": self.min,
+            "max": self.max,
+        }
+        for name, q in quantiles.items():
+            stats[name] = self.sketch.quantile(q)
+        return {name: value.astype(np.float32).tolist() for name, value in stats.items()}
+
+
+def _is_numeric(data_type: pa.DataType) -> bool:
+    while pa.types.is_list(data_type) or pa.types.is_fixed_size_list(data_type):
+        data_type = data_type.value_type
+    return (
+        pa.types.is_integer(data_type)
+        or pa.types.is_floating(data_type)
+        or pa.types.is_boolean(data_type)
+    )
+
+
+def compute_episode_statistics(
+    parquet_path: Path | str, capacity: int = DEFAULT_SKETCH_CAPACITY
+) -> dict[str, FeatureStatistics]:
+    """Compute the statistics of every numeric column of an episode parquet file."""
+    table = pq.read_table(parquet_path)
+    episode_statistics = {}
+    for column_name in table.column_names:
+        column = table.column(column_name).combine_chunks()
+        if not _is_numeric(column.type) or len(column) == 0:
+            continue
+        values = column
+        while pa.types.is_list(values.type) or pa.types.is_fixed_size_list(values.type):
+            values = values.flatten()
+        values = values.to_numpy(zero_copy_only=False).astype(np.float32).reshape(len(column), -1)
+        # Seed the sketch with the path so that the statistics are reproducible
+        seed = zlib.crc32(f"{parquet_path}:{column_name}".encode())
+        feature_statistics = FeatureStatistics(values.shape[1], capacity=capacity, seed=seed)
+        feature_statistics.update(values)
+        episode_statistics[column_name] = feature_statistics
+    return episode_statistics
+
+
+def aggregate_statistics(
+    statistics_list: Sequence[dict[str, FeatureStatistics]],
+) -> dict[str, FeatureStatistics]:
+    """Merge the statistics of several episodes or datasets, feature by feature."""
+    aggregated = {}
+    for statistics in statistics_list:
+        for feature, feature_statistics in statistics.items():
+            if feature in aggregated:
+                aggregated[feature].merge(feature_statistics)
+            else:
+                aggregated[feature] = feature_statistics
+    return aggregated
+
+
+def calculate_dataset_statistics(
+    parquet_paths: Sequence[Path],
+    num_workers: int | None = None,
+    capacity: int = DEFAULT_SKETCH_CAPACITY,
+) -> dict:
+    """
+    Calculate the dataset statistics of all numeric columns for a list of parquet files.
+
+    Episodes are summarized in a pool of `num_workers` processes (all the CPUs by default, no pool
+    if 1) and merged as they come back, so the memory footprint is bounded by one episode per worker.
+    The result is in the format of `meta/stats.json`, with mean/std/min/max/q01/q99 per column.
+    """
+    parquet_paths = sorted(parquet_paths)
+    if num_workers is None:
+        num_workers = min(len(parquet_paths), os.cpu_count() or 1)
+    statistics: dict[str, FeatureStatistics] = {}
+    progress = tqdm(total=len(parquet_paths), desc="Computing dataset statistics")
+    if num_workers <= 1:
+        episodes_statistics = (
+            compute_episode_statistics(path, capacity=capacity) for path in parquet_paths
+        )
+        for episode_statistics in episodes_statistics:
+            statistics = aggregate_statistics([statistics, episode_statistics])
+            progress.update()
+    else:
+        with ProcessPoolExecutor(max_workers=num_workers) as executor:
+            episodes_statistics = executor.map(
+                compute_episode_statistics,
+                parquet_paths,
+                [capacity] * len(parquet_paths),
+                chunksize=max(1, len(parquet_paths) // (num_workers * 8)),
+            )
+            for episode_statistics in episodes_statistics:
+                statistics = aggregate_statistics([statistics, episode_statistics])
+                progress.update()
+    progress.close()
+    return {feature: stats.to_dict() for feature, stats in statistics.items()}
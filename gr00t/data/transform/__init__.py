@@ -13,29 +13,70 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import importlib
+from typing import TYPE_CHECKING
+
 from .base import (
     ComposedModalityTransform,
     InvertibleModalityTransform,
     ModalityTransform,
 )
 from .concat import ConcatTransform
-from .state_action import (
-    StateActionDropout,
-    StateActionPerturbation,
-    StateActionSinCosTransform,
-    StateActionToTensor,
-    StateActionTransform,
-)
-from .video import (
-    VideoColorJitter,
-    VideoCrop,
-    VideoGrayscale,
-    VideoHorizontalFlip,
-    VideoRandomGrayscale,
-    VideoRandomPosterize,
-    VideoRandomRotation,
-    VideoResize,
-    VideoToNumpy,
-    VideoToTensor,
-    VideoTransform,
-)
+
+# The state/action and video transforms import pytorch3d, torchvision and albumentations, so their
+# modules are only imported when one of their transforms is first accessed.
+_LAZY_TRANSFORMS = {
+    "StateActionDropout": ".state_action",
+    "StateActionPerturbation": ".state_action",
+    "StateActionSinCosTransform": ".state_action",
+    "StateActionToTensor": ".state_action",
+    "StateActionTransform": ".state_action",
+    "VideoColorJitter": ".video",
+    "VideoCrop": ".video",
+    "VideoGrayscale": ".video",
+    "VideoHorizontalFlip": ".video",
+    "VideoRandomGrayscale": ".video",
+    "VideoRandomPosterize": ".video",
+    "VideoRandomRotation": ".video",
+    "VideoResize": ".video",
+    "VideoToNumpy": ".video",
+    "VideoToTensor": ".video",
+    "VideoTransform": ".video",
+}
+
+__all__ = [
+    "ComposedModalityTransform",
+    "ConcatTransform",
+    "InvertibleModalityTransform",
+    "ModalityTransform",
+    *_LAZY_TRANSFORMS,
+]
+
+
+def __getattr__(name: str):
+    if name in _LAZY_TRANSFORMS:
+        return getattr(importlib.import_module(_LAZY_TRANSFORMS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
+if TYPE_CHECKING:
+    from .state_action import (
+        StateActionDropout,
+        StateActionPerturbation,
+        StateActionSinCosTransform,
+        StateActionToTensor,
+        StateActionTransform,
+    )
+    from .video import (
+        VideoColorJitter,
+        VideoCrop,
+        VideoGrayscale,
+        VideoHorizontalFlip,
+        VideoRandomGrayscale,
+        VideoRandomPosterize,
+        VideoRandomRotation,
+        VideoResize,
+        VideoToNumpy,
+        VideoToTensor,
+        VideoTransform,
+    )
@@ -60,8 +60,8 @@ class VideoConfig:
 class MultiStepConfig:
     """Configuration for multi-step environment settings."""
 
-    video_delta_indices: np.ndarray = field(default=np.array([0]))
-    state_delta_indices: np.ndarray = field(default=np.array([0]))
+    video_delta_indices: np.ndarray = field(default_factory=lambda: np.array([0]))
+    state_delta_indices: np.ndarray = field(default_factory=lambda: np.array([0]))
     n_action_steps: int = 16
     max_episode_steps: int = 1440
 
@@ -121,42 +121,45 @@ class SimulationInferenceClient(BaseInferenceClient, BasePolicy):
         )
         # Set up the environment
         self.env = self.setup_environment(config)
-        # Initialize tracking variables
+        # Initialize tracking variables, one slot per environment
         episode_lengths = []
-        current_rewards = [0] * config.n_envs
-        current_lengths = [0] * config.n_envs
-        completed_episodes = 0
-        current_successes = [False] * config.n_envs
         episode_successes = []
+        current_rewards = np.zeros(config.n_envs)
+        current_lengths = np.zeros(config.n_envs, dtype=np.int64)
+        current_successes = np.zeros(config.n_envs, dtype=bool)
         # Initial environment reset
         obs, _ = self.env.reset()
-        # Main simulation loop
-        while completed_episodes < config.n_episodes:
-            # Process observations and get actions from the server
+        # Main simulation loop, finished environments are reset by the vector env while the others
+        # keep stepping
+        while len(episode_successes) < config.n_episodes:
+            # Process the observations of all the environments in a single server call
             actions = self._get_actions_from_server(obs)
-            # Step the environment
-            next_obs, rewards, terminations, truncations, env_infos = self.env.step(actions)
+            # Step the environments in their worker processes
+            self.env.step_async(actions)
+            obs, rewards, terminations, truncations, env_infos = self.env.step_wait()
             # Update episode tracking
-            for env_idx in range(config.n_envs):
-                current_successes[env_idx] |= bool(env_infos["success"][env_idx][0])
-                current_rewards[env_idx] += rewards[env_idx]
-                current_lengths[env_idx] += 1
-                # If episode ended, store results
-                if terminations[env_idx] or truncations[env_idx]:
-                    episode_lengths.append(current_lengths[env_idx])
-                    episode_successes.append(current_successes[env_idx])
-                    current_successes[env_idx] = False
-                    completed_episodes += 1
-                    # Reset trackers for this environment
-                    current_rewards[env_idx] = 0
-                    current_lengths[env_idx] = 0
-            obs = next_obs
+            # The success of each environment is the list of its last successes, kept by the
+            # multi-step wrapper, so the vector env stacks them in an object array
+            successes = np.array([s[0] for s in env_infos["success"]], dtype=bool)
+            current_successes |= successes
+            current_rewards += rewards
+            current_lengths += 1
+            # Store the results of the finished episodes and reset their trackers
+            dones = np.logical_or(terminations, truncations)
+            if dones.any():
+                episode_lengths.extend(current_lengths[dones].tolist())
+                episode_successes.extend(current_successes[dones].tolist())
+                current_rewards[dones] = 0
+                current_lengths[dones] = 0
+                current_successes[dones] = False
         # Clean up
         self.env.reset()
         self.env.close()
         self.env = None
+        elapsed = time.time() - start_time
         print(
-            f"Collecting {config.n_episodes} episodes took {time.time() - start_time:.2f} seconds"
+            f"Collecting {len(episode_successes)} episodes took {elapsed:.2f} seconds "
+            f"({len(episode_successes) / elapsed:.2f} episodes/s)"
         )
         assert (
             len(episode_successes) >= config.n_episodes
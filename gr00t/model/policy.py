@@ -14,9 +14,10 @@
 # limitations under the License.
 
 import json
+import shutil
 from abc import ABC, abstractmethod
 from pathlib import Path
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, Literal, Optional, Union
 
 import numpy as np
 import torch
@@ -27,7 +28,14 @@ from gr00t.data.dataset import ModalityConfig
 from gr00t.data.embodiment_tags import EmbodimentTag
 from gr00t.data.schema import DatasetMetadata
 from gr00t.data.transform.base import ComposedModalityTransform
-from gr00t.model.gr00t_n1 import GR00T_N1_5
+from gr00t.model.gr00t_n1 import GR00T_N1_5, GR00T_N1_5_Config
+from gr00t.model.quantization import (
+    QUANTIZATION_METHOD,
+    is_quantized_checkpoint,
+    load_quantized_checkpoint,
+    quantize_model,
+    save_quantized_checkpoint,
+)
 
 COMPUTE_DTYPE = torch.bfloat16
 
@@ -70,6 +78,7 @@ class Gr00tPolicy(BasePolicy):
         modality_transform: ComposedModalityTransform,
         denoising_steps: Optional[int] = None,
         device: Union[int, str] = "cuda" if torch.cuda.is_available() else "cpu",
+        quantization: Optional[Literal["int8_dynamic"]] = None,
     ):
         """
         Initialize the Gr00tPolicy.
@@ -81,6 +90,8 @@ class Gr00tPolicy(BasePolicy):
             embodiment_tag (Union[str, EmbodimentTag]): The embodiment tag for the model.
             denoising_steps: Number of denoising steps to use for the action head.
             device (Union[int, str]): Device to run the model on.
+            quantization: "int8_dynamic" to quantize the linear layers of the model to int8 for CPU
+                inference. Checkpoints exported with `export_quantized` are always loaded quantized.
         """
         try:
             # NOTE(YL) this returns the local path to the model which is normally
@@ -97,6 +108,14 @@ class Gr00tPolicy(BasePolicy):
         self._modality_transform.eval()  # set this to eval mode
         self.model_path = Path(model_path)
         self.device = device
+        if is_quantized_checkpoint(self.model_path):
+            quantization = QUANTIZATION_METHOD
+        if quantization is not None:
+            if quantization != QUANTIZATION_METHOD:
+                raise ValueError(f"Unsupported quantization: {quantization}")
+            if torch.device(device).type != "cpu":
+                raise ValueError(f"Quantized inference runs on CPU only, got device {device}")
+        self.quantization = quantization
 
         # Convert string embodiment tag to EmbodimentTag enum if needed
         if isinstance(embodiment_tag, str):
@@ -236,8 +255,33 @@ class Gr00tPolicy(BasePolicy):
                 return False
         return True
 
+    def export_quantized(self, output_dir: Union[str, Path]):
+        """
+        Export the quantized model as a checkpoint directory loadable by `Gr00tPolicy`, with the
+        model config, the quantized weights and the experiment config of the float checkpoint.
+
+        Args:
+            output_dir (Union[str, Path]): Directory to write the checkpoint to.
+        """
+        if self.quantization is None:
+            raise ValueError("Only quantized policies can be exported, set `quantization`")
+        output_dir = Path(output_dir)
+        self.model.config.save_pretrained(output_dir)
+        save_quantized_checkpoint(self.model, output_dir)
+        shutil.copytree(
+            self.model_path / "experiment_cfg", output_dir / "experiment_cfg", dirs_exist_ok=True
+        )
+
     def _load_model(self, model_path):
-        model = GR00T_N1_5.from_pretrained(model_path, torch_dtype=COMPUTE_DTYPE)
+        if is_quantized_checkpoint(model_path):
+            # The float weights are replaced by the quantized ones after rebuilding the structure
+            config = GR00T_N1_5_Config.from_pretrained(model_path)
+            model = GR00T_N1_5(config, local_model_path=model_path)
+        elif self.quantization is not None:
+            # Quantize from float32 weights rather than from their bf16 cast
+            model = GR00T_N1_5.from_pretrained(model_path, torch_dtype=torch.float32)
+        else:
+            model = GR00T_N1_5.from_pretrained(model_path, torch_dtype=COMPUTE_DTYPE)
         model.eval()  # Set model to eval mode
 
         # Update action_horizon to match modality config
@@ -272,6 +316,11 @@ class Gr00tPolicy(BasePolicy):
             model.action_horizon = expected_action_horizon
             model.config.action_head_cfg["action_horizon"] = expected_action_horizon
 
+        if is_quantized_checkpoint(model_path):
+            load_quantized_checkpoint(model, model_path)
+        elif self.quantization is not None:
+            quantize_model(model)
+
         model.to(device=self.device)  # type: ignore
 
         self.model = model
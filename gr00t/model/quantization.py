@@ -0,0 +1,188 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Int8 dynamic quantization of GR00T models for CPU inference.
+
+The `nn.Linear` layers of the backbone and of the action head are replaced by dynamically
+quantized linear layers: weights are stored in int8 with per-output-channel scales, and
+activations are quantized on the fly with scales computed per batch. No activation statistics
+are collected, so quantizing a model does not need calibration data.
+
+The per-embodiment `CategorySpecificLinear` layers of the action head hold most of its weights,
+and are quantized weight-only: the weights of the selected embodiments are dequantized on the fly.
+"""
+
+import fnmatch
+import json
+from pathlib import Path
+from typing import Sequence
+
+import torch
+from torch import nn
+
+from gr00t.model.action_head.flow_matching_action_head import CategorySpecificLinear
+
+QUANTIZATION_METHOD = "int8_dynamic"
+QUANTIZATION_CONFIG_FILENAME = "quantization_config.json"
+QUANTIZED_WEIGHTS_FILENAME = "quantized_model.pt"
+
+QUANTIZED_MODULES = ("backbone", "action_head")
+
+# Linear layers kept in float, because the modules using them read their weight attributes.
+SKIPPED_LINEAR_PATTERNS = (
+    # Tied to the input embeddings, and its weight dtype is read by `MambaForCausalLM`
+    "*lm_head",
+    # Its weight device is read by the HF Mamba mixer to select its kernels
+    "*mixer.x_proj",
+    # `TimestepEncoder` reads its compute dtype from its parameters
+    "*timestep_encoder.*",
+)
+
+
+class Int8CategorySpecificLinear(nn.Module):
+    """Weight-only int8 `CategorySpecificLinear`, with per-category, per-output-channel scales."""
+
+    def __init__(self, layer: CategorySpecificLinear):
+        super().__init__()
+        self.num_categories = layer.num_categories
+        W = layer.W.detach().float()
+        W_scale = W.abs().amax(dim=1, keepdim=True).clamp(min=1e-12) / 127
+        self.register_buffer("W_int8", torch.round(W / W_scale).to(torch.int8))
+        self.register_buffer("W_scale", W_scale)
+        self.b = nn.Parameter(layer.b.detach().float(), requires_grad=False)
+
+    def forward(self, x, cat_ids):
+        selected_W = self.W_int8[cat_ids].to(x.dtype) * self.W_scale[cat_ids].to(x.dtype)
+        selected_b = self.b[cat_ids]
+        return torch.bmm(x, selected_W) + selected_b.unsqueeze(1)
+
+
+def quantize_model(
+    model: nn.Module,
+    modules: Sequence[str] = QUANTIZED_MODULES,
+    skipped_linear_patterns: Sequence[str] = SKIPPED_LINEAR_PATTERNS,
+) -> nn.Module:
+    """
+    Quantize the linear and category specific linear layers of the given submodules of a model
+    to int8, in place.
+
+    The model is cast to float32 first, as quantized kernels only take float32 activations.
+    Quantized models run on CPU only.
+
+    Args:
+        model: The model to quantize.
+        modules: Names of the submodules whose linear layers are quantized, "" for the whole model.
+        skipped_linear_patterns: `fnmatch` patterns of the layer names kept in float.
+
+    Returns:
+        The quantized model.
+    """
+    model.float()
+    for module_name in modules:
+        module = model.get_submodule(module_name)
+        quantized_names = [
+            name
+            for name, submodule in module.named_modules()
+            if isinstance(submodule, (nn.Linear, CategorySpecificLinear))
+            and not any(
+                fnmatch.fnmatch(f"{module_name}.{name}" if module_name else name, pattern)
+                for pattern in skipped_linear_patterns
+            )
+        ]
+        qconfig_spec = {}
+        for name in quantized_names:
+            submodule = module.get_submodule(name)
+            if isinstance(submodule, CategorySpecificLinear):
+                parent_name, _, attr = name.rpartition(".")
+                setattr(
+                    module.get_submodule(parent_name), attr, Int8CategorySpecificLinear(submodule)
+                )
+            else:
+                qconfig_spec[name] = torch.ao.quantization.per_channel_dynamic_qconfig
+        torch.ao.quantization.quantize_dynamic(
+            module, qconfig_spec, dtype=torch.qint8, inplace=True
+        )
+    return model
+
+
+def save_quantized_checkpoint(
+    model: nn.Module,
+    output_dir: str | Path,
+    modules: Sequence[str] = QUANTIZED_MODULES,
+    skipped_linear_patterns: Sequence[str] = SKIPPED_LINEAR_PATTERNS,
+):
+    """
+    Save the weights of a model quantized with `quantize_model`, along with the quantization
+    settings needed to rebuild its structure in `load_quantized_checkpoint`.
+    """
+    output_dir = Path(output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    torch.save(model.state_dict(), output_dir / QUANTIZED_WEIGHTS_FILENAME)
+    quantization_config = {
+        "method": QUANTIZATION_METHOD,
+        "modules": list(modules),
+        "skipped_linear_patterns": list(skipped_linear_patterns),
+        "torch_version": torch.__version__,
+    }
+    with open(output_dir / QUANTIZATION_CONFIG_FILENAME, "w") as f:
+        json.dump(quantization_config, f, indent=4)
+
+
+def is_quantized_checkpoint(checkpoint_dir: str | Path) -> bool:
+    """Whether the checkpoint directory was saved with `save_quantized_checkpoint`."""
+    return (Path(checkpoint_dir) / QUANTIZATION_CONFIG_FILENAME).exists()
+
+
+def load_quantized_checkpoint(model: nn.Module, checkpoint_dir: str | Path) -> nn.Module:
+    """
+    Quantize a float model with the settings of a quantized checkpoint, and load its weights.
+
+    Args:
+        model: A model with the architecture of the checkpoint. Its float weights are overwritten.
+        checkpoint_dir: Directory written by `save_quantized_checkpoint`.
+
+    Returns:
+        The quantized model.
+    """
+    checkpoint_dir = Path(checkpoint_dir)
+    with open(checkpoint_dir / QUANTIZATION_CONFIG_FILENAME, "r") as f:
+        quantization_config = json.load(f)
+    if quantization_config["method"] != QUANTIZATION_METHOD:
+        raise ValueError(f"Unsupported quantization method: {quantization_config['method']}")
+
+    quantize_model(
+        model,
+        modules=quantization_config["modules"],
+        skipped_linear_patterns=quantization_config["skipped_linear_patterns"],
+    )
+    state_dict = torch.load(
+        checkpoint_dir / QUANTIZED_WEIGHTS_FILENAME, map_location="cpu", weights_only=True
+    )
+    model.load_state_dict(state_dict)
+    return model
+
+
+def model_size_bytes(model: nn.Module) -> int:
+    """Size of the weights and buffers of a model, including the packed quantized weights."""
+
+    def size(value) -> int:
+        if isinstance(value, torch.Tensor):
+            return value.numel() * value.element_size()
+        if isinstance(value, (tuple, list)):
+            return sum(size(v) for v in value)
+        return 0
+
+    return sum(size(value) for value in model.state_dict().values())
@@ -13,6 +13,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import functools
 import random
 import re
 from typing import Any, Dict, List, Optional
@@ -52,6 +53,12 @@ def build_eagle_processor(eagle_path: str) -> ProcessorMixin:
     return eagle_processor
 
 
+@functools.cache
+def get_default_eagle_processor() -> ProcessorMixin:
+    """The processor of the default Eagle model, built on first use and shared by all transforms."""
+    return build_eagle_processor(DEFAULT_EAGLE_PATH)
+
+
 def collate(features: List[dict], eagle_processor) -> dict:
     batch = {}
     keys = features[0].keys()
@@ -114,7 +121,10 @@ class GR00TTransform(InvertibleModalityTransform):
     # Private attributes to keep track of shapes/dimensions across apply/unapply
     _language_key: Optional[list[str]] = PrivateAttr(default=None)
 
-    eagle_processor: ProcessorMixin = Field(default=build_eagle_processor(DEFAULT_EAGLE_PATH))
+    eagle_processor: ProcessorMixin | None = Field(
+        default=None,
+        description="Eagle processor. The default Eagle processor is built on first use if None.",
+    )
 
     # XEmbDiT arguments
     default_instruction: str = Field(default="Perform the default behavior.")
@@ -131,6 +141,12 @@ class GR00TTransform(InvertibleModalityTransform):
         super().set_metadata(dataset_metadata)
         self.embodiment_tag = dataset_metadata.embodiment_tag
 
+    def get_eagle_processor(self) -> ProcessorMixin:
+        """Get the Eagle processor, building the default one on first use."""
+        if self.eagle_processor is None:
+            return get_default_eagle_processor()
+        return self.eagle_processor
+
     def get_embodiment_tag(self) -> int:
         """Get the embodiment tag from the data."""
         assert (
@@ -199,11 +215,13 @@ class GR00TTransform(InvertibleModalityTransform):
         ]
 
         text_list = [
-            self.eagle_processor.apply_chat_template(
+            self.get_eagle_processor().apply_chat_template(
                 eagle_conversation, tokenize=False, add_generation_prompt=True
             )
         ]
-        image_inputs, video_inputs = self.eagle_processor.process_vision_info(eagle_conversation)
+        image_inputs, video_inputs = self.get_eagle_processor().process_vision_info(
+            eagle_conversation
+        )
         eagle_content = {
             "image_inputs": image_inputs,
             "video_inputs": video_inputs,
@@ -342,7 +360,7 @@ class GR00TTransform(InvertibleModalityTransform):
         data_split = [tree.map_structure(lambda x: x[i], data) for i in range(batch_size)]
         # Process each element.
         data_split_processed = [self.apply_single(elem) for elem in data_split]
-        return collate(data_split_processed, self.eagle_processor)
+        return collate(data_split_processed, self.get_eagle_processor())
 
     def apply(self, data: dict) -> dict:
         is_batched, batch_size = self.check_keys_and_batch_size(data)
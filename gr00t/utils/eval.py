@@ -12,12 +12,19 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+from typing import Iterator, Sequence
+
 import matplotlib
 import matplotlib.pyplot as plt
 import numpy as np
+import torch
 
 from gr00t.data.dataset import LeRobotSingleDataset
-from gr00t.model.policy import BasePolicy
+from gr00t.model.policy import BasePolicy, squeeze_dict_values, unsqueeze_dict_values
 
 # numpy print precision settings 3, dont use exponential notation
 np.set_printoptions(precision=3, suppress=True)
@@ -78,6 +85,181 @@ def calc_mse_for_single_trajectory(
                 )
                 gt_action_across_time.append(concat_gt_action)
 
+    return _summarize_trajectory(
+        traj_id,
+        state_joints_across_time,
+        gt_action_across_time,
+        pred_action_across_time,
+        modality_keys,
+        steps=steps,
+        action_horizon=action_horizon,
+        plot=plot,
+        save_plot_path=save_plot_path,
+    )
+
+
+def calc_mse_for_trajectories(
+    policy: BasePolicy,
+    dataset: LeRobotSingleDataset,
+    traj_ids: Sequence[int],
+    modality_keys: list,
+    steps=300,
+    action_horizon=16,
+    batch_size=32,
+    num_workers: int | None = None,
+    plot=False,
+    plot_state=False,
+    save_plot_path=None,
+) -> list[float]:
+    """
+    Batched version of `calc_mse_for_single_trajectory` over several trajectories, with the same
+    per-trajectory MSE.
+
+    All the (trajectory, step) query points are planned up front. Their step data is loaded in a
+    pool of `num_workers` processes (8 at most by default, in the main process if 0), in order and
+    with a bounded number of steps in flight, and the inference points of all trajectories are
+    predicted in batches of `batch_size` observations.
+
+    Returns:
+        The MSE of each trajectory, in the order of `traj_ids`.
+    """
+    if num_workers is None:
+        num_workers = min(8, os.cpu_count() or 1)
+    # The states are only needed at every step for the plots
+    query_points = [
+        (traj_id, step_count)
+        for traj_id in traj_ids
+        for step_count in range(steps)
+        if plot_state or step_count % action_horizon == 0
+    ]
+    num_inference_points = len(traj_ids) * len(range(0, steps, action_horizon))
+
+    state_joints_across_time = {traj_id: [] for traj_id in traj_ids}
+    gt_action_across_time = {traj_id: [] for traj_id in traj_ids}
+    pred_action_across_time = {traj_id: [] for traj_id in traj_ids}
+    pending_points = []
+    num_inferred = 0
+
+    def infer_pending_points():
+        nonlocal num_inferred
+        num_inferred += len(pending_points)
+        print(f"inferencing {num_inferred}/{num_inference_points} steps")
+        action_chunks = _get_actions([data_point for _, data_point in pending_points], policy)
+        for (traj_id, data_point), action_chunk in zip(pending_points, action_chunks, strict=True):
+            for j in range(action_horizon):
+                pred_action_across_time[traj_id].append(
+                    np.concatenate(
+                        [np.atleast_1d(action_chunk[f"action.{key}"][j]) for key in modality_keys],
+                        axis=0,
+                    )
+                )
+                gt_action_across_time[traj_id].append(
+                    np.concatenate(
+                        [data_point[f"action.{key}"][j] for key in modality_keys], axis=0
+                    )
+                )
+        pending_points.clear()
+
+    for (traj_id, step_count), data_point in _load_step_data(dataset, query_points, num_workers):
+        if plot_state:
+            state_joints_across_time[traj_id].append(
+                np.concatenate([data_point[f"state.{key}"][0] for key in modality_keys], axis=0)
+            )
+        if step_count % action_horizon == 0:
+            pending_points.append((traj_id, data_point))
+            if len(pending_points) == batch_size:
+                infer_pending_points()
+    if pending_points:
+        infer_pending_points()
+
+    return [
+        _summarize_trajectory(
+            traj_id,
+            state_joints_across_time[traj_id],
+            gt_action_across_time[traj_id],
+            pred_action_across_time[traj_id],
+            modality_keys,
+            steps=steps,
+            action_horizon=action_horizon,
+            plot=plot,
+            save_plot_path=save_plot_path,
+        )
+        for traj_id in traj_ids
+    ]
+
+
+def _get_actions(data_points: list[dict], policy: BasePolicy) -> list[dict]:
+    """Predict the action chunks of several observations with a single batched call to the policy."""
+    # Each observation is batched like a single observation would be by the policy, then squeezed
+    # back, so that the action chunks have the same shapes as with unbatched calls.
+    unsqueezed = [unsqueeze_dict_values(data_point) for data_point in data_points]
+    batch = {key: np.concatenate([data[key] for data in unsqueezed]) for key in unsqueezed[0]}
+    actions = policy.get_action(batch)
+    return [
+        squeeze_dict_values(
+            {
+                key: value[i : i + 1] if isinstance(value, (np.ndarray, torch.Tensor)) else value
+                for key, value in actions.items()
+            }
+        )
+        for i in range(len(data_points))
+    ]
+
+
+_worker_dataset: LeRobotSingleDataset | None = None
+
+
+def _init_worker(dataset: LeRobotSingleDataset):
+    global _worker_dataset
+    _worker_dataset = dataset
+
+
+def _get_step_data_in_worker(query_point: tuple[int, int]) -> dict:
+    return _worker_dataset.get_step_data(*query_point)
+
+
+def _load_step_data(
+    dataset: LeRobotSingleDataset,
+    query_points: Sequence[tuple[int, int]],
+    num_workers: int,
+    max_in_flight_per_worker: int = 16,
+) -> Iterator[tuple[tuple[int, int], dict]]:
+    """Yield the (query point, step data) of the (trajectory, step) query points, in order."""
+    if num_workers == 0:
+        for query_point in query_points:
+            yield query_point, dataset.get_step_data(*query_point)
+        return
+
+    # `get_step_data` caches the current trajectory in the dataset, so each worker process has its
+    # own copy of the dataset.
+    with ProcessPoolExecutor(
+        max_workers=num_workers, initializer=_init_worker, initargs=(dataset,)
+    ) as executor:
+        query_points = iter(query_points)
+        in_flight = deque(
+            (query_point, executor.submit(_get_step_data_in_worker, query_point))
+            for query_point in islice(query_points, num_workers * max_in_flight_per_worker)
+        )
+        while in_flight:
+            query_point, future = in_flight.popleft()
+            for next_query_point in islice(query_points, 1):
+                in_flight.append(
+                    (next_query_point, executor.submit(_get_step_data_in_worker, next_query_point))
+                )
+            yield query_point, future.result()
+
+
+def _summarize_trajectory(
+    traj_id: int,
+    state_joints_across_time: list,
+    gt_action_across_time: list,
+    pred_action_across_time: list,
+    modality_keys: list,
+    steps: int,
+    action_horizon: int,
+    plot=False,
+    save_plot_path=None,
+) -> float:
     # plot the joints
     state_joints_across_time = np.array(state_joints_across_time)[:steps]
     gt_action_across_time = np.array(gt_action_across_time)[:steps]
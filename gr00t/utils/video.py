@@ -12,11 +12,10 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+
+# The video backends are imported on first use, as importing them takes seconds.
+# torch is imported first, as it has to be loaded before torchvision and decord.
 import torch  # noqa: F401 # isort: skip
-import torchvision  # noqa: F401 # isort: skip
-import av
-import cv2
-import decord  # noqa: F401
 import numpy as np
 
 
@@ -27,10 +26,14 @@ def get_frames_by_indices(
     video_backend_kwargs: dict = {},
 ) -> np.ndarray:
     if video_backend == "decord":
+        import decord
+
         vr = decord.VideoReader(video_path, **video_backend_kwargs)
         frames = vr.get_batch(indices)
         return frames.asnumpy()
     elif video_backend == "opencv":
+        import cv2
+
         frames = []
         cap = cv2.VideoCapture(video_path, **video_backend_kwargs)
         for idx in indices:
@@ -61,6 +64,8 @@ def get_frames_by_timestamps(
         np.ndarray: Frames at the specified timestamps.
     """
     if video_backend == "decord":
+        import decord
+
         vr = decord.VideoReader(video_path, **video_backend_kwargs)
         num_frames = len(vr)
         # Retrieve the timestamps for each frame in the video
@@ -71,6 +76,8 @@ def get_frames_by_timestamps(
         frames = vr.get_batch(indices)
         return frames.asnumpy()
     elif video_backend == "opencv":
+        import cv2
+
         # Open the video file
         cap = cv2.VideoCapture(video_path, **video_backend_kwargs)
         if not cap.isOpened():
@@ -94,6 +101,8 @@ def get_frames_by_timestamps(
         frames = np.array(frames)
         return frames
     elif video_backend == "torchvision_av":
+        import torchvision
+
         # set backend
         torchvision.set_video_backend("pyav")
         # set a video stream reader
@@ -139,9 +148,13 @@ def get_all_frames(
         resize_size (tuple[int, int], optional): Resize size for the frames. Defaults to None.
     """
     if video_backend == "decord":
+        import decord
+
         vr = decord.VideoReader(video_path, **video_backend_kwargs)
         frames = vr.get_batch(range(len(vr))).asnumpy()
     elif video_backend == "pyav":
+        import av
+
         container = av.open(video_path)
         frames = []
         for frame in container.decode(video=0):
@@ -149,6 +162,8 @@ def get_all_frames(
             frames.append(frame)
         frames = np.array(frames)
     elif video_backend == "torchvision_av":
+        import torchvision
+
         # set backend and reader
         torchvision.set_video_backend("pyav")
         reader = torchvision.io.VideoReader(video_path, "video")
@@ -161,6 +176,8 @@ def get_all_frames(
         raise NotImplementedError(f"Video backend {video_backend} not implemented")
     # resize frames if specified
     if resize_size is not None:
+        import cv2
+
         frames = [cv2.resize(frame, resize_size) for frame in frames]
         frames = np.array(frames)
     return frames
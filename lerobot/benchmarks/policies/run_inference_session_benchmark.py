@@ -0,0 +1,267 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Compare the latency of the inference sessions of PI0 and SmolVLA with their `sample_actions`.
+
+Both policies are built offline with tiny, randomly initialized models and a tokenizer of the characters of the
+task, so that only the inference code differs from the pretrained policies. For every policy, a call of
+`sample_actions` as done by `select_action` (`prepare_images`, `prepare_state`, `prepare_language` and
+`model.sample_actions`) is timed against `FlowMatchingInferenceSession.sample_actions`, with
+`compile_inference_session=False` and `True`. Every session must return the actions of `sample_actions` from the
+same noise. Reports the latency per call, excluding the first (compilation) calls.
+
+Example:
+    ```bash
+    python benchmarks/policies/run_inference_session_benchmark.py --num-calls 20 --device cpu
+    ```
+"""
+
+import argparse
+import time
+from contextlib import ExitStack
+from unittest.mock import patch
+
+import torch
+from transformers import SmolVLMConfig
+from transformers.models.auto.configuration_auto import CONFIG_MAPPING
+
+from lerobot.configs.types import FeatureType, PolicyFeature
+from lerobot.constants import ACTION, OBS_STATE
+from lerobot.policies.pi0 import modeling_pi0
+from lerobot.policies.pi0.configuration_pi0 import PI0Config
+from lerobot.policies.pi0.modeling_pi0 import PI0Policy
+from lerobot.policies.pi0.paligemma_with_expert import PaliGemmaWithExpertConfig
+from lerobot.policies.smolvla import modeling_smolvla, smolvlm_with_expert
+from lerobot.policies.smolvla.configuration_smolvla import SmolVLAConfig
+from lerobot.policies.smolvla.modeling_smolvla import SmolVLAPolicy
+
+IMAGE_KEY = "observation.images.top"
+IMAGE_SHAPE = (3, 24, 32)
+STATE_DIM = 6
+
+
+class CharTokenizer:
+    """Tokenizes the characters of the tasks, after the special image tokens of SmolVLM."""
+
+    fake_image_token_id = 1
+    global_image_token_id = 2
+
+    def __call__(self, tasks, padding, padding_side, max_length, return_tensors):
+        token_lists = [[ord(char) % 253 + 3 for char in task][:max_length] for task in tasks]
+        length = max_length if padding == "max_length" else max(len(tokens) for tokens in token_lists)
+        input_ids = torch.zeros(len(tasks), length, dtype=torch.long)
+        attention_mask = torch.zeros(len(tasks), length, dtype=torch.long)
+        for i, tokens in enumerate(token_lists):
+            input_ids[i, : len(tokens)] = torch.tensor(tokens)
+            attention_mask[i, : len(tokens)] = 1
+        return {"input_ids": input_ids, "attention_mask": attention_mask}
+
+
+class CharProcessor:
+    tokenizer = CharTokenizer()
+
+
+def tiny_paligemma_with_expert_config(**kwargs) -> PaliGemmaWithExpertConfig:
+    config = PaliGemmaWithExpertConfig(**kwargs)
+    config.paligemma_config = CONFIG_MAPPING["paligemma"](
+        hidden_size=64,
+        image_token_index=256,
+        projection_dim=64,
+        text_config={
+            "model_type": "gemma",
+            "hidden_size": 64,
+            "intermediate_size": 128,
+            "num_attention_heads": 2,
+            "num_hidden_layers": 2,
+            "num_key_value_heads": 1,
+            "head_dim": 16,
+            "vocab_size": 257,
+        },
+        vision_config={
+            "model_type": "siglip_vision_model",
+            "hidden_size": 32,
+            "intermediate_size": 64,
+            "num_attention_heads": 2,
+            "num_hidden_layers": 1,
+            "image_size": 32,
+            "patch_size": 8,
+            "projection_dim": 64,
+            "vision_use_head": False,
+        },
+    )
+    config.gemma_expert_config = CONFIG_MAPPING["gemma"](
+        hidden_size=32,
+        intermediate_size=64,
+        num_attention_heads=2,
+        num_hidden_layers=2,
+        num_key_value_heads=1,
+        head_dim=16,
+        vocab_size=257,
+    )
+    return config
+
+
+def tiny_smolvlm_config(*args, **kwargs) -> SmolVLMConfig:
+    return SmolVLMConfig(
+        text_config={
+            "model_type": "llama",
+            "hidden_size": 64,
+            "intermediate_size": 128,
+            "num_attention_heads": 4,
+            "num_key_value_heads": 2,
+            "num_hidden_layers": 4,
+            "head_dim": 16,
+            "vocab_size": 256,
+        },
+        vision_config={
+            "hidden_size": 32,
+            "intermediate_size": 64,
+            "num_attention_heads": 2,
+            "num_hidden_layers": 1,
+            "image_size": 32,
+            "patch_size": 8,
+        },
+        scale_factor=2,
+    )
+
+
+def make_policy(name: str, device: str) -> PI0Policy | SmolVLAPolicy:
+    features = {
+        "input_features": {
+            IMAGE_KEY: PolicyFeature(type=FeatureType.VISUAL, shape=IMAGE_SHAPE),
+            OBS_STATE: PolicyFeature(type=FeatureType.STATE, shape=(STATE_DIM,)),
+        },
+        "output_features": {ACTION: PolicyFeature(type=FeatureType.ACTION, shape=(STATE_DIM,))},
+    }
+    stats = {
+        key: {"mean": torch.zeros(STATE_DIM), "std": torch.ones(STATE_DIM)} for key in [OBS_STATE, ACTION]
+    }
+    with ExitStack() as stack:
+        if name == "pi0":
+            stack.enter_context(
+                patch.object(modeling_pi0, "PaliGemmaWithExpertConfig", tiny_paligemma_with_expert_config)
+            )
+            stack.enter_context(
+                patch.object(
+                    modeling_pi0.AutoTokenizer, "from_pretrained", lambda *args, **kwargs: CharTokenizer()
+                )
+            )
+            config = PI0Config(
+                **features,
+                chunk_size=4,
+                n_action_steps=4,
+                max_state_dim=8,
+                max_action_dim=8,
+                proj_width=32,
+                resize_imgs_with_padding=(32, 32),
+                tokenizer_max_length=12,
+                device=device,
+            )
+            policy = PI0Policy(config, dataset_stats=stats)
+        else:
+            stack.enter_context(
+                patch.object(smolvlm_with_expert.AutoConfig, "from_pretrained", tiny_smolvlm_config)
+            )
+            for module in [smolvlm_with_expert, modeling_smolvla]:
+                stack.enter_context(
+                    patch.object(
+                        module.AutoProcessor, "from_pretrained", lambda *args, **kwargs: CharProcessor()
+                    )
+                )
+            config = SmolVLAConfig(
+                **features,
+                chunk_size=4,
+                n_action_steps=4,
+                max_state_dim=8,
+                max_action_dim=8,
+                resize_imgs_with_padding=(32, 32),
+                tokenizer_max_length=24,
+                num_vlm_layers=4,
+                device=device,
+            )
+            policy = SmolVLAPolicy(config, dataset_stats=stats)
+    policy.to(device)
+    policy.eval()
+    return policy
+
+
+def sample_actions(policy: PI0Policy | SmolVLAPolicy, batch: dict, noise: torch.Tensor) -> torch.Tensor:
+    """`sample_actions` of the model, as called by `select_action` without a session."""
+    images, img_masks = policy.prepare_images(batch)
+    state = policy.prepare_state(batch)
+    lang_tokens, lang_masks = policy.prepare_language(batch)
+    return policy.model.sample_actions(images, img_masks, lang_tokens, lang_masks, state, noise=noise)
+
+
+def session_sample_actions(
+    policy: PI0Policy | SmolVLAPolicy, batch: dict, noise: torch.Tensor
+) -> torch.Tensor:
+    """`sample_actions` of the inference session of the batch."""
+    return policy.inference_session(batch).sample_actions(batch, noise=noise)
+
+
+def time_calls(
+    fn, policy: PI0Policy | SmolVLAPolicy, batch: dict, noise: torch.Tensor, num_calls: int
+) -> tuple[float, torch.Tensor]:
+    """Average latency of `fn` in seconds after a first call, and the actions of the first call."""
+    actions = fn(policy, batch, noise.clone())
+    start = time.perf_counter()
+    for _ in range(num_calls):
+        fn(policy, batch, noise.clone())
+    if noise.device.type == "cuda":
+        torch.cuda.synchronize()
+    return (time.perf_counter() - start) / num_calls, actions
+
+
+@torch.no_grad()
+def main(policies: list[str], batch_size: int, num_calls: int, device: str):
+    for name in policies:
+        torch.manual_seed(0)
+        policy = make_policy(name, device)
+        config = policy.config
+        batch = policy.normalize_inputs(
+            {
+                IMAGE_KEY: torch.rand(batch_size, *IMAGE_SHAPE, device=device),
+                OBS_STATE: torch.randn(batch_size, STATE_DIM, device=device),
+                "task": ["pick the cube"] * batch_size,
+            }
+        )
+        noise = torch.randn(batch_size, config.chunk_size, config.max_action_dim, device=device)
+
+        latency, expected = time_calls(sample_actions, policy, batch, noise, num_calls)
+        print(f"{name} sample_actions: {latency * 1e3:.2f}ms")
+        for compile in [False, True]:
+            config.compile_inference_session = compile
+            policy._inference_sessions.clear()
+            session_latency, actions = time_calls(session_sample_actions, policy, batch, noise, num_calls)
+            # The models run in bfloat16, whose operations inductor fuses and rounds differently
+            tolerance = 1e-2 if compile else None
+            torch.testing.assert_close(actions, expected, atol=tolerance, rtol=tolerance)
+            print(
+                f"{name} inference session (compile={compile}): {session_latency * 1e3:.2f}ms "
+                f"({latency / session_latency:.2f}x)"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--policies", type=str, nargs="+", default=["pi0", "smolvla"], help="Policies to benchmark."
+    )
+    parser.add_argument("--batch-size", type=int, default=1, help="Batch size of the observations.")
+    parser.add_argument("--num-calls", type=int, default=20, help="Number of timed calls of each path.")
+    parser.add_argument("--device", type=str, default="cpu", help="Device to run the policies on.")
+    args = parser.parse_args()
+    main(**vars(args))
@@ -0,0 +1,175 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Compare the latency of `TDMPCPolicy.plan` with the previous planner.
+
+The previous planner, kept below as `reference_plan`, evaluates the trajectories sampled from the policy (π)
+again at every CEM iteration. Both planners are run from the same seed on a randomly initialized policy with the
+default config (or smaller networks with `--mlp-dim`), and must return the same actions. Reports the latency of
+a call to each for every batch size.
+
+Example:
+    ```bash
+    python benchmarks/policies/run_tdmpc_plan_benchmark.py --batch-sizes 1 32 --device cpu
+    ```
+"""
+
+# ruff: noqa: N806
+
+import argparse
+import time
+
+import einops
+import torch
+from torch import Tensor
+
+from lerobot.configs.types import FeatureType, PolicyFeature
+from lerobot.constants import ACTION, OBS_STATE
+from lerobot.policies.tdmpc.configuration_tdmpc import TDMPCConfig
+from lerobot.policies.tdmpc.modeling_tdmpc import TDMPCPolicy
+
+STATE_DIM = 8
+ACTION_DIM = 4
+
+
+@torch.no_grad()
+def reference_estimate_value(policy: TDMPCPolicy, z: Tensor, actions: Tensor) -> Tensor:
+    """`TDMPCPolicy.estimate_value` of the previous planner."""
+    config = policy.config
+    G, running_discount = 0, 1
+    for t in range(actions.shape[0]):
+        if config.uncertainty_regularizer_coeff > 0:
+            regularization = -(config.uncertainty_regularizer_coeff * policy.model.Qs(z, actions[t]).std(0))
+        else:
+            regularization = 0
+        z, reward = policy.model.latent_dynamics_and_reward(z, actions[t])
+        G += running_discount * (reward + regularization)
+        running_discount *= config.discount
+    next_action = policy.model.pi(z, config.min_std)
+    terminal_values = policy.model.Qs(z, next_action)
+    if config.q_ensemble_size > 2:
+        G += (
+            running_discount
+            * torch.min(terminal_values[torch.randint(0, config.q_ensemble_size, size=(2,))], dim=0)[0]
+        )
+    else:
+        G += running_discount * torch.min(terminal_values, dim=0)[0]
+    if config.uncertainty_regularizer_coeff > 0:
+        G -= running_discount * config.uncertainty_regularizer_coeff * terminal_values.std(0)
+    return G
+
+
+@torch.no_grad()
+def reference_plan(policy: TDMPCPolicy, z: Tensor) -> Tensor:
+    """`TDMPCPolicy.plan` of the previous planner, on its first call (without warm start)."""
+    config = policy.config
+    batch_size = z.shape[0]
+    pi_actions = torch.empty(
+        config.horizon, config.n_pi_samples, batch_size, config.action_feature.shape[0], device=z.device
+    )
+    if config.n_pi_samples > 0:
+        _z = einops.repeat(z, "b d -> n b d", n=config.n_pi_samples)
+        for t in range(config.horizon):
+            pi_actions[t] = policy.model.pi(_z, config.min_std)
+            _z = policy.model.latent_dynamics(_z, pi_actions[t])
+    z = einops.repeat(z, "b d -> n b d", n=config.n_gaussian_samples + config.n_pi_samples)
+
+    mean = torch.zeros(config.horizon, batch_size, config.action_feature.shape[0], device=z.device)
+    std = config.max_std * torch.ones_like(mean)
+    for _ in range(config.cem_iterations):
+        std_normal_noise = torch.randn(
+            config.horizon,
+            config.n_gaussian_samples,
+            batch_size,
+            config.action_feature.shape[0],
+            device=z.device,
+        )
+        gaussian_actions = torch.clamp(mean.unsqueeze(1) + std.unsqueeze(1) * std_normal_noise, -1, 1)
+        actions = torch.cat([gaussian_actions, pi_actions], dim=1)
+        value = reference_estimate_value(policy, z, actions).nan_to_num_(0)
+        elite_idxs = torch.topk(value, config.n_elites, dim=0).indices
+        elite_value = value.take_along_dim(elite_idxs, dim=0)
+        elite_actions = actions.take_along_dim(einops.rearrange(elite_idxs, "n b -> 1 n b 1"), dim=1)
+        max_value = elite_value.max(0, keepdim=True)[0]
+        score = torch.exp(config.elite_weighting_temperature * (elite_value - max_value))
+        score /= score.sum(axis=0, keepdim=True)
+        _mean = torch.sum(einops.rearrange(score, "n b -> n b 1") * elite_actions, dim=1)
+        _std = torch.sqrt(
+            torch.sum(
+                einops.rearrange(score, "n b -> n b 1")
+                * (elite_actions - einops.rearrange(_mean, "h b d -> h 1 b d")) ** 2,
+                dim=1,
+            )
+        )
+        mean = config.gaussian_mean_momentum * mean + (1 - config.gaussian_mean_momentum) * _mean
+        std = _std.clamp_(config.min_std, config.max_std)
+    return elite_actions[:, torch.multinomial(score.T, 1).squeeze(1), torch.arange(batch_size)]
+
+
+def make_policy(mlp_dim: int, device: str) -> TDMPCPolicy:
+    config = TDMPCConfig(
+        input_features={OBS_STATE: PolicyFeature(type=FeatureType.STATE, shape=(STATE_DIM,))},
+        output_features={ACTION: PolicyFeature(type=FeatureType.ACTION, shape=(ACTION_DIM,))},
+        device=device,
+        mlp_dim=mlp_dim,
+    )
+    policy = TDMPCPolicy(config).to(device)
+    policy.eval()
+    # The last layers of the reward and the Qs are initialized to zero, which would make all trajectories equal
+    for param in policy.model.parameters():
+        param.data.normal_(0, 0.1)
+    return policy
+
+
+def time_plan(plan_fn, policy: TDMPCPolicy, z: Tensor, num_calls: int) -> tuple[float, Tensor]:
+    """Average latency of `plan_fn` in seconds, and the actions of its first call from seed 0."""
+    torch.manual_seed(0)
+    actions = plan_fn(policy, z)
+    start = time.perf_counter()
+    for _ in range(num_calls):
+        policy.reset()
+        plan_fn(policy, z)
+    if z.device.type == "cuda":
+        torch.cuda.synchronize()
+    return (time.perf_counter() - start) / num_calls, actions
+
+
+def main(batch_sizes: list[int], num_calls: int, mlp_dim: int, device: str):
+    policy = make_policy(mlp_dim, device)
+    for batch_size in batch_sizes:
+        z = torch.rand(batch_size, policy.config.latent_dim, device=device)
+        policy.reset()
+        reference_latency, reference_actions = time_plan(reference_plan, policy, z, num_calls)
+        policy.reset()
+        latency, actions = time_plan(TDMPCPolicy.plan, policy, z, num_calls)
+        torch.testing.assert_close(actions, reference_actions)
+        print(
+            f"batch_size={batch_size}: previous planner {reference_latency * 1e3:.1f}ms, "
+            f"plan {latency * 1e3:.1f}ms ({reference_latency / latency:.2f}x)"
+        )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument(
+        "--batch-sizes", type=int, nargs="+", default=[1, 32], help="Batch sizes of the latent states."
+    )
+    parser.add_argument("--num-calls", type=int, default=3, help="Number of timed calls of each planner.")
+    parser.add_argument(
+        "--mlp-dim", type=int, default=512, help="Hidden dimension of the MLPs (512 in the default config)."
+    )
+    parser.add_argument("--device", type=str, default="cpu", help="Device to plan on.")
+    args = parser.parse_args()
+    main(**vars(args))
@@ -0,0 +1,123 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""Compare the throughput of the training loop with and without `DevicePrefetcher`.
+
+A synthetic dataset, whose frames take `--frame-load-ms` to load like decoded video frames, feeds a small MLP
+policy updated with `update_policy`, once loading each batch serially and once prefetching the batches in the
+background. Reports the steps per second and the average `dataloading_s` of both.
+
+Example:
+    ```bash
+    python benchmarks/training/run_prefetch_benchmark.py --steps 100 --device cuda
+    ```
+"""
+
+import argparse
+import time
+
+import torch
+from torch import nn
+
+from lerobot.datasets.utils import DevicePrefetcher, cycle
+from lerobot.scripts.train import update_policy
+from lerobot.utils.logging_utils import AverageMeter, MetricsTracker
+
+
+class SlowDataset(torch.utils.data.Dataset):
+    """Synthetic dataset whose frames take some time to load, like decoding videos."""
+
+    def __init__(self, frame_load_s: float):
+        self.frame_load_s = frame_load_s
+
+    def __len__(self):
+        return 100_000
+
+    def __getitem__(self, idx):
+        time.sleep(self.frame_load_s)
+        return {"observation.state": torch.randn(64), "action": torch.randn(8), "index": idx}
+
+
+class MLPPolicy(nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.net = nn.Sequential(nn.Linear(64, 1024), nn.ReLU(), nn.Linear(1024, 1024), nn.ReLU())
+        self.head = nn.Linear(1024, 8)
+
+    def forward(self, batch):
+        loss = nn.functional.mse_loss(self.head(self.net(batch["observation.state"])), batch["action"])
+        return loss, {}
+
+
+def run_training(
+    prefetch_batches: int, steps: int, batch_size: int, frame_load_s: float, device: torch.device
+) -> tuple[float, float]:
+    """Train for `steps` steps, and return the steps per second and the average `dataloading_s`."""
+    torch.manual_seed(0)
+    policy = MLPPolicy().to(device)
+    optimizer = torch.optim.Adam(policy.parameters(), lr=1e-4)
+    grad_scaler = torch.amp.GradScaler(device.type, enabled=False)
+    dataloader = torch.utils.data.DataLoader(
+        SlowDataset(frame_load_s), batch_size=batch_size, num_workers=0, pin_memory=device.type == "cuda"
+    )
+    dl_iter = cycle(dataloader)
+    if prefetch_batches > 0:
+        dl_iter = DevicePrefetcher(dl_iter, device, num_batches=prefetch_batches)
+
+    metrics = {
+        "loss": AverageMeter("loss", ":.3f"),
+        "grad_norm": AverageMeter("grdn", ":.3f"),
+        "lr": AverageMeter("lr", ":0.1e"),
+        "update_s": AverageMeter("updt_s", ":.3f"),
+        "dataloading_s": AverageMeter("data_s", ":.3f"),
+    }
+    tracker = MetricsTracker(batch_size, len(dataloader.dataset), 1, metrics)
+    start = time.perf_counter()
+    for _ in range(steps):
+        start_time = time.perf_counter()
+        batch = next(dl_iter)
+        tracker.dataloading_s = time.perf_counter() - start_time
+        if prefetch_batches == 0:
+            batch = {k: v.to(device) if isinstance(v, torch.Tensor) else v for k, v in batch.items()}
+        tracker, _ = update_policy(tracker, policy, batch, optimizer, 10.0, grad_scaler)
+        tracker.step()
+    # Read the loss to wait for the last update
+    _ = tracker.loss.avg
+    steps_per_s = steps / (time.perf_counter() - start)
+    if prefetch_batches > 0:
+        dl_iter.close()
+    return steps_per_s, tracker.dataloading_s.avg
+
+
+def main(steps: int, batch_size: int, frame_load_ms: float, prefetch_batches: int, device: str):
+    device = torch.device(device)
+    for name, num_batches in [("serial", 0), (f"prefetch_batches={prefetch_batches}", prefetch_batches)]:
+        steps_per_s, dataloading_s = run_training(num_batches, steps, batch_size, frame_load_ms / 1e3, device)
+        print(f"{name}: {steps_per_s:.1f} steps/s, data_s={dataloading_s * 1e3:.2f}ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--steps", type=int, default=50, help="Number of training steps of each run.")
+    parser.add_argument("--batch-size", type=int, default=8, help="Batch size.")
+    parser.add_argument(
+        "--frame-load-ms", type=float, default=1.0, help="Time to load a frame of the synthetic dataset."
+    )
+    parser.add_argument(
+        "--prefetch-batches", type=int, default=2, help="Number of batches loaded ahead by the prefetcher."
+    )
+    parser.add_argument("--device", type=str, default="cpu", help="Device to train on.")
+    args = parser.parse_args()
+    main(**vars(args))
@@ -0,0 +1,396 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Provides the CameraCaptureHub, which captures frames from several cameras into shared-memory ring buffers.
+
+Each camera gets a capture thread which writes every frame once into a `SharedFrameRing`, together with a
+sequence number and a capture timestamp. Consumers (recording, policy inference, visualization) then read
+`SharedFrame` views of the ring instead of copies. A `SharedFrame` carries a `FrameRef` — the ring name,
+slot and sequence number — which is all that needs to be sent to another process (e.g. the
+`AsyncImageWriter` subprocesses) for it to read the frame from shared memory.
+
+Example:
+    ```python
+    cameras = make_cameras_from_configs(camera_configs)
+    for cam in cameras.values():
+        cam.connect()
+
+    hub = CameraCaptureHub(cameras)
+    hub.start()
+    frames = hub.synchronized_frames(tolerance_s=0.01)  # {name: SharedFrame}, captured within 10 ms
+    hub.stop()
+    ```
+"""
+
+import logging
+import threading
+import time
+import weakref
+from dataclasses import dataclass
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any
+
+import numpy as np
+
+from lerobot.errors import DeviceNotConnectedError
+
+from .camera import Camera
+from .configs import ColorMode
+
+logger = logging.getLogger(__name__)
+
+# Sequence number of a slot which is being written to.
+WRITING_SEQ = -1
+
+
+class StaleFrameError(KeyError):
+    """Raised when a frame is read from a `SharedFrameRing` after the ring wrapped around and overwrote it."""
+
+
+@dataclass(frozen=True)
+class FrameRef:
+    """Small, picklable reference to a frame stored in a `SharedFrameRing`."""
+
+    ring_name: str
+    shape: tuple[int, ...]
+    dtype: str
+    num_slots: int
+    seq: int
+
+    @property
+    def slot(self) -> int:
+        return self.seq % self.num_slots
+
+
+class SharedFrame(np.ndarray):
+    """A view of a frame stored in a `SharedFrameRing`.
+
+    It behaves like any other `np.ndarray`, but the underlying memory is reused once the ring wraps around:
+    use `is_valid()` to check the frame was not overwritten, or `.copy()` it to keep it around.
+    """
+
+    ref: FrameRef
+    timestamp: float
+    _ring: "SharedFrameRing"
+
+    def __array_finalize__(self, obj):
+        # Slices, copies and arithmetic results are not frames of the ring, only `SharedFrameRing.frame` sets these
+        self.ref = None
+        self.timestamp = None
+        self._ring = None
+
+    def is_valid(self) -> bool:
+        return self._ring is not None and self._ring.is_valid(self.ref.seq)
+
+
+class SharedFrameRing:
+    """Fixed-size ring of frames in shared memory, with a sequence number and a timestamp per slot.
+
+    The memory layout is `[write_seq, slot_seqs[num_slots], timestamps[num_slots], frames[num_slots]]`. A single
+    writer updates a slot as a seqlock: its sequence number is set to `WRITING_SEQ` while the frame is copied,
+    then to the sequence number of the frame. Readers, possibly in other processes, check the sequence
+    number of a slot after reading it to detect that it was overwritten.
+    """
+
+    def __init__(
+        self,
+        shape: tuple[int, ...],
+        num_slots: int,
+        dtype: np.dtype | str = np.uint8,
+        name: str | None = None,
+        create: bool = True,
+    ):
+        self.shape = tuple(shape)
+        self.dtype = np.dtype(dtype)
+        self.num_slots = num_slots
+        self.owner = create
+
+        header_size = 8 * (1 + 2 * num_slots)
+        frame_size = int(np.prod(self.shape)) * self.dtype.itemsize
+        if create:
+            self.shm = shared_memory.SharedMemory(
+                name=name, create=True, size=header_size + num_slots * frame_size
+            )
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            # Only the creator of the segment must unlink it
+            resource_tracker.unregister(self.shm._name, "shared_memory")
+        self.name = self.shm.name
+
+        buf = self.shm.buf
+        self._write_seq = np.ndarray((1,), dtype=np.int64, buffer=buf, offset=0)
+        self._slot_seqs = np.ndarray((num_slots,), dtype=np.int64, buffer=buf, offset=8)
+        self._timestamps = np.ndarray((num_slots,), dtype=np.float64, buffer=buf, offset=8 * (1 + num_slots))
+        self._frames = np.ndarray((num_slots, *self.shape), dtype=self.dtype, buffer=buf, offset=header_size)
+        if create:
+            self._write_seq[0] = WRITING_SEQ
+            self._slot_seqs[:] = WRITING_SEQ
+        _open_rings[self.name] = self
+
+    @classmethod
+    def attach(cls, ref: FrameRef) -> "SharedFrameRing":
+        """Open, without creating it, the ring `ref` points to."""
+        return cls(ref.shape, ref.num_slots, ref.dtype, name=ref.ring_name, create=False)
+
+    @property
+    def latest_seq(self) -> int:
+        """Sequence number of the last frame written, or `WRITING_SEQ` if there is none yet."""
+        return int(self._write_seq[0])
+
+    def write(self, frame: np.ndarray, timestamp: float) -> int:
+        """Copy `frame` into the next slot and return its sequence number."""
+        seq = self.latest_seq + 1
+        slot = seq % self.num_slots
+        self._slot_seqs[slot] = WRITING_SEQ
+        self._frames[slot] = frame
+        self._timestamps[slot] = timestamp
+        self._slot_seqs[slot] = seq
+        self._write_seq[0] = seq
+        return seq
+
+    def is_valid(self, seq: int) -> bool:
+        """Whether the frame `seq` is still held by the ring."""
+        return seq >= 0 and int(self._slot_seqs[seq % self.num_slots]) == seq
+
+    def ref(self, seq: int) -> FrameRef:
+        return FrameRef(self.name, self.shape, self.dtype.str, self.num_slots, seq)
+
+    def frame(self, seq: int) -> SharedFrame:
+        """Return a view of the frame `seq`, without copying it."""
+        if not self.is_valid(seq):
+            raise StaleFrameError(
+                f"Frame {seq} is not in the ring '{self.name}' (latest is {self.latest_seq})."
+            )
+        slot = seq % self.num_slots
+        frame = self._frames[slot].view(SharedFrame)
+        frame.ref = self.ref(seq)
+        frame.timestamp = float(self._timestamps[slot])
+        frame._ring = self
+        return frame
+
+    def valid_seqs_and_timestamps(self) -> tuple[np.ndarray, np.ndarray]:
+        """Sequence numbers and timestamps of every frame currently held by the ring."""
+        seqs = self._slot_seqs.copy()
+        timestamps = self._timestamps.copy()
+        valid = seqs >= 0
+        return seqs[valid], timestamps[valid]
+
+    def close(self) -> None:
+        _open_rings.pop(self.name, None)
+        del self._write_seq, self._slot_seqs, self._timestamps, self._frames
+        try:
+            self.shm.close()
+        except BufferError:
+            # Frames still referenced by a consumer keep the memory mapped until they are garbage collected
+            logger.debug(f"Frames of the ring '{self.name}' are still in use, it will be unmapped later.")
+        if self.owner:
+            self.shm.unlink()
+
+
+# Rings opened in this process, by name, so that a `FrameRef` is resolved without mapping its ring twice
+_open_rings: weakref.WeakValueDictionary[str, SharedFrameRing] = weakref.WeakValueDictionary()
+_attached_rings: dict[str, SharedFrameRing] = {}
+
+
+def read_frame_ref(ref: FrameRef) -> np.ndarray:
+    """Copy the frame `ref` points to out of its ring, attaching to the ring in this process if needed.
+
+    Raises:
+        StaleFrameError: If the frame was overwritten before it could be read entirely.
+    """
+    ring = _open_rings.get(ref.ring_name)
+    if ring is None:
+        # Keep the rings attached by this process alive for the following frames
+        ring = _attached_rings[ref.ring_name] = SharedFrameRing.attach(ref)
+    frame = np.array(ring.frame(ref.seq))
+    if not ring.is_valid(ref.seq):
+        raise StaleFrameError(
+            f"Frame {ref.seq} of the ring '{ref.ring_name}' was overwritten while being read."
+        )
+    return frame
+
+
+class CameraCaptureHub:
+    """Captures frames from several cameras, each in its own thread, into shared-memory ring buffers.
+
+    Frames are read with the blocking `Camera.read()` of every camera, and written once in the camera's
+    `SharedFrameRing` with a `time.perf_counter()` capture timestamp. The rings are allocated on `start()`
+    from the shape of a first frame. They should hold at least as many frames as the slowest consumer can
+    lag behind (e.g. the image writer queue while recording).
+
+    Args:
+        cameras (dict[str, Camera]): Connected cameras, by name.
+        num_slots (int): Number of frames kept in shared memory per camera. Defaults to 90 (3s at 30 fps).
+    """
+
+    def __init__(self, cameras: dict[str, Camera], num_slots: int = 90):
+        self.cameras = cameras
+        self.num_slots = num_slots
+        self.rings: dict[str, SharedFrameRing] = {}
+        self.threads: dict[str, threading.Thread] = {}
+        self.stop_event = threading.Event()
+        self.new_frame_conditions = {name: threading.Condition() for name in cameras}
+
+    @property
+    def is_running(self) -> bool:
+        return bool(self.threads) and not self.stop_event.is_set()
+
+    def start(self) -> None:
+        if self.is_running:
+            raise RuntimeError("The capture hub is already running.")
+
+        self.stop_event.clear()
+        for name, camera in self.cameras.items():
+            if not camera.is_connected:
+                raise DeviceNotConnectedError(f"Camera '{name}' must be connected before starting the hub.")
+            frame = camera.read()
+            ring = SharedFrameRing(frame.shape, self.num_slots, frame.dtype)
+            ring.write(frame, time.perf_counter())
+            self.rings[name] = ring
+
+        for name in self.cameras:
+            thread = threading.Thread(target=self._capture_loop, args=(name,), name=f"capture_hub_{name}")
+            thread.daemon = True
+            thread.start()
+            self.threads[name] = thread
+
+    def _capture_loop(self, name: str) -> None:
+        camera, ring = self.cameras[name], self.rings[name]
+        condition = self.new_frame_conditions[name]
+        while not self.stop_event.is_set():
+            try:
+                frame = camera.read()
+                timestamp = time.perf_counter()
+            except DeviceNotConnectedError:
+                break
+            except Exception as e:
+                logger.warning(f"Error reading frame from camera '{name}' in the capture hub: {e}")
+                continue
+            with condition:
+                ring.write(frame, timestamp)
+                condition.notify_all()
+
+    def stop(self) -> None:
+        """Stops the capture threads and releases the shared memory. Cameras are left connected."""
+        self.stop_event.set()
+        for thread in self.threads.values():
+            thread.join(timeout=2.0)
+        self.threads = {}
+        for ring in self.rings.values():
+            ring.close()
+        self.rings = {}
+
+    def latest_frame(self, name: str) -> SharedFrame:
+        """Return a view of the most recent frame of a camera."""
+        ring = self.rings[name]
+        return ring.frame(ring.latest_seq)
+
+    def wait_for_frame(self, name: str, after_seq: int, timeout_ms: float = 200) -> SharedFrame:
+        """Return a view of the most recent frame of a camera, waiting for one newer than `after_seq`."""
+        ring = self.rings[name]
+        with self.new_frame_conditions[name]:
+            if not self.new_frame_conditions[name].wait_for(
+                lambda: ring.latest_seq > after_seq, timeout=timeout_ms / 1000
+            ):
+                raise TimeoutError(
+                    f"Timed out waiting for a new frame from camera '{name}' after {timeout_ms} ms."
+                )
+            return ring.frame(ring.latest_seq)
+
+    def synchronized_frames(self, tolerance_s: float, timeout_ms: float = 200) -> dict[str, SharedFrame]:
+        """Return one frame per camera, all captured within `tolerance_s` of each other.
+
+        The reference time is the capture time of the latest frame of the camera which lags the most. Every
+        other camera contributes the frame of its ring closest to that time, so the frames are as recent as
+        possible. Waits for new frames until `timeout_ms` if the cameras are not synchronized enough.
+        """
+        deadline = time.perf_counter() + timeout_ms / 1000
+        while True:
+            latest = {name: self.latest_frame(name) for name in self.rings}
+            reference_time = min(frame.timestamp for frame in latest.values())
+            frames = {}
+            for name, ring in self.rings.items():
+                seqs, timestamps = ring.valid_seqs_and_timestamps()
+                closest = np.argmin(np.abs(timestamps - reference_time))
+                if abs(timestamps[closest] - reference_time) <= tolerance_s and ring.is_valid(seqs[closest]):
+                    frames[name] = ring.frame(int(seqs[closest]))
+
+            if len(frames) == len(self.rings):
+                return frames
+            if time.perf_counter() > deadline:
+                raise TimeoutError(f"Could not find frames captured within {tolerance_s}s of each other.")
+
+            laggiest = min(latest, key=lambda name: latest[name].timestamp)
+            self.wait_for_frame(laggiest, latest[laggiest].ref.seq, timeout_ms)
+
+    def make_cameras(self) -> dict[str, "HubCamera"]:
+        """Wrap the cameras so that their reads are served from the hub, e.g. to replace `robot.cameras`."""
+        return {name: HubCamera(self, name) for name in self.cameras}
+
+
+class HubCamera(Camera):
+    """A camera whose frames are read from a `CameraCaptureHub` instead of the device.
+
+    `async_read()` returns `SharedFrame` views of the ring without copying them. Disconnecting it stops the hub,
+    then disconnects the underlying camera.
+    """
+
+    def __init__(self, hub: CameraCaptureHub, name: str):
+        camera = hub.cameras[name]
+        self.fps = camera.fps
+        self.width = camera.width
+        self.height = camera.height
+        self.hub = hub
+        self.name = name
+        self.camera = camera
+        self.last_seq = WRITING_SEQ
+
+    def __str__(self) -> str:
+        return f"{self.__class__.__name__}({self.camera})"
+
+    @property
+    def is_connected(self) -> bool:
+        return self.hub.is_running and self.camera.is_connected
+
+    @staticmethod
+    def find_cameras() -> list[dict[str, Any]]:
+        return []
+
+    def connect(self, warmup: bool = True) -> None:
+        if not self.camera.is_connected:
+            self.camera.connect(warmup)
+        if not self.hub.is_running and all(cam.is_connected for cam in self.hub.cameras.values()):
+            self.hub.start()
+
+    def read(self, color_mode: ColorMode | None = None) -> np.ndarray:
+        if color_mode is not None:
+            raise ValueError(f"{self} only serves frames in the color mode of the underlying camera.")
+        return self.async_read()
+
+    def async_read(self, timeout_ms: float = 200) -> SharedFrame:
+        if not self.is_connected:
+            raise DeviceNotConnectedError(f"{self} is not connected.")
+        frame = self.hub.wait_for_frame(self.name, self.last_seq, timeout_ms)
+        self.last_seq = frame.ref.seq
+        return frame
+
+    def disconnect(self) -> None:
+        if not self.camera.is_connected:
+            raise DeviceNotConnectedError(f"{self} not connected.")
+        if self.hub.is_running:
+            self.hub.stop()
+        self.camera.disconnect()
@@ -58,6 +58,9 @@ class EvalConfig:
     batch_size: int = 50
     # `use_async_envs` specifies whether to use asynchronous environments (multiprocessing).
     use_async_envs: bool = False
+    # `autoreset` starts the next episode of an environment as soon as its current one ends, instead of
+    # running batches of `batch_size` episodes until the slowest one ends. No videos are rendered.
+    autoreset: bool = False
 
     def __post_init__(self):
         if self.batch_size > self.n_episodes:
@@ -51,6 +51,9 @@ class TrainPipelineConfig(HubMixin):
     seed: int | None = 1000
     # Number of workers for the dataloader.
     num_workers: int = 4
+    # Number of batches loaded and moved to the device in the background while the policy is updated (0 loads
+    # each batch when the previous update is done).
+    prefetch_batches: int = 2
     batch_size: int = 8
     steps: int = 100_000
     eval_freq: int = 20_000
@@ -58,6 +61,10 @@ class TrainPipelineConfig(HubMixin):
     save_checkpoint: bool = True
     # Checkpoint is saved every `save_freq` training iterations and after the last training step.
     save_freq: int = 20_000
+    # Write checkpoints in a background thread instead of pausing training. Training only waits for the
+    # state to be copied to the cpu, or for a previous checkpoint when `max_checkpoints_in_flight` are pending.
+    async_checkpoint: bool = True
+    max_checkpoints_in_flight: int = 1
     use_policy_training_preset: bool = True
     optimizer: OptimizerConfig | None = None
     scheduler: LRSchedulerConfig | None = None
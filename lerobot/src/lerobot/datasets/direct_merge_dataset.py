@@ -1,253 +1,391 @@
 #!/usr/bin/env python
+
+# Copyright 2024 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
 """
-Direct dataset merging by copying parquet files.
+Merge several local LeRobot datasets into a single one without decoding nor re-encoding anything.
+
+The whole merge is planned up front from the `meta/` manifests of the source datasets: every source episode
+is given its new episode index, global frame index offset and output chunk (respecting `chunks_size`), and
+tasks are deduplicated into a single task table. Then:
+
+- parquet files are rewritten in a process pool, only remapping the `episode_index`, `index` and
+  `task_index` columns with vectorized Arrow compute;
+- videos are hardlinked (or reflinked, or copied as a last resort) into the output dataset;
+- per-episode stats are renumbered and aggregated into `meta/stats.json` with `aggregate_stats`.
+
+Usage:
 
-This is the simplest possible approach - just copy the parquet files
-from multiple datasets into a single merged dataset.
+```bash
+python -m lerobot.datasets.direct_merge_dataset
+```
 """
 
-import os
+import contextlib
+import fcntl
 import json
+import logging
+import os
 import shutil
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass
 from pathlib import Path
-import pandas as pd
-
-def find_datasets():
-    """Find available moving-tape datasets"""
-    possible_paths = [
-        ".",
-        "~/lerobotjs/datasets",
-        os.path.expanduser("~/lerobotjs/datasets"),
-        "/home/son/lerobotjs/datasets",
-    ]
-    
-    datasets = []
-    for path in possible_paths:
-        expanded_path = os.path.expanduser(path)
-        if os.path.exists(expanded_path):
-            print(f"Checking path: {expanded_path}")
-            for item in os.listdir(expanded_path):
-                item_path = os.path.join(expanded_path, item)
-                if item.startswith('moving-tape-dataset') and os.path.isdir(item_path):
-                    info_path = os.path.join(item_path, 'meta', 'info.json')
-                    if os.path.exists(info_path):
-                        try:
-                            with open(info_path, 'r') as f:
-                                info = json.load(f)
-                            datasets.append((item, item_path, info))
-                            print(f"✓ Found: {item} ({info.get('total_episodes', '?')} episodes)")
-                        except Exception as e:
-                            print(f"✗ Error reading {item}: {e}")
-    
-    return datasets
-
-def merge_datasets_direct(datasets, output_path):
-    """Merge datasets by directly copying and renumbering parquet files"""
-    
-    if not datasets:
-        print("No datasets found!")
-        return False
-    
-    print(f"\nMerging {len(datasets)} datasets directly...")
-    
-    # Create output directory structure
-    output_path = Path(output_path)
-    output_path.mkdir(parents=True, exist_ok=True)
-    
-    meta_dir = output_path / "meta"
-    data_dir = output_path / "data" / "chunk-000"
-    videos_dir = output_path / "videos" / "chunk-000"
-    
-    meta_dir.mkdir(parents=True, exist_ok=True)
-    data_dir.mkdir(parents=True, exist_ok=True)
-    videos_dir.mkdir(parents=True, exist_ok=True)
-    
-    # Use first dataset as template for metadata
-    first_dataset_path = Path(datasets[0][1])
-    first_info_path = first_dataset_path / "meta" / "info.json"
-    
-    with open(first_info_path, 'r') as f:
-        template_info = json.load(f)
-    
-    # Initialize merged dataset info
-    merged_info = template_info.copy()
-    merged_info.update({
-        "total_episodes": 0,
-        "total_frames": 0,
-        "total_tasks": 0,
-        "total_videos": 0,
-        "splits": {"train": "0:0"}
-    })
-    
-    # Process each dataset
-    episode_counter = 0
-    frame_counter = 0
-    all_tasks = set()
-    all_episodes = []
-    all_episodes_stats = []
-    
-    for i, (dataset_name, dataset_path, info) in enumerate(datasets):
-        print(f"\nProcessing dataset {i+1}/{len(datasets)}: {dataset_name}")
-        
-        dataset_path = Path(dataset_path)
-        
-        # Load episodes info
-        episodes_path = dataset_path / "meta" / "episodes.jsonl"
-        if episodes_path.exists():
-            with open(episodes_path, 'r') as f:
-                episodes = [json.loads(line) for line in f]
-        else:
-            episodes = []
-        
-        # Load tasks info
-        tasks_path = dataset_path / "meta" / "tasks.jsonl"
-        if tasks_path.exists():
-            with open(tasks_path, 'r') as f:
-                tasks = [json.loads(line) for line in f]
-                for task in tasks:
-                    all_tasks.add(task.get('task', 'default_task'))
-        
-        # Load episodes stats
-        episodes_stats_path = dataset_path / "meta" / "episodes_stats.jsonl"
-        if episodes_stats_path.exists():
-            with open(episodes_stats_path, 'r') as f:
-                episodes_stats = [json.loads(line) for line in f]
-        else:
-            episodes_stats = []
-        
-        # Process each episode
-        for ep_idx, episode in enumerate(episodes):
-            print(f"  Episode {ep_idx + 1}/{len(episodes)}")
-            
-            # Copy parquet file
-            old_parquet = dataset_path / "data" / "chunk-000" / f"episode_{episode['episode_index']:06d}.parquet"
-            new_parquet = data_dir / f"episode_{episode_counter:06d}.parquet"
-            
-            if old_parquet.exists():
-                shutil.copy2(old_parquet, new_parquet)
-                print(f"    Copied parquet: {old_parquet.name} -> {new_parquet.name}")
-                
-                # Update episode info
-                new_episode = episode.copy()
-                new_episode['episode_index'] = episode_counter
-                all_episodes.append(new_episode)
-                
-                # Update frame counter
-                frame_counter += episode['length']
-                episode_counter += 1
-                
-                # Copy video files if they exist
-                if 'videos' in template_info and template_info['videos']:
-                    old_videos_dir = dataset_path / "videos" / "chunk-000"
-                    if old_videos_dir.exists():
-                        for video_key in template_info.get('video_keys', []):
-                            old_video_dir = old_videos_dir / video_key
-                            new_video_dir = videos_dir / video_key
-                            new_video_dir.mkdir(exist_ok=True)
-                            
-                            old_video_file = old_video_dir / f"episode_{episode['episode_index']:06d}.mp4"
-                            new_video_file = new_video_dir / f"episode_{episode_counter-1:06d}.mp4"
-                            
-                            if old_video_file.exists():
-                                shutil.copy2(old_video_file, new_video_file)
-                                print(f"    Copied video: {old_video_file.name} -> {new_video_file.name}")
+
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from lerobot.datasets.compute_stats import aggregate_stats
+from lerobot.datasets.utils import (
+    EPISODES_PATH,
+    EPISODES_STATS_PATH,
+    INFO_PATH,
+    TASKS_PATH,
+    load_episodes,
+    load_episodes_stats,
+    load_info,
+    load_tasks,
+    serialize_dict,
+    write_info,
+    write_jsonlines,
+    write_stats,
+)
+
+# ioctl request cloning a whole file on copy-on-write file systems (btrfs, xfs, ...)
+FICLONE = 0x40049409
+
+
+@dataclass
+class EpisodeMergePlan:
+    """Where a source episode goes in the merged dataset and how its index columns are remapped."""
+
+    src_root: Path
+    src_data_path: Path
+    src_video_paths: dict[str, Path]
+    dst_data_path: Path
+    dst_video_paths: dict[str, Path]
+    src_episode_index: int
+    episode_index: int
+    index_offset: int
+    task_index_map: list[int]
+
+
+@dataclass
+class MergePlan:
+    info: dict
+    tasks: list[str]
+    episodes: list[dict]
+    episodes_stats: list[dict]
+    episode_plans: list[EpisodeMergePlan]
+
+
+def find_datasets(search_paths: list[str] | None = None, prefix: str = "moving-tape-dataset") -> list[Path]:
+    """Find the local datasets whose directory name starts with `prefix` in the first search path having any."""
+    if search_paths is None:
+        search_paths = [".", "~/lerobotjs/datasets", "/home/son/lerobotjs/datasets"]
+
+    for search_path in search_paths:
+        search_path = Path(search_path).expanduser()
+        if not search_path.is_dir():
+            continue
+        roots = sorted(
+            path
+            for path in search_path.iterdir()
+            if path.name.startswith(prefix) and (path / INFO_PATH).exists()
+        )
+        if roots:
+            return roots
+    return []
+
+
+def _check_compatible(info: dict, reference_info: dict, root: Path) -> None:
+    for key in ["fps", "robot_type", "features"]:
+        if info[key] != reference_info[key]:
+            raise ValueError(
+                f"Dataset '{root}' can't be merged: its '{key}' ({info[key]}) differs from the one of the first "
+                f"dataset ({reference_info[key]})."
+            )
+
+
+def _remap_episode_stats(
+    stats: dict, episode_index: int, index_shift: int, task_index_map: list[int]
+) -> dict:
+    """Update the stats of the index columns of an episode to their values in the merged dataset."""
+    stats = {key: dict(value) for key, value in stats.items()}
+    if "episode_index" in stats:
+        for name in ["min", "max", "mean"]:
+            stats["episode_index"][name] = np.full_like(stats["episode_index"][name], episode_index)
+    if "index" in stats:
+        for name in ["min", "max", "mean"]:
+            stats["index"][name] = stats["index"][name] + index_shift
+    if "task_index" in stats:
+        task_stats = stats["task_index"]
+        # The new task indices are not an affine function of the old ones, only single task episodes are exact
+        if np.all(task_stats["min"] == task_stats["max"]):
+            new_task_index = task_index_map[int(task_stats["min"].item())]
+            for name in ["min", "max", "mean"]:
+                task_stats[name] = np.full_like(task_stats[name], new_task_index)
+    return stats
+
+
+def plan_merge(roots: list[Path], chunks_size: int | None = None) -> MergePlan:
+    """Plan the merge of the datasets stored in `roots` from their `meta/` manifests only.
+
+    Args:
+        roots: Local directories of the datasets to merge, in order.
+        chunks_size: Max number of episodes per chunk of the merged dataset. Defaults to the one of the first
+            dataset.
+    """
+    if not roots:
+        raise ValueError("At least one dataset is needed to merge.")
+
+    roots = [Path(root) for root in roots]
+    info = load_info(roots[0])
+    if chunks_size is None:
+        chunks_size = info["chunks_size"]
+    video_keys = [key for key, ft in info["features"].items() if ft["dtype"] == "video"]
+
+    tasks, task_to_task_index = [], {}
+    episodes, episodes_stats, episode_plans = [], [], []
+    total_frames = 0
+    for root in roots:
+        src_info = load_info(root)
+        _check_compatible(src_info, info, root)
+        src_tasks, _ = load_tasks(root)
+        src_episodes = load_episodes(root)
+        src_episodes_stats = load_episodes_stats(root) if (root / EPISODES_STATS_PATH).exists() else {}
+
+        task_index_map = [0] * (max(src_tasks, default=-1) + 1)
+        for src_task_index, task in src_tasks.items():
+            if task not in task_to_task_index:
+                task_to_task_index[task] = len(tasks)
+                tasks.append(task)
+            task_index_map[src_task_index] = task_to_task_index[task]
+
+        src_index_start = 0
+        for src_episode_index, episode in src_episodes.items():
+            episode_index = len(episodes)
+            src_chunk = src_episode_index // src_info["chunks_size"]
+            dst_chunk = episode_index // chunks_size
+            episode_plans.append(
+                EpisodeMergePlan(
+                    src_root=root,
+                    src_data_path=root
+                    / src_info["data_path"].format(episode_chunk=src_chunk, episode_index=src_episode_index),
+                    src_video_paths={
+                        key: root
+                        / src_info["video_path"].format(
+                            episode_chunk=src_chunk, video_key=key, episode_index=src_episode_index
+                        )
+                        for key in video_keys
+                    },
+                    dst_data_path=Path(
+                        info["data_path"].format(episode_chunk=dst_chunk, episode_index=episode_index)
+                    ),
+                    dst_video_paths={
+                        key: Path(
+                            info["video_path"].format(
+                                episode_chunk=dst_chunk, video_key=key, episode_index=episode_index
+                            )
+                        )
+                        for key in video_keys
+                    },
+                    src_episode_index=src_episode_index,
+                    episode_index=episode_index,
+                    index_offset=total_frames,
+                    task_index_map=task_index_map,
+                )
+            )
+            episodes.append({**episode, "episode_index": episode_index})
+            if src_episode_index in src_episodes_stats:
+                stats = _remap_episode_stats(
+                    src_episodes_stats[src_episode_index],
+                    episode_index,
+                    total_frames - src_index_start,
+                    task_index_map,
+                )
+                episodes_stats.append({"episode_index": episode_index, "stats": stats})
+            src_index_start += episode["length"]
+            total_frames += episode["length"]
+
+    total_episodes = len(episodes)
+    merged_info = {
+        **info,
+        "total_episodes": total_episodes,
+        "total_frames": total_frames,
+        "total_tasks": len(tasks),
+        "total_videos": total_episodes * len(video_keys),
+        "total_chunks": (total_episodes + chunks_size - 1) // chunks_size,
+        "chunks_size": chunks_size,
+        "splits": {"train": f"0:{total_episodes}"},
+    }
+    return MergePlan(merged_info, tasks, episodes, episodes_stats, episode_plans)
+
+
+def rewrite_episode_data(plan: EpisodeMergePlan, output_dir: Path) -> int:
+    """Write the parquet file of an episode in the merged dataset, remapping its index columns only."""
+    table = pq.read_table(plan.src_data_path)
+    num_frames = len(table)
+    columns = {}
+    if "episode_index" in table.column_names:
+        columns["episode_index"] = pa.array(
+            np.full(num_frames, plan.episode_index), type=table.schema.field("episode_index").type
+        )
+    if "index" in table.column_names and num_frames > 0:
+        index = table.column("index")
+        shift = pa.scalar(plan.index_offset - index[0].as_py(), type=index.type)
+        columns["index"] = pc.add(index, shift)
+    if "task_index" in table.column_names:
+        task_index = table.column("task_index")
+        task_index_map = pa.array(plan.task_index_map, type=task_index.type)
+        columns["task_index"] = pc.take(task_index_map, task_index)
+    for name, column in columns.items():
+        table = table.set_column(table.schema.get_field_index(name), name, column)
+
+    dst_path = output_dir / plan.dst_data_path
+    dst_path.parent.mkdir(parents=True, exist_ok=True)
+    pq.write_table(table, dst_path)
+    return num_frames
+
+
+def link_or_copy(src: Path, dst: Path) -> str:
+    """Hardlink `src` to `dst`, or reflink it, or copy it, whichever is possible first. Returns the method used."""
+    dst.parent.mkdir(parents=True, exist_ok=True)
+    with contextlib.suppress(OSError):
+        os.link(src, dst)
+        return "hardlink"
+    with contextlib.suppress(OSError), open(src, "rb") as src_file, open(dst, "wb") as dst_file:
+        fcntl.ioctl(dst_file.fileno(), FICLONE, src_file.fileno())
+        return "reflink"
+    shutil.copy2(src, dst)
+    return "copy"
+
+
+def merge_datasets(
+    roots: list[Path],
+    output_dir: Path,
+    chunks_size: int | None = None,
+    num_workers: int | None = None,
+    link_videos: bool = True,
+) -> MergePlan:
+    """Merge the datasets stored in `roots` into a new dataset in `output_dir`, without re-encoding anything.
+
+    Args:
+        roots: Local directories of the datasets to merge, in order.
+        output_dir: Directory of the merged dataset. It must not exist already, or be empty.
+        chunks_size: Max number of episodes per chunk of the merged dataset. Defaults to the one of the first
+            dataset.
+        num_workers: Number of processes rewriting the parquet files. Defaults to the number of CPUs, and no
+            process pool is used if 1.
+        link_videos: Whether videos may be hardlinked or reflinked to the source ones instead of copied.
+    """
+    output_dir = Path(output_dir)
+    if output_dir.exists() and any(output_dir.iterdir()):
+        raise FileExistsError(f"Output directory '{output_dir}' already exists and is not empty.")
+
+    plan = plan_merge(roots, chunks_size)
+    logging.info(
+        f"Merging {len(roots)} datasets into {output_dir}: {plan.info['total_episodes']} episodes, "
+        f"{plan.info['total_frames']} frames, {plan.info['total_tasks']} tasks"
+    )
+
+    if num_workers is None:
+        num_workers = os.cpu_count() or 1
+    num_workers = max(1, min(num_workers, len(plan.episode_plans)))
+    if num_workers == 1:
+        num_frames = [rewrite_episode_data(ep_plan, output_dir) for ep_plan in plan.episode_plans]
+    else:
+        with ProcessPoolExecutor(max_workers=num_workers) as executor:
+            num_frames = list(
+                executor.map(
+                    rewrite_episode_data,
+                    plan.episode_plans,
+                    [output_dir] * len(plan.episode_plans),
+                    chunksize=max(1, len(plan.episode_plans) // (num_workers * 4)),
+                )
+            )
+    for ep_plan, episode, ep_num_frames in zip(plan.episode_plans, plan.episodes, num_frames, strict=True):
+        if ep_num_frames != episode["length"]:
+            raise ValueError(
+                f"Episode {ep_plan.src_episode_index} of '{ep_plan.src_root}' has {ep_num_frames} frames, but "
+                f"{episode['length']} according to its metadata."
+            )
+
+    methods = {}
+    for ep_plan in plan.episode_plans:
+        for key, src_path in ep_plan.src_video_paths.items():
+            dst_path = output_dir / ep_plan.dst_video_paths[key]
+            if link_videos:
+                method = link_or_copy(src_path, dst_path)
             else:
-                print(f"    ⚠ Parquet file not found: {old_parquet}")
-    
-    # Update merged info
-    merged_info.update({
-        "total_episodes": episode_counter,
-        "total_frames": frame_counter,
-        "total_tasks": len(all_tasks),
-        "total_videos": episode_counter * len(template_info.get('video_keys', [])),
-        "splits": {"train": f"0:{episode_counter}"}
-    })
-    
-    # Save merged info
-    with open(meta_dir / "info.json", 'w') as f:
-        json.dump(merged_info, f, indent=2)
-    
-    # Save episodes
-    with open(meta_dir / "episodes.jsonl", 'w') as f:
-        for episode in all_episodes:
-            f.write(json.dumps(episode) + '\n')
-    
-    # Save tasks
-    with open(meta_dir / "tasks.jsonl", 'w') as f:
-        for i, task in enumerate(sorted(all_tasks)):
-            f.write(json.dumps({"task_index": i, "task": task}) + '\n')
-    
-    # Save episodes stats (if available)
-    if all_episodes_stats:
-        with open(meta_dir / "episodes_stats.jsonl", 'w') as f:
-            for stats in all_episodes_stats:
-                f.write(json.dumps(stats) + '\n')
-    
-    # Create empty stats.json
-    with open(meta_dir / "stats.json", 'w') as f:
-        json.dump({}, f)
-    
-    print(f"\n✓ Direct merge completed!")
-    print(f"  Total episodes: {episode_counter}")
-    print(f"  Total frames: {frame_counter}")
-    print(f"  Total tasks: {len(all_tasks)}")
-    print(f"  Output path: {output_path}")
-    
-    return True
+                dst_path.parent.mkdir(parents=True, exist_ok=True)
+                method = "copy"
+                shutil.copy2(src_path, dst_path)
+            methods[method] = methods.get(method, 0) + 1
+    if methods:
+        logging.info(f"Videos: {methods}")
+
+    write_info(plan.info, output_dir)
+    write_jsonlines(
+        [{"task_index": task_index, "task": task} for task_index, task in enumerate(plan.tasks)],
+        output_dir / TASKS_PATH,
+    )
+    write_jsonlines(plan.episodes, output_dir / EPISODES_PATH)
+    if plan.episodes_stats:
+        write_jsonlines(
+            [
+                {"episode_index": ep_stats["episode_index"], "stats": serialize_dict(ep_stats["stats"])}
+                for ep_stats in plan.episodes_stats
+            ],
+            output_dir / EPISODES_STATS_PATH,
+        )
+        write_stats(aggregate_stats([ep_stats["stats"] for ep_stats in plan.episodes_stats]), output_dir)
+
+    return plan
+
 
 def main():
-    """Main function"""
-    print("Direct Dataset Merger")
-    print("=" * 50)
-    
-    # Find datasets
-    datasets = find_datasets()
-    
-    if not datasets:
+    logging.basicConfig(level=logging.INFO)
+    roots = find_datasets()
+    if not roots:
         print("No datasets found!")
         return
-    
-    print(f"\nFound {len(datasets)} datasets:")
-    for i, (name, path, info) in enumerate(datasets):
-        print(f"  {i+1}. {name} ({info.get('total_episodes', '?')} episodes)")
-    
-    # Ask which datasets to merge
-    if len(datasets) == 1:
-        selected = [0]
-    else:
-        print(f"\nWhich datasets to merge? (enter numbers separated by commas, or 'all' for all)")
-        choice = input("Choice: ").strip()
-        
-        if choice.lower() == 'all':
-            selected = list(range(len(datasets)))
-        else:
+
+    print(f"Found {len(roots)} datasets:")
+    for i, root in enumerate(roots):
+        total_episodes = json.loads((root / INFO_PATH).read_text()).get("total_episodes", "?")
+        print(f"  {i + 1}. {root.name} ({total_episodes} episodes)")
+
+    selected = list(range(len(roots)))
+    if len(roots) > 1:
+        choice = input("Which datasets to merge? (numbers separated by commas, or 'all'): ").strip()
+        if choice.lower() != "all":
             try:
-                selected = [int(x.strip()) - 1 for x in choice.split(',')]
-                selected = [x for x in selected if 0 <= x < len(datasets)]
-            except:
+                selected = [int(x.strip()) - 1 for x in choice.split(",")]
+                selected = [x for x in selected if 0 <= x < len(roots)]
+            except ValueError:
                 print("Invalid choice, using all datasets")
-                selected = list(range(len(datasets)))
-    
-    selected_datasets = [datasets[i] for i in selected]
-    print(f"\nSelected {len(selected_datasets)} datasets for merging")
-    
-    # Create output directory
-    output_dir = os.path.expanduser("~/lerobotjs/datasets/JisooSong-cookingbot")
-    
-    # Remove existing output if it exists
-    if os.path.exists(output_dir):
+
+    output_dir = Path("~/lerobotjs/datasets/JisooSong-cookingbot").expanduser()
+    if output_dir.exists():
         print(f"Removing existing output: {output_dir}")
         shutil.rmtree(output_dir)
-    
-    # Merge datasets
-    success = merge_datasets_direct(selected_datasets, output_dir)
-    
-    if success:
-        print(f"\n🎉 Merge successful!")
-        print(f"Dataset saved at: {output_dir}")
-        print(f"You can now upload it manually or use the LeRobot upload tools.")
-    else:
-        print(f"\n❌ Merge failed!")
+
+    merge_datasets([roots[i] for i in selected], output_dir)
+    print(f"Dataset saved at: {output_dir}")
+
 
 if __name__ == "__main__":
     main()
@@ -16,12 +16,15 @@
 import multiprocessing
 import queue
 import threading
+from multiprocessing.sharedctypes import Synchronized
 from pathlib import Path
 
 import numpy as np
 import PIL.Image
 import torch
 
+from lerobot.cameras.capture_hub import FrameRef, SharedFrame, StaleFrameError, read_frame_ref
+
 
 def safe_stop_image_writer(func):
     def wrapper(*args, **kwargs):
@@ -68,7 +71,11 @@ def image_array_to_pil_image(image_array: np.ndarray, range_check: bool = True)
     return PIL.Image.fromarray(image_array)
 
 
-def write_image(image: np.ndarray | PIL.Image.Image, fpath: Path):
+def write_image(image: np.ndarray | PIL.Image.Image | FrameRef, fpath: Path):
+    if isinstance(image, FrameRef):
+        # Not caught below: a frame overwritten in its ring before being written is lost, which the caller must
+        # report rather than leaving a hole in the episode
+        image = read_frame_ref(image)
     try:
         if isinstance(image, np.ndarray):
             img = image_array_to_pil_image(image)
@@ -81,21 +88,25 @@ def write_image(image: np.ndarray | PIL.Image.Image, fpath: Path):
         print(f"Error writing image {fpath}: {e}")
 
 
-def worker_thread_loop(queue: queue.Queue):
+def worker_thread_loop(queue: queue.Queue, num_lost_frames: Synchronized):
     while True:
         item = queue.get()
         if item is None:
             queue.task_done()
             break
         image_array, fpath = item
-        write_image(image_array, fpath)
+        try:
+            write_image(image_array, fpath)
+        except StaleFrameError:
+            with num_lost_frames.get_lock():
+                num_lost_frames.value += 1
         queue.task_done()
 
 
-def worker_process(queue: queue.Queue, num_threads: int):
+def worker_process(queue: queue.Queue, num_threads: int, num_lost_frames: Synchronized):
     threads = []
     for _ in range(num_threads):
-        t = threading.Thread(target=worker_thread_loop, args=(queue,))
+        t = threading.Thread(target=worker_thread_loop, args=(queue, num_lost_frames))
         t.daemon = True
         t.start()
         threads.append(t)
@@ -116,6 +127,9 @@ class AsyncImageWriter:
     The optimal number of processes and threads depends on your computer capabilities.
     We advise to use 4 threads per camera with 0 processes. If the fps is not stable, try to increase or lower
     the number of threads. If it is still not stable, try to use 1 subprocess, or more.
+
+    Frames of a `CameraCaptureHub` are read from shared memory by the workers. The ones overwritten by the hub
+    before a worker got to them are counted, and reported by `wait_until_done()`.
     """
 
     def __init__(self, num_processes: int = 0, num_threads: int = 1):
@@ -125,6 +139,8 @@ class AsyncImageWriter:
         self.threads = []
         self.processes = []
         self._stopped = False
+        # Shared with the workers, which may run in subprocesses
+        self.num_lost_frames = multiprocessing.Value("i", 0)
 
         if num_threads <= 0 and num_processes <= 0:
             raise ValueError("Number of threads and processes must be greater than zero.")
@@ -133,7 +149,7 @@ class AsyncImageWriter:
             # Use threading
             self.queue = queue.Queue()
             for _ in range(self.num_threads):
-                t = threading.Thread(target=worker_thread_loop, args=(self.queue,))
+                t = threading.Thread(target=worker_thread_loop, args=(self.queue, self.num_lost_frames))
                 t.daemon = True
                 t.start()
                 self.threads.append(t)
@@ -141,7 +157,9 @@ class AsyncImageWriter:
             # Use multiprocessing
             self.queue = multiprocessing.JoinableQueue()
             for _ in range(self.num_processes):
-                p = multiprocessing.Process(target=worker_process, args=(self.queue, self.num_threads))
+                p = multiprocessing.Process(
+                    target=worker_process, args=(self.queue, self.num_threads, self.num_lost_frames)
+                )
                 p.daemon = True
                 p.start()
                 self.processes.append(p)
@@ -150,10 +168,29 @@ class AsyncImageWriter:
         if isinstance(image, torch.Tensor):
             # Convert tensor to numpy array to minimize main process time
             image = image.cpu().numpy()
+        elif isinstance(image, SharedFrame) and image.ref is not None:
+            if not image.is_valid():
+                raise StaleFrameError(f"Frame {image.ref.seq} was overwritten before being saved to {fpath}.")
+            # Frames of a `CameraCaptureHub` are read from shared memory by the workers instead of being copied
+            image = image.ref
         self.queue.put((image, fpath))
 
     def wait_until_done(self):
+        """Wait for the queued images to be written.
+
+        Raises:
+            StaleFrameError: If frames of a `CameraCaptureHub` were overwritten in its ring before being written,
+                i.e. the workers lagged behind the capture by more than the number of slots of the hub.
+        """
         self.queue.join()
+        with self.num_lost_frames.get_lock():
+            num_lost_frames = self.num_lost_frames.value
+            self.num_lost_frames.value = 0
+        if num_lost_frames > 0:
+            raise StaleFrameError(
+                f"{num_lost_frames} frames were overwritten in the capture hub before being written. Increase "
+                "`capture_hub_num_slots`, or the number of image writer threads or processes."
+            )
 
     def stop(self):
         if self._stopped:
@@ -40,6 +40,7 @@ from lerobot.datasets.utils import (
     TASKS_PATH,
     _validate_feature_names,
     append_jsonlines,
+    arrow_table_to_torch,
     backward_compatible_episodes_stats,
     check_delta_timestamps,
     check_timestamps_sync,
@@ -716,9 +717,85 @@ class LeRobotDataset(torch.utils.data.Dataset):
             for key, val in query_result.items():
                 item[key] = val
 
+        query_timestamps = None
         if len(self.meta.video_keys) > 0:
             current_ts = item["timestamp"].item()
             query_timestamps = self._get_query_timestamps(current_ts, query_indices)
+
+        return self._finish_item(item, ep_idx, query_timestamps)
+
+    def __getitems__(self, indices: list[int]) -> list[dict]:
+        """Batched counterpart of `__getitem__`, used by the DataLoader to fetch a whole batch at once.
+
+        The query indices and padding masks of the whole batch are computed with vectorized NumPy from the
+        episode boundaries, and all the frames they need are gathered with a single Arrow `take`, instead of
+        one `hf_dataset.select` per sample and per key.
+        """
+        if self.hf_dataset._indices is not None:
+            # The rows are behind an indices mapping, which the per-item path takes care of
+            return [self[idx] for idx in indices]
+
+        indices = np.asarray(indices, dtype=np.int64)
+        table = self.hf_dataset.data.table
+        features = self.hf_dataset.features
+        frames = arrow_table_to_torch(table.take(indices), features)
+        ep_indices = frames["episode_index"].numpy()
+
+        padding, query_result, query_timestamps = {}, {}, {}
+        if self.delta_indices is not None:
+            ep_start = self.episode_data_index["from"].numpy()[ep_indices][:, None]
+            ep_end = self.episode_data_index["to"].numpy()[ep_indices][:, None]
+            query_indices = {}
+            for key, delta_idx in self.delta_indices.items():
+                query = indices[:, None] + np.asarray(delta_idx)[None, :]
+                # Pad values outside of current episode range
+                padding[f"{key}_is_pad"] = torch.from_numpy((query < ep_start) | (query >= ep_end))
+                query_indices[key] = np.clip(query, ep_start, ep_end - 1)
+
+            # Every row needed by any key is taken once
+            columns = [key for key in query_indices if key not in self.meta.video_keys]
+            if len(columns) < len(query_indices):
+                columns.append("timestamp")
+            rows, inverse = np.unique(
+                np.concatenate([query.ravel() for query in query_indices.values()]), return_inverse=True
+            )
+            queried = arrow_table_to_torch(table.select(columns).take(rows), features)
+
+            offset = 0
+            for key, query in query_indices.items():
+                query_rows = inverse[offset : offset + query.size].reshape(query.shape)
+                offset += query.size
+                if key in self.meta.video_keys:
+                    query_timestamps[key] = queried["timestamp"][query_rows]
+                elif isinstance(queried[key], torch.Tensor):
+                    query_result[key] = queried[key][query_rows]
+                else:
+                    query_result[key] = [
+                        torch.stack([queried[key][row] for row in sample_rows]) for sample_rows in query_rows
+                    ]
+
+        items = []
+        for i, ep_idx in enumerate(ep_indices.tolist()):
+            item = {key: value[i] for key, value in frames.items()}
+            if self.delta_indices is not None:
+                item = {**item, **{key: value[i] for key, value in padding.items()}}
+                for key, value in query_result.items():
+                    item[key] = value[i]
+
+            item_query_timestamps = None
+            if len(self.meta.video_keys) > 0:
+                current_ts = item["timestamp"].item()
+                item_query_timestamps = {
+                    key: query_timestamps[key][i].tolist() if key in query_timestamps else [current_ts]
+                    for key in self.meta.video_keys
+                }
+
+            items.append(self._finish_item(item, ep_idx, item_query_timestamps))
+        return items
+
+    def _finish_item(self, item: dict, ep_idx: int, query_timestamps: dict[str, list[float]] | None) -> dict:
+        """Decode the video frames, apply the image transforms and add the task of an item."""
+        if query_timestamps is not None:
             video_frames = self._query_videos(query_timestamps, ep_idx)
             item = {**video_frames, **item}
 
@@ -10,10 +10,14 @@ Fixed issues:
 - Improved image dimension conversion for different tensor types
 - Added progress tracking and better logging
 - Made the merge process more robust with graceful error handling
+- Merged with the engine of `direct_merge_dataset`, without decoding nor re-encoding the frames
 """
 
 import os
 import json
+from pathlib import Path
+
+from lerobot.datasets.direct_merge_dataset import merge_datasets
 from lerobot.datasets.lerobot_dataset import LeRobotDataset, MultiLeRobotDataset
 
 def find_available_datasets():
@@ -168,123 +172,16 @@ def merge_with_multi_dataset(repo_ids, merged_name="moving-tape-merged-dataset")
             print(f"기존 데이터셋 제거 중: {merged_path}")
             shutil.rmtree(merged_path)
         
-        # 첫 번째 데이터셋의 정보를 기준으로 새 데이터셋 생성
-        first_dataset = multi_dataset._datasets[0]
-        
-        # LeRobotDataset.create을 사용해서 새 데이터셋 생성
-        merged_dataset = LeRobotDataset.create(
-            repo_id="JisooSong/cookingbot",
-            fps=multi_dataset.fps,
-            features=first_dataset.features,
-            root=datasets_dir,
-            robot_type=first_dataset.meta.robot_type,
-            use_videos=len(first_dataset.meta.video_keys) > 0
-        )
-        
-        print(f"✓ 통합 데이터셋 생성: {merged_dataset.repo_id}")
-        
-        # 3. MultiLeRobotDataset의 모든 데이터를 새 데이터셋에 복사
-        print(f"\n데이터 복사 시작...")
-        
-        total_episodes = sum(ds.num_episodes for ds in multi_dataset._datasets)
-        processed_episodes = 0
-        successful_episodes = 0
-        failed_episodes = 0
-        
-        # 각 원본 데이터셋별로 에피소드 처리
-        for dataset_idx, original_dataset in enumerate(multi_dataset._datasets):
-            dataset_name = repo_ids[dataset_idx]
-            print(f"\n[{dataset_idx + 1}/{len(multi_dataset._datasets)}] {dataset_name} 처리 중...")
-            print(f"  총 에피소드: {original_dataset.num_episodes}개")
-            
-            # 해당 데이터셋의 에피소드들 처리
-            for local_ep_idx in range(original_dataset.num_episodes):
-                processed_episodes += 1
-                print(f"  에피소드 {local_ep_idx + 1}/{original_dataset.num_episodes} 처리 중... (전체 진행률: {processed_episodes}/{total_episodes})")
-                
-                # 에피소드의 시작과 끝 프레임 찾기
-                ep_start = original_dataset.episode_data_index["from"][local_ep_idx].item()
-                ep_end = original_dataset.episode_data_index["to"][local_ep_idx].item()
-                
-                print(f"    프레임 범위: {ep_start} ~ {ep_end-1} (총 {ep_end - ep_start}개)")
-                
-                # 에피소드 버퍼 초기화 (새 에피소드 시작)
-                merged_dataset.episode_buffer = merged_dataset.create_episode_buffer(episode_index=merged_dataset.num_episodes)
-                
-                # 에피소드의 모든 프레임 처리
-                frame_count = 0
-                for frame_idx in range(ep_start, ep_end):
-                    try:
-                        # 원본 데이터셋에서 직접 프레임 가져오기 (더 안전함)
-                        frame_data = original_dataset[frame_idx]
-                        
-                        # task 정보 추출 (여러 가능한 키에서 찾기)
-                        task = (frame_data.get('task') or 
-                               frame_data.get('task_name') or 
-                               'default_task')
-                        
-                        # 새 데이터셋에 추가할 프레임 데이터 준비
-                        new_frame_data = {}
-                        for key, value in frame_data.items():
-                            # 메타데이터 키들은 제외
-                            if key in ['episode_index', 'index', 'frame_index', 'timestamp', 
-                                     'task_index', 'task', 'task_name', 'dataset_index']:
-                                continue
-                            
-                            # 이미지 데이터인 경우 차원 변환 (CHW -> HWC)
-                            if 'images' in key and hasattr(value, 'shape') and len(value.shape) == 3:
-                                if value.shape[0] == 3:  # (3, H, W) 형식인 경우
-                                    # (3, H, W) -> (H, W, 3)로 변환
-                                    import torch
-                                    import numpy as np
-                                    try:
-                                        if isinstance(value, torch.Tensor):
-                                            value = value.permute(1, 2, 0)  # pytorch tensor
-                                        elif isinstance(value, np.ndarray):
-                                            value = value.transpose(1, 2, 0)  # numpy array
-                                        else:
-                                            # 다른 타입의 경우 numpy로 변환 후 처리
-                                            value = np.array(value)
-                                            if value.shape[0] == 3:
-                                                value = value.transpose(1, 2, 0)
-                                        print(f"      이미지 차원 변환: {key} {value.shape}")
-                                    except Exception as img_error:
-                                        print(f"      ⚠ 이미지 변환 실패 {key}: {img_error}, 원본 유지")
-                                        # 변환 실패시 원본 유지
-                                        pass
-                            
-                            new_frame_data[key] = value
-                        
-                        # 프레임 추가
-                        merged_dataset.add_frame(new_frame_data, task)
-                        frame_count += 1
-                        
-                    except Exception as frame_error:
-                        print(f"      ✗ 프레임 {frame_idx} 처리 실패: {frame_error}")
-                        print(f"      프레임 데이터 키: {list(frame_data.keys()) if 'frame_data' in locals() else '없음'}")
-                        # 개별 프레임 실패시에도 계속 진행
-                        print(f"      ⚠ 프레임 {frame_idx} 건너뛰고 계속 진행...")
-                        continue
-                
-                print(f"    에피소드 완료: {frame_count}개 프레임 처리됨")
-                
-                # 각 에피소드가 끝날 때마다 저장
-                try:
-                    merged_dataset.save_episode()
-                    print(f"    ✓ 에피소드 {local_ep_idx + 1} 저장 완료")
-                    successful_episodes += 1
-                except Exception as save_error:
-                    print(f"    ✗ 에피소드 {local_ep_idx + 1} 저장 실패: {save_error}")
-                    failed_episodes += 1
-                    # 저장 실패해도 계속 진행
-                    continue
-        
-        print(f"\n✓ 데이터 복사 완료!")
-        print(f"  성공한 에피소드: {successful_episodes}개")
-        print(f"  실패한 에피소드: {failed_episodes}개")
+        # 3. 다운로드된 데이터셋들을 프레임 디코딩/재인코딩 없이 통합
+        print(f"\n데이터 통합 시작...")
+        plan = merge_datasets([dataset.root for dataset in multi_dataset._datasets], Path(merged_path))
+        merged_dataset = LeRobotDataset("JisooSong/cookingbot", root=merged_path)
+        successful_episodes = plan.info["total_episodes"]
+
+        print(f"\n✓ 데이터 통합 완료!")
         print(f"  총 에피소드: {merged_dataset.num_episodes}")
         print(f"  총 프레임: {merged_dataset.num_frames}")
-        
+
         # 데이터가 없는 경우 조기 종료
         if successful_episodes == 0:
             print(f"\n❌ 성공한 에피소드가 없습니다. 통합을 중단합니다.")
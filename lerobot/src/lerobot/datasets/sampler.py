@@ -13,10 +13,40 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import math
 from collections.abc import Iterator
 
+import numpy as np
 import torch
 
+# Number of positions mapped to frame indices at once while iterating
+SAMPLER_CHUNK_SIZE = 65536
+# Number of rounds of the Feistel network used to shuffle the positions
+FEISTEL_ROUNDS = 4
+
+
+def _feistel_permutation(positions: np.ndarray, num_items: int, keys: np.ndarray) -> np.ndarray:
+    """Map `positions` in [0, num_items) through a pseudo-random permutation of [0, num_items).
+
+    The permutation is a balanced Feistel network on the smallest even number of bits covering `num_items`,
+    restricted to [0, num_items) by cycle walking. It is defined by `keys` only, so any position can be
+    mapped without materializing the permutation.
+    """
+    half_bits = max(1, math.ceil(math.log2(max(num_items, 2)) / 2))
+    mask = np.uint64((1 << half_bits) - 1)
+    shift = np.uint64(half_bits)
+    values = positions.astype(np.uint64)
+    todo = np.ones(len(values), dtype=bool)
+    while todo.any():
+        left, right = values[todo] >> shift, values[todo] & mask
+        for key in keys:
+            mixed = (right ^ key) * np.uint64(0x9E3779B97F4A7C15)
+            mixed ^= mixed >> np.uint64(29)
+            left, right = right, left ^ (mixed & mask)
+        values[todo] = (left << shift) | right
+        todo = values >= num_items
+    return values.astype(np.int64)
+
 
 class EpisodeAwareSampler:
     def __init__(
@@ -26,9 +56,17 @@ class EpisodeAwareSampler:
         drop_n_first_frames: int = 0,
         drop_n_last_frames: int = 0,
         shuffle: bool = False,
+        episode_weights: list[float] | None = None,
+        num_samples: int | None = None,
+        num_replicas: int = 1,
+        rank: int = 0,
+        seed: int | None = None,
     ):
         """Sampler that optionally incorporates episode boundary information.
 
+        Only the start and the number of valid frames of each episode are stored, so the memory footprint does
+        not depend on the number of frames. Frame indices are computed chunk by chunk while iterating.
+
         Args:
             episode_data_index: Dictionary with keys 'from' and 'to' containing the start and end indices of each episode.
             episode_indices_to_use: List of episode indices to use. If None, all episodes are used.
@@ -36,26 +74,113 @@ class EpisodeAwareSampler:
             drop_n_first_frames: Number of frames to drop from the start of each episode.
             drop_n_last_frames: Number of frames to drop from the end of each episode.
             shuffle: Whether to shuffle the indices.
+            episode_weights: Optional sampling weight of each episode in `episode_data_index`. When given,
+                frames are drawn with replacement and the probability of drawing a frame from an episode is
+                proportional to its weight, whatever its length.
+            num_samples: Number of frames drawn per epoch when `episode_weights` is given. Defaults to the
+                number of valid frames.
+            num_replicas: Number of processes the samples are sharded across for distributed training.
+            rank: Rank of the current process, in [0, num_replicas).
+            seed: Seed of the shuffling and of the weighted sampling, combined with the epoch set with
+                `set_epoch`. It must be the same on every replica. If None, the global torch RNG is used when
+                there is a single replica and 0 otherwise.
         """
-        indices = []
-        for episode_idx, (start_index, end_index) in enumerate(
-            zip(episode_data_index["from"], episode_data_index["to"], strict=True)
-        ):
-            if episode_indices_to_use is None or episode_idx in episode_indices_to_use:
-                indices.extend(
-                    range(start_index.item() + drop_n_first_frames, end_index.item() - drop_n_last_frames)
+        if not 0 <= rank < num_replicas:
+            raise ValueError(f"rank should be in [0, {num_replicas}), but is {rank}.")
+
+        starts = torch.as_tensor(episode_data_index["from"]).numpy().astype(np.int64)
+        ends = torch.as_tensor(episode_data_index["to"]).numpy().astype(np.int64)
+        keep = np.ones(len(starts), dtype=bool)
+        if episode_indices_to_use is not None:
+            keep = np.isin(np.arange(len(starts)), np.asarray(episode_indices_to_use, dtype=np.int64))
+
+        starts = starts + drop_n_first_frames
+        lengths = np.maximum(ends - drop_n_last_frames - starts, 0)
+        keep &= lengths > 0
+
+        self.episode_starts = starts[keep]
+        self.episode_lengths = lengths[keep]
+        self.cumulative_lengths = np.cumsum(self.episode_lengths)
+        self.num_frames = int(self.cumulative_lengths[-1]) if len(self.cumulative_lengths) > 0 else 0
+
+        self.episode_weights = None
+        if episode_weights is not None:
+            if len(episode_weights) != len(starts):
+                raise ValueError(
+                    f"episode_weights should have one weight per episode ({len(starts)}), "
+                    f"but has {len(episode_weights)}."
                 )
+            self.episode_weights = torch.as_tensor(np.asarray(episode_weights, dtype=np.float64)[keep])
 
-        self.indices = indices
         self.shuffle = shuffle
+        self.num_samples = num_samples if num_samples is not None else self.num_frames
+        self.num_replicas = num_replicas
+        self.rank = rank
+        self.seed = seed if seed is not None or num_replicas == 1 else 0
+        self.epoch = 0
+
+    @property
+    def indices(self) -> list[int]:
+        """All the valid frame indices, in dataset order. This materializes them, so use it for inspection only."""
+        return self._frame_indices(np.arange(self.num_frames)).tolist()
+
+    def set_epoch(self, epoch: int) -> None:
+        """Set the epoch used to seed the shuffling, so that every epoch has a different order."""
+        self.epoch = epoch
+
+    def _generator(self) -> torch.Generator | None:
+        if self.seed is None:
+            return None
+        generator = torch.Generator()
+        generator.manual_seed(self.seed + self.epoch)
+        return generator
+
+    def _frame_indices(self, positions: np.ndarray) -> np.ndarray:
+        """Map positions in the concatenation of the valid frames of every episode to frame indices."""
+        episodes = np.searchsorted(self.cumulative_lengths, positions, side="right")
+        return (
+            self.episode_starts[episodes]
+            + positions
+            - (self.cumulative_lengths[episodes] - self.episode_lengths[episodes])
+        )
+
+    def _total_size(self) -> int:
+        num_items = self.num_samples if self.episode_weights is not None else self.num_frames
+        return math.ceil(num_items / self.num_replicas) * self.num_replicas
 
     def __iter__(self) -> Iterator[int]:
+        if self.num_frames == 0:
+            return
+
+        generator = self._generator()
+        if self.episode_weights is not None:
+            yield from self._iter_weighted(generator)
+            return
+
+        keys = None
         if self.shuffle:
-            for i in torch.randperm(len(self.indices)):
-                yield self.indices[i]
-        else:
-            for i in self.indices:
-                yield i
+            keys = torch.randint(0, 2**62, (FEISTEL_ROUNDS,), generator=generator).numpy().astype(np.uint64)
+
+        # Positions of this replica, padded by wrapping around so that every replica has the same length
+        for chunk_start in range(self.rank, self._total_size(), self.num_replicas * SAMPLER_CHUNK_SIZE):
+            chunk_end = min(chunk_start + self.num_replicas * SAMPLER_CHUNK_SIZE, self._total_size())
+            positions = np.arange(chunk_start, chunk_end, self.num_replicas) % self.num_frames
+            if keys is not None:
+                positions = _feistel_permutation(positions, self.num_frames, keys)
+            yield from self._frame_indices(positions).tolist()
+
+    def _iter_weighted(self, generator: torch.Generator | None) -> Iterator[int]:
+        # Every replica draws the same global sequence and keeps its own share of it
+        for chunk_start in range(0, self._total_size(), self.num_replicas * SAMPLER_CHUNK_SIZE):
+            chunk_size = min(self.num_replicas * SAMPLER_CHUNK_SIZE, self._total_size() - chunk_start)
+            episodes = torch.multinomial(
+                self.episode_weights, chunk_size, replacement=True, generator=generator
+            ).numpy()
+            offsets = torch.rand(chunk_size, generator=generator, dtype=torch.float64).numpy()
+            frames = self.episode_starts[episodes] + (offsets * self.episode_lengths[episodes]).astype(
+                np.int64
+            )
+            yield from frames[self.rank :: self.num_replicas].tolist()
 
     def __len__(self) -> int:
-        return len(self.indices)
+        return self._total_size() // self.num_replicas
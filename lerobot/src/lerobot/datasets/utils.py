@@ -17,7 +17,9 @@ import contextlib
 import importlib.resources
 import json
 import logging
-from collections.abc import Iterator
+import queue
+import threading
+from collections.abc import Iterable, Iterator
 from itertools import accumulate
 from pathlib import Path
 from pprint import pformat
@@ -28,6 +30,7 @@ import datasets
 import jsonlines
 import numpy as np
 import packaging.version
+import pyarrow as pa
 import torch
 from datasets.table import embed_table_storage
 from huggingface_hub import DatasetCard, DatasetCardData, HfApi
@@ -272,6 +275,53 @@ def hf_transform_to_torch(items_dict: dict[torch.Tensor | None]):
     return items_dict
 
 
+def arrow_table_to_torch(table: pa.Table, features: datasets.Features) -> dict[str, torch.Tensor | list]:
+    """Batched counterpart of `hf_transform_to_torch`, working on the Arrow columns of `table` directly.
+
+    Numeric columns (scalars or fixed length sequences) are converted into a single tensor with a leading batch
+    dimension and the same dtype `hf_transform_to_torch` would give every row. Images are decoded to tensors
+    and the other columns are converted row by row, both returned as lists.
+    """
+    to_tensor = transforms.ToTensor()
+    columns = {}
+    for key in table.column_names:
+        column = table.column(key).combine_chunks()
+        feature = features.get(key)
+        if isinstance(feature, datasets.Image):
+            columns[key] = [
+                to_tensor(feature.decode_example(value)) if value is not None else None
+                for value in column.to_pylist()
+            ]
+            continue
+
+        values, shape = column, [len(column)]
+        while pa.types.is_fixed_size_list(values.type) or (
+            pa.types.is_list(values.type) and len(values) > 0 and values.null_count == 0
+        ):
+            if pa.types.is_fixed_size_list(values.type):
+                shape.append(values.type.list_size)
+            else:
+                lengths = values.value_lengths().to_numpy()
+                if (lengths != lengths[0]).any():
+                    break
+                shape.append(int(lengths[0]))
+            values = values.flatten()
+
+        is_numeric = pa.types.is_integer(values.type) or pa.types.is_floating(values.type)
+        if (is_numeric or pa.types.is_boolean(values.type)) and values.null_count == 0:
+            tensor = torch.from_numpy(values.to_numpy(zero_copy_only=False, writable=True).reshape(shape))
+            if tensor.is_floating_point():
+                tensor = tensor.to(torch.get_default_dtype())
+            elif tensor.dtype != torch.bool:
+                tensor = tensor.to(torch.int64)
+            columns[key] = tensor
+        else:
+            columns[key] = [
+                x if isinstance(x, str) or x is None else torch.tensor(x) for x in column.to_pylist()
+            ]
+    return columns
+
+
 def is_valid_version(version: str) -> bool:
     try:
         packaging.version.parse(version)
@@ -632,6 +682,102 @@ def cycle(iterable):
             iterator = iter(iterable)
 
 
+class DevicePrefetcher:
+    """Iterates over the batches of `iterable` moved to `device`, loading them ahead in a background thread.
+
+    While the training step of the current batch runs, the thread fetches the next `num_batches` batches and
+    copies their tensors to the device. On CUDA, the copies run on a side stream (asynchronously when the
+    batches are in pinned memory) and the main stream waits for them before using the batch.
+
+    Example:
+        ```python
+        dl_iter = DevicePrefetcher(cycle(dataloader), device, num_batches=2)
+        for _ in range(steps):
+            batch = next(dl_iter)  # Already on `device`
+        dl_iter.close()
+        ```
+
+    Args:
+        iterable: Iterable of batches, dictionaries of tensors and other values.
+        device: Device to move the tensors to.
+        num_batches: Maximum number of batches loaded ahead.
+    """
+
+    _END = object()
+
+    def __init__(self, iterable: Iterable[dict], device: torch.device, num_batches: int = 2):
+        if num_batches < 1:
+            raise ValueError(f"`num_batches` should be at least 1, got {num_batches}.")
+        self.device = torch.device(device)
+        self.stream = torch.cuda.Stream(self.device) if self.device.type == "cuda" else None
+        self._iterator = iter(iterable)
+        self._queue = queue.Queue(maxsize=num_batches)
+        self._stop_event = threading.Event()
+        self._thread = threading.Thread(target=self._prefetch, daemon=True)
+        self._thread.start()
+
+    def _to_device(self, batch: dict) -> tuple[dict, Any]:
+        if self.stream is None:
+            batch = {
+                key: value.to(self.device) if isinstance(value, torch.Tensor) else value
+                for key, value in batch.items()
+            }
+            return batch, None
+
+        with torch.cuda.stream(self.stream):
+            batch = {
+                key: value.to(self.device, non_blocking=True) if isinstance(value, torch.Tensor) else value
+                for key, value in batch.items()
+            }
+            event = torch.cuda.Event()
+            event.record(self.stream)
+        return batch, event
+
+    def _put(self, item: Any) -> bool:
+        while not self._stop_event.is_set():
+            try:
+                self._queue.put(item, timeout=0.1)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def _prefetch(self) -> None:
+        try:
+            for batch in self._iterator:
+                if not self._put(self._to_device(batch)):
+                    return
+            self._put((self._END, None))
+        except Exception as e:
+            self._put((e, None))
+
+    def __iter__(self) -> "DevicePrefetcher":
+        return self
+
+    def __next__(self) -> dict:
+        batch, event = self._queue.get()
+        if batch is self._END or isinstance(batch, Exception):
+            # Let the following calls end or fail in the same way
+            self._queue.put((batch, event))
+            if batch is self._END:
+                raise StopIteration
+            raise batch
+
+        if event is not None:
+            current_stream = torch.cuda.current_stream(self.device)
+            current_stream.wait_event(event)
+            for value in batch.values():
+                if isinstance(value, torch.Tensor):
+                    # The memory of the tensors was allocated on the side stream
+                    value.record_stream(current_stream)
+        return batch
+
+    def close(self) -> None:
+        self._stop_event.set()
+        # The thread may be waiting for a batch of the iterable, it is a daemon thread
+        self._thread.join(timeout=1.0)
+
+
 def create_branch(repo_id, *, branch: str, repo_type: str | None = None) -> None:
     """Create a branch on a existing Hugging Face repo. Delete the branch if it already
     exists before creating it.
@@ -14,6 +14,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import warnings
+import weakref
 from typing import Any
 
 import einops
@@ -106,7 +107,16 @@ def are_all_envs_same_type(env: gym.vector.VectorEnv) -> bool:
     return all(type(e) is first_type for e in env.envs)  # Fast type check
 
 
+_envs_task_attribute: weakref.WeakKeyDictionary[gym.vector.VectorEnv, str | None] = (
+    weakref.WeakKeyDictionary()
+)
+
+
 def check_env_attributes_and_types(env: gym.vector.VectorEnv) -> None:
+    if not isinstance(env, gym.vector.SyncVectorEnv):
+        # The sub-environments of an AsyncVectorEnv live in other processes
+        return
+
     with warnings.catch_warnings():
         warnings.simplefilter("once", UserWarning)  # Apply filter only in this function
 
@@ -124,12 +134,27 @@ def check_env_attributes_and_types(env: gym.vector.VectorEnv) -> None:
             )
 
 
+def get_envs_task_attribute(env: gym.vector.VectorEnv) -> str | None:
+    """Name of the attribute of the environments holding their task, or None if they have none."""
+    if env in _envs_task_attribute:
+        return _envs_task_attribute[env]
+
+    if isinstance(env, gym.vector.SyncVectorEnv):
+        first_env = env.envs[0]
+    else:
+        # Getting a missing attribute would kill the workers of an AsyncVectorEnv, look it up on a local env
+        first_env = env.env_fns[0]()
+        first_env.close()
+    task_attribute = next((a for a in ["task_description", "task"] if hasattr(first_env, a)), None)
+    _envs_task_attribute[env] = task_attribute
+    return task_attribute
+
+
 def add_envs_task(env: gym.vector.VectorEnv, observation: dict[str, Any]) -> dict[str, Any]:
     """Adds task feature to the observation dict with respect to the first environment attribute."""
-    if hasattr(env.envs[0], "task_description"):
-        observation["task"] = env.call("task_description")
-    elif hasattr(env.envs[0], "task"):
-        observation["task"] = env.call("task")
+    task_attribute = get_envs_task_attribute(env)
+    if task_attribute is not None:
+        observation["task"] = env.call(task_attribute)
     else:  #  For envs without language instructions, e.g. aloha transfer cube and etc.
         num_envs = observation[list(observation.keys())[0]].shape[0]
         observation["task"] = ["" for _ in range(num_envs)]
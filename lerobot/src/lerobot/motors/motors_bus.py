@@ -28,6 +28,7 @@ from functools import cached_property
 from pprint import pformat
 from typing import Protocol, TypeAlias
 
+import numpy as np
 import serial
 from deepdiff import DeepDiff
 from tqdm import tqdm
@@ -268,6 +269,7 @@ class MotorsBus(abc.ABC):
     ):
         self.port = port
         self.motors = motors
+        self._motor_index = {m.id: idx for idx, m in enumerate(self.motors.values())}
         self.calibration = calibration if calibration else {}
 
         self.port_handler: PortHandler
@@ -294,6 +296,66 @@ class MotorsBus(abc.ABC):
             ")',\n"
         )
 
+    @property
+    def calibration(self) -> dict[str, MotorCalibration]:
+        """dict[str, MotorCalibration]: Cached calibration used to (un)normalize values.
+
+        Assigning a new calibration refreshes the per-motor arrays used by :pymeth:`_normalize_array` and
+        :pymeth:`_unnormalize_array`. Calibrations modified in place must be assigned again.
+        """
+        return self._calibration
+
+    @calibration.setter
+    def calibration(self, calibration: dict[str, MotorCalibration]) -> None:
+        self._calibration = calibration
+        self._refresh_calibration_arrays()
+
+    def _refresh_calibration_arrays(self) -> None:
+        # One row per motor, in the order of `self.motors`, so that (un)normalization of any subset of motors
+        # is a single NumPy expression instead of a Python loop over motors.
+        num_motors = len(self.motors)
+        range_min = np.zeros(num_motors)
+        range_max = np.ones(num_motors)
+        scale = np.ones(num_motors)
+        offset = np.zeros(num_motors)
+        flip = np.zeros(num_motors)
+        resolution = np.ones(num_motors)
+        drive_mode = np.zeros(num_motors, dtype=bool)
+        degrees = np.zeros(num_motors, dtype=bool)
+        calibrated = np.zeros(num_motors, dtype=bool)
+        for idx, (motor, m) in enumerate(self.motors.items()):
+            if motor not in self._calibration:
+                continue
+            calibrated[idx] = True
+            range_min[idx] = self._calibration[motor].range_min
+            range_max[idx] = self._calibration[motor].range_max
+            drive_mode[idx] = bool(self.apply_drive_mode and self._calibration[motor].drive_mode)
+            resolution[idx] = self.model_resolution_table[m.model] - 1
+            if m.norm_mode is MotorNormMode.RANGE_M100_100:
+                scale[idx], offset[idx], flip[idx] = 200, -100, 0
+            elif m.norm_mode is MotorNormMode.RANGE_0_100:
+                scale[idx], offset[idx], flip[idx] = 100, 0, 100
+            elif m.norm_mode is MotorNormMode.DEGREES:
+                degrees[idx] = True
+            else:
+                raise NotImplementedError(m.norm_mode)
+
+        self._calibration_arrays = {
+            "range_min": range_min,
+            "range_max": range_max,
+            "scale": scale,
+            "offset": offset,
+            "flip": flip,
+            "resolution": resolution,
+            "drive_mode": drive_mode & ~degrees,
+            "degrees": degrees,
+            "calibrated": calibrated,
+            "valid": range_min != range_max,
+        }
+
+    def _motors_to_indices(self, motors: list[str]) -> np.ndarray:
+        return np.array([self._motor_index[self.motors[motor].id] for motor in motors], dtype=np.intp)
+
     @cached_property
     def _has_different_ctrl_tables(self) -> bool:
         if len(self.models) < 2:
@@ -773,64 +835,68 @@ class MotorsBus(abc.ABC):
 
         return mins, maxes
 
-    def _normalize(self, ids_values: dict[int, int]) -> dict[int, float]:
+    def _check_calibration(self, indices: np.ndarray) -> None:
         if not self.calibration:
             raise RuntimeError(f"{self} has no calibration registered.")
 
-        normalized_values = {}
-        for id_, val in ids_values.items():
-            motor = self._id_to_name(id_)
-            min_ = self.calibration[motor].range_min
-            max_ = self.calibration[motor].range_max
-            drive_mode = self.apply_drive_mode and self.calibration[motor].drive_mode
-            if max_ == min_:
-                raise ValueError(f"Invalid calibration for motor '{motor}': min and max are equal.")
-
-            bounded_val = min(max_, max(min_, val))
-            if self.motors[motor].norm_mode is MotorNormMode.RANGE_M100_100:
-                norm = (((bounded_val - min_) / (max_ - min_)) * 200) - 100
-                normalized_values[id_] = -norm if drive_mode else norm
-            elif self.motors[motor].norm_mode is MotorNormMode.RANGE_0_100:
-                norm = ((bounded_val - min_) / (max_ - min_)) * 100
-                normalized_values[id_] = 100 - norm if drive_mode else norm
-            elif self.motors[motor].norm_mode is MotorNormMode.DEGREES:
-                mid = (min_ + max_) / 2
-                max_res = self.model_resolution_table[self._id_to_model(id_)] - 1
-                normalized_values[id_] = (val - mid) * 360 / max_res
-            else:
-                raise NotImplementedError
+        arrays = self._calibration_arrays
+        if not arrays["calibrated"][indices].all():
+            motor = list(self.motors)[indices[~arrays["calibrated"][indices]][0]]
+            raise KeyError(motor)
+        if not arrays["valid"][indices].all():
+            motor = list(self.motors)[indices[~arrays["valid"][indices]][0]]
+            raise ValueError(f"Invalid calibration for motor '{motor}': min and max are equal.")
+
+    def _normalize_array(self, indices: np.ndarray, values: np.ndarray) -> np.ndarray:
+        """Convert raw values of the motors at `indices` (rows of :pyattr:`motors`) to the user range."""
+        self._check_calibration(indices)
+        arrays = self._calibration_arrays
+        values = np.asarray(values, dtype=np.float64)
+        min_ = arrays["range_min"][indices]
+        max_ = arrays["range_max"][indices]
+
+        bounded = np.minimum(max_, np.maximum(min_, values))
+        norm = ((bounded - min_) / (max_ - min_)) * arrays["scale"][indices] + arrays["offset"][indices]
+        norm = np.where(arrays["drive_mode"][indices], arrays["flip"][indices] - norm, norm)
+
+        mid = (min_ + max_) / 2
+        degrees = (values - mid) * 360 / arrays["resolution"][indices]
+        return np.where(arrays["degrees"][indices], degrees, norm)
+
+    def _unnormalize_array(self, indices: np.ndarray, values: np.ndarray) -> np.ndarray:
+        """Convert values of the motors at `indices` (rows of :pyattr:`motors`) from the user range to raw
+        integer units."""
+        self._check_calibration(indices)
+        arrays = self._calibration_arrays
+        values = np.asarray(values, dtype=np.float64)
+        min_ = arrays["range_min"][indices]
+        max_ = arrays["range_max"][indices]
+        scale = arrays["scale"][indices]
+        offset = arrays["offset"][indices]
+
+        values_ = np.where(arrays["drive_mode"][indices], arrays["flip"][indices] - values, values)
+        bounded = np.minimum(scale + offset, np.maximum(offset, values_))
+        raw = ((bounded - offset) / scale) * (max_ - min_) + min_
+
+        mid = (min_ + max_) / 2
+        degrees = (values * arrays["resolution"][indices] / 360) + mid
+        return np.trunc(np.where(arrays["degrees"][indices], degrees, raw)).astype(np.int64)
+
+    def _normalize(self, ids_values: dict[int, int]) -> dict[int, float]:
+        if not self.calibration:
+            raise RuntimeError(f"{self} has no calibration registered.")
 
-        return normalized_values
+        indices = np.array([self._motor_index[id_] for id_ in ids_values], dtype=np.intp)
+        normalized = self._normalize_array(indices, np.fromiter(ids_values.values(), np.float64))
+        return dict(zip(ids_values, normalized.tolist(), strict=True))
 
     def _unnormalize(self, ids_values: dict[int, float]) -> dict[int, int]:
         if not self.calibration:
             raise RuntimeError(f"{self} has no calibration registered.")
 
-        unnormalized_values = {}
-        for id_, val in ids_values.items():
-            motor = self._id_to_name(id_)
-            min_ = self.calibration[motor].range_min
-            max_ = self.calibration[motor].range_max
-            drive_mode = self.apply_drive_mode and self.calibration[motor].drive_mode
-            if max_ == min_:
-                raise ValueError(f"Invalid calibration for motor '{motor}': min and max are equal.")
-
-            if self.motors[motor].norm_mode is MotorNormMode.RANGE_M100_100:
-                val = -val if drive_mode else val
-                bounded_val = min(100.0, max(-100.0, val))
-                unnormalized_values[id_] = int(((bounded_val + 100) / 200) * (max_ - min_) + min_)
-            elif self.motors[motor].norm_mode is MotorNormMode.RANGE_0_100:
-                val = 100 - val if drive_mode else val
-                bounded_val = min(100.0, max(0.0, val))
-                unnormalized_values[id_] = int((bounded_val / 100) * (max_ - min_) + min_)
-            elif self.motors[motor].norm_mode is MotorNormMode.DEGREES:
-                mid = (min_ + max_) / 2
-                max_res = self.model_resolution_table[self._id_to_model(id_)] - 1
-                unnormalized_values[id_] = int((val * max_res / 360) + mid)
-            else:
-                raise NotImplementedError
-
-        return unnormalized_values
+        indices = np.array([self._motor_index[id_] for id_ in ids_values], dtype=np.intp)
+        unnormalized = self._unnormalize_array(indices, np.fromiter(ids_values.values(), np.float64))
+        return dict(zip(ids_values, unnormalized.tolist(), strict=True))
 
     @abc.abstractmethod
     def _encode_sign(self, data_name: str, ids_values: dict[int, int]) -> dict[int, int]:
@@ -1098,6 +1164,56 @@ class MotorsBus(abc.ABC):
 
         return {self._id_to_name(id_): value for id_, value in ids_values.items()}
 
+    def sync_read_array(
+        self,
+        data_name: str,
+        motors: str | list[str] | None = None,
+        *,
+        normalize: bool = True,
+        num_retry: int = 0,
+    ) -> np.ndarray:
+        """Same as :pymeth:`sync_read` but returns the values as an array ordered like `motors`.
+
+        Normalization is done in a single vectorized pass over the precompiled calibration arrays, which keeps
+        the per-call overhead flat when reading many motors at a high frequency.
+
+        Args:
+            data_name (str): Register name.
+            motors (str | list[str] | None, optional): Motors to query. `None` (default) reads every motor.
+            normalize (bool, optional): Normalisation flag.  Defaults to `True`.
+            num_retry (int, optional): Retry attempts.  Defaults to `0`.
+
+        Returns:
+            np.ndarray: Values of shape `(len(motors),)`, `float64` if normalized and `int64` otherwise.
+        """
+        if not self.is_connected:
+            raise DeviceNotConnectedError(
+                f"{self.__class__.__name__}('{self.port}') is not connected. You need to run `{self.__class__.__name__}.connect()`."
+            )
+
+        self._assert_protocol_is_compatible("sync_read")
+
+        names = self._get_motors_list(motors)
+        ids = [self.motors[motor].id for motor in names]
+        models = [self.motors[motor].model for motor in names]
+
+        if self._has_different_ctrl_tables:
+            assert_same_address(self.model_ctrl_table, models, data_name)
+
+        addr, length = get_address(self.model_ctrl_table, models[0], data_name)
+
+        err_msg = f"Failed to sync read '{data_name}' on {ids=} after {num_retry + 1} tries."
+        ids_values, _ = self._sync_read(
+            addr, length, ids, num_retry=num_retry, raise_on_error=True, err_msg=err_msg
+        )
+        ids_values = self._decode_sign(data_name, ids_values)
+        values = np.fromiter((ids_values[id_] for id_ in ids), dtype=np.int64, count=len(ids))
+
+        if normalize and data_name in self.normalized_data:
+            return self._normalize_array(self._motors_to_indices(names), values)
+
+        return values
+
     def _sync_read(
         self,
         addr: int,
@@ -1187,6 +1303,50 @@ class MotorsBus(abc.ABC):
         err_msg = f"Failed to sync write '{data_name}' with {ids_values=} after {num_retry + 1} tries."
         self._sync_write(addr, length, ids_values, num_retry=num_retry, raise_on_error=True, err_msg=err_msg)
 
+    def sync_write_array(
+        self,
+        data_name: str,
+        values: np.ndarray,
+        motors: str | list[str] | None = None,
+        *,
+        normalize: bool = True,
+        num_retry: int = 0,
+    ) -> None:
+        """Same as :pymeth:`sync_write` but takes the values as an array ordered like `motors`.
+
+        Args:
+            data_name (str): Register name.
+            values (np.ndarray): Values of shape `(len(motors),)`.
+            motors (str | list[str] | None, optional): Motors to write to. `None` (default) writes to every
+                motor.
+            normalize (bool, optional): If `True` (default) convert values from the user range to raw units.
+            num_retry (int, optional): Retry attempts.  Defaults to `0`.
+        """
+        if not self.is_connected:
+            raise DeviceNotConnectedError(
+                f"{self.__class__.__name__}('{self.port}') is not connected. You need to run `{self.__class__.__name__}.connect()`."
+            )
+
+        names = self._get_motors_list(motors)
+        values = np.asarray(values).reshape(-1)
+        if len(values) != len(names):
+            raise ValueError(f"Got {len(values)} values for {len(names)} motors.")
+
+        ids = [self.motors[motor].id for motor in names]
+        models = [self.motors[motor].model for motor in names]
+        if self._has_different_ctrl_tables:
+            assert_same_address(self.model_ctrl_table, models, data_name)
+
+        addr, length = get_address(self.model_ctrl_table, models[0], data_name)
+
+        if normalize and data_name in self.normalized_data:
+            values = self._unnormalize_array(self._motors_to_indices(names), values)
+
+        ids_values = self._encode_sign(data_name, dict(zip(ids, values.tolist(), strict=True)))
+
+        err_msg = f"Failed to sync write '{data_name}' with {ids_values=} after {num_retry + 1} tries."
+        self._sync_write(addr, length, ids_values, num_retry=num_retry, raise_on_error=True, err_msg=err_msg)
+
     def _sync_write(
         self,
         addr: int,
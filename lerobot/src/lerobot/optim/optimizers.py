@@ -174,7 +174,12 @@ def save_optimizer_state(
 
 def _save_single_optimizer_state(optimizer: torch.optim.Optimizer, save_dir: Path) -> None:
     """Save a single optimizer's state to disk."""
-    state = optimizer.state_dict()
+    save_optimizer_state_dict(optimizer.state_dict(), save_dir)
+
+
+def save_optimizer_state_dict(state_dict: dict, save_dir: Path) -> None:
+    """Save the `state_dict()` of a single optimizer to disk, e.g. a snapshot taken earlier."""
+    state = dict(state_dict)
     param_groups = state.pop("param_groups")
     flat_state = flatten_dict(state)
     save_file(flat_state, save_dir / OPTIMIZER_STATE)
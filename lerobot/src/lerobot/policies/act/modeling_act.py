@@ -107,6 +107,17 @@ class ACTPolicy(PreTrainedPolicy):
         else:
             self._action_queue = deque([], maxlen=self.config.n_action_steps)
 
+    def reset_envs(self, env_mask: Tensor) -> None:
+        """Resets the environments of the (batch,) boolean `env_mask`, while the others keep going.
+
+        Without temporal ensembling, the queued actions are shared by all the environments, so the whole policy
+        is reset.
+        """
+        if self.config.temporal_ensemble_coeff is not None:
+            self.temporal_ensembler.reset_envs(env_mask)
+        elif env_mask.any():
+            self.reset()
+
     @torch.no_grad()
     def select_action(self, batch: dict[str, Tensor]) -> Tensor:
         """Select a single action given environment observations.
@@ -219,52 +230,81 @@ class ACTTemporalEnsembler:
             avg /= exp_weights[: i + 1].sum()
         print("online", avg)
         ```
+
+        The online averages are kept in a ring buffer over preallocated storage, with a count of the actions
+        in the ensemble of each time step for every element of the batch, so that the environments of a
+        batched rollout can be reset independently with `reset_envs`.
         """
         self.chunk_size = chunk_size
         self.ensemble_weights = torch.exp(-temporal_ensemble_coeff * torch.arange(chunk_size))
         self.ensemble_weights_cumsum = torch.cumsum(self.ensemble_weights, dim=0)
+        # (Σw[:n], w[n], Σw[:n+1]) factors of the online update of a time step with n actions in its ensemble.
+        # With Σw[:0] = 0, the update also initializes the empty time steps.
+        self._update_factors = torch.stack(
+            [
+                torch.cat([torch.zeros(1), self.ensemble_weights_cumsum[:-1]]),
+                self.ensemble_weights,
+                self.ensemble_weights_cumsum,
+            ],
+            dim=-1,
+        )
         self.reset()
 
     def reset(self):
         """Resets the online computation variables."""
+        # (batch, chunk_size, action_dim) online averages, and (batch, chunk_size) count of how many actions are
+        # in the ensemble for each time step in the sequence. Time step i is stored at index (head + i) % chunk
+        # of the ring buffer.
         self.ensembled_actions = None
-        # (chunk_size,) count of how many actions are in the ensemble for each time step in the sequence.
         self.ensembled_actions_count = None
+        self._head = 0
+
+    def reset_envs(self, env_mask: Tensor) -> None:
+        """Resets the online computation variables of the batch elements of the (batch,) boolean `env_mask`."""
+        if self.ensembled_actions is None:
+            return
+        env_mask = env_mask.to(self.ensembled_actions.device)
+        self.ensembled_actions[env_mask] = 0
+        self.ensembled_actions_count[env_mask] = 0
+
+    def _allocate(self, actions: Tensor) -> None:
+        device = actions.device
+        self.ensemble_weights = self.ensemble_weights.to(device=device)
+        self.ensemble_weights_cumsum = self.ensemble_weights_cumsum.to(device=device)
+        self._update_factors = self._update_factors.to(device=device)
+        # Index of the time step of each slot of the ring buffer, for each position of its head.
+        slots = torch.arange(self.chunk_size, device=device)
+        self._ring_indices = (slots.unsqueeze(0) - slots.unsqueeze(1)) % self.chunk_size
+        self.ensembled_actions = torch.zeros_like(actions)
+        self.ensembled_actions_count = torch.zeros(actions.shape[:2], dtype=torch.long, device=device)
+        self._head = 0
 
     def update(self, actions: Tensor) -> Tensor:
         """
         Takes a (batch, chunk_size, action_dim) sequence of actions, update the temporal ensemble for all
         time steps, and pop/return the next batch of actions in the sequence.
         """
-        self.ensemble_weights = self.ensemble_weights.to(device=actions.device)
-        self.ensemble_weights_cumsum = self.ensemble_weights_cumsum.to(device=actions.device)
-        if self.ensembled_actions is None:
-            # Initializes `self._ensembled_action` to the sequence of actions predicted during the first
-            # time step of the episode.
-            self.ensembled_actions = actions.clone()
-            # Note: The last dimension is unsqueeze to make sure we can broadcast properly for tensor
-            # operations later.
-            self.ensembled_actions_count = torch.ones(
-                (self.chunk_size, 1), dtype=torch.long, device=self.ensembled_actions.device
-            )
-        else:
-            # self.ensembled_actions will have shape (batch_size, chunk_size - 1, action_dim). Compute
-            # the online update for those entries.
-            self.ensembled_actions *= self.ensemble_weights_cumsum[self.ensembled_actions_count - 1]
-            self.ensembled_actions += actions[:, :-1] * self.ensemble_weights[self.ensembled_actions_count]
-            self.ensembled_actions /= self.ensemble_weights_cumsum[self.ensembled_actions_count]
-            self.ensembled_actions_count = torch.clamp(self.ensembled_actions_count + 1, max=self.chunk_size)
-            # The last action, which has no prior online average, needs to get concatenated onto the end.
-            self.ensembled_actions = torch.cat([self.ensembled_actions, actions[:, -1:]], dim=1)
-            self.ensembled_actions_count = torch.cat(
-                [self.ensembled_actions_count, torch.ones_like(self.ensembled_actions_count[-1:])]
-            )
-        # "Consume" the first action.
-        action, self.ensembled_actions, self.ensembled_actions_count = (
-            self.ensembled_actions[:, 0],
-            self.ensembled_actions[:, 1:],
-            self.ensembled_actions_count[1:],
+        if self.ensembled_actions is None or self.ensembled_actions.shape != actions.shape:
+            self._allocate(actions)
+
+        # Online update of the ensemble of every time step: avg = (avg * Σw[:n] + action * w[n]) / Σw[:n+1]
+        # for n actions already in the ensemble. Time steps with n = 0 (the last one, and all of them after a
+        # reset) are set to the new action.
+        cumsum, weights, next_cumsum = (
+            self._update_factors[self.ensembled_actions_count].unsqueeze(-1).unbind(-2)
         )
+        # The actions are permuted to the order of the ring buffer.
+        actions = actions.index_select(1, self._ring_indices[self._head])
+        self.ensembled_actions *= cumsum
+        self.ensembled_actions += actions * weights
+        self.ensembled_actions /= next_cumsum
+        # Note: a time step is consumed before its ensemble reaches chunk_size actions.
+        self.ensembled_actions_count += 1
+
+        # "Consume" the first action. Its slot becomes the last time step of the sequence.
+        action = self.ensembled_actions[:, self._head].clone()
+        self.ensembled_actions_count[:, self._head] = 0
+        self._head = (self._head + 1) % self.chunk_size
         return action
 
 
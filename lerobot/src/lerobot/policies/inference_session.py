@@ -0,0 +1,254 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""Static-shape inference of the flow matching VLA policies (PI0, SmolVLA).
+
+On every call, these policies resize and pad the images into new tensors, tokenize the task and their
+`sample_actions` rebuilds the attention masks and position ids of the prefix and, at every denoising step, of
+the suffix. For a given batch size, set of cameras and `tokenizer_max_length`, all of them have static shapes.
+A `FlowMatchingInferenceSession` writes the images into preallocated buffers, caches the tokens and masks of
+the last prompts, and runs the `num_steps` denoising steps over precomputed timesteps, without waiting for the
+device to test the end of the loop. As its shapes never change, the denoising step can be compiled with
+`torch.compile`.
+
+Each policy implements a thin subclass, which binds the session to the embeddings of its model.
+"""
+
+import abc
+from collections import OrderedDict
+
+import torch
+import torch.nn.functional as F  # noqa: N812
+from torch import Tensor, nn
+
+from lerobot.constants import OBS_STATE
+from lerobot.policies.pretrained import PreTrainedPolicy
+from lerobot.policies.utils import get_device_from_parameters
+
+
+def make_denoising_timesteps(num_steps: int) -> tuple[Tensor, Tensor]:
+    """Timesteps visited by the Euler integration of `sample_actions`, and their step.
+
+    They are accumulated in float32 exactly like in the loop of `sample_actions`, so that a loop over them
+    visits the same timesteps without testing the current one on the device at every step.
+    """
+    dt = torch.tensor(-1.0 / num_steps, dtype=torch.float32)
+    time = torch.tensor(1.0, dtype=torch.float32)
+    timesteps = []
+    while time >= -dt / 2:
+        timesteps.append(time.clone())
+        time += dt
+    return torch.stack(timesteps), dt
+
+
+class FlowMatchingInferenceSession(abc.ABC):
+    """Static-shape inference of the `sample_actions` of a flow matching policy for a batch size and a set of
+    cameras.
+
+    Subclasses bind the session to the model of a policy, by implementing how the prompts are tokenized and
+    how the prefix and suffix are embedded.
+
+    Args:
+        policy: The policy, whose `model` runs the inference.
+        batch_size: The batch size of the observations.
+        image_shapes: (C, H, W) shapes of the images of the cameras present in the observations.
+        compile: Whether to compile the denoising step with `torch.compile`.
+        max_cached_prompts: Number of prompts whose tokens and masks are cached.
+    """
+
+    def __init__(
+        self,
+        policy: PreTrainedPolicy,
+        batch_size: int,
+        image_shapes: dict[str, tuple[int, ...]],
+        compile: bool = False,
+        max_cached_prompts: int = 16,
+    ):
+        self.policy = policy
+        self.model = policy.model
+        self.config = policy.config
+        self.batch_size = batch_size
+        self.image_shapes = image_shapes
+        self.max_cached_prompts = max_cached_prompts
+        self.device = get_device_from_parameters(policy)
+
+        # Padded images, as written by `resize_with_pad` followed by the [0, 1] -> [-1, 1] rescaling: the
+        # padding is -1 and the resized image fills the bottom right corner.
+        self._images = {}
+        self._resized_shapes = {}
+        for key, (channels, height, width) in image_shapes.items():
+            if self.config.resize_imgs_with_padding is not None:
+                resized_width, resized_height = self.config.resize_imgs_with_padding
+                ratio = max(width / resized_width, height / resized_height)
+                self._resized_shapes[key] = (int(height / ratio), int(width / ratio))
+                height = max(resized_height, self._resized_shapes[key][0])
+                width = max(resized_width, self._resized_shapes[key][1])
+            self._images[key] = torch.full(
+                (batch_size, channels, height, width), -1.0, dtype=torch.float32, device=self.device
+            )
+
+        num_missing_cameras = len([key for key in self.config.image_features if key not in image_shapes])
+        num_empty_cameras = min(num_missing_cameras, self.config.empty_cameras)
+        last_image = self._images[list(image_shapes)[-1]]
+        self._empty_images = [torch.full_like(last_image, -1.0) for _ in range(num_empty_cameras)]
+        ones = torch.ones(batch_size, dtype=torch.bool, device=self.device)
+        self._img_masks = [ones] * len(image_shapes) + [torch.zeros_like(ones)] * num_empty_cameras
+
+        self._prompts: OrderedDict[tuple[str, ...], dict[str, Tensor]] = OrderedDict()
+        timesteps, self._dt = make_denoising_timesteps(self.config.num_steps)
+        self._timesteps = [t.to(self.device).expand(batch_size) for t in timesteps]
+        self._dt = self._dt.to(self.device)
+
+        self._denoise_step = self._predict_velocity
+        if compile:
+            self._denoise_step = torch.compile(self._predict_velocity, dynamic=False)
+
+    @classmethod
+    def for_batch(cls, policy: PreTrainedPolicy, batch: dict[str, Tensor]) -> "FlowMatchingInferenceSession":
+        """The session of `policy` for the batch size and the cameras of `batch`, created on first use and kept
+        in `policy._inference_sessions`."""
+        image_shapes = {
+            key: tuple(batch[key].shape[-3:]) for key in policy.config.image_features if key in batch
+        }
+        if len(image_shapes) == 0:
+            raise ValueError(
+                f"All image features are missing from the batch. At least one expected. (batch: {batch.keys()}) (image_features:{policy.config.image_features})"
+            )
+        batch_size = batch[OBS_STATE].shape[0]
+        key = (batch_size, tuple(image_shapes.items()), policy.config.tokenizer_max_length)
+        if key not in policy._inference_sessions:
+            policy._inference_sessions[key] = cls(
+                policy, batch_size, image_shapes, compile=policy.config.compile_inference_session
+            )
+        return policy._inference_sessions[key]
+
+    @property
+    @abc.abstractmethod
+    def vlm_with_expert(self) -> nn.Module:
+        """The VLM and action expert of the model, which fills the key value cache of the prefix."""
+
+    @property
+    @abc.abstractmethod
+    def chunk_size(self) -> int:
+        """Number of actions sampled per call."""
+
+    @staticmethod
+    @abc.abstractmethod
+    def make_att_2d_masks(pad_masks: Tensor, att_masks: Tensor) -> Tensor:
+        """The `make_att_2d_masks` of the policy."""
+
+    @abc.abstractmethod
+    def tokenize(self, batch: dict[str, Tensor], tasks: tuple[str, ...]) -> tuple[Tensor, Tensor]:
+        """Tokens and attention masks of the tasks of the batch."""
+
+    @abc.abstractmethod
+    def embed_prefix(
+        self, images: list[Tensor], img_masks: list[Tensor], prompt: dict[str, Tensor], state: Tensor
+    ) -> tuple[Tensor, Tensor, Tensor]:
+        """Embeddings, padding masks and attention masks of the prefix, as in `sample_actions`."""
+
+    @abc.abstractmethod
+    def embed_suffix(self, state: Tensor, x_t: Tensor, timestep: Tensor) -> tuple[Tensor, Tensor, Tensor]:
+        """Embeddings, padding masks and attention masks of the suffix, as in `sample_actions`."""
+
+    @abc.abstractmethod
+    def embed_suffix_tokens(self, state: Tensor, x_t: Tensor, timestep: Tensor) -> Tensor:
+        """Embeddings of `embed_suffix`, without their masks."""
+
+    def get_image(self, batch: dict[str, Tensor], key: str) -> Tensor:
+        """The (B, C, H, W) image of the camera `key` in the batch."""
+        return batch[key]
+
+    def get_tasks(self, batch: dict[str, Tensor]) -> tuple[str, ...]:
+        """The tasks of the batch, which identify its prompt in the cache."""
+        return tuple(batch["task"])
+
+    def prepare_images(self, batch: dict[str, Tensor]) -> tuple[list[Tensor], list[Tensor]]:
+        """`prepare_images` of the policy, writing into the preallocated image buffers."""
+        images = []
+        for key, buffer in self._images.items():
+            img = self.get_image(batch, key)
+            if key in self._resized_shapes:
+                resized_height, resized_width = self._resized_shapes[key]
+                img = F.interpolate(
+                    img, size=(resized_height, resized_width), mode="bilinear", align_corners=False
+                )
+                target = buffer[:, :, buffer.shape[2] - resized_height :, buffer.shape[3] - resized_width :]
+            else:
+                target = buffer
+            # Normalize from range [0,1] to [-1,1] as expected by siglip
+            torch.mul(img, 2.0, out=target)
+            target.sub_(1.0)
+            images.append(buffer)
+        return images + self._empty_images, self._img_masks
+
+    def prepare_language(self, batch: dict[str, Tensor]) -> dict[str, Tensor]:
+        """Tokens of the tasks of the batch and the masks depending on them, cached for the last prompts."""
+        tasks = self.get_tasks(batch)
+        if tasks in self._prompts:
+            self._prompts.move_to_end(tasks)
+            return self._prompts[tasks]
+
+        lang_tokens, lang_masks = self.tokenize(batch, tasks)
+        self._prompts[tasks] = {"lang_tokens": lang_tokens, "lang_masks": lang_masks}
+        if len(self._prompts) > self.max_cached_prompts:
+            self._prompts.popitem(last=False)
+        return self._prompts[tasks]
+
+    def _predict_velocity(self, state, x_t, timestep, att_2d_masks, position_ids, past_key_values) -> Tensor:
+        suffix_embs = self.embed_suffix_tokens(state, x_t, timestep)
+        return self.model.predict_velocity(suffix_embs, att_2d_masks, position_ids, past_key_values)
+
+    def sample_actions(self, batch: dict[str, Tensor], noise: Tensor | None = None) -> Tensor:
+        """`sample_actions` of the model on a normalized batch, with padded action dimensions."""
+        images, img_masks = self.prepare_images(batch)
+        state = self.policy.prepare_state(batch)
+        prompt = self.prepare_language(batch)
+
+        if noise is None:
+            actions_shape = (self.batch_size, self.chunk_size, self.config.max_action_dim)
+            noise = self.model.sample_noise(actions_shape, self.device)
+
+        prefix_embs, prefix_pad_masks, prefix_att_masks = self.embed_prefix(images, img_masks, prompt, state)
+        if "prefix_att_2d_masks" not in prompt:
+            # The masks only depend on the prompt, as the masks of the images and of the state are constant
+            prompt["prefix_att_2d_masks"] = self.make_att_2d_masks(prefix_pad_masks, prefix_att_masks)
+            prompt["prefix_position_ids"] = torch.cumsum(prefix_pad_masks, dim=1) - 1
+            suffix_embs, suffix_pad_masks, suffix_att_masks = self.embed_suffix(
+                state, noise, self._timesteps[0]
+            )
+            prompt["att_2d_masks"], prompt["position_ids"] = self.model.make_suffix_att_2d_masks(
+                prefix_pad_masks, suffix_pad_masks, suffix_att_masks
+            )
+
+        # Compute image and language key value cache
+        _, past_key_values = self.vlm_with_expert.forward(
+            attention_mask=prompt["prefix_att_2d_masks"],
+            position_ids=prompt["prefix_position_ids"],
+            past_key_values=None,
+            inputs_embeds=[prefix_embs, None],
+            use_cache=self.config.use_cache,
+            fill_kv_cache=True,
+        )
+
+        x_t = noise
+        for timestep in self._timesteps:
+            v_t = self._denoise_step(
+                state, x_t, timestep, prompt["att_2d_masks"], prompt["position_ids"], past_key_values
+            )
+            # Euler step
+            x_t += self._dt * v_t
+        return x_t
@@ -70,6 +70,10 @@ class PI0Config(PreTrainedConfig):
     use_cache: bool = True
     attention_implementation: str = "eager"  # or fa2, flex
 
+    # Static-shape inference with preallocated buffers and cached prompts and masks (see `PI0InferenceSession`)
+    use_inference_session: bool = False
+    compile_inference_session: bool = False  # Compile the denoising step with `torch.compile`
+
     # Finetuning settings
     freeze_vision_encoder: bool = True
     train_expert_only: bool = False
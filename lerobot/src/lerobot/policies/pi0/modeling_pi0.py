@@ -59,6 +59,7 @@ from torch import Tensor, nn
 from transformers import AutoTokenizer
 
 from lerobot.constants import ACTION, OBS_STATE
+from lerobot.policies.inference_session import FlowMatchingInferenceSession
 from lerobot.policies.normalize import Normalize, Unnormalize
 from lerobot.policies.pi0.configuration_pi0 import PI0Config
 from lerobot.policies.pi0.paligemma_with_expert import (
@@ -246,6 +247,7 @@ class PI0Policy(PreTrainedPolicy):
 
         self.language_tokenizer = AutoTokenizer.from_pretrained("google/paligemma-3b-pt-224")
         self.model = PI0FlowMatching(config)
+        self._inference_sessions: dict[tuple, PI0InferenceSession] = {}
 
         self.reset()
 
@@ -382,13 +384,16 @@ class PI0Policy(PreTrainedPolicy):
         # Action queue logic for n_action_steps > 1. When the action_queue is depleted, populate it by
         # querying the policy.
         if len(self._action_queue) == 0:
-            images, img_masks = self.prepare_images(batch)
-            state = self.prepare_state(batch)
-            lang_tokens, lang_masks = self.prepare_language(batch)
+            if self.config.use_inference_session:
+                actions = self.inference_session(batch).sample_actions(batch, noise=noise)
+            else:
+                images, img_masks = self.prepare_images(batch)
+                state = self.prepare_state(batch)
+                lang_tokens, lang_masks = self.prepare_language(batch)
 
-            actions = self.model.sample_actions(
-                images, img_masks, lang_tokens, lang_masks, state, noise=noise
-            )
+                actions = self.model.sample_actions(
+                    images, img_masks, lang_tokens, lang_masks, state, noise=noise
+                )
 
             # Unpad actions
             original_action_dim = self.config.action_feature.shape[0]
@@ -404,6 +409,10 @@ class PI0Policy(PreTrainedPolicy):
             self._action_queue.extend(actions.transpose(0, 1))
         return self._action_queue.popleft()
 
+    def inference_session(self, batch: dict[str, Tensor]) -> "PI0InferenceSession":
+        """The inference session for the batch size and the cameras of `batch`, created on first use."""
+        return PI0InferenceSession.for_batch(self, batch)
+
     def forward(self, batch: dict[str, Tensor], noise=None, time=None) -> tuple[Tensor, dict[str, Tensor]]:
         """Do a full training forward pass to compute the loss"""
         if self.config.adapt_to_pi_aloha:
@@ -662,24 +671,27 @@ class PI0FlowMatching(nn.Module):
 
     def embed_suffix(self, state, noisy_actions, timestep):
         """Embed state, noisy_actions, timestep to prepare for Expert Gemma processing."""
-        embs = []
-        pad_masks = []
-        att_masks = []
+        embs = self.embed_suffix_tokens(state, noisy_actions, timestep)
+        bsize, suffix_len = embs.shape[:2]
+
+        pad_masks = torch.ones(bsize, suffix_len, dtype=torch.bool, device=embs.device)
+
+        # Set attention masks so that image and language inputs do not attend to state or actions, and
+        # image, language and state inputs do not attend to action tokens
+        att_masks = [1] + [1] + ([0] * (self.config.n_action_steps - 1))
+        att_masks = torch.tensor(att_masks, dtype=embs.dtype, device=embs.device)
+        att_masks = att_masks[None, :].expand(bsize, len(att_masks))
 
+        return embs, pad_masks, att_masks
+
+    def embed_suffix_tokens(self, state, noisy_actions, timestep) -> Tensor:
+        """Embeddings of `embed_suffix`, without their masks which only depend on the batch size."""
         # Embed state
         state_emb = self.state_proj(state)
         state_emb = state_emb.to(dtype=torch.bfloat16)
-        embs.append(state_emb[:, None, :])
-        bsize = state_emb.shape[0]
         dtype = state_emb.dtype
         device = state_emb.device
 
-        state_mask = torch.ones(bsize, 1, dtype=torch.bool, device=device)
-        pad_masks.append(state_mask)
-
-        # Set attention masks so that image and language inputs do not attend to state or actions
-        att_masks += [1]
-
         # Embed timestep using sine-cosine positional encoding with sensitivity in the range [0, 1]
         time_emb = create_sinusoidal_pos_embedding(
             timestep, self.config.proj_width, min_period=4e-3, max_period=4.0, device=device
@@ -696,22 +708,7 @@ class PI0FlowMatching(nn.Module):
         action_time_emb = F.silu(action_time_emb)  # swish == silu
         action_time_emb = self.action_time_mlp_out(action_time_emb)
 
-        # Add to input tokens
-        embs.append(action_time_emb)
-
-        bsize, action_time_dim = action_time_emb.shape[:2]
-        action_time_mask = torch.ones(bsize, action_time_dim, dtype=torch.bool, device=device)
-        pad_masks.append(action_time_mask)
-
-        # Set attention masks so that image, language and state inputs do not attend to action tokens
-        att_masks += [1] + ([0] * (self.config.n_action_steps - 1))
-
-        embs = torch.cat(embs, dim=1)
-        pad_masks = torch.cat(pad_masks, dim=1)
-        att_masks = torch.tensor(att_masks, dtype=embs.dtype, device=embs.device)
-        att_masks = att_masks[None, :].expand(bsize, len(att_masks))
-
-        return embs, pad_masks, att_masks
+        return torch.cat([state_emb[:, None, :], action_time_emb], dim=1)
 
     def forward(
         self, images, img_masks, lang_tokens, lang_masks, state, actions, noise=None, time=None
@@ -809,7 +806,13 @@ class PI0FlowMatching(nn.Module):
     ):
         """Apply one denoising step of the noise `x_t` at a given timestep."""
         suffix_embs, suffix_pad_masks, suffix_att_masks = self.embed_suffix(state, x_t, timestep)
+        att_2d_masks, position_ids = self.make_suffix_att_2d_masks(
+            prefix_pad_masks, suffix_pad_masks, suffix_att_masks
+        )
+        return self.predict_velocity(suffix_embs, att_2d_masks, position_ids, past_key_values)
 
+    def make_suffix_att_2d_masks(self, prefix_pad_masks, suffix_pad_masks, suffix_att_masks):
+        """Attention masks and position ids of the suffix tokens attending to the cached prefix."""
         suffix_len = suffix_pad_masks.shape[1]
         batch_size = prefix_pad_masks.shape[0]
         prefix_len = prefix_pad_masks.shape[1]
@@ -821,9 +824,12 @@ class PI0FlowMatching(nn.Module):
 
         prefix_offsets = torch.sum(prefix_pad_masks, dim=-1)[:, None]
         position_ids = prefix_offsets + torch.cumsum(suffix_pad_masks, dim=1) - 1
+        return full_att_2d_masks, position_ids
 
+    def predict_velocity(self, suffix_embs, att_2d_masks, position_ids, past_key_values) -> Tensor:
+        """Velocity of the noisy actions, given the embedded suffix and the key value cache of the prefix."""
         outputs_embeds, _ = self.paligemma_with_expert.forward(
-            attention_mask=full_att_2d_masks,
+            attention_mask=att_2d_masks,
             position_ids=position_ids,
             past_key_values=past_key_values,
             inputs_embeds=[None, suffix_embs],
@@ -835,3 +841,29 @@ class PI0FlowMatching(nn.Module):
         suffix_out = suffix_out.to(dtype=torch.float32)
         v_t = self.action_out_proj(suffix_out)
         return v_t
+
+
+class PI0InferenceSession(FlowMatchingInferenceSession):
+    """Static-shape inference of `PI0FlowMatching.sample_actions`, see `FlowMatchingInferenceSession`."""
+
+    make_att_2d_masks = staticmethod(make_att_2d_masks)
+
+    @property
+    def vlm_with_expert(self) -> nn.Module:
+        return self.model.paligemma_with_expert
+
+    @property
+    def chunk_size(self) -> int:
+        return self.config.n_action_steps
+
+    def tokenize(self, batch: dict[str, Tensor], tasks: tuple[str, ...]) -> tuple[Tensor, Tensor]:
+        return self.policy.prepare_language(batch)
+
+    def embed_prefix(self, images, img_masks, prompt, state) -> tuple[Tensor, Tensor, Tensor]:
+        return self.model.embed_prefix(images, img_masks, prompt["lang_tokens"], prompt["lang_masks"])
+
+    def embed_suffix(self, state, x_t, timestep) -> tuple[Tensor, Tensor, Tensor]:
+        return self.model.embed_suffix(state, x_t, timestep)
+
+    def embed_suffix_tokens(self, state, x_t, timestep) -> Tensor:
+        return self.model.embed_suffix_tokens(state, x_t, timestep)
@@ -53,6 +53,9 @@ class PI0FASTConfig(PreTrainedConfig):
     # Decoding
     max_decoding_steps: int = 256
     fast_skip_tokens: int = 128  # Skip last 128 tokens in PaliGemma vocab since they are special tokens
+    # Only sample the "Action: " prefix, then FAST action tokens until EOS, and detokenize the actions of the
+    # batch at once. Otherwise, any token can be sampled and the output text is parsed sample by sample.
+    constrained_action_decoding: bool = False
     max_input_seq_len: int = 256  # 512
 
     # Utils
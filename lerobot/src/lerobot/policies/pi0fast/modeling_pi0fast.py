@@ -53,13 +53,24 @@ import torch.nn.functional as F  # noqa: N812
 from PIL import Image
 from scipy.fft import idct
 from torch import Tensor, nn
-from transformers import AutoProcessor, AutoTokenizer, PaliGemmaForConditionalGeneration
+from transformers import (
+    AutoProcessor,
+    AutoTokenizer,
+    LogitsProcessor,
+    LogitsProcessorList,
+    PaliGemmaForConditionalGeneration,
+)
 from transformers.cache_utils import HybridCache, StaticCache
 from transformers.models.auto import CONFIG_MAPPING
 
 from lerobot.constants import ACTION, OBS_STATE
 from lerobot.policies.normalize import Normalize, Unnormalize
 from lerobot.policies.pi0fast.configuration_pi0fast import PI0FASTConfig
+from lerobot.policies.pi0fast.tokenization_pi0fast import (
+    FASTActionDecoder,
+    PI0FASTPromptTokenizer,
+    discretize_state,
+)
 from lerobot.policies.pretrained import PreTrainedPolicy
 
 PRECISION = {
@@ -410,6 +421,33 @@ def prepare_inputs_for_generation(
     return model_inputs
 
 
+class FASTActionLogitsProcessor(LogitsProcessor):
+    """Forces the generation of `prefix_ids` ("Action: "), then only allows action tokens and EOS."""
+
+    def __init__(self, prefix_ids: list[int], action_token_range: tuple[int, int], eos_token_id: int):
+        self.prefix_ids = prefix_ids
+        self.action_token_range = action_token_range
+        self.eos_token_id = eos_token_id
+        self._masks: dict[int, torch.Tensor] = {}
+
+    def _mask(self, step: int, scores: torch.Tensor) -> torch.Tensor:
+        key = min(step, len(self.prefix_ids))
+        if key not in self._masks:
+            mask = torch.full(scores.shape[-1:], float("-inf"), dtype=scores.dtype, device=scores.device)
+            if key < len(self.prefix_ids):
+                mask[self.prefix_ids[key]] = 0
+            else:
+                first, last = self.action_token_range
+                mask[first : last + 1] = 0
+                mask[self.eos_token_id] = 0
+            self._masks[key] = mask
+        return self._masks[key]
+
+    def __call__(self, input_ids: torch.LongTensor, scores: torch.FloatTensor) -> torch.FloatTensor:
+        # Generating from embeddings, `input_ids` only holds the generated tokens
+        return scores + self._mask(input_ids.shape[1], scores)
+
+
 class PI0FAST(nn.Module):
     def __init__(self, config: PI0FASTConfig):
         super().__init__()
@@ -422,6 +460,9 @@ class PI0FAST(nn.Module):
         self.processor = AutoProcessor.from_pretrained(pi0_paligemma_path)
         self.fast_tokenizer = AutoProcessor.from_pretrained(fast_tokenizer_path, trust_remote_code=True)
         self.fast_skip_tokens = self.config.fast_skip_tokens
+        self.action_decoder = FASTActionDecoder(
+            self.fast_tokenizer, self.paligemma_tokenizer.vocab_size, self.fast_skip_tokens
+        )
         self.max_input_seq_len = self.config.max_input_seq_len
         self.action_horizon = self.config.chunk_size
         self.action_dim = self.config.action_feature.shape[
@@ -434,6 +475,10 @@ class PI0FAST(nn.Module):
             if hasattr(self.paligemma_tokenizer, "pad_token_id")
             else self.paligemma_tokenizer.eos_token_id
         )
+        self.prompt_tokenizer = PI0FASTPromptTokenizer(self.paligemma_tokenizer)
+        self._action_prefix = self.paligemma_tokenizer(
+            "Action: ", add_special_tokens=False, return_tensors="pt"
+        )
 
         paligemma_config = CONFIG_MAPPING["paligemma"](
             transformers_version="4.48.1",
@@ -505,7 +550,8 @@ class PI0FAST(nn.Module):
                     params.requires_grad = False
 
     def embed_tokens(self, tokens: torch.Tensor):
-        return self.pi0_paligemma.language_model.model.embed_tokens(tokens)
+        # The language model has no `.model` in recent versions of transformers
+        return self.pi0_paligemma.get_input_embeddings()(tokens)
 
     def prepare_inputs_for_generation(self, *args, **kwargs):
         return self.pi0_paligemma.prepare_inputs_for_generation(*args, **kwargs)
@@ -584,24 +630,9 @@ class PI0FAST(nn.Module):
     def create_input_tokens(self, state, lang_text, actions=None):
         bsize = state.shape[0]
         device = state.device
-        bins = torch.linspace(-1, 1, 256 + 1, device=device)[:-1]
-        discretized = torch.bucketize(state, bins) - 1
-        discretized = discretized[:, :32]
-
-        prefix_texts = []
-        state_text = []
-        for txt, disc in zip(lang_text, discretized, strict=False):
-            cleaned = txt.lower().strip().replace("_", " ")
-            state_str = " ".join(str(val.item()) for val in disc)
-            prefix_texts.append(f"Task: {cleaned}, State: {state_str};\n")
-            state_text.append(f"State: {state_str};\n")
-
-        prefix_out = self.paligemma_tokenizer(
-            prefix_texts, add_special_tokens=True, return_tensors="pt", padding="longest", truncation=False
-        )
-        prefix_ids = prefix_out["input_ids"].to(device)
-        prefix_mask = prefix_out["attention_mask"].to(device)
-        prefix_lens = prefix_mask.sum(dim=1)[:, None].cpu()
+        discretized = discretize_state(state)
+        prefix_ids, prefix_mask = self.prompt_tokenizer(discretized, lang_text)
+        prefix_lens = prefix_mask.sum(dim=1)[:, None]
 
         if actions is not None:
             actions_norm = self.normalize_actions(actions)
@@ -626,9 +657,8 @@ class PI0FAST(nn.Module):
                 [self.paligemma_tokenizer.eos_token_id], dtype=torch.long, device=device
             ).expand(bsize, -1)
             eos_mask = torch.tensor([1], dtype=torch.long, device=device).expand(bsize, -1)
-            bos = self.paligemma_tokenizer("Action: ", add_special_tokens=False, return_tensors="pt")
-            bos_token = bos["input_ids"].expand(act_ids.shape[0], -1).to(device)
-            bos_mask = bos["attention_mask"].expand(act_ids.shape[0], -1).to(device)
+            bos_token = self._action_prefix["input_ids"].expand(act_ids.shape[0], -1).to(device)
+            bos_mask = self._action_prefix["attention_mask"].expand(act_ids.shape[0], -1).to(device)
             act_ids = torch.cat([bos_token, act_ids, eos_token], dim=1)
             act_mask = torch.cat([bos_mask, act_mask, eos_mask], dim=1)
             act_mask = act_mask.to(device)
@@ -638,13 +668,9 @@ class PI0FAST(nn.Module):
         final_ids = torch.cat([prefix_ids, act_ids], dim=1)
 
         final_mask = torch.cat([prefix_mask, act_mask], dim=1)
-        batch_inputs = {"input_ids": final_ids.tolist(), "attention_mask": final_mask.tolist()}
-
-        # Use tokenizer pad function
-        padded_output = self.paligemma_tokenizer.pad(
-            batch_inputs, padding="longest", max_length=180, return_tensors="pt"
-        )
-        padded_mask = padded_output["attention_mask"]
+        # The prompts and the actions are padded to the longest of the batch already
+        padded_output = {"input_ids": final_ids, "attention_mask": final_mask}
+        padded_mask = final_mask
 
         # define tensor of padding lengths
         att_mask = (padded_mask != 0).cumsum(dim=1) > prefix_lens
@@ -671,28 +697,16 @@ class PI0FAST(nn.Module):
         if padding_side not in ["right", "left"]:
             return tokens, ar_mask, padding_mask, loss_mask, targets, token_type_ids
 
-        new_tokens = torch.empty_like(tokens)
-        new_ar_masks = torch.empty_like(ar_mask)
-        new_padding_mask = torch.empty_like(padding_mask)
-        new_loss_mask = torch.empty_like(loss_mask)
-        new_targets = torch.empty_like(targets)
-        new_token_type_ids = torch.empty_like(token_type_ids)
-        batch_size = tokens.shape[0]
-        for i in range(batch_size):
-            padding_indices = torch.where(padding_mask[i] == 0)[0]
-            non_padding_indices = torch.where(padding_mask[i] == 1)[0]
-            if padding_side == "left":
-                new_indices = torch.cat((padding_indices, non_padding_indices), dim=0)
-            else:
-                new_indices = torch.cat((non_padding_indices, padding_indices), dim=0)
-            new_tokens[i] = tokens[i].index_select(0, new_indices)
-            new_ar_masks[i] = ar_mask[i].index_select(0, new_indices)
-            new_padding_mask[i] = padding_mask[i].index_select(0, new_indices)
-            new_loss_mask[i] = loss_mask[i].index_select(0, new_indices)
-            new_targets[i] = targets[i].index_select(0, new_indices)
-            new_token_type_ids[i] = token_type_ids[i].index_select(0, new_indices)
+        # Stable sort of the positions, moving the padding to one side while keeping the order of the tokens
+        is_padding = padding_mask == 0
+        sort_key = is_padding if padding_side == "right" else ~is_padding
+        new_indices = torch.sort(sort_key.to(torch.uint8), dim=1, stable=True).indices
+
+        def gather(x: torch.Tensor) -> torch.Tensor:
+            index = new_indices.view(*new_indices.shape, *[1] * (x.dim() - 2)).expand_as(x)
+            return x.gather(1, index)
 
-        return new_tokens, new_ar_masks, new_padding_mask, new_loss_mask, new_targets, new_token_type_ids
+        return tuple(gather(x) for x in (tokens, ar_mask, padding_mask, loss_mask, targets, token_type_ids))
 
     def forward(self, batch: dict[str, Tensor]):
         device = batch[OBS_STATE].device
@@ -880,6 +894,25 @@ class PI0FAST(nn.Module):
         )
         token_type_ids = token_type_ids.to(dtype=torch.int64)
         prefix_position_ids = torch.cumsum(pad_masks, dim=1) - 1
+
+        max_new_tokens = self.config.max_decoding_steps
+        generate_kwargs = {}
+        if self.config.constrained_action_decoding:
+            eos_token_id = self.paligemma_tokenizer.eos_token_id
+            action_prefix_ids = self._action_prefix["input_ids"][0].tolist()
+            # Every action token decodes to at least one DCT coefficient, more are truncated anyway
+            max_new_tokens = min(
+                max_new_tokens, len(action_prefix_ids) + self.action_horizon * self.action_dim + 1
+            )
+            processor = FASTActionLogitsProcessor(
+                action_prefix_ids, self.action_decoder.action_token_range, eos_token_id
+            )
+            generate_kwargs = {
+                "logits_processor": LogitsProcessorList([processor]),
+                "eos_token_id": eos_token_id,
+                "pad_token_id": self.pad_token_id,
+            }
+
         output_tokens = self.pi0_paligemma.generate(
             input_ids=None,
             attention_mask=pad_masks,
@@ -887,11 +920,23 @@ class PI0FAST(nn.Module):
             past_key_values=None,
             inputs_embeds=embs,
             use_cache=self.config.use_cache,
-            max_new_tokens=self.config.max_decoding_steps,
+            max_new_tokens=max_new_tokens,
             do_sample=False,
             num_beams=1,
             token_type_ids=token_type_ids,
+            **generate_kwargs,
         )
+        if self.config.constrained_action_decoding:
+            fast_tokens = self.action_decoder.to_fast_tokens(
+                output_tokens[:, len(action_prefix_ids) :], eos_token_id
+            )
+            return self.action_decoder.decode(
+                fast_tokens,
+                self.action_horizon,
+                self.action_dim,
+                relaxed_decoding=self.config.relaxed_action_decoding,
+            )
+
         actions = self.extract_actions(output_tokens, self.action_horizon, self.action_dim)
         return actions
 
@@ -0,0 +1,330 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Batched tokenization of the prompts, and detokenization of the actions of π0+FAST.
+
+The prefix of every sample is the text `"Task: {task}, State: {s_0} {s_1} ... {s_n};\\n"`, where the `s_i` are
+the state discretized in 256 bins. Tokenizing these strings one by one with the PaliGemma tokenizer is slow,
+while the prompt only depends on a handful of tasks and on 257 possible values per state dimension.
+`PI0FASTPromptTokenizer` tokenizes each task and each value once, and builds the token ids of a batch of
+prompts by gathering and concatenating these pieces with tensor operations. Likewise, `FASTActionDecoder`
+decodes the DCT coefficients of each FAST token once, and the actions of a batch of generated tokens at once.
+"""
+
+import logging
+import math
+from collections import OrderedDict
+
+import torch
+from torch import Tensor
+
+STATE_PREFIX = "State:"
+STATE_SUFFIX = ";\n"
+# State values used to check that the tokenization of a new task can be built from its pieces
+PROBE_STATE = [-1, 0, 7, 10, 42, 100, 255, 3]
+
+
+def clean_task(task: str) -> str:
+    return task.lower().strip().replace("_", " ")
+
+
+def discretize_state(state: Tensor, num_bins: int = 256, max_state_dim: int = 32) -> Tensor:
+    """Bins of the (normalized) state in [-1, 1], from -1 for values below -1 to `num_bins - 1`."""
+    bins = torch.linspace(-1, 1, num_bins + 1, device=state.device)[:-1]
+    discretized = torch.bucketize(state, bins) - 1
+    return discretized[:, :max_state_dim]
+
+
+class PI0FASTPromptTokenizer:
+    """Tokenizes the "Task: ..., State: ...;" prompts of π0+FAST from tensors of discretized states.
+
+    The token ids of a prompt are the concatenation of the ids of `"Task: {task}, State:"`, cached per task,
+    of the ids of `" {value}"` for each state value, looked up in a table, and of the ids of `";\\n"`. The
+    batch is then padded in one scatter. This relies on the tokenizer never merging tokens across these
+    boundaries, which holds for the PaliGemma tokenizer as it splits digits. It is checked once for every
+    state value and every new task against the tokenization of the full text, and batches containing a task
+    for which it does not hold are tokenized from text.
+
+    Args:
+        tokenizer: The PaliGemma tokenizer.
+        num_bins (int): Number of bins of the discretized state. Defaults to 256.
+        max_cached_tasks (int): Maximum number of tasks whose tokens are cached. Defaults to 1024.
+    """
+
+    def __init__(self, tokenizer, num_bins: int = 256, max_cached_tasks: int = 1024):
+        self.tokenizer = tokenizer
+        self.num_bins = num_bins
+        self.max_cached_tasks = max_cached_tasks
+        self.pad_token_id = tokenizer.pad_token_id if tokenizer.pad_token_id is not None else 0
+        self._task_ids: OrderedDict[str, list[int] | None] = OrderedDict()
+        self._value_ids: Tensor | None = None
+        self._value_lens: Tensor | None = None
+        self._suffix_ids: Tensor | None = None
+        self._composable: bool | None = None
+
+    def _encode(self, texts: list[str], add_special_tokens: bool = False) -> list[list[int]]:
+        return self.tokenizer(texts, add_special_tokens=add_special_tokens)["input_ids"]
+
+    def _build_value_table(self) -> None:
+        """Tokenizes every state value between the prefix and the suffix of the state."""
+        prefix_ids, suffix_ids = self._encode([STATE_PREFIX, STATE_SUFFIX])
+        values = range(-1, self.num_bins)
+        value_ids = []
+        for ids in self._encode([f"{STATE_PREFIX} {value}{STATE_SUFFIX}" for value in values]):
+            middle = ids[len(prefix_ids) : len(ids) - len(suffix_ids)]
+            if ids[: len(prefix_ids)] != prefix_ids or ids[len(ids) - len(suffix_ids) :] != suffix_ids:
+                middle = []
+            value_ids.append(middle)
+
+        # Values must tokenize the same next to other values, e.g. no "1" + " 2" -> "12"
+        probe = list(values) + list(reversed(values))
+        expected = self._encode([f"{STATE_PREFIX} {' '.join(str(value) for value in probe)}{STATE_SUFFIX}"])[
+            0
+        ]
+        composed = prefix_ids + [i for value in probe for i in value_ids[value + 1]] + suffix_ids
+        self._composable = all(value_ids) and composed == expected
+        if not self._composable:
+            logging.warning(
+                "The tokenizer merges tokens of the state values, prompts are tokenized from text."
+            )
+            return
+
+        max_len = max(len(ids) for ids in value_ids)
+        self._value_ids = torch.full((len(value_ids), max_len), self.pad_token_id, dtype=torch.long)
+        self._value_lens = torch.tensor([len(ids) for ids in value_ids], dtype=torch.long)
+        for i, ids in enumerate(value_ids):
+            self._value_ids[i, : len(ids)] = torch.tensor(ids, dtype=torch.long)
+        self._suffix_ids = torch.tensor(suffix_ids, dtype=torch.long)
+
+    def _compose(self, task_ids: list[int], state: list[int]) -> list[int]:
+        value_ids = [self._value_ids[value + 1, : self._value_lens[value + 1]].tolist() for value in state]
+        return task_ids + [i for ids in value_ids for i in ids] + self._suffix_ids.tolist()
+
+    def task_ids(self, task: str) -> list[int] | None:
+        """Token ids of `"Task: {task}, State:"`, or None if prompts of this task can't be composed."""
+        if task in self._task_ids:
+            self._task_ids.move_to_end(task)
+            return self._task_ids[task]
+
+        text = f"Task: {clean_task(task)}, {STATE_PREFIX}"
+        ids = self._encode([text], add_special_tokens=True)[0]
+        expected = self._encode([self.prompt_text(task, PROBE_STATE)], add_special_tokens=True)[0]
+        if self._compose(ids, PROBE_STATE) != expected:
+            logging.warning(f"The prompts of the task {task!r} are tokenized from text.")
+            ids = None
+
+        self._task_ids[task] = ids
+        if len(self._task_ids) > self.max_cached_tasks:
+            self._task_ids.popitem(last=False)
+        return ids
+
+    @staticmethod
+    def prompt_text(task: str, state: list[int]) -> str:
+        state_str = " ".join(str(value) for value in state)
+        return f"Task: {clean_task(task)}, {STATE_PREFIX} {state_str}{STATE_SUFFIX}"
+
+    def tokenize_from_text(self, discretized_state: Tensor, tasks: list[str]) -> tuple[Tensor, Tensor]:
+        """Reference implementation, tokenizing the text of every prompt."""
+        prompts = [
+            self.prompt_text(task, state)
+            for task, state in zip(tasks, discretized_state.tolist(), strict=False)
+        ]
+        out = self.tokenizer(
+            prompts, add_special_tokens=True, return_tensors="pt", padding="longest", truncation=False
+        )
+        return out["input_ids"], out["attention_mask"]
+
+    def __call__(self, discretized_state: Tensor, tasks: list[str]) -> tuple[Tensor, Tensor]:
+        """Token ids and attention mask of the prompts, padded to the longest one like the tokenizer would.
+
+        Args:
+            discretized_state (Tensor): (batch_size, state_dim) state bins, as returned by `discretize_state`.
+            tasks (list[str]): The task of every sample.
+
+        Returns:
+            tuple[Tensor, Tensor]: (batch_size, seq_len) token ids and attention mask, on the device of
+                `discretized_state`.
+        """
+        device = discretized_state.device
+        if self._composable is None:
+            self._build_value_table()
+
+        # Index of the task of every sample in the (few) unique tasks of the batch
+        unique_tasks = {}
+        task_index = torch.tensor([unique_tasks.setdefault(task, len(unique_tasks)) for task in tasks])
+        task_ids = [self.task_ids(task) for task in unique_tasks] if self._composable else [None]
+        if any(ids is None for ids in task_ids):
+            input_ids, attention_mask = self.tokenize_from_text(discretized_state, tasks)
+            return input_ids.to(device), attention_mask.to(device)
+
+        task_lens = torch.tensor([len(ids) for ids in task_ids], dtype=torch.long)
+        task_table = torch.full((len(task_ids), int(task_lens.max())), self.pad_token_id, dtype=torch.long)
+        for i, ids in enumerate(task_ids):
+            task_table[i, : len(ids)] = torch.tensor(ids, dtype=torch.long)
+
+        # All the pieces of every prompt, followed by their padding, and whether each token is valid
+        state_index = discretized_state.cpu() + 1
+        batch_size, state_dim = state_index.shape
+        value_ids = self._value_ids[state_index].view(batch_size, -1)
+        value_positions = torch.arange(self._value_ids.shape[1])
+        value_valid = (value_positions < self._value_lens[state_index][..., None]).view(batch_size, -1)
+        pieces = torch.cat(
+            [task_table[task_index], value_ids, self._suffix_ids.expand(batch_size, -1)], dim=1
+        )
+        valid = torch.cat(
+            [
+                torch.arange(task_table.shape[1]) < task_lens[task_index][:, None],
+                value_valid,
+                torch.ones(batch_size, len(self._suffix_ids), dtype=torch.bool),
+            ],
+            dim=1,
+        )
+
+        # Scatter the valid tokens to their position in the padded prompts
+        lengths = valid.sum(dim=1)
+        positions = valid.cumsum(dim=1) - 1
+        if self.tokenizer.padding_side == "left":
+            positions += (lengths.max() - lengths)[:, None]
+        rows = torch.arange(batch_size)[:, None].expand_as(valid)[valid]
+        input_ids = torch.full((batch_size, int(lengths.max())), self.pad_token_id, dtype=torch.long)
+        attention_mask = torch.zeros_like(input_ids)
+        input_ids[rows, positions[valid]] = pieces[valid]
+        attention_mask[rows, positions[valid]] = 1
+        return input_ids.to(device), attention_mask.to(device)
+
+
+def idct_matrix(n: int, dtype: torch.dtype = torch.float64, device: torch.device | str = "cpu") -> Tensor:
+    """(n, n) matrix of the orthonormal inverse DCT, i.e. `scipy.fft.idct(x, axis=0, norm="ortho")`."""
+    positions = torch.arange(n, dtype=torch.float64)[:, None]
+    frequencies = torch.arange(n, dtype=torch.float64)[None, :]
+    matrix = torch.cos(math.pi * (2 * positions + 1) * frequencies / (2 * n)) * math.sqrt(2 / n)
+    matrix[:, 0] = math.sqrt(1 / n)
+    return matrix.to(dtype=dtype, device=device)
+
+
+class FASTActionDecoder:
+    """Decodes batches of FAST action tokens into action chunks with tensor operations.
+
+    FAST encodes an action chunk as the DCT coefficients of every action dimension, rounded, flattened and
+    compressed with BPE, each character of the BPE vocabulary being a coefficient. The coefficients of every
+    token are decoded once into a table, from which the coefficients of a batch of tokens are gathered, padded
+    or truncated to `time_horizon * action_dim` and transformed back with the inverse DCT as a matrix product.
+    If the BPE tokenizer decodes sequences differently than the concatenation of their tokens, the
+    coefficients are decoded sample by sample instead.
+
+    In the PaliGemma vocabulary, the FAST token `i` is `vocab_size - 1 - fast_skip_tokens - i`.
+
+    Args:
+        fast_tokenizer: The FAST action tokenizer.
+        vocab_size (int): Size of the vocabulary of the PaliGemma tokenizer.
+        fast_skip_tokens (int): Number of tokens at the end of the PaliGemma vocabulary which are not used.
+    """
+
+    def __init__(self, fast_tokenizer, vocab_size: int, fast_skip_tokens: int):
+        self.fast_tokenizer = fast_tokenizer
+        self.last_token_id = vocab_size - 1 - fast_skip_tokens
+        self.first_token_id = self.last_token_id - (fast_tokenizer.bpe_tokenizer.vocab_size - 1)
+        self._token_coeffs: Tensor | None = None
+        self._token_lens: Tensor | None = None
+        self._vectorizable: bool | None = None
+
+    @property
+    def action_token_range(self) -> tuple[int, int]:
+        """First and last ids of the action tokens in the PaliGemma vocabulary."""
+        return self.first_token_id, self.last_token_id
+
+    def to_fast_tokens(self, tokens: Tensor, eos_token_id: int) -> Tensor:
+        """FAST ids of the PaliGemma `tokens` until the first EOS, -1 for any other token."""
+        after_eos = (tokens == eos_token_id).cumsum(dim=1) > 0
+        is_action = (tokens >= self.first_token_id) & (tokens <= self.last_token_id) & ~after_eos
+        return torch.where(is_action, self.last_token_id - tokens, -1)
+
+    def _token_to_coeffs(self, token_ids: list[int]) -> list[int]:
+        decoded = self.fast_tokenizer.bpe_tokenizer.decode(token_ids)
+        return [ord(char) + self.fast_tokenizer.min_token for char in decoded]
+
+    def _build_token_table(self) -> None:
+        token_ids = range(self.fast_tokenizer.bpe_tokenizer.vocab_size)
+        token_coeffs = [self._token_to_coeffs([token_id]) for token_id in token_ids]
+        probe = list(token_ids) + list(reversed(token_ids))
+        composed = [coeff for token_id in probe for coeff in token_coeffs[token_id]]
+        self._vectorizable = all(token_coeffs) and composed == self._token_to_coeffs(probe)
+        if not self._vectorizable:
+            logging.warning("FAST tokens don't decode independently, actions are decoded sample by sample.")
+            return
+
+        max_len = max(len(coeffs) for coeffs in token_coeffs)
+        self._token_coeffs = torch.zeros(len(token_coeffs), max_len, dtype=torch.float64)
+        self._token_lens = torch.tensor([len(coeffs) for coeffs in token_coeffs], dtype=torch.long)
+        for i, coeffs in enumerate(token_coeffs):
+            self._token_coeffs[i, : len(coeffs)] = torch.tensor(coeffs, dtype=torch.float64)
+
+    def _gather_coeffs(self, fast_tokens: Tensor) -> tuple[Tensor, Tensor]:
+        """Coefficients of every token of every sample, flattened, and whether each of them is valid."""
+        if self._vectorizable:
+            is_token = fast_tokens >= 0
+            token_ids = fast_tokens.clamp(min=0)
+            coeffs = self._token_coeffs[token_ids]
+            positions = torch.arange(coeffs.shape[-1])
+            valid = (positions < self._token_lens[token_ids][..., None]) & is_token[..., None]
+            return coeffs.flatten(1), valid.flatten(1)
+
+        samples = [
+            self._token_to_coeffs([token_id for token_id in tokens if token_id >= 0])
+            for tokens in fast_tokens.tolist()
+        ]
+        max_len = max(1, max(len(coeffs) for coeffs in samples))
+        coeffs = torch.zeros(len(samples), max_len, dtype=torch.float64)
+        valid = torch.zeros(len(samples), max_len, dtype=torch.bool)
+        for i, sample_coeffs in enumerate(samples):
+            coeffs[i, : len(sample_coeffs)] = torch.tensor(sample_coeffs, dtype=torch.float64)
+            valid[i, : len(sample_coeffs)] = True
+        return coeffs, valid
+
+    def decode(
+        self, fast_tokens: Tensor, time_horizon: int, action_dim: int, relaxed_decoding: bool = True
+    ) -> Tensor:
+        """Decodes the action chunks of a batch of FAST tokens, like `PI0FAST.decode_actions_with_fast`.
+
+        Args:
+            fast_tokens (Tensor): (batch_size, num_tokens) FAST ids, where negative ids are ignored.
+            time_horizon (int): Number of actions of the chunks.
+            action_dim (int): Dimension of the actions.
+            relaxed_decoding (bool): Whether to truncate or pad with zeros the coefficients to the size of the
+                chunk. Otherwise, chunks of the wrong size are decoded as zeros. Defaults to True.
+
+        Returns:
+            Tensor: (batch_size, time_horizon, action_dim) float32 actions, on the device of `fast_tokens`.
+        """
+        if self._vectorizable is None:
+            self._build_token_table()
+
+        coeffs, valid = self._gather_coeffs(fast_tokens.cpu())
+        batch_size = coeffs.shape[0]
+        chunk_size = time_horizon * action_dim
+        lengths = valid.sum(dim=1)
+        positions = valid.cumsum(dim=1) - 1
+        keep = valid & (positions < chunk_size)
+        rows = torch.arange(batch_size)[:, None].expand_as(keep)[keep]
+        dct_coeffs = torch.zeros(batch_size, chunk_size, dtype=torch.float64)
+        dct_coeffs[rows, positions[keep]] = coeffs[keep]
+        if not relaxed_decoding:
+            dct_coeffs[lengths != chunk_size] = 0
+
+        dct_coeffs = dct_coeffs.view(batch_size, time_horizon, action_dim) / self.fast_tokenizer.scale
+        actions = idct_matrix(time_horizon) @ dct_coeffs
+        return actions.to(device=fast_tokens.device, dtype=torch.float32)
@@ -53,6 +53,18 @@ class ActorLearnerConfig:
     learner_port: int = 50051
     policy_parameters_push_frequency: int = 4
     queue_get_timeout: float = 2
+    # Only send the parameters that changed since the last push, they are copied in place on the actor
+    policy_parameters_delta_sync: bool = True
+    # Optional dtype ("float16" or "bfloat16") the floating point parameters are cast to before being sent
+    policy_parameters_dtype: str | None = None
+    # Optional codec for the image observations of the transitions sent to the learner: "zlib" or "jpeg"
+    transitions_image_codec: str | None = None
+    # Identity of the actor, to tell several actors of the same learner apart. Defaults to "<hostname>-<pid>"
+    actor_id: str | None = None
+    # Maximum number of actors connected to the learner at the same time
+    max_actors: int = 4
+    # Number of transitions messages the learner buffers per actor before it stops reading from it
+    actor_transitions_queue_size: int = 4
 
 
 @dataclass
@@ -145,6 +157,9 @@ class SACConfig(PreTrainedConfig):
     online_buffer_capacity: int = 100000
     # Capacity of the offline replay buffer
     offline_buffer_capacity: int = 100000
+    # Whether to back the online replay buffer with memmap files in the output directory, so that its
+    # capacity is bounded by disk rather than RAM and it can be reopened as-is when resuming
+    online_buffer_on_disk: bool = False
     # Whether to use asynchronous prefetching for the buffers
     async_prefetch: bool = False
     # Number of steps before learning starts
@@ -202,6 +217,16 @@ class SACConfig(PreTrainedConfig):
     def __post_init__(self):
         super().__post_init__()
         # Any validation specific to SAC configuration
+        if self.actor_learner_config.policy_parameters_dtype not in (None, "float16", "bfloat16"):
+            raise ValueError(
+                "actor_learner_config.policy_parameters_dtype must be None, 'float16' or 'bfloat16', got "
+                f"{self.actor_learner_config.policy_parameters_dtype}"
+            )
+        if self.actor_learner_config.transitions_image_codec not in (None, "zlib", "jpeg"):
+            raise ValueError(
+                "actor_learner_config.transitions_image_codec must be None, 'zlib' or 'jpeg', got "
+                f"{self.actor_learner_config.transitions_image_codec}"
+            )
 
     def get_optimizer_preset(self) -> MultiAdamConfig:
         return MultiAdamConfig(
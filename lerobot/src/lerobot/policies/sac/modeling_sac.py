@@ -15,6 +15,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import copy
 import math
 from collections.abc import Callable
 from dataclasses import asdict
@@ -220,27 +221,15 @@ class SACPolicy(
 
         raise ValueError(f"Unknown model type: {model}")
 
+    @torch.no_grad()
     def update_target_networks(self):
         """Update target networks with exponential moving average"""
-        for target_param, param in zip(
-            self.critic_target.parameters(),
-            self.critic_ensemble.parameters(),
-            strict=True,
-        ):
-            target_param.data.copy_(
-                param.data * self.config.critic_target_update_weight
-                + target_param.data * (1.0 - self.config.critic_target_update_weight)
-            )
+        target_params = list(self.critic_target.parameters())
+        params = list(self.critic_ensemble.parameters())
         if self.config.num_discrete_actions is not None:
-            for target_param, param in zip(
-                self.discrete_critic_target.parameters(),
-                self.discrete_critic.parameters(),
-                strict=True,
-            ):
-                target_param.data.copy_(
-                    param.data * self.config.critic_target_update_weight
-                    + target_param.data * (1.0 - self.config.critic_target_update_weight)
-                )
+            target_params += list(self.discrete_critic_target.parameters())
+            params += list(self.discrete_critic.parameters())
+        torch._foreach_lerp_(target_params, params, self.config.critic_target_update_weight)
 
     def update_temperature(self):
         self.temperature = self.log_alpha.exp().item()
@@ -740,9 +729,86 @@ class CriticHead(nn.Module):
         return self.output_layer(self.net(x))
 
 
+class StackedCriticHeads(nn.Module):
+    """
+    Several CriticHead modules evaluated at once, their weights being stacked along a leading critic dimension.
+
+    The parameters of the heads are stored as `(num_critics, *shape)` tensors, so every linear layer of the
+    ensemble is a single batched matmul instead of one small matmul per critic, and every layer norm a single
+    kernel. The state dict keeps the layout of a `nn.ModuleList` of CriticHead (`{i}.net.net.0.weight`, ...),
+    so checkpoints are interchangeable with the per-critic implementation.
+
+    Args:
+        heads (List[CriticHead]): critic heads with the same architecture, whose weights are stacked.
+    """
+
+    def __init__(self, heads: list[CriticHead]):
+        super().__init__()
+        self.num_critics = len(heads)
+        self.param_names = [name for name, _ in heads[0].named_parameters()]
+        self.stacked = nn.ParameterList(
+            [
+                nn.Parameter(torch.stack([dict(head.named_parameters())[name].detach() for head in heads]))
+                for name in self.param_names
+            ]
+        )
+        # Kept out of the registered submodules, it only provides the layers' structure and activations
+        self._template = [copy.deepcopy(heads[0]).to("meta")]
+
+        self._register_state_dict_hook(self._unstack_state_dict)
+        self._register_load_state_dict_pre_hook(self._stack_state_dict)
+
+    def __len__(self) -> int:
+        return self.num_critics
+
+    def train(self, mode: bool = True):
+        super().train(mode)
+        self._template[0].train(mode)
+        return self
+
+    def _linear(self, x: Tensor, prefix: str) -> Tensor:
+        weight = self.stacked[self.param_names.index(f"{prefix}.weight")]
+        bias = self.stacked[self.param_names.index(f"{prefix}.bias")]
+        if x.dim() == 2:
+            x = x.expand(self.num_critics, *x.shape)
+        return torch.baddbmm(bias.unsqueeze(1), x, weight.transpose(1, 2))
+
+    def forward(self, x: torch.Tensor) -> torch.Tensor:
+        template = self._template[0]
+        for idx, layer in enumerate(template.net.net):
+            if isinstance(layer, nn.Linear):
+                x = self._linear(x, f"net.net.{idx}")
+            elif isinstance(layer, nn.LayerNorm):
+                weight = self.stacked[self.param_names.index(f"net.net.{idx}.weight")]
+                bias = self.stacked[self.param_names.index(f"net.net.{idx}.bias")]
+                x = F.layer_norm(x, layer.normalized_shape, eps=layer.eps) * weight.unsqueeze(
+                    1
+                ) + bias.unsqueeze(1)
+            else:
+                # Dropout and activations are element-wise, and draw independent masks for every critic
+                x = layer(x)
+        return self._linear(x, "output_layer").squeeze(-1)
+
+    def _unstack_state_dict(self, module, state_dict, prefix, local_metadata):
+        for idx, name in enumerate(self.param_names):
+            stacked = state_dict.pop(f"{prefix}stacked.{idx}")
+            for critic_idx in range(self.num_critics):
+                # Cloned so that the saved tensors don't share their storage
+                state_dict[f"{prefix}{critic_idx}.{name}"] = stacked[critic_idx].clone()
+        return state_dict
+
+    def _stack_state_dict(
+        self, state_dict, prefix, local_metadata, strict, missing_keys, unexpected_keys, error_msgs
+    ):
+        for idx, name in enumerate(self.param_names):
+            keys = [f"{prefix}{critic_idx}.{name}" for critic_idx in range(self.num_critics)]
+            if all(key in state_dict for key in keys):
+                state_dict[f"{prefix}stacked.{idx}"] = torch.stack([state_dict.pop(key) for key in keys])
+
+
 class CriticEnsemble(nn.Module):
     """
-    CriticEnsemble wraps multiple CriticHead modules into an ensemble.
+    CriticEnsemble wraps multiple CriticHead modules into an ensemble, evaluated at once by StackedCriticHeads.
 
     Args:
         encoder (SACObservationEncoder): encoder for observations.
@@ -764,7 +830,7 @@ class CriticEnsemble(nn.Module):
         self.encoder = encoder
         self.init_final = init_final
         self.output_normalization = output_normalization
-        self.critics = nn.ModuleList(ensemble)
+        self.critics = StackedCriticHeads(ensemble)
 
     def forward(
         self,
@@ -785,13 +851,8 @@ class CriticEnsemble(nn.Module):
 
         inputs = torch.cat([obs_enc, actions], dim=-1)
 
-        # Loop through critics and collect outputs
-        q_values = []
-        for critic in self.critics:
-            q_values.append(critic(inputs))
-
-        # Stack outputs to match expected shape [num_critics, batch_size]
-        q_values = torch.stack([q.squeeze(-1) for q in q_values], dim=0)
+        # Q-values of all the critics, of shape [num_critics, batch_size]
+        q_values = self.critics(inputs)
         return q_values
 
 
@@ -66,6 +66,10 @@ class SmolVLAConfig(PreTrainedConfig):
     # Attention utils
     use_cache: bool = True
 
+    # Static-shape inference with preallocated buffers and cached prompts (see `SmolVLAInferenceSession`)
+    use_inference_session: bool = False
+    compile_inference_session: bool = False  # Compile the denoising step with `torch.compile`
+
     # Finetuning settings
     freeze_vision_encoder: bool = True
     train_expert_only: bool = True
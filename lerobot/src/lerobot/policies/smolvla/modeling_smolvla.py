@@ -64,6 +64,7 @@ from torch import Tensor, nn
 from transformers import AutoProcessor
 
 from lerobot.constants import ACTION, OBS_STATE
+from lerobot.policies.inference_session import FlowMatchingInferenceSession
 from lerobot.policies.normalize import (
     Normalize,
     Unnormalize,
@@ -349,6 +350,7 @@ class SmolVLAPolicy(PreTrainedPolicy):
 
         self.language_tokenizer = AutoProcessor.from_pretrained(self.config.vlm_model_name).tokenizer
         self.model = VLAFlowMatching(config)
+        self._inference_sessions: dict[tuple, SmolVLAInferenceSession] = {}
         self.reset()
 
     def reset(self):
@@ -387,11 +389,17 @@ class SmolVLAPolicy(PreTrainedPolicy):
             if k in self._queues and k != ACTION:
                 batch[k] = torch.stack(list(self._queues[k]), dim=1)
 
-        images, img_masks = self.prepare_images(batch)
-        state = self.prepare_state(batch)
-        lang_tokens, lang_masks = self.prepare_language(batch)
+        # The inference session assumes that all the images of the batch are valid
+        if self.config.use_inference_session and not any(key.endswith("_padding_mask") for key in batch):
+            actions = self.inference_session(batch).sample_actions(batch, noise=noise)
+        else:
+            images, img_masks = self.prepare_images(batch)
+            state = self.prepare_state(batch)
+            lang_tokens, lang_masks = self.prepare_language(batch)
 
-        actions = self.model.sample_actions(images, img_masks, lang_tokens, lang_masks, state, noise=noise)
+            actions = self.model.sample_actions(
+                images, img_masks, lang_tokens, lang_masks, state, noise=noise
+            )
 
         # Unpad actions
         original_action_dim = self.config.action_feature.shape[0]
@@ -404,6 +412,10 @@ class SmolVLAPolicy(PreTrainedPolicy):
 
         return actions
 
+    def inference_session(self, batch: dict[str, Tensor]) -> "SmolVLAInferenceSession":
+        """The inference session for the batch size and the cameras of `batch`, created on first use."""
+        return SmolVLAInferenceSession.for_batch(self, batch)
+
     def _prepare_batch(self, batch: dict[str, Tensor]) -> dict[str, Tensor]:
         if self.config.adapt_to_pi_aloha:
             batch[OBS_STATE] = self._pi_aloha_decode_state(batch[OBS_STATE])
@@ -785,14 +797,21 @@ class VLAFlowMatching(nn.Module):
 
     def embed_suffix(self, noisy_actions, timestep):
         """Embed state, noisy_actions, timestep to prepare for Expert Gemma processing."""
-        embs = []
-        pad_masks = []
-        att_masks = []
+        embs = self.embed_suffix_tokens(noisy_actions, timestep)
+        bsize, action_time_dim = embs.shape[:2]
+        pad_masks = torch.ones(bsize, action_time_dim, dtype=torch.bool, device=embs.device)
+
+        # Set attention masks so that image, language and state inputs do not attend to action tokens
+        att_masks = [1] * self.config.chunk_size
+        att_masks = torch.tensor(att_masks, dtype=embs.dtype, device=embs.device)
+        att_masks = att_masks[None, :].expand(bsize, len(att_masks))
+        return embs, pad_masks, att_masks
 
+    def embed_suffix_tokens(self, noisy_actions, timestep) -> Tensor:
+        """Embeddings of `embed_suffix`, without their masks which only depend on the batch size."""
         # Fuse timestep + action information using an MLP
         action_emb = self.action_in_proj(noisy_actions)
         device = action_emb.device
-        bsize = action_emb.shape[0]
         dtype = action_emb.dtype
         # Embed timestep using sine-cosine positional encoding with sensitivity in the range [0, 1]
         time_emb = create_sinusoidal_pos_embedding(
@@ -810,21 +829,7 @@ class VLAFlowMatching(nn.Module):
         action_time_emb = self.action_time_mlp_in(action_time_emb)
         action_time_emb = F.silu(action_time_emb)  # swish == silu
         action_time_emb = self.action_time_mlp_out(action_time_emb)
-
-        # Add to input tokens
-        embs.append(action_time_emb)
-
-        bsize, action_time_dim = action_time_emb.shape[:2]
-        action_time_mask = torch.ones(bsize, action_time_dim, dtype=torch.bool, device=device)
-        pad_masks.append(action_time_mask)
-
-        # Set attention masks so that image, language and state inputs do not attend to action tokens
-        att_masks += [1] * self.config.chunk_size
-        embs = torch.cat(embs, dim=1)
-        pad_masks = torch.cat(pad_masks, dim=1)
-        att_masks = torch.tensor(att_masks, dtype=embs.dtype, device=embs.device)
-        att_masks = att_masks[None, :].expand(bsize, len(att_masks))
-        return embs, pad_masks, att_masks
+        return action_time_emb
 
     def forward(
         self, images, img_masks, lang_tokens, lang_masks, state, actions, noise=None, time=None
@@ -914,7 +919,13 @@ class VLAFlowMatching(nn.Module):
     ):
         """Apply one denoising step of the noise `x_t` at a given timestep."""
         suffix_embs, suffix_pad_masks, suffix_att_masks = self.embed_suffix(x_t, timestep)
+        att_2d_masks, position_ids = self.make_suffix_att_2d_masks(
+            prefix_pad_masks, suffix_pad_masks, suffix_att_masks
+        )
+        return self.predict_velocity(suffix_embs, att_2d_masks, position_ids, past_key_values)
 
+    def make_suffix_att_2d_masks(self, prefix_pad_masks, suffix_pad_masks, suffix_att_masks):
+        """Attention masks and position ids of the suffix tokens attending to the cached prefix."""
         suffix_len = suffix_pad_masks.shape[1]
         batch_size = prefix_pad_masks.shape[0]
         prefix_len = prefix_pad_masks.shape[1]
@@ -925,9 +936,12 @@ class VLAFlowMatching(nn.Module):
         full_att_2d_masks = torch.cat([prefix_pad_2d_masks, suffix_att_2d_masks], dim=2)
         prefix_offsets = torch.sum(prefix_pad_masks, dim=-1)[:, None]
         position_ids = prefix_offsets + torch.cumsum(suffix_pad_masks, dim=1) - 1
+        return full_att_2d_masks, position_ids
 
+    def predict_velocity(self, suffix_embs, att_2d_masks, position_ids, past_key_values) -> Tensor:
+        """Velocity of the noisy actions, given the embedded suffix and the key value cache of the prefix."""
         outputs_embeds, _ = self.vlm_with_expert.forward(
-            attention_mask=full_att_2d_masks,
+            attention_mask=att_2d_masks,
             position_ids=position_ids,
             past_key_values=past_key_values,
             inputs_embeds=[None, suffix_embs],
@@ -939,3 +953,56 @@ class VLAFlowMatching(nn.Module):
         suffix_out = suffix_out.to(dtype=torch.float32)
         v_t = self.action_out_proj(suffix_out)
         return v_t
+
+
+class SmolVLAInferenceSession(FlowMatchingInferenceSession):
+    """Static-shape inference of `VLAFlowMatching.sample_actions`, see `FlowMatchingInferenceSession`.
+
+    The tasks are always padded to `tokenizer_max_length` (whatever `pad_language_to`), the padding tokens
+    being masked the actions match those of `sample_actions` up to floating point rounding.
+    """
+
+    make_att_2d_masks = staticmethod(make_att_2d_masks)
+
+    @property
+    def vlm_with_expert(self) -> nn.Module:
+        return self.model.vlm_with_expert
+
+    @property
+    def chunk_size(self) -> int:
+        return self.config.chunk_size
+
+    def get_image(self, batch: dict[str, Tensor], key: str) -> Tensor:
+        return batch[key][:, -1, :, :, :] if batch[key].ndim == 5 else batch[key]
+
+    def get_tasks(self, batch: dict[str, Tensor]) -> tuple[str, ...]:
+        tasks = batch["task"]
+        if isinstance(tasks, str):
+            tasks = [tasks]
+        if len(tasks) == 1:
+            tasks = [tasks[0] for _ in range(self.batch_size)]
+        return tuple(task if task.endswith("\n") else f"{task}\n" for task in tasks)
+
+    def tokenize(self, batch: dict[str, Tensor], tasks: tuple[str, ...]) -> tuple[Tensor, Tensor]:
+        tokenized_prompt = self.policy.language_tokenizer.__call__(
+            list(tasks),
+            padding="max_length",
+            padding_side="right",
+            max_length=self.config.tokenizer_max_length,
+            return_tensors="pt",
+        )
+        lang_tokens = tokenized_prompt["input_ids"].to(device=self.device)
+        lang_masks = tokenized_prompt["attention_mask"].to(device=self.device, dtype=torch.bool)
+        return lang_tokens, lang_masks
+
+    def embed_prefix(self, images, img_masks, prompt, state) -> tuple[Tensor, Tensor, Tensor]:
+        return self.model.embed_prefix(
+            images, img_masks, prompt["lang_tokens"], prompt["lang_masks"], state=state
+        )
+
+    def embed_suffix(self, state, x_t, timestep) -> tuple[Tensor, Tensor, Tensor]:
+        return self.model.embed_suffix(x_t, timestep)
+
+    def embed_suffix_tokens(self, state, x_t, timestep) -> Tensor:
+        # The state is embedded in the prefix
+        return self.model.embed_suffix_tokens(x_t, timestep)
@@ -169,66 +169,82 @@ class TDMPCPolicy(PreTrainedPolicy):
         action = self._queues[ACTION].popleft()
         return action
 
+    def _warm_start(self, batch_size: int) -> Tensor:
+        """Initial mean of CEM, warm started with the mean of the previous call to `plan`.
+
+        The previous mean is shifted by the number of steps executed since, the steps past its horizon being
+        zeros.
+        """
+        device = get_device_from_parameters(self)
+        mean = torch.zeros(
+            self.config.horizon, batch_size, self.config.action_feature.shape[0], device=device
+        )
+        if self._prev_mean is not None:
+            # Note: `n_action_steps` is 1 when actions are repeated, a single step of the plan is then executed.
+            shift = self.config.n_action_steps
+            mean[: self.config.horizon - shift] = self._prev_mean[shift:]
+        return mean
+
     @torch.no_grad()
     def plan(self, z: Tensor) -> Tensor:
         """Plan sequence of actions using TD-MPC inference.
 
+        The trajectories sampled from the policy (π) are rolled out once, before CEM: their return up to the
+        horizon doesn't change across iterations, so every CEM iteration only rolls out the gaussian samples,
+        and estimates the terminal value of all of them.
+
         Args:
             z: (batch, latent_dim,) tensor for the initial state.
         Returns:
             (horizon, batch, action_dim,) tensor for the planned trajectory of actions.
         """
-        device = get_device_from_parameters(self)
-
         batch_size = z.shape[0]
+        horizon, action_dim = self.config.horizon, self.config.action_feature.shape[0]
+        n_gaussian_samples, n_pi_samples = self.config.n_gaussian_samples, self.config.n_pi_samples
 
-        # Sample Nπ trajectories from the policy.
-        pi_actions = torch.empty(
-            self.config.horizon,
-            self.config.n_pi_samples,
-            batch_size,
-            self.config.action_feature.shape[0],
-            device=device,
+        # Samples laid out as [gaussian | π].
+        actions = torch.empty(
+            horizon, n_gaussian_samples + n_pi_samples, batch_size, action_dim, device=z.device
         )
-        if self.config.n_pi_samples > 0:
-            _z = einops.repeat(z, "b d -> n b d", n=self.config.n_pi_samples)
-            for t in range(self.config.horizon):
-                # Note: Adding a small amount of noise here doesn't hurt during inference and may even be
-                # helpful for CEM.
-                pi_actions[t] = self.model.pi(_z, self.config.min_std)
-                _z = self.model.latent_dynamics(_z, pi_actions[t])
 
-        # In the CEM loop we will need this for a call to estimate_value with the gaussian sampled
+        # Sample Nπ trajectories from the policy, and estimate their return up to the horizon.
+        if n_pi_samples > 0:
+            pi_return, pi_z, _ = self.rollout_return(
+                einops.repeat(z, "b d -> n b d", n=n_pi_samples),
+                actions[:, n_gaussian_samples:],
+                sample_pi=True,
+            )
+
+        # In the CEM loop we will need this for a call to rollout_return with the gaussian sampled
         # trajectories.
-        z = einops.repeat(z, "b d -> n b d", n=self.config.n_gaussian_samples + self.config.n_pi_samples)
+        z = einops.repeat(z, "b d -> n b d", n=n_gaussian_samples)
 
         # Model Predictive Path Integral (MPPI) with the cross-entropy method (CEM) as the optimization
         # algorithm.
-        # The initial mean and standard deviation for the cross-entropy method (CEM).
-        mean = torch.zeros(
-            self.config.horizon, batch_size, self.config.action_feature.shape[0], device=device
-        )
-        # Maybe warm start CEM with the mean from the previous step.
-        if self._prev_mean is not None:
-            mean[:-1] = self._prev_mean[1:]
+        # The initial mean and standard deviation for the cross-entropy method (CEM), maybe warm started with
+        # the mean from the previous step.
+        mean = self._warm_start(batch_size)
         std = self.config.max_std * torch.ones_like(mean)
 
         for _ in range(self.config.cem_iterations):
             # Randomly sample action trajectories for the gaussian distribution.
             std_normal_noise = torch.randn(
-                self.config.horizon,
-                self.config.n_gaussian_samples,
-                batch_size,
-                self.config.action_feature.shape[0],
-                device=std.device,
+                horizon, n_gaussian_samples, batch_size, action_dim, device=std.device
+            )
+            torch.clamp(
+                mean.unsqueeze(1) + std.unsqueeze(1) * std_normal_noise,
+                -1,
+                1,
+                out=actions[:, :n_gaussian_samples],
             )
-            gaussian_actions = torch.clamp(mean.unsqueeze(1) + std.unsqueeze(1) * std_normal_noise, -1, 1)
 
             # Compute elite actions.
-            actions = torch.cat([gaussian_actions, pi_actions], dim=1)
-            value = self.estimate_value(z, actions).nan_to_num_(0)
-            elite_idxs = torch.topk(value, self.config.n_elites, dim=0).indices  # (n_elites, batch)
-            elite_value = value.take_along_dim(elite_idxs, dim=0)  # (n_elites, batch)
+            G, final_z, running_discount = self.rollout_return(z, actions[:, :n_gaussian_samples])
+            if n_pi_samples > 0:
+                G = torch.cat([G, pi_return])
+                final_z = torch.cat([final_z, pi_z])
+            value = self.terminal_value(G, final_z, running_discount).nan_to_num_(0)
+            elite_value, elite_idxs = torch.topk(value, self.config.n_elites, dim=0)  # (n_elites, batch)
             # (horizon, n_elites, batch, action_dim)
             elite_actions = actions.take_along_dim(einops.rearrange(elite_idxs, "n b -> 1 n b 1"), dim=1)
 
@@ -259,7 +275,7 @@ class TDMPCPolicy(PreTrainedPolicy):
 
         # Randomly select one of the elite actions from the last iteration of MPPI/CEM using the softmax
         # scores from the last iteration.
-        actions = elite_actions[:, torch.multinomial(score.T, 1).squeeze(), torch.arange(batch_size)]
+        actions = elite_actions[:, torch.multinomial(score.T, 1).squeeze(1), torch.arange(batch_size)]
 
         return actions
 
@@ -268,29 +284,66 @@ class TDMPCPolicy(PreTrainedPolicy):
         """Estimates the value of a trajectory as per eqn 4 of the FOWM paper.
 
         Args:
-            z: (batch, latent_dim) tensor of initial latent states.
-            actions: (horizon, batch, action_dim) tensor of action trajectories.
+            z: (*, batch, latent_dim) tensor of initial latent states.
+            actions: (horizon, *, batch, action_dim) tensor of action trajectories.
         Returns:
-            (batch,) tensor of values.
+            (*, batch) tensor of values.
+        """
+        return self.terminal_value(*self.rollout_return(z, actions))
+
+    @torch.no_grad()
+    def rollout_return(
+        self, z: Tensor, actions: Tensor, sample_pi: bool = False
+    ) -> tuple[Tensor, Tensor, float]:
+        """Roll out trajectories with the latent dynamics model, and estimate their return up to the horizon.
+
+        This is the first part of `estimate_value`, which is deterministic given the actions.
+
+        Args:
+            z: (*, batch, latent_dim) tensor of initial latent states.
+            actions: (horizon, *, batch, action_dim) tensor of action trajectories.
+            sample_pi: If True, the actions are sampled from the policy (π) during the rollout, and written to
+                `actions`.
+        Returns:
+            A tuple containing:
+                - (*, batch) tensor of the discounted returns, including the uncertainty regularizer.
+                - (*, batch, latent_dim) tensor of the final latent states.
+                - The discount of the terminal value.
         """
         # Initialize return and running discount factor.
         G, running_discount = 0, 1
         # Iterate over the actions in the trajectory to simulate the trajectory using the latent dynamics
         # model. Keep track of return.
         for t in range(actions.shape[0]):
-            # We will compute the reward in a moment. First compute the uncertainty regularizer from eqn 4
-            # of the FOWM paper.
-            if self.config.uncertainty_regularizer_coeff > 0:
-                regularization = -(
-                    self.config.uncertainty_regularizer_coeff * self.model.Qs(z, actions[t]).std(0)
-                )
-            else:
-                regularization = 0
-            # Estimate the next state (latent) and reward.
-            z, reward = self.model.latent_dynamics_and_reward(z, actions[t])
+            if sample_pi:
+                # Note: Adding a small amount of noise here doesn't hurt during inference and may even be
+                # helpful for CEM.
+                actions[t] = self.model.pi(z, self.config.min_std)
+            # Estimate the next state (latent), the reward, and the state-action values from which the
+            # uncertainty regularizer from eqn 4 of the FOWM paper is computed.
+            z, reward, qs = self.model.latent_dynamics_reward_and_Qs(
+                z, actions[t], return_qs=self.config.uncertainty_regularizer_coeff > 0
+            )
+            regularization = 0 if qs is None else -(self.config.uncertainty_regularizer_coeff * qs.std(0))
             # Update the return and running discount.
             G += running_discount * (reward + regularization)
             running_discount *= self.config.discount
+        return G, z, running_discount
+
+    @torch.no_grad()
+    def terminal_value(self, returns: Tensor, z: Tensor, running_discount: float) -> Tensor:
+        """Adds the terminal value of the final states to the returns of `rollout_return`.
+
+        This is the second part of `estimate_value`, which samples the next action and the Qs used.
+
+        Args:
+            returns: (*, batch) tensor of the returns up to the horizon.
+            z: (*, batch, latent_dim) tensor of the final latent states.
+            running_discount: The discount of the terminal value.
+        Returns:
+            (*, batch) tensor of values.
+        """
+        G = returns.clone()
         # Add the estimated value of the final state (using the minimum for a conservative estimate).
         # Do so by predicting the next action, then taking a minimum over the ensemble of state-action value
         # estimators.
@@ -629,6 +682,25 @@ class TDMPCTOLD(nn.Module):
         x = torch.cat([z, a], dim=-1)
         return self._dynamics(x), self._reward(x).squeeze(-1)
 
+    def latent_dynamics_reward_and_Qs(  # noqa: N802
+        self, z: Tensor, a: Tensor, return_qs: bool = True
+    ) -> tuple[Tensor, Tensor, Tensor | None]:
+        """Predict the next state's latent representation, the reward and the state-action values at once.
+
+        Args:
+            z: (*, latent_dim) tensor for the current state's latent representation.
+            a: (*, action_dim) tensor for the action to be applied.
+            return_qs: Whether to predict the state-action values.
+        Returns:
+            A tuple containing:
+                - (*, latent_dim) tensor for the next state's latent representation.
+                - (*,) tensor for the estimated reward.
+                - (q_ensemble, *) tensor for the value predictions of each learned Q function, or None.
+        """
+        x = torch.cat([z, a], dim=-1)
+        qs = torch.stack([q(x).squeeze(-1) for q in self._Qs], dim=0) if return_qs else None
+        return self._dynamics(x), self._reward(x).squeeze(-1), qs
+
     def latent_dynamics(self, z: Tensor, a: Tensor) -> Tensor:
         """Predict the next state's latent representation given a current latent and action.
 
@@ -123,6 +123,10 @@ class VQBeTPolicy(PreTrainedPolicy):
             OBS_STATE: deque(maxlen=self.config.n_obs_steps),
             ACTION: deque(maxlen=self.config.action_chunk_size),
         }
+        # GPT input tokens of the latest observations, and number of observations received since they were
+        # last encoded. Only the new observations are encoded when predicting the next action chunk.
+        self._obs_tokens: deque[Tensor] = deque(maxlen=self.config.n_obs_steps)
+        self._num_new_observations = self.config.n_obs_steps
 
     @torch.no_grad()
     def predict_action_chunk(self, batch: dict[str, Tensor]) -> Tensor:
@@ -131,6 +135,26 @@ class VQBeTPolicy(PreTrainedPolicy):
         actions = self.unnormalize_outputs({ACTION: actions})[ACTION]
         return actions
 
+    @torch.no_grad()
+    def _predict_action_chunk_incremental(self) -> Tensor:
+        """Same as `predict_action_chunk`, but only encodes the observations received since the last call.
+
+        The tokens of the previous observations are reused: their image features and projections do not depend
+        on the other observations. The GPT still runs over the whole window, as its learned positional
+        embeddings shift with the window.
+        """
+        new_obs = {
+            key: torch.stack(list(self._queues[key])[-self._num_new_observations :], dim=1)
+            for key in [OBS_IMAGES, OBS_STATE]
+        }
+        self._obs_tokens.extend(self.vqbet.encode_observations(new_obs).unbind(1))
+        self._num_new_observations = 0
+
+        obs_tokens = torch.stack(list(self._obs_tokens), dim=1)
+        actions = self.vqbet({}, rollout=True, obs_tokens=obs_tokens)[:, : self.config.action_chunk_size]
+        actions = self.unnormalize_outputs({ACTION: actions})[ACTION]
+        return actions
+
     @torch.no_grad()
     def select_action(self, batch: dict[str, Tensor]) -> Tensor:
         """Select a single action given environment observations.
@@ -148,6 +172,7 @@ class VQBeTPolicy(PreTrainedPolicy):
         batch["observation.images"] = torch.stack([batch[key] for key in self.config.image_features], dim=-4)
 
         self._queues = populate_queues(self._queues, batch)
+        self._num_new_observations = min(self._num_new_observations + 1, self.config.n_obs_steps)
 
         if not self.vqbet.action_head.vqvae_model.discretized.item():
             warnings.warn(
@@ -156,7 +181,7 @@ class VQBeTPolicy(PreTrainedPolicy):
             )
 
         if len(self._queues[ACTION]) == 0:
-            actions = self.predict_action_chunk(batch)
+            actions = self._predict_action_chunk_incremental()
             # since the data in the action queue's dimension is (action_chunk_size, batch_size, action_dim), we transpose the action and fill the queue
             self._queues[ACTION].extend(actions.transpose(0, 1))
 
@@ -349,11 +374,18 @@ class VQBeTModel(nn.Module):
             torch.row_stack([torch.arange(i, i + self.config.action_chunk_size) for i in range(num_tokens)]),
         )
 
-    def forward(self, batch: dict[str, Tensor], rollout: bool) -> tuple[dict, dict]:
-        # Input validation.
+    def encode_observations(self, batch: dict[str, Tensor]) -> Tensor:
+        """Project the observations to the input tokens of the GPT of each observation step.
+
+        Args:
+            batch: "observation.state" (batch, obs_step, state_dim) and "observation.images"
+                (batch, obs_step, number of cameras, C, H, W) tensors.
+        Returns:
+            (batch, obs_step, number of cameras + 2, gpt_input_dim) tensor of the image tokens, the state token
+            and the action query token of each observation step.
+        """
         assert set(batch).issuperset({"observation.state", "observation.images"})
         batch_size, n_obs_steps = batch["observation.state"].shape[:2]
-        assert n_obs_steps == self.config.n_obs_steps
 
         # Extract image feature (first combine batch and sequence dims).
         img_features = self.rgb_encoder(
@@ -374,9 +406,26 @@ class VQBeTModel(nn.Module):
             self.state_projector(batch["observation.state"])
         )  # (batch, obs_step, projection dims)
         input_tokens.append(einops.repeat(self.action_token, "1 1 d -> b n d", b=batch_size, n=n_obs_steps))
-        # Interleave tokens by stacking and rearranging.
-        input_tokens = torch.stack(input_tokens, dim=2)
-        input_tokens = einops.rearrange(input_tokens, "b n t d -> b (n t) d")
+        return torch.stack(input_tokens, dim=2)
+
+    def forward(
+        self, batch: dict[str, Tensor], rollout: bool, obs_tokens: Tensor | None = None
+    ) -> tuple[dict, dict]:
+        """
+        Args:
+            batch: Observations (and actions, for training).
+            rollout: Whether to only predict the action chunk of the current step, instead of the loss.
+            obs_tokens: Optional (batch, n_obs_steps, tokens per step, gpt_input_dim) tensor of the tokens
+                returned by `encode_observations`, for example cached during a rollout. When given, the
+                observations of `batch` are not encoded.
+        """
+        if obs_tokens is None:
+            obs_tokens = self.encode_observations(batch)
+        batch_size, n_obs_steps = obs_tokens.shape[:2]
+        assert n_obs_steps == self.config.n_obs_steps
+
+        # Interleave tokens by rearranging.
+        input_tokens = einops.rearrange(obs_tokens, "b n t d -> b (n t) d")
 
         len_additional_action_token = self.config.n_action_pred_token - 1
         future_action_tokens = self.action_token.repeat(batch_size, len_additional_action_token, 1)
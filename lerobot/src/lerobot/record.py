@@ -66,6 +66,7 @@ from pprint import pformat
 from lerobot.cameras import (  # noqa: F401
     CameraConfig,  # noqa: F401
 )
+from lerobot.cameras.capture_hub import CameraCaptureHub
 from lerobot.cameras.opencv.configuration_opencv import OpenCVCameraConfig  # noqa: F401
 from lerobot.cameras.realsense.configuration_realsense import RealSenseCameraConfig  # noqa: F401
 from lerobot.configs import parser
@@ -104,6 +105,7 @@ from lerobot.utils.control_utils import (
     sanity_check_dataset_name,
     sanity_check_dataset_robot_compatibility,
 )
+from lerobot.utils.control_profiler import ControlLoopProfiler
 from lerobot.utils.robot_utils import busy_wait
 from lerobot.utils.utils import (
     get_safe_torch_device,
@@ -149,6 +151,10 @@ class DatasetRecordConfig:
     # Number of episodes to record before batch encoding videos
     # Set to 1 for immediate encoding (default behavior), or higher for batched encoding
     video_encoding_batch_size: int = 1
+    # Number of frames buffered per camera in shared memory by a `CameraCaptureHub`, which captures all the
+    # cameras in the background and hands the frames to the image writers without copying them. It must cover
+    # how far behind the image writers can lag. Set to 0 to read the cameras directly.
+    capture_hub_num_slots: int = 0
 
     def __post_init__(self):
         if self.single_task is None:
@@ -165,6 +171,11 @@ class RecordConfig:
     policy: PreTrainedConfig | None = None
     # Display all cameras on screen
     display_data: bool = False
+    # Time every stage of the control loop and log a summary of the latencies at the end of each episode
+    profile: bool = False
+    # Directory where a Chrome trace (chrome://tracing, https://ui.perfetto.dev) of each episode is saved when
+    # profiling
+    profile_trace_dir: Path | None = None
     # Use vocal synthesis to read events.
     play_sounds: bool = True
     # Resume recording on an existing dataset.
@@ -198,6 +209,7 @@ def record_loop(
     control_time_s: int | None = None,
     single_task: str | None = None,
     display_data: bool = False,
+    profiler: ControlLoopProfiler | None = None,
 ):
     if dataset is not None and dataset.fps != fps:
         raise ValueError(f"The dataset fps should be equal to requested fps ({dataset.fps} != {fps}).")
@@ -230,32 +242,39 @@ def record_loop(
     if policy is not None:
         policy.reset()
 
+    if profiler is None:
+        profiler = ControlLoopProfiler(fps, enabled=False)
+
     timestamp = 0
     start_episode_t = time.perf_counter()
     while timestamp < control_time_s:
         start_loop_t = time.perf_counter()
+        profiler.start_iteration()
 
         if events["exit_early"]:
             events["exit_early"] = False
             break
 
-        observation = robot.get_observation()
+        with profiler.span("get_observation"):
+            observation = robot.get_observation()
 
         if policy is not None or dataset is not None:
             observation_frame = build_dataset_frame(dataset.features, observation, prefix="observation")
 
         if policy is not None:
-            action_values = predict_action(
-                observation_frame,
-                policy,
-                get_safe_torch_device(policy.config.device),
-                policy.config.use_amp,
-                task=single_task,
-                robot_type=robot.robot_type,
-            )
+            with profiler.span("predict_action"):
+                action_values = predict_action(
+                    observation_frame,
+                    policy,
+                    get_safe_torch_device(policy.config.device),
+                    policy.config.use_amp,
+                    task=single_task,
+                    robot_type=robot.robot_type,
+                )
             action = {key: action_values[i].item() for i, key in enumerate(robot.action_features)}
         elif policy is None and isinstance(teleop, Teleoperator):
-            action = teleop.get_action()
+            with profiler.span("get_action"):
+                action = teleop.get_action()
         elif policy is None and isinstance(teleop, list):
             # TODO(pepijn, steven): clean the record loop for use of multiple robots (possibly with pipeline)
             arm_action = teleop_arm.get_action()
@@ -275,21 +294,27 @@ def record_loop(
 
         # Action can eventually be clipped using `max_relative_target`,
         # so action actually sent is saved in the dataset.
-        sent_action = robot.send_action(action)
+        with profiler.span("send_action"):
+            sent_action = robot.send_action(action)
 
         if dataset is not None:
             action_frame = build_dataset_frame(dataset.features, sent_action, prefix="action")
             frame = {**observation_frame, **action_frame}
-            dataset.add_frame(frame, task=single_task)
+            with profiler.span("add_frame"):
+                dataset.add_frame(frame, task=single_task)
 
         if display_data:
-            log_rerun_data(observation, action)
+            with profiler.span("log_rerun_data"):
+                log_rerun_data(observation, action)
 
+        profiler.end_of_work()
         dt_s = time.perf_counter() - start_loop_t
         busy_wait(1 / fps - dt_s)
 
         timestamp = time.perf_counter() - start_episode_t
 
+    profiler.end_iteration()
+
 
 @parser.wrap()
 def record(cfg: RecordConfig) -> LeRobotDataset:
@@ -340,12 +365,23 @@ def record(cfg: RecordConfig) -> LeRobotDataset:
     if teleop is not None:
         teleop.connect()
 
+    if cfg.dataset.capture_hub_num_slots > 0 and getattr(robot, "cameras", None):
+        capture_hub = CameraCaptureHub(robot.cameras, num_slots=cfg.dataset.capture_hub_num_slots)
+        capture_hub.start()
+        # Disconnecting the robot stops the hub
+        robot.cameras = capture_hub.make_cameras()
+
+    profiler = ControlLoopProfiler(cfg.dataset.fps, enabled=cfg.profile)
+    for name, camera in getattr(robot, "cameras", {}).items():
+        profiler.instrument(camera, "async_read", f"camera_{name}")
+
     listener, events = init_keyboard_listener()
 
     with VideoEncodingManager(dataset):
         recorded_episodes = 0
         while recorded_episodes < cfg.dataset.num_episodes and not events["stop_recording"]:
             log_say(f"Recording episode {dataset.num_episodes}", cfg.play_sounds)
+            profiler.reset()
             record_loop(
                 robot=robot,
                 events=events,
@@ -356,7 +392,15 @@ def record(cfg: RecordConfig) -> LeRobotDataset:
                 control_time_s=cfg.dataset.episode_time_s,
                 single_task=cfg.dataset.single_task,
                 display_data=cfg.display_data,
+                profiler=profiler,
             )
+            if cfg.profile:
+                logging.info(
+                    f"Control loop profile of episode {dataset.num_episodes}:\n{profiler.format_summary()}"
+                )
+                if cfg.profile_trace_dir is not None:
+                    trace_path = Path(cfg.profile_trace_dir) / f"episode_{dataset.num_episodes:06d}.json"
+                    profiler.export_chrome_trace(trace_path)
 
             # Execute a few seconds without recording to give time to manually reset the environment
             # Skip reset for the last episode to be recorded
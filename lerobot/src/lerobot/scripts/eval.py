@@ -156,7 +156,6 @@ def rollout(
         }
 
         # Infer "task" from attributes of environments.
-        # TODO: works with SyncVectorEnv but not AsyncVectorEnv
         observation = add_envs_task(env, observation)
 
         with torch.inference_mode():
@@ -412,6 +411,142 @@ def eval_policy(
     return info
 
 
+def eval_policy_autoreset(
+    env: gym.vector.VectorEnv,
+    policy: PreTrainedPolicy,
+    n_episodes: int,
+    start_seed: int | None = None,
+) -> dict:
+    """Evaluate a policy with the environments reset as soon as their episode ends.
+
+    Contrary to `eval_policy`, which runs batches of episodes until the slowest environment of each batch is
+    done, every environment starts its next episode right away (gymnasium vector environments reset finished
+    sub-environments during `step`), so no environment ever idles. The observations of all the environments
+    are batched into a single policy call per step, and the stepping of the environments (in their worker
+    processes with an AsyncVectorEnv) overlaps with the bookkeeping of the previous step.
+
+    The first `n_episodes` episodes to *start* are the ones reported, so that the metrics are not biased
+    towards short episodes. Only the first episode of each environment is seeded (with `start_seed + env_ix`),
+    the following ones are seeded by the random generator of their environment.
+
+    Policies keep a batched state (e.g. action or observation queues). When an environment starts a new episode,
+    only its row is reset if the policy has a `reset_envs(env_mask)` method; otherwise the whole policy is
+    reset and the other environments re-plan from their current observation.
+
+    Args:
+        env: The batch of environments.
+        policy: The policy.
+        n_episodes: The number of episodes to evaluate.
+        start_seed: The first seed to use. If not provided, the environments are not manually seeded.
+    Returns:
+        Dictionary with metrics regarding the rollouts, in the same format as `eval_policy`.
+    """
+    if not isinstance(policy, PreTrainedPolicy):
+        raise ValueError(
+            f"Policy of type 'PreTrainedPolicy' is expected, but type '{type(policy)}' was provided."
+        )
+
+    start = time.time()
+    policy.eval()
+    policy.reset()
+    device = get_device_from_parameters(policy)
+    check_env_attributes_and_types(env)
+
+    num_envs = env.num_envs
+    seeds = None if start_seed is None else [start_seed + env_ix for env_ix in range(num_envs)]
+    observation, _ = env.reset(seed=seeds)
+
+    # Index of the episode run by each environment, -1 once enough episodes have been started.
+    env_episodes = np.where(np.arange(num_envs) < n_episodes, np.arange(num_envs), -1)
+    n_started = min(num_envs, n_episodes)
+    sum_rewards = np.zeros(n_episodes)
+    max_rewards = np.full(n_episodes, -np.inf)
+    successes = np.zeros(n_episodes, dtype=bool)
+    episode_seeds = [None] * n_episodes
+    if seeds is not None:
+        for env_ix in range(n_started):
+            episode_seeds[env_ix] = seeds[env_ix]
+    n_done = 0
+
+    def record_step(reward, done, final_info, episodes):
+        live = episodes >= 0
+        np.add.at(sum_rewards, episodes[live], reward[live])
+        np.maximum.at(max_rewards, episodes[live], reward[live])
+        # VectorEnv stores is_success in `info["final_info"][env_index]["is_success"]`.
+        for env_ix in np.flatnonzero(done & live):
+            successes[episodes[env_ix]] = bool((final_info[env_ix] or {}).get("is_success", False))
+        n_finished = int(np.sum(done & live))
+        if n_finished:
+            progbar.update(n_finished)
+            progbar.set_postfix({"running_success_rate": f"{successes.sum() / progbar.n * 100:.1f}%"})
+
+    progbar = trange(n_episodes, desc="Evaluating episodes", disable=inside_slurm())
+    previous_step = None
+    while n_done < n_episodes:
+        observation = preprocess_observation(observation)
+        observation = {
+            key: observation[key].to(device, non_blocking=device.type == "cuda") for key in observation
+        }
+        observation = add_envs_task(env, observation)
+        with torch.inference_mode():
+            action = policy.select_action(observation)
+        action = action.to("cpu").numpy()
+        assert action.ndim == 2, "Action dimensions should be (batch, action_dim)"
+
+        # The environments step in their worker processes (AsyncVectorEnv) while the previous step is
+        # recorded.
+        env.step_async(action)
+        if previous_step is not None:
+            record_step(*previous_step)
+        observation, reward, terminated, truncated, info = env.step_wait()
+
+        done = terminated | truncated
+        previous_step = (reward, done, info.get("final_info", [None] * num_envs), env_episodes.copy())
+        if not done.any():
+            continue
+        n_done += int(np.sum(done & (env_episodes >= 0)))
+
+        # The finished environments were reset by the vector env: assign them their next episode.
+        for env_ix in np.flatnonzero(done):
+            if n_started < n_episodes:
+                env_episodes[env_ix] = n_started
+                n_started += 1
+            else:
+                env_episodes[env_ix] = -1
+
+        if hasattr(policy, "reset_envs"):
+            policy.reset_envs(torch.from_numpy(done))
+        elif (done & (env_episodes >= 0)).any():
+            policy.reset()
+
+    record_step(*previous_step)
+    progbar.close()
+    if hasattr(policy, "use_original_modules"):
+        policy.use_original_modules()
+
+    eval_s = time.time() - start
+    return {
+        "per_episode": [
+            {
+                "episode_ix": i,
+                "sum_reward": float(sum_rewards[i]),
+                "max_reward": float(max_rewards[i]),
+                "success": bool(successes[i]),
+                "seed": episode_seeds[i],
+            }
+            for i in range(n_episodes)
+        ],
+        "aggregated": {
+            "avg_sum_reward": float(np.nanmean(sum_rewards)),
+            "avg_max_reward": float(np.nanmean(max_rewards)),
+            "pc_success": float(np.nanmean(successes) * 100),
+            "eval_s": eval_s,
+            "eval_ep_s": eval_s / n_episodes,
+            "eval_episodes_per_s": n_episodes / eval_s,
+        },
+    }
+
+
 def _compile_episode_data(
     rollout_data: dict, done_indices: Tensor, start_episode_index: int, start_data_index: int, fps: float
 ) -> dict:
@@ -482,14 +617,17 @@ def eval_main(cfg: EvalPipelineConfig):
     policy.eval()
 
     with torch.no_grad(), torch.autocast(device_type=device.type) if cfg.policy.use_amp else nullcontext():
-        info = eval_policy(
-            env,
-            policy,
-            cfg.eval.n_episodes,
-            max_episodes_rendered=10,
-            videos_dir=Path(cfg.output_dir) / "videos",
-            start_seed=cfg.seed,
-        )
+        if cfg.eval.autoreset:
+            info = eval_policy_autoreset(env, policy, cfg.eval.n_episodes, start_seed=cfg.seed)
+        else:
+            info = eval_policy(
+                env,
+                policy,
+                cfg.eval.n_episodes,
+                max_episodes_rendered=10,
+                videos_dir=Path(cfg.output_dir) / "videos",
+                start_seed=cfg.seed,
+            )
     print(info["aggregated"])
 
     # Save info
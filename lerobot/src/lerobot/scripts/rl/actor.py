@@ -48,6 +48,7 @@ https://github.com/michel-aractingi/lerobot-hilserl-guide
 
 import logging
 import os
+import socket
 import time
 from functools import lru_cache
 from queue import Empty
@@ -67,15 +68,20 @@ from lerobot.scripts.rl.gym_manipulator import make_robot_env
 from lerobot.teleoperators import gamepad, so101_leader  # noqa: F401
 from lerobot.transport import services_pb2, services_pb2_grpc
 from lerobot.transport.utils import (
+    TransitionsEncoder,
+    actor_id_metadata,
+    apply_parameters_delta,
+    bytes_to_parameters_delta,
     bytes_to_state_dict,
     grpc_channel_options,
+    is_parameters_delta,
     python_object_to_bytes,
     receive_bytes_in_chunks,
     send_bytes_in_chunks,
     transitions_to_bytes,
 )
 from lerobot.utils.process import ProcessSignalHandler
-from lerobot.utils.queue import get_last_item_from_queue
+from lerobot.utils.queue import get_all_items_from_queue
 from lerobot.utils.random_utils import set_seed
 from lerobot.utils.robot_utils import busy_wait
 from lerobot.utils.transition import (
@@ -119,6 +125,11 @@ def actor_cli(cfg: TrainRLServerPipelineConfig):
     is_threaded = use_threads(cfg)
     shutdown_event = ProcessSignalHandler(is_threaded, display_pid=display_pid).shutdown_event
 
+    # Set before starting the other processes so that all the streams of this actor share the same id
+    if cfg.policy.actor_learner_config.actor_id is None:
+        cfg.policy.actor_learner_config.actor_id = f"{socket.gethostname()}-{os.getpid()}"
+    logging.info(f"[ACTOR] Actor id: {cfg.policy.actor_learner_config.actor_id}")
+
     learner_client, grpc_channel = learner_service_client(
         host=cfg.policy.actor_learner_config.learner_host,
         port=cfg.policy.actor_learner_config.learner_port,
@@ -267,6 +278,11 @@ def act_with_policy(
     episode_total_steps = 0
 
     policy_timer = TimerManager("Policy inference", log=False)
+    # Version of every parameter received from the learner, for the parameters deltas
+    parameters_versions = {}
+    transitions_encoder = TransitionsEncoder(
+        image_codec=cfg.policy.actor_learner_config.transitions_image_codec
+    )
 
     for interaction_step in range(cfg.policy.online_steps):
         start_time = time.perf_counter()
@@ -317,12 +333,18 @@ def act_with_policy(
         if done or truncated:
             logging.info(f"[ACTOR] Global step {interaction_step}: Episode reward: {sum_reward_episode}")
 
-            update_policy_parameters(policy=policy, parameters_queue=parameters_queue, device=device)
+            parameters_update_time = update_policy_parameters(
+                policy=policy,
+                parameters_queue=parameters_queue,
+                device=device,
+                applied_versions=parameters_versions,
+            )
 
             if len(list_transition_to_send_to_learner) > 0:
                 push_transitions_to_transport_queue(
                     transitions=list_transition_to_send_to_learner,
                     transitions_queue=transitions_queue,
+                    encoder=transitions_encoder,
                 )
                 list_transition_to_send_to_learner = []
 
@@ -342,6 +364,12 @@ def act_with_policy(
                         "Interaction step": interaction_step,
                         "Episode intervention": int(episode_intervention),
                         "Intervention rate": intervention_rate,
+                        "Parameters update time [ms]": parameters_update_time * 1000,
+                        "Parameters version": max(
+                            (max(versions.values(), default=0) for versions in parameters_versions.values()),
+                            default=0,
+                        ),
+                        "Actor id": cfg.policy.actor_learner_config.actor_id,
                         **stats,
                     }
                 )
@@ -451,7 +479,9 @@ def receive_policy(
         )
 
     try:
-        iterator = learner_client.StreamParameters(services_pb2.Empty())
+        iterator = learner_client.StreamParameters(
+            services_pb2.Empty(), metadata=actor_id_metadata(cfg.policy.actor_learner_config.actor_id)
+        )
         receive_bytes_in_chunks(
             iterator,
             parameters_queue,
@@ -505,7 +535,8 @@ def send_transitions(
         learner_client.SendTransitions(
             transitions_stream(
                 shutdown_event, transitions_queue, cfg.policy.actor_learner_config.queue_get_timeout
-            )
+            ),
+            metadata=actor_id_metadata(cfg.policy.actor_learner_config.actor_id),
         )
     except grpc.RpcError as e:
         logging.error(f"[ACTOR] gRPC error: {e}")
@@ -558,7 +589,8 @@ def send_interactions(
         learner_client.SendInteractions(
             interactions_stream(
                 shutdown_event, interactions_queue, cfg.policy.actor_learner_config.queue_get_timeout
-            )
+            ),
+            metadata=actor_id_metadata(cfg.policy.actor_learner_config.actor_id),
         )
     except grpc.RpcError as e:
         logging.error(f"[ACTOR] gRPC error: {e}")
@@ -611,20 +643,43 @@ def interactions_stream(
 #################################################
 
 
-def update_policy_parameters(policy: SACPolicy, parameters_queue: Queue, device):
-    bytes_state_dict = get_last_item_from_queue(parameters_queue, block=False)
-    if bytes_state_dict is not None:
+def update_policy_parameters(
+    policy: SACPolicy,
+    parameters_queue: Queue,
+    device,
+    applied_versions: dict[str, dict[str, int]] | None = None,
+) -> float:
+    """Update the policy with the parameters received from the learner, if any.
+
+    Only the most recent full state dict is loaded. Parameters deltas only hold the tensors that changed, so
+    all the ones received after it are copied in place, in order.
+
+    Args:
+        policy: The policy to update.
+        parameters_queue: Queue to receive updated network parameters from the learner.
+        device: The device of the policy.
+        applied_versions: Version of every tensor received as a delta so far, updated in place.
+
+    Returns:
+        float: The time spent updating the parameters, in seconds.
+    """
+    start_time = time.perf_counter()
+    buffers = get_all_items_from_queue(parameters_queue, block=False)
+
+    full_state_indices = [i for i, buffer in enumerate(buffers) if not is_parameters_delta(buffer)]
+    if full_state_indices:
         logging.info("[ACTOR] Load new parameters from Learner.")
-        state_dicts = bytes_to_state_dict(bytes_state_dict)
+        state_dicts = bytes_to_state_dict(buffers[full_state_indices[-1]])
+        buffers = buffers[full_state_indices[-1] + 1 :]
 
         # TODO: check encoder parameter synchronization possible issues:
         # 1. When shared_encoder=True, we're loading stale encoder params from actor's state_dict
         #    instead of the updated encoder params from critic (which is optimized separately)
         # 2. When freeze_vision_encoder=True, we waste bandwidth sending/loading frozen params
+        #    (avoided with `policy_parameters_delta_sync`, frozen params are only sent once)
         # 3. Need to handle encoder params correctly for both actor and discrete_critic
         # Potential fixes:
         # - Send critic's encoder state when shared_encoder=True
-        # - Skip encoder params entirely when freeze_vision_encoder=True
         # - Ensure discrete_critic gets correct encoder state (currently uses encoder_critic)
 
         # Load actor state dict
@@ -639,19 +694,42 @@ def update_policy_parameters(policy: SACPolicy, parameters_queue: Queue, device)
             policy.discrete_critic.load_state_dict(discrete_critic_state_dict)
             logging.info("[ACTOR] Loaded discrete critic parameters from Learner.")
 
+    if buffers:
+        applied_versions = applied_versions if applied_versions is not None else {}
+        modules = {"policy": policy.actor}
+        if hasattr(policy, "discrete_critic") and policy.discrete_critic is not None:
+            modules["discrete_critic"] = policy.discrete_critic
+
+        num_applied = 0
+        for buffer in buffers:
+            num_applied += apply_parameters_delta(
+                modules, bytes_to_parameters_delta(buffer), applied_versions
+            )
+
+        num_bytes = sum(len(buffer) for buffer in buffers)
+        logging.info(
+            f"[ACTOR] Applied {num_applied} tensors ({num_bytes / 1024 / 1024:.2f} MB) from Learner in "
+            f"{(time.perf_counter() - start_time) * 1000:.1f} ms."
+        )
+
+    return time.perf_counter() - start_time
+
 
 #################################################
 #  Utilities functions #
 #################################################
 
 
-def push_transitions_to_transport_queue(transitions: list, transitions_queue):
+def push_transitions_to_transport_queue(
+    transitions: list, transitions_queue, encoder: TransitionsEncoder | None = None
+):
     """Send transitions to learner in smaller chunks to avoid network issues.
 
     Args:
         transitions: List of transitions to send
-        message_queue: Queue to send messages to learner
-        chunk_size: Size of each chunk to send
+        transitions_queue: Queue to send messages to learner
+        encoder: Optional encoder to serialize the transitions with the schema-based binary format, they
+            are serialized with `transitions_to_bytes` otherwise
     """
     transition_to_send_to_learner = []
     for transition in transitions:
@@ -662,7 +740,10 @@ def push_transitions_to_transport_queue(transitions: list, transitions_queue):
 
         transition_to_send_to_learner.append(tr)
 
-    transitions_queue.put(transitions_to_bytes(transition_to_send_to_learner))
+    if encoder is not None:
+        transitions_queue.put(encoder.encode(transition_to_send_to_learner))
+    else:
+        transitions_queue.put(transitions_to_bytes(transition_to_send_to_learner))
 
 
 def get_frequency_stats(timer: TimerManager) -> dict[str, float]:
@@ -78,8 +78,13 @@ from lerobot.teleoperators import gamepad, so101_leader  # noqa: F401
 from lerobot.transport import services_pb2_grpc
 from lerobot.transport.utils import (
     MAX_MESSAGE_SIZE,
+    ParametersDeltaEncoder,
+    TransitionsDecoder,
+    UnknownTransitionsSchemaError,
     bytes_to_python_object,
     bytes_to_transitions,
+    is_framed_transitions,
+    parameters_delta_to_bytes,
     state_to_bytes,
 )
 from lerobot.utils.buffer import ReplayBuffer, concatenate_batch_transitions
@@ -195,7 +200,11 @@ def start_learner_threads(
         shutdown_event: Event to signal shutdown
     """
     # Create multiprocessing queues
-    transition_queue = Queue()
+    # The transitions queue is bounded so that the actors are slowed down when the learner falls behind
+    actor_learner_config = cfg.policy.actor_learner_config
+    transition_queue = Queue(
+        maxsize=actor_learner_config.max_actors * actor_learner_config.actor_transitions_queue_size
+    )
     interaction_message_queue = Queue()
     parameters_queue = Queue()
 
@@ -321,9 +330,19 @@ def add_actor_information_and_train(
 
     policy.train()
 
-    push_actor_policy_to_queue(parameters_queue=parameters_queue, policy=policy)
+    parameters_delta_encoder = None
+    if cfg.policy.actor_learner_config.policy_parameters_delta_sync:
+        parameters_dtype = cfg.policy.actor_learner_config.policy_parameters_dtype
+        parameters_delta_encoder = ParametersDeltaEncoder(
+            dtype=getattr(torch, parameters_dtype) if parameters_dtype is not None else None
+        )
+
+    push_actor_policy_to_queue(
+        parameters_queue=parameters_queue, policy=policy, delta_encoder=parameters_delta_encoder
+    )
 
     last_time_policy_pushed = time.time()
+    parameters_push_bytes = 0
 
     optimizers, lr_scheduler = make_optimizers_and_scheduler(cfg=cfg, policy=policy)
 
@@ -357,6 +376,10 @@ def add_actor_information_and_train(
     online_iterator = None
     offline_iterator = None
 
+    transitions_decoder = TransitionsDecoder()
+    # Last interaction step of every actor
+    actors_interaction_steps = {}
+
     # NOTE: THIS IS THE MAIN LOOP OF THE LEARNER
     while True:
         # Exit the training loop if shutdown is requested
@@ -372,6 +395,7 @@ def add_actor_information_and_train(
             device=device,
             dataset_repo_id=dataset_repo_id,
             shutdown_event=shutdown_event,
+            transitions_decoder=transitions_decoder,
         )
 
         # Process all available interaction messages sent by the actor server
@@ -380,6 +404,10 @@ def add_actor_information_and_train(
             interaction_step_shift=interaction_step_shift,
             wandb_logger=wandb_logger,
             shutdown_event=shutdown_event,
+            actors_interaction_steps=actors_interaction_steps,
+            parameters_version=(
+                parameters_delta_encoder.version if parameters_delta_encoder is not None else None
+            ),
         )
 
         # Wait until the replay buffer has enough samples to start training
@@ -556,7 +584,9 @@ def add_actor_information_and_train(
 
         # Push policy to actors if needed
         if time.time() - last_time_policy_pushed > policy_parameters_push_frequency:
-            push_actor_policy_to_queue(parameters_queue=parameters_queue, policy=policy)
+            parameters_push_bytes += push_actor_policy_to_queue(
+                parameters_queue=parameters_queue, policy=policy, delta_encoder=parameters_delta_encoder
+            )
             last_time_policy_pushed = time.time()
 
         # Update target networks (main and discrete)
@@ -568,6 +598,9 @@ def add_actor_information_and_train(
             if offline_replay_buffer is not None:
                 training_infos["offline_replay_buffer_size"] = len(offline_replay_buffer)
             training_infos["Optimization step"] = optimization_step
+            # Bytes of parameters pushed to the actor since the last log
+            training_infos["parameters_push_bytes"] = parameters_push_bytes
+            parameters_push_bytes = 0
 
             # Log training metrics
             if wandb_logger:
@@ -652,10 +685,13 @@ def start_learner(
         transition_queue=transition_queue,
         interaction_message_queue=interaction_message_queue,
         queue_get_timeout=cfg.policy.actor_learner_config.queue_get_timeout,
+        actor_transitions_queue_size=cfg.policy.actor_learner_config.actor_transitions_queue_size,
     )
 
     server = grpc.server(
-        ThreadPoolExecutor(max_workers=learner_service.MAX_WORKERS),
+        ThreadPoolExecutor(
+            max_workers=learner_service.MAX_WORKERS * cfg.policy.actor_learner_config.max_actors
+        ),
         options=[
             ("grpc.max_receive_message_length", MAX_MESSAGE_SIZE),
             ("grpc.max_send_message_length", MAX_MESSAGE_SIZE),
@@ -741,17 +777,21 @@ def save_training_checkpoint(
     # Update the "last" symlink
     update_last_checkpoint(checkpoint_dir)
 
-    # TODO : temporary save replay buffer here, remove later when on the robot
-    # We want to control this with the keyboard inputs
-    dataset_dir = os.path.join(cfg.output_dir, "dataset")
-    if os.path.exists(dataset_dir) and os.path.isdir(dataset_dir):
-        shutil.rmtree(dataset_dir)
-
-    # Save dataset
-    # NOTE: Handle the case where the dataset repo id is not specified in the config
-    # eg. RL training without demonstrations data
-    repo_id_buffer_save = cfg.env.task if dataset_repo_id is None else dataset_repo_id
-    replay_buffer.to_lerobot_dataset(repo_id=repo_id_buffer_save, fps=fps, root=dataset_dir)
+    if replay_buffer.storage_dir is not None:
+        # A disk-backed buffer only needs to be flushed, it is reopened from its memmap files on resume
+        replay_buffer.snapshot()
+    else:
+        # TODO : temporary save replay buffer here, remove later when on the robot
+        # We want to control this with the keyboard inputs
+        dataset_dir = os.path.join(cfg.output_dir, "dataset")
+        if os.path.exists(dataset_dir) and os.path.isdir(dataset_dir):
+            shutil.rmtree(dataset_dir)
+
+        # Save dataset
+        # NOTE: Handle the case where the dataset repo id is not specified in the config
+        # eg. RL training without demonstrations data
+        repo_id_buffer_save = cfg.env.task if dataset_repo_id is None else dataset_repo_id
+        replay_buffer.to_lerobot_dataset(repo_id=repo_id_buffer_save, fps=fps, root=dataset_dir)
 
     if offline_replay_buffer is not None:
         dataset_offline_dir = os.path.join(cfg.output_dir, "dataset_offline")
@@ -954,6 +994,22 @@ def initialize_replay_buffer(
     Returns:
         ReplayBuffer: Initialized replay buffer
     """
+    if cfg.policy.online_buffer_on_disk:
+        storage_dir = os.path.join(cfg.output_dir, "replay_buffer")
+        if not cfg.resume and os.path.isdir(storage_dir):
+            shutil.rmtree(storage_dir)
+        if cfg.resume:
+            logging.info("Resume training reopen the disk-backed online replay buffer")
+        # NOTE: An existing buffer in `storage_dir` is reopened by the ReplayBuffer itself
+        return ReplayBuffer(
+            capacity=cfg.policy.online_buffer_capacity,
+            device=device,
+            state_keys=cfg.policy.input_features.keys(),
+            storage_device="cpu",
+            optimize_memory=True,
+            storage_dir=storage_dir,
+        )
+
     if not cfg.resume:
         return ReplayBuffer(
             capacity=cfg.policy.online_buffer_capacity,
@@ -1106,28 +1162,80 @@ def check_nan_in_transition(
     return nan_detected
 
 
-def push_actor_policy_to_queue(parameters_queue: Queue, policy: nn.Module):
+def push_actor_policy_to_queue(
+    parameters_queue: Queue,
+    policy: nn.Module,
+    delta_encoder: ParametersDeltaEncoder | None = None,
+) -> int:
+    """Push the actor (and discrete critic) parameters to the queue streamed to the actor.
+
+    Args:
+        parameters_queue: Queue for sending policy parameters to the actor.
+        policy: The policy whose parameters are pushed.
+        delta_encoder: If provided, only the parameters that changed since the last push are sent.
+
+    Returns:
+        int: The number of bytes pushed.
+    """
     logging.debug("[LEARNER] Pushing actor policy to the queue")
 
-    # Create a dictionary to hold all the state dicts
-    state_dicts = {"policy": move_state_dict_to_device(policy.actor.state_dict(), device="cpu")}
+    modules = {"policy": policy.actor}
 
     # Add discrete critic if it exists
     if hasattr(policy, "discrete_critic") and policy.discrete_critic is not None:
-        state_dicts["discrete_critic"] = move_state_dict_to_device(
-            policy.discrete_critic.state_dict(), device="cpu"
-        )
+        modules["discrete_critic"] = policy.discrete_critic
         logging.debug("[LEARNER] Including discrete critic in state dict push")
 
-    state_bytes = state_to_bytes(state_dicts)
+    if delta_encoder is not None:
+        frozen_keys = {
+            name: {key for key, param in module.named_parameters() if not param.requires_grad}
+            for name, module in modules.items()
+        }
+        delta = delta_encoder.encode(
+            {name: module.state_dict() for name, module in modules.items()}, frozen_keys=frozen_keys
+        )
+        state_bytes = parameters_delta_to_bytes(delta)
+        num_tensors = sum(len(state_dict) for state_dict in delta["state_dicts"].values())
+        logging.debug(f"[LEARNER] Parameters delta version {delta['version']} with {num_tensors} tensors")
+    else:
+        # Create a dictionary to hold all the state dicts
+        state_dicts = {
+            name: move_state_dict_to_device(module.state_dict(), device="cpu")
+            for name, module in modules.items()
+        }
+        state_bytes = state_to_bytes(state_dicts)
+
     parameters_queue.put(state_bytes)
+    return len(state_bytes)
 
 
 def process_interaction_message(
-    message, interaction_step_shift: int, wandb_logger: WandBLogger | None = None
+    message,
+    interaction_step_shift: int,
+    wandb_logger: WandBLogger | None = None,
+    actors_interaction_steps: dict[str, int] | None = None,
+    parameters_version: int | None = None,
 ):
-    """Process a single interaction message with consistent handling."""
+    """Process a single interaction message with consistent handling.
+
+    When several actors are connected, the interaction step is the total number of steps of all the actors
+    (tracked in `actors_interaction_steps`) and their policy frequency and parameters lag are logged under their
+    actor id.
+    """
     message = bytes_to_python_object(message)
+    actor_id = message.pop("Actor id", None)
+    actor_parameters_version = message.pop("Parameters version", None)
+
+    if actor_id is not None and actors_interaction_steps is not None:
+        actors_interaction_steps[actor_id] = message["Interaction step"]
+        message["Interaction step"] = sum(actors_interaction_steps.values())
+
+        for key in ("Policy frequency [Hz]", "Policy frequency 90th-p [Hz]"):
+            if key in message:
+                message[f"{actor_id}/{key}"] = message[key]
+        if parameters_version is not None and actor_parameters_version is not None:
+            message[f"{actor_id}/Parameters lag [versions]"] = parameters_version - actor_parameters_version
+
     # Shift interaction step for consistency with checkpointed state
     message["Interaction step"] += interaction_step_shift
 
@@ -1145,6 +1253,7 @@ def process_transitions(
     device: str,
     dataset_repo_id: str | None,
     shutdown_event: any,
+    transitions_decoder: TransitionsDecoder | None = None,
 ):
     """Process all available transitions from the queue.
 
@@ -1155,9 +1264,30 @@ def process_transitions(
         device: Device to move transitions to
         dataset_repo_id: Repository ID for dataset
         shutdown_event: Event to signal shutdown
+        transitions_decoder: Decoder for the transitions sent with a `TransitionsEncoder`, it must be kept
+            across calls since the schemas are only sent once
     """
+    if transitions_decoder is None:
+        transitions_decoder = TransitionsDecoder()
+
     while not transition_queue.empty() and not shutdown_event.is_set():
         transition_list = transition_queue.get()
+
+        if is_framed_transitions(transition_list):
+            try:
+                batch = transitions_decoder.decode(transition_list)
+            except UnknownTransitionsSchemaError as e:
+                logging.warning(f"[LEARNER] {e}, skipping the transitions until the schema is resent")
+                continue
+            if batch is not None:
+                process_transitions_batch(
+                    batch=batch,
+                    replay_buffer=replay_buffer,
+                    offline_replay_buffer=offline_replay_buffer,
+                    dataset_repo_id=dataset_repo_id,
+                )
+            continue
+
         transition_list = bytes_to_transitions(buffer=transition_list)
 
         for transition in transition_list:
@@ -1181,11 +1311,70 @@ def process_transitions(
                 offline_replay_buffer.add(**transition)
 
 
+def select_transitions_batch(batch: dict, mask: torch.Tensor) -> dict:
+    """Select the transitions of a decoded batch where `mask` is True."""
+    selected = {
+        key: value[mask]
+        for key, value in batch.items()
+        if key not in ("state", "next_state", "complementary_info")
+    }
+    selected["state"] = {key: value[mask] for key, value in batch["state"].items()}
+    selected["next_state"] = {key: value[mask] for key, value in batch["next_state"].items()}
+    selected["complementary_info"] = (
+        {key: value[mask] for key, value in batch["complementary_info"].items()}
+        if batch["complementary_info"] is not None
+        else None
+    )
+    return selected
+
+
+def process_transitions_batch(
+    batch: dict,
+    replay_buffer: ReplayBuffer,
+    offline_replay_buffer: ReplayBuffer,
+    dataset_repo_id: str | None,
+):
+    """Add a batch of transitions decoded by a `TransitionsDecoder` to the replay buffers.
+
+    Args:
+        batch: Decoded transitions, every value has a leading batch dimension
+        replay_buffer: Replay buffer to add transitions to
+        offline_replay_buffer: Offline replay buffer to add transitions to
+        dataset_repo_id: Repository ID for dataset
+    """
+    num_transitions = len(batch["action"])
+
+    # Skip transitions with NaN values, checked for the whole batch at once
+    nan_mask = batch["action"].reshape(num_transitions, -1).isnan().any(dim=1)
+    for key in batch["state"]:
+        nan_mask |= batch["state"][key].reshape(num_transitions, -1).isnan().any(dim=1)
+        nan_mask |= batch["next_state"][key].reshape(num_transitions, -1).isnan().any(dim=1)
+    if nan_mask.any():
+        logging.warning(f"[LEARNER] NaN detected in {int(nan_mask.sum())} transitions, skipping")
+        batch = select_transitions_batch(batch, ~nan_mask)
+
+    replay_buffer.add_batch(**batch)
+
+    # Add to offline buffer if it's an intervention
+    complementary_info = batch["complementary_info"]
+    if (
+        dataset_repo_id is not None
+        and complementary_info is not None
+        and "is_intervention" in complementary_info
+    ):
+        is_intervention = complementary_info["is_intervention"].reshape(len(batch["action"]), -1).bool()
+        is_intervention = is_intervention.any(dim=1)
+        if is_intervention.any():
+            offline_replay_buffer.add_batch(**select_transitions_batch(batch, is_intervention))
+
+
 def process_interaction_messages(
     interaction_message_queue: Queue,
     interaction_step_shift: int,
     wandb_logger: WandBLogger | None,
     shutdown_event: any,
+    actors_interaction_steps: dict[str, int] | None = None,
+    parameters_version: int | None = None,
 ) -> dict | None:
     """Process all available interaction messages from the queue.
 
@@ -1194,6 +1383,8 @@ def process_interaction_messages(
         interaction_step_shift: Amount to shift interaction step by
         wandb_logger: Logger for tracking progress
         shutdown_event: Event to signal shutdown
+        actors_interaction_steps: Last interaction step of every actor, updated in place
+        parameters_version: Version of the last parameters pushed to the actors, if sent as deltas
 
     Returns:
         dict | None: The last interaction message processed, or None if none were processed
@@ -1205,6 +1396,8 @@ def process_interaction_messages(
             message=message,
             interaction_step_shift=interaction_step_shift,
             wandb_logger=wandb_logger,
+            actors_interaction_steps=actors_interaction_steps,
+            parameters_version=parameters_version,
         )
 
     return last_message
@@ -16,15 +16,49 @@
 # limitations under the License.
 
 import logging
+import queue
+import threading
 import time
 from multiprocessing import Event, Queue
 
 from lerobot.transport import services_pb2, services_pb2_grpc
-from lerobot.transport.utils import receive_bytes_in_chunks, send_bytes_in_chunks
-from lerobot.utils.queue import get_last_item_from_queue
+from lerobot.transport.utils import (
+    bytes_to_parameters_delta,
+    get_actor_id,
+    is_parameters_delta,
+    merge_parameters_deltas,
+    parameters_delta_to_bytes,
+    receive_bytes_in_chunks,
+    select_parameters_delta,
+    send_bytes_in_chunks,
+)
+from lerobot.utils.queue import get_all_items_from_queue
 
-MAX_WORKERS = 3  # Stream parameters, send transitions and interactions
+MAX_WORKERS = 3  # Per actor: stream parameters, send transitions and interactions
 SHUTDOWN_TIMEOUT = 10
+ACTORS_STATS_LOG_INTERVAL = 60  # seconds
+
+
+class ActorTransitionsQueue(queue.Queue):
+    """Bounded queue of the transitions received from one actor.
+
+    `put` blocks while the queue is full, which stops reading from the actor's stream and lets gRPC flow
+    control push back on the actor, but gives up when the shutdown event is set.
+    """
+
+    def __init__(self, maxsize: int, shutdown_event: Event, available_event: threading.Event):  # type: ignore
+        super().__init__(maxsize=maxsize)
+        self.shutdown_event = shutdown_event
+        self.available_event = available_event
+
+    def put(self, item, block=True, timeout=None):
+        while not self.shutdown_event.is_set():
+            try:
+                super().put(item, timeout=0.1)
+            except queue.Full:
+                continue
+            self.available_event.set()
+            return
 
 
 class LearnerService(services_pb2_grpc.LearnerServiceServicer):
@@ -32,6 +66,11 @@ class LearnerService(services_pb2_grpc.LearnerServiceServicer):
     Implementation of the LearnerService gRPC service
     This service is used to send parameters to the Actor and receive transitions and interactions from the Actor
     check transport.proto for the gRPC service definition
+
+    Several actors can be connected at the same time, they are told apart by the actor id they send in the
+    metadata of their calls (see `get_actor_id`). The transitions of every actor are buffered in their own
+    bounded queue and forwarded to the learner in a round-robin, so that a fast actor can't starve the others,
+    and the parameters are serialized once and sent to every actor.
     """
 
     def __init__(
@@ -42,6 +81,7 @@ class LearnerService(services_pb2_grpc.LearnerServiceServicer):
         transition_queue: Queue,
         interaction_message_queue: Queue,
         queue_get_timeout: float = 0.001,
+        actor_transitions_queue_size: int = 4,
     ):
         self.shutdown_event = shutdown_event
         self.parameters_queue = parameters_queue
@@ -49,12 +89,81 @@ class LearnerService(services_pb2_grpc.LearnerServiceServicer):
         self.transition_queue = transition_queue
         self.interaction_message_queue = interaction_message_queue
         self.queue_get_timeout = queue_get_timeout
+        self.actor_transitions_queue_size = actor_transitions_queue_size
+
+        # All the parameters deltas received so far, merged. It lets every stream catch up from the version it
+        # last sent, even if some deltas were consumed in between (or before the stream was opened).
+        self._parameters_state = None
+        # Last full state dict buffer received, with a counter so that every stream sends it once
+        self._full_parameters = None
+        self._full_parameters_id = 0
+        # Serialized deltas of the current parameters state, by the version they start from
+        self._serialized_deltas: dict[int, bytes] = {}
+        self._parameters_lock = threading.Lock()
+
+        self._actors_transitions: dict[str, ActorTransitionsQueue] = {}
+        self._actors_stats: dict[str, dict[str, float]] = {}
+        self._actors_lock = threading.Lock()
+        self._transitions_available = threading.Event()
+        self._transitions_forwarder = None
+
+    def _consume_parameters(self):
+        """Drain the parameters queue, merging the deltas into the parameters state and keeping the most recent
+        full state dict buffer."""
+        items = get_all_items_from_queue(self.parameters_queue, block=True, timeout=self.queue_get_timeout)
+        if not items:
+            return
+
+        with self._parameters_lock:
+            for item in items:
+                if is_parameters_delta(item):
+                    self._parameters_state = merge_parameters_deltas(
+                        self._parameters_state, bytes_to_parameters_delta(item)
+                    )
+                    self._serialized_deltas = {}
+                else:
+                    self._full_parameters = item
+                    self._full_parameters_id += 1
+
+    def _parameters_to_send(self, sent_full_id: int, sent_version: int) -> tuple[list[bytes], int, int]:
+        """Select the buffers a stream has to send to catch up with the current parameters.
+
+        Returns the buffers and the new full state dict id and delta version of the stream.
+        """
+        buffers = []
+        with self._parameters_lock:
+            if self._full_parameters_id > sent_full_id:
+                buffers.append(self._full_parameters)
+                sent_full_id = self._full_parameters_id
+
+            state = self._parameters_state
+            if state is not None and state["version"] > sent_version:
+                # Actors at the same version share the same serialized delta
+                if sent_version not in self._serialized_deltas:
+                    self._serialized_deltas[sent_version] = parameters_delta_to_bytes(
+                        select_parameters_delta(state, since_version=sent_version)
+                    )
+                buffers.append(self._serialized_deltas[sent_version])
+                sent_version = state["version"]
+
+        return buffers, sent_full_id, sent_version
+
+    def _actor_stats(self, actor_id: str) -> dict[str, float]:
+        with self._actors_lock:
+            return self._actors_stats.setdefault(
+                actor_id,
+                {"transitions_messages": 0, "transitions_bytes": 0, "parameters_version": 0},
+            )
 
     def StreamParameters(self, request, context):  # noqa: N802
         # TODO: authorize the request
-        logging.info("[LEARNER] Received request to stream parameters from the Actor")
+        actor_id = get_actor_id(context)
+        logging.info(f"[LEARNER] Received request to stream parameters from the Actor {actor_id}")
+        stats = self._actor_stats(actor_id)
 
         last_push_time = 0
+        last_sent_full_id = 0
+        last_sent_version = 0
 
         while not self.shutdown_event.is_set():
             time_since_last_push = time.time() - last_push_time
@@ -64,53 +173,142 @@ class LearnerService(services_pb2_grpc.LearnerServiceServicer):
                 # and it's checked in the while loop
                 continue
 
-            logging.info("[LEARNER] Push parameters to the Actor")
-            buffer = get_last_item_from_queue(
-                self.parameters_queue, block=True, timeout=self.queue_get_timeout
+            logging.info(f"[LEARNER] Push parameters to the Actor {actor_id}")
+            self._consume_parameters()
+            buffers, last_sent_full_id, last_sent_version = self._parameters_to_send(
+                last_sent_full_id, last_sent_version
             )
 
-            if buffer is None:
+            if not buffers:
                 continue
 
-            yield from send_bytes_in_chunks(
-                buffer,
-                services_pb2.Parameters,
-                log_prefix="[LEARNER] Sending parameters",
-                silent=True,
-            )
+            for buffer in buffers:
+                yield from send_bytes_in_chunks(
+                    buffer,
+                    services_pb2.Parameters,
+                    log_prefix=f"[LEARNER] Sending parameters to {actor_id}",
+                    silent=True,
+                )
 
+            stats["parameters_version"] = last_sent_version
             last_push_time = time.time()
-            logging.info("[LEARNER] Parameters sent")
+            logging.info(f"[LEARNER] Parameters sent to {actor_id}")
 
-        logging.info("[LEARNER] Stream parameters finished")
+        logging.info(f"[LEARNER] Stream parameters to {actor_id} finished")
         return services_pb2.Empty()
 
-    def SendTransitions(self, request_iterator, _context):  # noqa: N802
+    def _forward_transitions(self):
+        """Forward the transitions of every actor to the learner, one message per actor in turn."""
+        last_log_time = time.time()
+        last_logged_stats = {}
+
+        while not self.shutdown_event.is_set():
+            self._transitions_available.wait(timeout=0.1)
+            self._transitions_available.clear()
+
+            forwarded = True
+            while forwarded and not self.shutdown_event.is_set():
+                forwarded = False
+                with self._actors_lock:
+                    actors_transitions = list(self._actors_transitions.items())
+
+                for actor_id, actor_queue in actors_transitions:
+                    try:
+                        item = actor_queue.get_nowait()
+                    except queue.Empty:
+                        continue
+                    self._put_transitions(item)
+                    actor_queue.task_done()
+
+                    stats = self._actor_stats(actor_id)
+                    stats["transitions_messages"] += 1
+                    stats["transitions_bytes"] += len(item)
+                    forwarded = True
+
+            if time.time() - last_log_time >= ACTORS_STATS_LOG_INTERVAL:
+                last_logged_stats = self._log_actors_stats(time.time() - last_log_time, last_logged_stats)
+                last_log_time = time.time()
+
+    def _put_transitions(self, item: bytes):
+        # The learner queue may be bounded, don't block the shutdown when it's full
+        while not self.shutdown_event.is_set():
+            try:
+                self.transition_queue.put(item, timeout=0.1)
+                return
+            except queue.Full:
+                continue
+
+    def _log_actors_stats(self, elapsed: float, last_logged_stats: dict) -> dict:
+        with self._parameters_lock:
+            version = self._parameters_state["version"] if self._parameters_state is not None else 0
+        with self._actors_lock:
+            actors_stats = {actor_id: dict(stats) for actor_id, stats in self._actors_stats.items()}
+
+        for actor_id, stats in actors_stats.items():
+            last = last_logged_stats.get(actor_id, {"transitions_messages": 0, "transitions_bytes": 0})
+            messages_rate = (stats["transitions_messages"] - last["transitions_messages"]) / elapsed
+            bytes_rate = (stats["transitions_bytes"] - last["transitions_bytes"]) / elapsed
+            logging.info(
+                f"[LEARNER] Actor {actor_id}: {messages_rate:.2f} transitions messages/s, "
+                f"{bytes_rate / 1024 / 1024:.2f} MB/s, parameters lag "
+                f"{version - stats['parameters_version']} versions"
+            )
+        return actors_stats
+
+    def _register_actor(self, actor_id: str) -> ActorTransitionsQueue:
+        with self._actors_lock:
+            if actor_id in self._actors_transitions:
+                # Several streams with the same id (e.g. actors without id) share their queue
+                return self._actors_transitions[actor_id]
+
+            actor_queue = ActorTransitionsQueue(
+                maxsize=self.actor_transitions_queue_size,
+                shutdown_event=self.shutdown_event,
+                available_event=self._transitions_available,
+            )
+            self._actors_transitions[actor_id] = actor_queue
+
+            if self._transitions_forwarder is None:
+                self._transitions_forwarder = threading.Thread(
+                    target=self._forward_transitions, name="TransitionsForwarder", daemon=True
+                )
+                self._transitions_forwarder.start()
+            return actor_queue
+
+    def SendTransitions(self, request_iterator, context):  # noqa: N802
         # TODO: authorize the request
-        logging.info("[LEARNER] Received request to receive transitions from the Actor")
+        actor_id = get_actor_id(context)
+        logging.info(f"[LEARNER] Received request to receive transitions from the Actor {actor_id}")
+        actor_queue = self._register_actor(actor_id)
 
         receive_bytes_in_chunks(
             request_iterator,
-            self.transition_queue,
+            actor_queue,
             self.shutdown_event,
-            log_prefix="[LEARNER] transitions",
+            log_prefix=f"[LEARNER] transitions from {actor_id}",
         )
 
-        logging.debug("[LEARNER] Finished receiving transitions")
+        # Wait for the forwarder to hand over everything this actor sent
+        with actor_queue.all_tasks_done:
+            while actor_queue.unfinished_tasks and not self.shutdown_event.is_set():
+                actor_queue.all_tasks_done.wait(timeout=0.1)
+
+        logging.debug(f"[LEARNER] Finished receiving transitions from {actor_id}")
         return services_pb2.Empty()
 
-    def SendInteractions(self, request_iterator, _context):  # noqa: N802
+    def SendInteractions(self, request_iterator, context):  # noqa: N802
         # TODO: authorize the request
-        logging.info("[LEARNER] Received request to receive interactions from the Actor")
+        actor_id = get_actor_id(context)
+        logging.info(f"[LEARNER] Received request to receive interactions from the Actor {actor_id}")
 
         receive_bytes_in_chunks(
             request_iterator,
             self.interaction_message_queue,
             self.shutdown_event,
-            log_prefix="[LEARNER] interactions",
+            log_prefix=f"[LEARNER] interactions from {actor_id}",
         )
 
-        logging.debug("[LEARNER] Finished receiving interactions")
+        logging.debug(f"[LEARNER] Finished receiving interactions from {actor_id}")
         return services_pb2.Empty()
 
     def Ready(self, request, context):  # noqa: N802
@@ -21,6 +21,7 @@ from lerobot.robots.config import RobotConfig
 from lerobot.scripts.server.constants import (
     DEFAULT_FPS,
     DEFAULT_INFERENCE_LATENCY,
+    DEFAULT_MAX_BATCH_SIZE,
     DEFAULT_OBS_QUEUE_TIMEOUT,
 )
 
@@ -56,13 +57,22 @@ class PolicyServerConfig:
     # Timing configuration
     fps: int = field(default=DEFAULT_FPS, metadata={"help": "Frames per second"})
     inference_latency: float = field(
-        default=DEFAULT_INFERENCE_LATENCY, metadata={"help": "Target inference latency in seconds"}
+        default=DEFAULT_INFERENCE_LATENCY,
+        metadata={
+            "help": "Default latency budget to return an action chunk in seconds, clients can set their own"
+        },
     )
 
     obs_queue_timeout: float = field(
         default=DEFAULT_OBS_QUEUE_TIMEOUT, metadata={"help": "Timeout for observation queue in seconds"}
     )
 
+    # Batching configuration
+    max_batch_size: int = field(
+        default=DEFAULT_MAX_BATCH_SIZE,
+        metadata={"help": "Maximum number of clients' observations run through a policy at once"},
+    )
+
     def __post_init__(self):
         """Validate configuration after initialization."""
         if self.port < 1 or self.port > 65535:
@@ -77,6 +87,9 @@ class PolicyServerConfig:
         if self.obs_queue_timeout < 0:
             raise ValueError(f"obs_queue_timeout must be non-negative, got {self.obs_queue_timeout}")
 
+        if self.max_batch_size < 1:
+            raise ValueError(f"max_batch_size must be positive, got {self.max_batch_size}")
+
     @classmethod
     def from_dict(cls, config_dict: dict) -> "PolicyServerConfig":
         """Create a PolicyServerConfig from a dictionary."""
@@ -95,6 +108,7 @@ class PolicyServerConfig:
             "fps": self.fps,
             "environment_dt": self.environment_dt,
             "inference_latency": self.inference_latency,
+            "max_batch_size": self.max_batch_size,
         }
 
 
@@ -126,6 +140,12 @@ class RobotClientConfig:
     # Device configuration
     policy_device: str = field(default="cpu", metadata={"help": "Device for policy inference"})
 
+    # Latency budget for the server to return an action chunk, it waits at most this long to batch this
+    # client's observations with other clients'. Defaults to the server's `inference_latency`
+    inference_latency: float | None = field(
+        default=None, metadata={"help": "Latency budget for the server to return an action chunk"}
+    )
+
     # Control behavior configuration
     chunk_size_threshold: float = field(default=0.5, metadata={"help": "Threshold for chunk size control"})
     fps: int = field(default=DEFAULT_FPS, metadata={"help": "Frames per second"})
@@ -174,6 +194,9 @@ class RobotClientConfig:
         if self.actions_per_chunk <= 0:
             raise ValueError(f"actions_per_chunk must be positive, got {self.actions_per_chunk}")
 
+        if self.inference_latency is not None and self.inference_latency < 0:
+            raise ValueError(f"inference_latency must be non-negative, got {self.inference_latency}")
+
         self.aggregate_fn = get_aggregate_function(self.aggregate_fn_name)
 
     @classmethod
@@ -188,6 +211,7 @@ class RobotClientConfig:
             "policy_type": self.policy_type,
             "pretrained_name_or_path": self.pretrained_name_or_path,
             "policy_device": self.policy_device,
+            "inference_latency": self.inference_latency,
             "chunk_size_threshold": self.chunk_size_threshold,
             "fps": self.fps,
             "actions_per_chunk": self.actions_per_chunk,
@@ -22,8 +22,15 @@ DEFAULT_INFERENCE_LATENCY = 1 / DEFAULT_FPS
 """Server side: Timeout for observation queue in seconds"""
 DEFAULT_OBS_QUEUE_TIMEOUT = 2
 
+"""Server side: Maximum number of observations (from different clients) run through a policy at once"""
+DEFAULT_MAX_BATCH_SIZE = 8
+
 # All action chunking policies
 SUPPORTED_POLICIES = ["act", "smolvla", "diffusion", "pi0", "tdmpc", "vqbet"]
 
+# Policies predicting action chunks without keeping a history of observations: a single instance can be shared by
+# several clients, and their observations batched together
+BATCHABLE_POLICIES = ["act", "smolvla", "pi0"]
+
 # TODO: Add all other robots
 SUPPORTED_ROBOTS = ["so100_follower", "so101_follower"]
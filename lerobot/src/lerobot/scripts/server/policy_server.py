@@ -29,9 +29,10 @@ import pickle  # nosec
 import threading
 import time
 from concurrent import futures
-from dataclasses import asdict
+from dataclasses import asdict, dataclass, field
 from pprint import pformat
 from queue import Empty, Queue
+from typing import Any
 
 import draccus
 import grpc
@@ -39,7 +40,7 @@ import torch
 
 from lerobot.policies.factory import get_policy_class
 from lerobot.scripts.server.configs import PolicyServerConfig
-from lerobot.scripts.server.constants import SUPPORTED_POLICIES
+from lerobot.scripts.server.constants import BATCHABLE_POLICIES, SUPPORTED_POLICIES
 from lerobot.scripts.server.helpers import (
     FPSTracker,
     Observation,
@@ -56,31 +57,112 @@ from lerobot.transport import (
 )
 from lerobot.transport.utils import receive_bytes_in_chunks
 
+# Clients that didn't ask for actions for this long are not waited for when batching observations
+SESSION_ACTIVITY_TIMEOUT = 1.0  # seconds
+# Smoothing factor of the moving average of the inference time of every policy
+INFERENCE_TIME_SMOOTHING = 0.1
+
+
+@dataclass
+class ClientSession:
+    """State of a robot client connected to the server."""
+
+    client_id: str | None
+    target_fps: float
+    inference_latency: float
+    policy: Any = None
+    policy_type: str | None = None
+    lerobot_features: dict | None = None
+    actions_per_chunk: int | None = None
+    device: str | None = None
+    # only running inference on the latest observation received from the client
+    observation_queue: Queue = field(default_factory=lambda: Queue(maxsize=1))
+    last_processed_obs: TimedObservation | None = None
+    predicted_timesteps: set[int] = field(default_factory=set)
+    predicted_timesteps_lock: threading.Lock = field(default_factory=threading.Lock)
+    last_request_time: float = 0.0
+
+    def __post_init__(self):
+        self.fps_tracker = FPSTracker(target_fps=self.target_fps)
+
+    @property
+    def policy_image_features(self):
+        return self.policy.config.image_features
+
+
+@dataclass
+class InferenceRequest:
+    """An observation of a client waiting to be run through its policy, possibly batched with others."""
+
+    session: ClientSession
+    observation: TimedObservation
+    # time.perf_counter() by which the action chunk should be returned
+    deadline: float
+    done: threading.Event = field(default_factory=threading.Event)
+    action_chunk: list[TimedAction] | None = None
+    error: Exception | None = None
+
+
+class _DefaultSessionAttribute:
+    """Attribute of the server read from and written to its default session (the last client that connected),
+    which keeps the single client API of the server working."""
+
+    def __init__(self, name: str | None = None):
+        self.name = name
+
+    def __set_name__(self, owner, name):
+        self.name = self.name or name
+
+    def __get__(self, server, owner=None):
+        if server is None:
+            return self
+        return getattr(server._default_session, self.name)
+
+    def __set__(self, server, value):
+        setattr(server._default_session, self.name, value)
+
 
 class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
+    """Serves the action chunks of one or several robot clients.
+
+    Every client (identified by its gRPC peer) has its own session, with its policy, observation queue and
+    latency budget (`inference_latency`). Clients running the same batchable policy share a single instance of
+    it, and a scheduler thread runs their pending observations through it in a single batch. It dispatches a
+    batch as soon as every active client of the policy is waiting, or when the earliest deadline of the batch
+    leaves just enough time for the inference.
+    """
+
     prefix = "policy_server"
     logger = get_logger(prefix)
 
+    policy = _DefaultSessionAttribute()
+    policy_type = _DefaultSessionAttribute()
+    lerobot_features = _DefaultSessionAttribute()
+    actions_per_chunk = _DefaultSessionAttribute()
+    device = _DefaultSessionAttribute()
+    observation_queue = _DefaultSessionAttribute()
+    last_processed_obs = _DefaultSessionAttribute()
+    fps_tracker = _DefaultSessionAttribute()
+    _predicted_timesteps = _DefaultSessionAttribute("predicted_timesteps")
+    _predicted_timesteps_lock = _DefaultSessionAttribute("predicted_timesteps_lock")
+
     def __init__(self, config: PolicyServerConfig):
         self.config = config
         self.shutdown_event = threading.Event()
 
-        # FPS measurement
-        self.fps_tracker = FPSTracker(target_fps=config.fps)
-
-        self.observation_queue = Queue(maxsize=1)
+        self._sessions_lock = threading.Lock()
+        self._sessions: dict[str, ClientSession] = {}
+        # Attributes will be set by SendPolicyInstructions
+        self._default_session = self._new_session(client_id=None)
 
-        self._predicted_timesteps_lock = threading.Lock()
-        self._predicted_timesteps = set()
+        # Policies shared by the clients, by (policy type, pretrained name or path, device)
+        self._policies: dict[tuple, Any] = {}
+        self._policies_lock = threading.Lock()
 
-        self.last_processed_obs = None
-
-        # Attributes will be set by SendPolicyInstructions
-        self.device = None
-        self.policy_type = None
-        self.lerobot_features = None
-        self.actions_per_chunk = None
-        self.policy = None
+        self._pending_requests: list[InferenceRequest] = []
+        self._pending_condition = threading.Condition()
+        self._inference_times: dict[int, float] = {}
+        self._scheduler_thread = None
 
     @property
     def running(self):
@@ -90,23 +172,71 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
     def policy_image_features(self):
         return self.policy.config.image_features
 
+    def _new_session(self, client_id: str | None) -> ClientSession:
+        session = ClientSession(
+            client_id=client_id,
+            target_fps=self.config.fps,
+            inference_latency=self.config.inference_latency,
+        )
+        if hasattr(self, "_default_session"):
+            # Until it sends its own instructions, a client uses the policy of the last client that connected
+            for name in ("policy", "policy_type", "lerobot_features", "actions_per_chunk", "device"):
+                setattr(session, name, getattr(self._default_session, name))
+        return session
+
+    def _get_session(self, client_id: str) -> ClientSession:
+        with self._sessions_lock:
+            session = self._sessions.get(client_id)
+            if session is None:
+                session = self._sessions[client_id] = self._new_session(client_id)
+                self._default_session = session
+            return session
+
     def _reset_server(self) -> None:
-        """Flushes server state when new client connects."""
-        # only running inference on the latest observation received by the server
+        """Flushes the state of all the clients."""
         self.shutdown_event.set()
-        self.observation_queue = Queue(maxsize=1)
-
-        with self._predicted_timesteps_lock:
-            self._predicted_timesteps = set()
+        with self._sessions_lock:
+            self._sessions = {}
+            self._default_session = self._new_session(client_id=None)
+        with self._pending_condition:
+            self._pending_condition.notify_all()
 
     def Ready(self, request, context):  # noqa: N802
         client_id = context.peer()
         self.logger.info(f"Client {client_id} connected and ready")
-        self._reset_server()
+
+        # Flushes the state of the client, other clients are not affected
+        with self._sessions_lock:
+            session = self._new_session(client_id)
+            self._sessions[client_id] = session
+            self._default_session = session
         self.shutdown_event.clear()
 
         return services_pb2.Empty()
 
+    def _load_policy(self, policy_specs: RemotePolicyConfig, client_id: str) -> Any:
+        """Load a policy, or reuse the instance already loaded for another client if it can be shared."""
+        key = (policy_specs.policy_type, policy_specs.pretrained_name_or_path, policy_specs.device)
+        if policy_specs.policy_type not in BATCHABLE_POLICIES:
+            # Policies keeping a history of observations can't be shared
+            key = (*key, client_id)
+
+        with self._policies_lock:
+            if key in self._policies:
+                self.logger.info(f"Reusing the policy already loaded for {key[:3]}")
+                return self._policies[key]
+
+            policy_class = get_policy_class(policy_specs.policy_type)
+
+            start = time.perf_counter()
+            policy = policy_class.from_pretrained(policy_specs.pretrained_name_or_path)
+            policy.to(policy_specs.device)
+            end = time.perf_counter()
+
+            self.logger.info(f"Time taken to put policy on {policy_specs.device}: {end - start:.4f} seconds")
+            self._policies[key] = policy
+            return policy
+
     def SendPolicyInstructions(self, request, context):  # noqa: N802
         """Receive policy instructions from the robot client"""
 
@@ -132,22 +262,18 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
             f"Policy type: {policy_specs.policy_type} | "
             f"Pretrained name or path: {policy_specs.pretrained_name_or_path} | "
             f"Actions per chunk: {policy_specs.actions_per_chunk} | "
-            f"Device: {policy_specs.device}"
+            f"Device: {policy_specs.device} | "
+            f"Inference latency: {policy_specs.inference_latency}"
         )
 
-        self.device = policy_specs.device
-        self.policy_type = policy_specs.policy_type  # act, pi0, etc.
-        self.lerobot_features = policy_specs.lerobot_features
-        self.actions_per_chunk = policy_specs.actions_per_chunk
-
-        policy_class = get_policy_class(self.policy_type)
-
-        start = time.perf_counter()
-        self.policy = policy_class.from_pretrained(policy_specs.pretrained_name_or_path)
-        self.policy.to(self.device)
-        end = time.perf_counter()
-
-        self.logger.info(f"Time taken to put policy on {self.device}: {end - start:.4f} seconds")
+        session = self._get_session(client_id)
+        session.device = policy_specs.device
+        session.policy_type = policy_specs.policy_type  # act, pi0, etc.
+        session.lerobot_features = policy_specs.lerobot_features
+        session.actions_per_chunk = policy_specs.actions_per_chunk
+        if policy_specs.inference_latency is not None:
+            session.inference_latency = policy_specs.inference_latency
+        session.policy = self._load_policy(policy_specs, client_id)
 
         return services_pb2.Empty()
 
@@ -169,11 +295,13 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
         obs_timestep = timed_observation.get_timestep()
         obs_timestamp = timed_observation.get_timestamp()
 
+        session = self._get_session(client_id)
+
         # Calculate FPS metrics
-        fps_metrics = self.fps_tracker.calculate_fps_metrics(obs_timestamp)
+        fps_metrics = session.fps_tracker.calculate_fps_metrics(obs_timestamp)
 
         self.logger.info(
-            f"Received observation #{obs_timestep} | "
+            f"Received observation #{obs_timestep} from {client_id} | "
             f"Avg FPS: {fps_metrics['avg_fps']:.2f} | "  # fps at which observations are received from client
             f"Target: {fps_metrics['target_fps']:.2f} | "
             f"One-way latency: {(receive_time - obs_timestamp) * 1000:.2f}ms"
@@ -186,7 +314,8 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
         )
 
         if not self._enqueue_observation(
-            timed_observation  # wrapping a RawObservation
+            timed_observation,  # wrapping a RawObservation
+            session,
         ):
             self.logger.info(f"Observation #{obs_timestep} has been filtered out")
 
@@ -197,21 +326,29 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
         chunk, containing multiple actions."""
         client_id = context.peer()
         self.logger.debug(f"Client {client_id} connected for action streaming")
+        session = self._get_session(client_id)
+        session.last_request_time = time.perf_counter()
 
         # Generate action based on the most recent observation and its timestep
         try:
+            obs = session.observation_queue.get(timeout=self.config.obs_queue_timeout)
             getactions_starts = time.perf_counter()
-            obs = self.observation_queue.get(timeout=self.config.obs_queue_timeout)
             self.logger.info(
-                f"Running inference for observation #{obs.get_timestep()} (must_go: {obs.must_go})"
+                f"Running inference for observation #{obs.get_timestep()} of {client_id} "
+                f"(must_go: {obs.must_go})"
             )
 
-            with self._predicted_timesteps_lock:
-                self._predicted_timesteps.add(obs.get_timestep())
+            with session.predicted_timesteps_lock:
+                session.predicted_timesteps.add(obs.get_timestep())
 
-            start_time = time.perf_counter()
-            action_chunk = self._predict_action_chunk(obs)
-            inference_time = time.perf_counter() - start_time
+            action_chunk = self._submit_inference(
+                InferenceRequest(
+                    session=session,
+                    observation=obs,
+                    deadline=getactions_starts + session.inference_latency,
+                )
+            )
+            inference_time = time.perf_counter() - getactions_starts
 
             start_time = time.perf_counter()
             actions_bytes = pickle.dumps(action_chunk)  # nosec
@@ -221,21 +358,17 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
             actions = services_pb2.Actions(data=actions_bytes)
 
             self.logger.info(
-                f"Action chunk #{obs.get_timestep()} generated | "
+                f"Action chunk #{obs.get_timestep()} generated for {client_id} | "
                 f"Total time: {(inference_time + serialize_time) * 1000:.2f}ms"
             )
 
             self.logger.debug(
                 f"Action chunk #{obs.get_timestep()} generated | "
-                f"Inference time: {inference_time:.2f}s |"
+                f"Inference time (including batching): {inference_time:.2f}s |"
                 f"Serialize time: {serialize_time:.2f}s |"
                 f"Total time: {inference_time + serialize_time:.2f}s"
             )
 
-            time.sleep(
-                max(0, self.config.inference_latency - max(0, time.perf_counter() - getactions_starts))
-            )  # sleep controls inference latency
-
             return actions
 
         except Empty:  # no observation added to queue in obs_queue_timeout
@@ -246,16 +379,109 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
 
             return services_pb2.Empty()
 
-    def _obs_sanity_checks(self, obs: TimedObservation, previous_obs: TimedObservation) -> bool:
+    def _submit_inference(self, request: InferenceRequest) -> list[TimedAction]:
+        """Hand an observation over to the scheduler and wait for its action chunk."""
+        with self._pending_condition:
+            if self._scheduler_thread is None or not self._scheduler_thread.is_alive():
+                self._scheduler_thread = threading.Thread(
+                    target=self._schedule_inference, name="InferenceScheduler", daemon=True
+                )
+                self._scheduler_thread.start()
+            self._pending_requests.append(request)
+            self._pending_condition.notify()
+
+        while not request.done.wait(timeout=0.1):
+            if not self.running:
+                raise RuntimeError("Server stopped before the inference was run")
+
+        if request.error is not None:
+            raise request.error
+        return request.action_chunk
+
+    def _active_sessions(self, policy: Any) -> int:
+        """Number of clients of `policy` that asked for actions recently."""
+        now = time.perf_counter()
+        with self._sessions_lock:
+            sessions = list(self._sessions.values()) or [self._default_session]
+        return sum(
+            1
+            for session in sessions
+            if session.policy is policy and now - session.last_request_time < SESSION_ACTIVITY_TIMEOUT
+        )
+
+    def _next_batch(self) -> tuple[list[InferenceRequest] | None, float | None]:
+        """Pick the pending requests to run now, if any. Must be called with `_pending_condition` held.
+
+        Returns the batch, or None and how long to wait before a batch is due.
+        """
+        groups: dict[int, list[InferenceRequest]] = {}
+        for request in self._pending_requests:
+            groups.setdefault(id(request.session.policy), []).append(request)
+
+        now = time.perf_counter()
+        wait_time = None
+        for policy_id, requests in sorted(groups.items(), key=lambda item: min(r.deadline for r in item[1])):
+            requests = sorted(requests, key=lambda r: r.deadline)
+            waiting_clients = len({id(r.session) for r in requests})
+            # Leave enough time to run the inference before the earliest deadline
+            dispatch_time = requests[0].deadline - self._inference_times.get(policy_id, 0.0)
+
+            if (
+                waiting_clients >= self._active_sessions(requests[0].session.policy)
+                or len(requests) >= self.config.max_batch_size
+                or now >= dispatch_time
+            ):
+                batch = requests[: self.config.max_batch_size]
+                for request in batch:
+                    self._pending_requests.remove(request)
+                return batch, None
+
+            wait_time = dispatch_time - now if wait_time is None else min(wait_time, dispatch_time - now)
+
+        return None, wait_time
+
+    def _schedule_inference(self):
+        """Run the pending observations through their policies, batching the clients that share one."""
+        while self.running:
+            with self._pending_condition:
+                batch, wait_time = self._next_batch()
+                if batch is None:
+                    self._pending_condition.wait(timeout=wait_time if wait_time is not None else 0.1)
+                    continue
+
+            start_time = time.perf_counter()
+            try:
+                action_chunks = self._predict_action_chunks([(r.session, r.observation) for r in batch])
+                for request, action_chunk in zip(batch, action_chunks, strict=True):
+                    request.action_chunk = action_chunk
+            except Exception as e:
+                for request in batch:
+                    request.error = e
+            finally:
+                policy_id = id(batch[0].session.policy)
+                elapsed = time.perf_counter() - start_time
+                previous = self._inference_times.get(policy_id, elapsed)
+                self._inference_times[policy_id] = (
+                    1 - INFERENCE_TIME_SMOOTHING
+                ) * previous + INFERENCE_TIME_SMOOTHING * elapsed
+                for request in batch:
+                    request.done.set()
+
+            self.logger.debug(f"Ran a batch of {len(batch)} observations in {elapsed * 1000:.2f}ms")
+
+    def _obs_sanity_checks(
+        self, obs: TimedObservation, previous_obs: TimedObservation, session: ClientSession | None = None
+    ) -> bool:
         """Check if the observation is valid to be processed by the policy"""
-        with self._predicted_timesteps_lock:
-            predicted_timesteps = self._predicted_timesteps
+        session = session or self._default_session
+        with session.predicted_timesteps_lock:
+            predicted_timesteps = session.predicted_timesteps
 
         if obs.get_timestep() in predicted_timesteps:
             self.logger.debug(f"Skipping observation #{obs.get_timestep()} - Timestep predicted already!")
             return False
 
-        elif observations_similar(obs, previous_obs, lerobot_features=self.lerobot_features):
+        elif observations_similar(obs, previous_obs, lerobot_features=session.lerobot_features):
             self.logger.debug(
                 f"Skipping observation #{obs.get_timestep()} - Observation too similar to last obs predicted!"
             )
@@ -264,28 +490,29 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
         else:
             return True
 
-    def _enqueue_observation(self, obs: TimedObservation) -> bool:
+    def _enqueue_observation(self, obs: TimedObservation, session: ClientSession | None = None) -> bool:
         """Enqueue an observation if it must go through processing, otherwise skip it.
         Observations not in queue are never run through the policy network"""
+        session = session or self._default_session
 
         if (
             obs.must_go
-            or self.last_processed_obs is None
-            or self._obs_sanity_checks(obs, self.last_processed_obs)
+            or session.last_processed_obs is None
+            or self._obs_sanity_checks(obs, session.last_processed_obs, session)
         ):
-            last_obs = self.last_processed_obs.get_timestep() if self.last_processed_obs else "None"
+            last_obs = session.last_processed_obs.get_timestep() if session.last_processed_obs else "None"
             self.logger.debug(
                 f"Enqueuing observation. Must go: {obs.must_go} | Last processed obs: {last_obs}"
             )
 
             # If queue is full, get the old observation to make room
-            if self.observation_queue.full():
+            if session.observation_queue.full():
                 # pops from queue
-                _ = self.observation_queue.get_nowait()
+                _ = session.observation_queue.get_nowait()
                 self.logger.debug("Observation queue was full, removed oldest observation")
 
             # Now put the new observation (never blocks as queue is non-full here)
-            self.observation_queue.put(obs)
+            session.observation_queue.put(obs)
             return True
 
         return False
@@ -300,73 +527,106 @@ class PolicyServer(services_pb2_grpc.AsyncInferenceServicer):
             for i, action in enumerate(action_chunk)
         ]
 
-    def _prepare_observation(self, observation_t: TimedObservation) -> Observation:
+    def _prepare_observation(
+        self, observation_t: TimedObservation, session: ClientSession | None = None
+    ) -> Observation:
         """
         Prepare observation, ready for policy inference.
         E.g.: To keep observation sampling rate high (and network packet tiny) we send int8 [0,255] images from the
         client and then convert them to float32 [0,1] images here, before running inference.
         """
+        session = session or self._default_session
         # RawObservation from robot.get_observation() - wrong keys, wrong dtype, wrong image shape
         observation: Observation = raw_observation_to_observation(
             observation_t.get_observation(),
-            self.lerobot_features,
-            self.policy_image_features,
-            self.device,
+            session.lerobot_features,
+            session.policy_image_features,
+            session.device,
         )
         # processed Observation - right keys, right dtype, right image shape
 
         return observation
 
-    def _get_action_chunk(self, observation: dict[str, torch.Tensor]) -> torch.Tensor:
-        """Get an action chunk from the policy. The chunk contains only"""
-        chunk = self.policy.predict_action_chunk(observation)
+    @staticmethod
+    def _collate_observations(observations: list[Observation]) -> Observation:
+        """Stack the observations of several clients along the batch dimension."""
+        if len(observations) == 1:
+            return observations[0]
+
+        batch = {}
+        for key, value in observations[0].items():
+            values = [observation[key] for observation in observations]
+            batch[key] = torch.cat(values, dim=0) if isinstance(value, torch.Tensor) else values
+        return batch
+
+    def _get_action_chunk(self, observation: dict[str, torch.Tensor], policy: Any = None) -> torch.Tensor:
+        """Get an action chunk from the policy (the default one if None), of shape (B, chunk_size, action_dim)."""
+        policy = policy if policy is not None else self.policy
+        chunk = policy.predict_action_chunk(observation)
         if chunk.ndim != 3:
             chunk = chunk.unsqueeze(0)  # adding batch dimension, now shape is (B, chunk_size, action_dim)
 
-        return chunk[:, : self.actions_per_chunk, :]
+        return chunk
 
-    def _predict_action_chunk(self, observation_t: TimedObservation) -> list[TimedAction]:
-        """Predict an action chunk based on an observation"""
+    def _predict_action_chunks(
+        self, requests: list[tuple[ClientSession, TimedObservation]]
+    ) -> list[list[TimedAction]]:
+        """Predict the action chunks of the observations of several clients sharing the same policy, in a single
+        forward pass."""
         inference_starts = time.perf_counter()
+        sessions = [session for session, _ in requests]
 
-        """1. Prepare observation"""
+        """1. Prepare observations"""
         start_time = time.perf_counter()
-        observation = self._prepare_observation(observation_t)
+        observations = []
+        for session, observation_t in requests:
+            observations.append(self._prepare_observation(observation_t, session))
+            session.last_processed_obs = observation_t
+        batch = self._collate_observations(observations)
         preprocessing_time = time.perf_counter() - start_time
 
-        self.last_processed_obs: TimedObservation = observation_t
-
-        """2. Get action chunk"""
+        """2. Get action chunks"""
         start_time = time.perf_counter()
-        action_tensor = self._get_action_chunk(observation)
+        action_tensor = self._get_action_chunk(batch, sessions[0].policy)
         inference_time = time.perf_counter() - start_time
 
         """3. Post-inference processing"""
         start_time = time.perf_counter()
         # Move to CPU before serializing
-        action_tensor = action_tensor.cpu().squeeze(0)
-
-        action_chunk = self._time_action_chunk(
-            observation_t.get_timestamp(), list(action_tensor), observation_t.get_timestep()
-        )
+        action_tensor = action_tensor.cpu()
+
+        action_chunks = []
+        for i, (session, observation_t) in enumerate(requests):
+            actions = action_tensor[i, : session.actions_per_chunk]
+            action_chunks.append(
+                self._time_action_chunk(
+                    observation_t.get_timestamp(), list(actions), observation_t.get_timestep()
+                )
+            )
         postprocessing_time = time.perf_counter() - start_time
         inference_stops = time.perf_counter()
 
+        timesteps = [observation_t.get_timestep() for _, observation_t in requests]
         self.logger.info(
-            f"Observation {observation_t.get_timestep()} |"
-            f"Inference time: {1000 * (inference_stops - inference_starts):.2f}ms"
+            f"Observations {timesteps} |Inference time: {1000 * (inference_stops - inference_starts):.2f}ms"
         )
 
         # full-process latency breakdown for debugging purposes
         self.logger.debug(
-            f"Observation {observation_t.get_timestep()} | "
-            f"Preprocessing time: {1000 * (preprocessing_time - inference_starts):.2f}ms | "
-            f"Inference time: {1000 * (inference_time - preprocessing_time):.2f}ms | "
-            f"Postprocessing time: {1000 * (postprocessing_time - inference_time):.2f}ms | "
-            f"Total time: {1000 * (postprocessing_time - inference_starts):.2f}ms"
+            f"Observations {timesteps} | "
+            f"Preprocessing time: {1000 * preprocessing_time:.2f}ms | "
+            f"Inference time: {1000 * inference_time:.2f}ms | "
+            f"Postprocessing time: {1000 * postprocessing_time:.2f}ms | "
+            f"Total time: {1000 * (inference_stops - inference_starts):.2f}ms"
         )
 
-        return action_chunk
+        return action_chunks
+
+    def _predict_action_chunk(
+        self, observation_t: TimedObservation, session: ClientSession | None = None
+    ) -> list[TimedAction]:
+        """Predict an action chunk based on an observation"""
+        return self._predict_action_chunks([(session or self._default_session, observation_t)])[0]
 
     def stop(self):
         """Stop the server"""
@@ -28,7 +28,7 @@ from lerobot.configs import parser
 from lerobot.configs.train import TrainPipelineConfig
 from lerobot.datasets.factory import make_dataset
 from lerobot.datasets.sampler import EpisodeAwareSampler
-from lerobot.datasets.utils import cycle
+from lerobot.datasets.utils import DevicePrefetcher, cycle
 from lerobot.envs.factory import make_env
 from lerobot.optim.factory import make_optimizer_and_scheduler
 from lerobot.policies.factory import make_policy
@@ -38,6 +38,7 @@ from lerobot.scripts.eval import eval_policy
 from lerobot.utils.logging_utils import AverageMeter, MetricsTracker
 from lerobot.utils.random_utils import set_seed
 from lerobot.utils.train_utils import (
+    AsyncCheckpointer,
     get_step_checkpoint_dir,
     get_step_identifier,
     load_training_state,
@@ -45,6 +46,7 @@ from lerobot.utils.train_utils import (
     update_last_checkpoint,
 )
 from lerobot.utils.utils import (
+    DeviceTimer,
     format_big_number,
     get_safe_torch_device,
     has_method,
@@ -64,8 +66,8 @@ def update_policy(
     use_amp: bool = False,
     lock=None,
 ) -> tuple[MetricsTracker, dict]:
-    start_time = time.perf_counter()
     device = get_device_from_parameters(policy)
+    timer = DeviceTimer(device).start()
     policy.train()
     with torch.autocast(device_type=device.type) if use_amp else nullcontext():
         loss, output_dict = policy.forward(batch)
@@ -98,10 +100,11 @@ def update_policy(
         # To possibly update an internal buffer (for instance an Exponential Moving Average like in TDMPC).
         policy.update()
 
-    train_metrics.loss = loss.item()
-    train_metrics.grad_norm = grad_norm.item()
+    # The metrics stay on the device and are only synchronized when they are logged
+    train_metrics.loss = loss
+    train_metrics.grad_norm = grad_norm
     train_metrics.lr = optimizer.param_groups[0]["lr"]
-    train_metrics.update_s = time.perf_counter() - start_time
+    train_metrics.update_s = timer.stop()
     return train_metrics, output_dict
 
 
@@ -184,6 +187,13 @@ def train(cfg: TrainPipelineConfig):
         drop_last=False,
     )
     dl_iter = cycle(dataloader)
+    if cfg.prefetch_batches > 0:
+        # Load the next batches and move them to the device while the policy is updated
+        dl_iter = DevicePrefetcher(dl_iter, device, num_batches=cfg.prefetch_batches)
+
+    checkpointer = None
+    if cfg.save_checkpoint and cfg.async_checkpoint:
+        checkpointer = AsyncCheckpointer(max_in_flight=cfg.max_checkpoints_in_flight)
 
     policy.train()
 
@@ -205,9 +215,10 @@ def train(cfg: TrainPipelineConfig):
         batch = next(dl_iter)
         train_tracker.dataloading_s = time.perf_counter() - start_time
 
-        for key in batch:
-            if isinstance(batch[key], torch.Tensor):
-                batch[key] = batch[key].to(device, non_blocking=device.type == "cuda")
+        if cfg.prefetch_batches == 0:
+            for key in batch:
+                if isinstance(batch[key], torch.Tensor):
+                    batch[key] = batch[key].to(device, non_blocking=device.type == "cuda")
 
         train_tracker, output_dict = update_policy(
             train_tracker,
@@ -240,10 +251,14 @@ def train(cfg: TrainPipelineConfig):
         if cfg.save_checkpoint and is_saving_step:
             logging.info(f"Checkpoint policy after step {step}")
             checkpoint_dir = get_step_checkpoint_dir(cfg.output_dir, cfg.steps, step)
-            save_checkpoint(checkpoint_dir, step, cfg, policy, optimizer, lr_scheduler)
-            update_last_checkpoint(checkpoint_dir)
-            if wandb_logger:
-                wandb_logger.log_policy(checkpoint_dir)
+            if checkpointer is not None:
+                on_saved = wandb_logger.log_policy if wandb_logger else None
+                checkpointer.save(checkpoint_dir, step, cfg, policy, optimizer, lr_scheduler, on_saved)
+            else:
+                save_checkpoint(checkpoint_dir, step, cfg, policy, optimizer, lr_scheduler)
+                update_last_checkpoint(checkpoint_dir)
+                if wandb_logger:
+                    wandb_logger.log_policy(checkpoint_dir)
 
         if cfg.env and is_eval_step:
             step_id = get_step_identifier(step, cfg.steps)
@@ -278,6 +293,10 @@ def train(cfg: TrainPipelineConfig):
                 wandb_logger.log_dict(wandb_log_dict, step, mode="eval")
                 wandb_logger.log_video(eval_info["video_paths"][0], step, mode="eval")
 
+    if isinstance(dl_iter, DevicePrefetcher):
+        dl_iter.close()
+    if checkpointer is not None:
+        checkpointer.close()
     if eval_env:
         eval_env.close()
     logging.info("End of training")
@@ -54,6 +54,7 @@ lerobot-teleoperate \
 import logging
 import time
 from dataclasses import asdict, dataclass
+from pathlib import Path
 from pprint import pformat
 
 import draccus
@@ -82,6 +83,7 @@ from lerobot.teleoperators import (  # noqa: F401
     so100_leader,
     so101_leader,
 )
+from lerobot.utils.control_profiler import ControlLoopProfiler
 from lerobot.utils.robot_utils import busy_wait
 from lerobot.utils.utils import init_logging, move_cursor_up
 from lerobot.utils.visualization_utils import _init_rerun, log_rerun_data
@@ -97,21 +99,39 @@ class TeleoperateConfig:
     teleop_time_s: float | None = None
     # Display all cameras on screen
     display_data: bool = False
+    # Time every stage of the control loop and log a summary of the latencies when stopping
+    profile: bool = False
+    # Path where a Chrome trace (chrome://tracing, https://ui.perfetto.dev) is saved when profiling
+    profile_trace_path: Path | None = None
 
 
 def teleop_loop(
-    teleop: Teleoperator, robot: Robot, fps: int, display_data: bool = False, duration: float | None = None
+    teleop: Teleoperator,
+    robot: Robot,
+    fps: int,
+    display_data: bool = False,
+    duration: float | None = None,
+    profiler: ControlLoopProfiler | None = None,
 ):
+    if profiler is None:
+        profiler = ControlLoopProfiler(fps, enabled=False)
+
     display_len = max(len(key) for key in robot.action_features)
     start = time.perf_counter()
     while True:
         loop_start = time.perf_counter()
-        action = teleop.get_action()
+        profiler.start_iteration()
+        with profiler.span("get_action"):
+            action = teleop.get_action()
         if display_data:
-            observation = robot.get_observation()
-            log_rerun_data(observation, action)
-
-        robot.send_action(action)
+            with profiler.span("get_observation"):
+                observation = robot.get_observation()
+            with profiler.span("log_rerun_data"):
+                log_rerun_data(observation, action)
+
+        with profiler.span("send_action"):
+            robot.send_action(action)
+        profiler.end_of_work()
         dt_s = time.perf_counter() - loop_start
         busy_wait(1 / fps - dt_s)
 
@@ -124,6 +144,7 @@ def teleop_loop(
         print(f"\ntime: {loop_s * 1e3:.2f}ms ({1 / loop_s:.0f} Hz)")
 
         if duration is not None and time.perf_counter() - start >= duration:
+            profiler.end_iteration()
             return
 
         move_cursor_up(len(action) + 5)
@@ -142,11 +163,26 @@ def teleoperate(cfg: TeleoperateConfig):
     teleop.connect()
     robot.connect()
 
+    profiler = ControlLoopProfiler(cfg.fps, enabled=cfg.profile)
+    for name, camera in getattr(robot, "cameras", {}).items():
+        profiler.instrument(camera, "async_read", f"camera_{name}")
+
     try:
-        teleop_loop(teleop, robot, cfg.fps, display_data=cfg.display_data, duration=cfg.teleop_time_s)
+        teleop_loop(
+            teleop,
+            robot,
+            cfg.fps,
+            display_data=cfg.display_data,
+            duration=cfg.teleop_time_s,
+            profiler=profiler,
+        )
     except KeyboardInterrupt:
-        pass
+        profiler.end_iteration()
     finally:
+        if cfg.profile:
+            logging.info(f"Control loop profile:\n{profiler.format_summary()}")
+            if cfg.profile_trace_path is not None:
+                profiler.export_chrome_trace(cfg.profile_trace_path)
         if cfg.display_data:
             rr.rerun_shutdown()
         teleop.disconnect()
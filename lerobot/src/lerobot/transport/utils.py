@@ -15,14 +15,19 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import hashlib
 import io
 import json
 import logging
+import math
 import pickle  # nosec B403: Safe usage for internal serialization only
+import struct
+import zlib
 from multiprocessing import Event
 from queue import Queue
 from typing import Any
 
+import numpy as np
 import torch
 
 from lerobot.transport import services_pb2
@@ -30,6 +35,15 @@ from lerobot.utils.transition import Transition
 
 CHUNK_SIZE = 2 * 1024 * 1024  # 2 MB
 MAX_MESSAGE_SIZE = 4 * 1024 * 1024  # 4 MB
+PARAMETERS_DELTA_MAGIC = b"LRPDELTA"
+ACTOR_ID_METADATA_KEY = "lerobot-actor-id"
+DEFAULT_ACTOR_ID = "default"
+TRANSITIONS_MAGIC = b"LRTRANS1"
+TRANSITIONS_ALIGNMENT = 8
+TRANSITIONS_IMAGE_CODECS = (None, "zlib", "jpeg")
+TRANSITIONS_JPEG_QUALITY = 95
+# The schema is sent again every so many messages so that a restarted learner can decode the stream again
+TRANSITIONS_SCHEMA_RESEND_INTERVAL = 100
 
 
 def bytes_buffer_size(buffer: io.BytesIO) -> int:
@@ -122,6 +136,138 @@ def bytes_to_state_dict(buffer: bytes) -> dict[str, torch.Tensor]:
     return torch.load(buffer, weights_only=True)
 
 
+def parameters_delta_to_bytes(delta: dict[str, Any]) -> bytes:
+    """Serialize a parameters delta (see `ParametersDeltaEncoder`), prefixed so it can be told apart from a
+    full state dict sent with `state_to_bytes`."""
+    buffer = io.BytesIO()
+    buffer.write(PARAMETERS_DELTA_MAGIC)
+    torch.save(delta, buffer)
+    return buffer.getvalue()
+
+
+def bytes_to_parameters_delta(buffer: bytes) -> dict[str, Any]:
+    buffer = io.BytesIO(buffer)
+    buffer.seek(len(PARAMETERS_DELTA_MAGIC))
+    return torch.load(buffer, weights_only=True)
+
+
+def is_parameters_delta(buffer: bytes) -> bool:
+    return buffer[: len(PARAMETERS_DELTA_MAGIC)] == PARAMETERS_DELTA_MAGIC
+
+
+class ParametersDeltaEncoder:
+    """Encode the learner's state dicts as deltas that only contain the tensors changed since the last push.
+
+    Every tensor is tagged with the version of the push that last changed it, so that deltas can be merged
+    (`merge_parameters_deltas`) when some of them are skipped along the way and applied in place on the actor
+    (`apply_parameters_delta`). Frozen tensors are only sent with the first push.
+    """
+
+    def __init__(self, dtype: torch.dtype | None = None):
+        """
+        Args:
+            dtype: Optional dtype (e.g. torch.float16 or torch.bfloat16) floating point tensors are cast to
+                before being sent, to reduce the bandwidth. The actor casts them back to its own dtype.
+        """
+        self.dtype = dtype
+        self.version = 0
+        self._last_pushed: dict[str, dict[str, torch.Tensor]] = {}
+
+    def encode(
+        self,
+        state_dicts: dict[str, dict[str, torch.Tensor]],
+        frozen_keys: dict[str, set[str]] | None = None,
+    ) -> dict[str, Any]:
+        """Build the delta of `state_dicts` with respect to the previous call.
+
+        Args:
+            state_dicts: Mapping from a module name (e.g. "policy") to its state dict.
+            frozen_keys: Mapping from a module name to the keys of its state dict that never change.
+
+        Returns:
+            The delta, with the changed tensors in "state_dicts" and their version in "versions".
+        """
+        self.version += 1
+        frozen_keys = frozen_keys or {}
+
+        delta = {"version": self.version, "state_dicts": {}, "versions": {}}
+        for module_name, state_dict in state_dicts.items():
+            last_pushed = self._last_pushed.setdefault(module_name, {})
+            frozen = frozen_keys.get(module_name, set())
+            changed = {}
+            for key, tensor in state_dict.items():
+                previous = last_pushed.get(key)
+                if previous is not None and (key in frozen or torch.equal(previous, tensor)):
+                    continue
+                last_pushed[key] = tensor.detach().clone()
+                tensor = tensor.detach().to("cpu")
+                if self.dtype is not None and tensor.is_floating_point():
+                    tensor = tensor.to(self.dtype)
+                changed[key] = tensor
+
+            delta["state_dicts"][module_name] = changed
+            delta["versions"][module_name] = dict.fromkeys(changed, self.version)
+
+        return delta
+
+
+def merge_parameters_deltas(base: dict[str, Any] | None, delta: dict[str, Any]) -> dict[str, Any]:
+    """Merge `delta` into `base` in place, keeping the most recent version of every tensor."""
+    if base is None:
+        return delta
+
+    base["version"] = max(base["version"], delta["version"])
+    for module_name, state_dict in delta["state_dicts"].items():
+        base_state_dict = base["state_dicts"].setdefault(module_name, {})
+        base_versions = base["versions"].setdefault(module_name, {})
+        for key, tensor in state_dict.items():
+            version = delta["versions"][module_name][key]
+            if version >= base_versions.get(key, -1):
+                base_state_dict[key] = tensor
+                base_versions[key] = version
+    return base
+
+
+def select_parameters_delta(state: dict[str, Any], since_version: int) -> dict[str, Any]:
+    """Select the tensors of a merged delta that changed after `since_version`."""
+    delta = {"version": state["version"], "state_dicts": {}, "versions": {}}
+    for module_name, versions in state["versions"].items():
+        keys = [key for key, version in versions.items() if version > since_version]
+        delta["state_dicts"][module_name] = {key: state["state_dicts"][module_name][key] for key in keys}
+        delta["versions"][module_name] = {key: versions[key] for key in keys}
+    return delta
+
+
+def apply_parameters_delta(
+    modules: dict[str, torch.nn.Module],
+    delta: dict[str, Any],
+    applied_versions: dict[str, dict[str, int]],
+) -> int:
+    """Copy the tensors of `delta` in place into the parameters and buffers of `modules`.
+
+    Tensors that are older than the version already applied (tracked in `applied_versions`, updated in place)
+    are skipped. Returns the number of tensors that were copied.
+    """
+    num_applied = 0
+    with torch.no_grad():
+        for module_name, state_dict in delta["state_dicts"].items():
+            module = modules.get(module_name)
+            if module is None:
+                continue
+            targets = module.state_dict(keep_vars=True)
+            module_versions = applied_versions.setdefault(module_name, {})
+            for key, tensor in state_dict.items():
+                version = delta["versions"][module_name][key]
+                if version <= module_versions.get(key, -1):
+                    continue
+                if key not in targets:
+                    raise KeyError(f"Unexpected key '{key}' in the parameters received for '{module_name}'")
+                targets[key].copy_(tensor)
+                module_versions[key] = version
+                num_applied += 1
+    return num_applied
+
+
 def python_object_to_bytes(python_object: Any) -> bytes:
     return pickle.dumps(python_object)
 
@@ -147,6 +293,243 @@ def transitions_to_bytes(transitions: list[Transition]) -> bytes:
     return buffer.getvalue()
 
 
+def is_framed_transitions(buffer: bytes) -> bool:
+    return buffer[: len(TRANSITIONS_MAGIC)] == TRANSITIONS_MAGIC
+
+
+def _transition_fields(transition: Transition) -> dict[str, torch.Tensor]:
+    """Flatten a transition into named CPU tensors, e.g. "state/observation.state" or "reward"."""
+    fields = {}
+    for key, value in transition["state"].items():
+        fields[f"state/{key}"] = value
+    for key, value in transition["next_state"].items():
+        fields[f"next_state/{key}"] = value
+    fields["action"] = transition["action"]
+    fields["reward"] = transition["reward"]
+    fields["done"] = transition["done"]
+    fields["truncated"] = transition["truncated"]
+    for key, value in (transition.get("complementary_info") or {}).items():
+        fields[f"complementary_info/{key}"] = value
+    return {name: torch.as_tensor(value).detach().cpu() for name, value in fields.items()}
+
+
+def _is_image_field(name: str) -> bool:
+    return name.split("/", 1)[-1].startswith("observation.image")
+
+
+def _align(size: int) -> int:
+    return (size + TRANSITIONS_ALIGNMENT - 1) // TRANSITIONS_ALIGNMENT * TRANSITIONS_ALIGNMENT
+
+
+def _encode_jpeg(images: torch.Tensor) -> list[bytes]:
+    import cv2
+
+    if images.is_floating_point():
+        images = (images.clamp(0, 1) * 255).round()
+    images = images.to(torch.uint8).reshape(len(images), *images.shape[-3:]).permute(0, 2, 3, 1).numpy()
+    blobs = []
+    for image in images:
+        success, encoded = cv2.imencode(".jpg", image, [cv2.IMWRITE_JPEG_QUALITY, TRANSITIONS_JPEG_QUALITY])
+        if not success:
+            raise RuntimeError("Failed to encode image as JPEG")
+        blobs.append(encoded.tobytes())
+    return blobs
+
+
+def _decode_jpeg(blobs: list[memoryview], dtype: torch.dtype, shape: tuple[int, ...]) -> torch.Tensor:
+    import cv2
+
+    images = [cv2.imdecode(np.frombuffer(blob, dtype=np.uint8), cv2.IMREAD_UNCHANGED) for blob in blobs]
+    images = torch.from_numpy(np.stack(images)).reshape(len(images), *shape[-2:], shape[-3])
+    images = images.permute(0, 3, 1, 2).reshape(len(images), *shape)
+    if dtype.is_floating_point:
+        return images.to(dtype) / 255
+    return images.to(dtype)
+
+
+class TransitionsEncoder:
+    """Serialize batches of transitions into a compact binary format.
+
+    Unlike `transitions_to_bytes`, the keys, dtypes and shapes of the transitions are described once by a
+    schema that is only embedded in the first message, whenever it changes and every
+    `TRANSITIONS_SCHEMA_RESEND_INTERVAL` messages. Each field of the batch is
+    then sent as a single contiguous buffer of shape (N, *item_shape), which the learner reads back without
+    unpickling and stores in its replay buffer with one vectorized write (`TransitionsDecoder`).
+    """
+
+    def __init__(self, image_codec: str | None = None):
+        """
+        Args:
+            image_codec: Optional codec for the image observations: "zlib" (lossless) or "jpeg" (lossy, the
+                images are quantized to uint8). Other fields are always sent raw.
+        """
+        if image_codec not in TRANSITIONS_IMAGE_CODECS:
+            raise ValueError(
+                f"Unsupported image codec {image_codec}, expected one of {TRANSITIONS_IMAGE_CODECS}"
+            )
+        self.image_codec = image_codec
+        self._messages_since_schema: dict[str, int] = {}
+
+    def _field_codec(self, name: str, shape: tuple[int, ...]) -> str | None:
+        if self.image_codec is None or not _is_image_field(name):
+            return None
+        if self.image_codec == "jpeg" and (
+            len(shape) < 3 or math.prod(shape[:-3]) != 1 or shape[-3] not in (1, 3)
+        ):
+            # Only single (C, H, W) images with 1 or 3 channels can be stored as JPEG
+            return "zlib"
+        return self.image_codec
+
+    def encode(self, transitions: list[Transition]) -> bytes:
+        if len(transitions) == 0:
+            return _pack_transitions_message({"num_transitions": 0}, [])
+
+        fields = [_transition_fields(transition) for transition in transitions]
+        schema = [
+            {
+                "name": name,
+                "dtype": str(tensor.dtype).removeprefix("torch."),
+                "shape": list(tensor.shape),
+                "codec": self._field_codec(name, tuple(tensor.shape)),
+            }
+            for name, tensor in fields[0].items()
+        ]
+        schema_id = hashlib.sha1(json.dumps(schema).encode()).hexdigest()[:16]  # nosec B324
+        header = {"num_transitions": len(transitions), "schema_id": schema_id, "sizes": []}
+        messages_since_schema = self._messages_since_schema.get(schema_id)
+        if messages_since_schema is None or messages_since_schema >= TRANSITIONS_SCHEMA_RESEND_INTERVAL:
+            header["schema"] = schema
+            messages_since_schema = 0
+        self._messages_since_schema[schema_id] = messages_since_schema + 1
+
+        payloads = []
+        for field in schema:
+            name = field["name"]
+            try:
+                batch = torch.stack([transition_fields[name] for transition_fields in fields])
+            except (KeyError, RuntimeError) as e:
+                raise ValueError(f"All the transitions of a batch must share the same fields: {e}") from e
+
+            if field["codec"] == "jpeg":
+                blobs = _encode_jpeg(batch)
+                header["sizes"].append([len(blob) for blob in blobs])
+                payloads.append(b"".join(blobs))
+                continue
+
+            data = batch.contiguous().view(torch.uint8).numpy().tobytes()
+            if field["codec"] == "zlib":
+                data = zlib.compress(data, level=1)
+            header["sizes"].append(len(data))
+            payloads.append(data)
+
+        return _pack_transitions_message(header, payloads)
+
+
+def _pack_transitions_message(header: dict[str, Any], payloads: list[bytes]) -> bytes:
+    header_bytes = json.dumps(header).encode()
+    buffer = io.BytesIO()
+    buffer.write(TRANSITIONS_MAGIC)
+    buffer.write(struct.pack("<I", len(header_bytes)))
+    buffer.write(header_bytes)
+    for payload in payloads:
+        # Keep every payload aligned so that the decoder can view it with any dtype
+        buffer.write(b"\0" * (_align(buffer.tell()) - buffer.tell()))
+        buffer.write(payload)
+    return buffer.getvalue()
+
+
+class UnknownTransitionsSchemaError(ValueError):
+    """Raised when decoding a message whose schema was described in a message the decoder never saw."""
+
+
+class TransitionsDecoder:
+    """Decode the messages produced by a `TransitionsEncoder`.
+
+    The decoder remembers the schemas it has seen, so one decoder must be kept per stream of messages.
+    """
+
+    def __init__(self):
+        self._schemas: dict[str, list[dict[str, Any]]] = {}
+
+    def decode(self, buffer: bytes) -> dict[str, Any] | None:
+        """Decode a message into a batch of transitions.
+
+        Returns:
+            A dict with the same keys as a `Transition`, where every value has a leading batch dimension
+            ("complementary_info" is None when the transitions had none), or None for an empty message.
+        """
+        if not is_framed_transitions(buffer):
+            raise ValueError("Buffer does not contain transitions encoded with TransitionsEncoder")
+
+        offset = len(TRANSITIONS_MAGIC)
+        (header_size,) = struct.unpack_from("<I", buffer, offset)
+        offset += 4
+        header = json.loads(bytes(buffer[offset : offset + header_size]))
+        offset += header_size
+
+        num_transitions = header["num_transitions"]
+        if num_transitions == 0:
+            return None
+
+        schema_id = header["schema_id"]
+        if "schema" in header:
+            self._schemas[schema_id] = header["schema"]
+        if schema_id not in self._schemas:
+            raise UnknownTransitionsSchemaError(
+                f"Unknown transitions schema {schema_id}, the message describing it was missed"
+            )
+
+        # A single copy of the message that all the decoded tensors share without further copies
+        data = bytearray(buffer)
+        view = memoryview(data)
+        batch = {"state": {}, "next_state": {}, "complementary_info": {}}
+        for field, size in zip(self._schemas[schema_id], header["sizes"], strict=True):
+            offset = _align(offset)
+            dtype = getattr(torch, field["dtype"])
+            shape = tuple(field["shape"])
+            if field["codec"] == "jpeg":
+                blobs = []
+                for blob_size in size:
+                    blobs.append(view[offset : offset + blob_size])
+                    offset += blob_size
+                tensor = _decode_jpeg(blobs, dtype, shape)
+            else:
+                if field["codec"] == "zlib":
+                    raw = bytearray(zlib.decompress(view[offset : offset + size]))
+                    tensor = torch.frombuffer(raw, dtype=dtype)
+                else:
+                    count = size // dtype.itemsize
+                    tensor = torch.frombuffer(data, dtype=dtype, count=count, offset=offset)
+                tensor = tensor.reshape(num_transitions, *shape)
+                offset += size
+
+            group, _, key = field["name"].rpartition("/")
+            if group:
+                batch[group][key] = tensor
+            else:
+                batch[key] = tensor
+
+        if not batch["complementary_info"]:
+            batch["complementary_info"] = None
+        return batch
+
+
+def actor_id_metadata(actor_id: str | None) -> tuple[tuple[str, str], ...]:
+    """gRPC call metadata identifying an actor to the learner."""
+    if actor_id is None:
+        return ()
+    return ((ACTOR_ID_METADATA_KEY, actor_id),)
+
+
+def get_actor_id(context) -> str:
+    """Read the actor id sent with `actor_id_metadata` from the context of a gRPC call."""
+    if context is not None:
+        for key, value in context.invocation_metadata() or ():
+            if key == ACTOR_ID_METADATA_KEY:
+                return value
+    return DEFAULT_ACTOR_ID
+
+
 def grpc_channel_options(
     max_receive_message_length: int = MAX_MESSAGE_SIZE,
     max_send_message_length: int = MAX_MESSAGE_SIZE,
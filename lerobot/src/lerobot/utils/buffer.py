@@ -15,15 +15,20 @@
 # limitations under the License.
 
 import functools
+import json
+import os
 from collections.abc import Callable, Sequence
 from contextlib import suppress
+from pathlib import Path
 from typing import TypedDict
 
+import numpy as np
 import torch
 import torch.nn.functional as F  # noqa: N812
 from tqdm import tqdm
 
 from lerobot.datasets.lerobot_dataset import LeRobotDataset
+from lerobot.datasets.online_buffer import _make_memmap_safe
 from lerobot.utils.transition import Transition
 
 
@@ -77,6 +82,9 @@ def random_shift(images: torch.Tensor, pad: int = 4):
 
 
 class ReplayBuffer:
+    LAYOUT_FILE = "layout.json"
+    CURSOR_FILE = "cursor.mmap"
+
     def __init__(
         self,
         capacity: int,
@@ -86,12 +94,14 @@ class ReplayBuffer:
         use_drq: bool = True,
         storage_device: str = "cpu",
         optimize_memory: bool = False,
+        storage_dir: str | Path | None = None,
     ):
         """
         Replay buffer for storing transitions.
         It will allocate tensors on the specified device, when the first transition is added.
         NOTE: If you encounter memory issues, you can try to use the `optimize_memory` flag to save memory or
-        and use the `storage_device` flag to store the buffer on a different device.
+        and use the `storage_device` flag to store the buffer on a different device. For buffers that do not
+        fit in RAM, use the `storage_dir` flag to back the storage with numpy memmap files.
         Args:
             capacity (int): Maximum number of transitions to store in the buffer.
             device (str): The device where the tensors will be moved when sampling ("cuda:0" or "cpu").
@@ -103,9 +113,15 @@ class ReplayBuffer:
                 Using "cpu" can help save GPU memory.
             optimize_memory (bool): If True, optimizes memory by not storing duplicate next_states when
                 they can be derived from states. This is useful for large datasets where next_state[i] = state[i+1].
+            storage_dir (str | Path | None): If provided, the storage tensors are backed by numpy memmap files
+                in this directory instead of RAM, so the capacity is bounded by disk space. If the directory
+                already holds a buffer (e.g. when the learner restarts), it is reopened in read-write mode
+                and its transitions are immediately available for sampling.
         """
         if capacity <= 0:
             raise ValueError("Capacity must be greater than 0.")
+        if storage_dir is not None and torch.device(storage_device).type != "cpu":
+            raise ValueError("A disk-backed replay buffer (`storage_dir`) requires `storage_device='cpu'`.")
 
         self.capacity = capacity
         self.device = device
@@ -114,6 +130,9 @@ class ReplayBuffer:
         self.size = 0
         self.initialized = False
         self.optimize_memory = optimize_memory
+        self.storage_dir = Path(storage_dir) if storage_dir is not None else None
+        self._memmaps: list[np.memmap] = []
+        self._cursor: np.memmap | None = None
 
         # Track episode boundaries for memory optimization
         self.episode_ends = torch.zeros(capacity, dtype=torch.bool, device=storage_device)
@@ -128,6 +147,9 @@ class ReplayBuffer:
             self.image_augmentation_function = torch.compile(base_function)
         self.use_drq = use_drq
 
+        if self.storage_dir is not None and (self.storage_dir / self.LAYOUT_FILE).exists():
+            self._open_storage()
+
     def _initialize_storage(
         self,
         state: dict[str, torch.Tensor],
@@ -136,53 +158,137 @@ class ReplayBuffer:
     ):
         """Initialize the storage tensors based on the first transition."""
         # Determine shapes from the first transition
-        state_shapes = {key: val.squeeze(0).shape for key, val in state.items()}
-        action_shape = action.squeeze(0).shape
+        state_shapes = {key: tuple(val.squeeze(0).shape) for key, val in state.items()}
+        action_shape = tuple(action.squeeze(0).shape)
 
-        # Pre-allocate tensors for storage
+        complementary_info_shapes = None
+        if complementary_info is not None:
+            complementary_info_shapes = {}
+            for key, value in complementary_info.items():
+                if isinstance(value, torch.Tensor):
+                    complementary_info_shapes[key] = tuple(value.squeeze(0).shape)
+                elif isinstance(value, (int, float)):
+                    # Handle scalar values similar to reward
+                    complementary_info_shapes[key] = ()
+                else:
+                    raise ValueError(f"Unsupported type {type(value)} for complementary_info[{key}]")
+
+        layout = {
+            "capacity": self.capacity,
+            "optimize_memory": self.optimize_memory,
+            "state_shapes": state_shapes,
+            "action_shape": action_shape,
+            "complementary_info_shapes": complementary_info_shapes,
+        }
+        if self.storage_dir is not None:
+            self.storage_dir.mkdir(parents=True, exist_ok=True)
+            # The layout is written last so that a partially created storage is never reopened.
+            self._allocate_from_layout(layout, mode="w+")
+            tmp_path = self.storage_dir / f"{self.LAYOUT_FILE}.tmp"
+            with open(tmp_path, "w") as f:
+                json.dump(layout, f, indent=4)
+            os.replace(tmp_path, self.storage_dir / self.LAYOUT_FILE)
+        else:
+            self._allocate_from_layout(layout)
+
+    def _allocate(self, name: str, shape: tuple, dtype: torch.dtype, mode: str | None = None) -> torch.Tensor:
+        """Allocate one storage tensor, backed by a memmap file when `storage_dir` is set."""
+        if self.storage_dir is None:
+            return torch.empty(shape, dtype=dtype, device=self.storage_device)
+
+        memmap = _make_memmap_safe(
+            filename=self.storage_dir / f"{name}.mmap",
+            dtype=np.dtype("bool" if dtype == torch.bool else "float32"),
+            mode=mode,
+            shape=shape,
+        )
+        self._memmaps.append(memmap)
+        # Zero-copy view: writes through the tensor land directly in the memmap pages.
+        return torch.from_numpy(memmap)
+
+    def _allocate_from_layout(self, layout: dict, mode: str | None = None):
+        """Pre-allocate the storage tensors described by `layout`."""
+        capacity = layout["capacity"]
         self.states = {
-            key: torch.empty((self.capacity, *shape), device=self.storage_device)
-            for key, shape in state_shapes.items()
+            key: self._allocate(f"states.{key}", (capacity, *shape), torch.float32, mode)
+            for key, shape in layout["state_shapes"].items()
         }
-        self.actions = torch.empty((self.capacity, *action_shape), device=self.storage_device)
-        self.rewards = torch.empty((self.capacity,), device=self.storage_device)
+        self.actions = self._allocate("actions", (capacity, *layout["action_shape"]), torch.float32, mode)
+        self.rewards = self._allocate("rewards", (capacity,), torch.float32, mode)
 
         if not self.optimize_memory:
             # Standard approach: store states and next_states separately
             self.next_states = {
-                key: torch.empty((self.capacity, *shape), device=self.storage_device)
-                for key, shape in state_shapes.items()
+                key: self._allocate(f"next_states.{key}", (capacity, *shape), torch.float32, mode)
+                for key, shape in layout["state_shapes"].items()
             }
         else:
             # Memory-optimized approach: don't allocate next_states buffer
             # Just create a reference to states for consistent API
             self.next_states = self.states  # Just a reference for API consistency
 
-        self.dones = torch.empty((self.capacity,), dtype=torch.bool, device=self.storage_device)
-        self.truncateds = torch.empty((self.capacity,), dtype=torch.bool, device=self.storage_device)
+        self.dones = self._allocate("dones", (capacity,), torch.bool, mode)
+        self.truncateds = self._allocate("truncateds", (capacity,), torch.bool, mode)
 
         # Initialize storage for complementary_info
-        self.has_complementary_info = complementary_info is not None
+        self.has_complementary_info = layout["complementary_info_shapes"] is not None
         self.complementary_info_keys = []
         self.complementary_info = {}
 
         if self.has_complementary_info:
-            self.complementary_info_keys = list(complementary_info.keys())
+            self.complementary_info_keys = list(layout["complementary_info_shapes"].keys())
             # Pre-allocate tensors for each key in complementary_info
-            for key, value in complementary_info.items():
-                if isinstance(value, torch.Tensor):
-                    value_shape = value.squeeze(0).shape
-                    self.complementary_info[key] = torch.empty(
-                        (self.capacity, *value_shape), device=self.storage_device
-                    )
-                elif isinstance(value, (int, float)):
-                    # Handle scalar values similar to reward
-                    self.complementary_info[key] = torch.empty((self.capacity,), device=self.storage_device)
-                else:
-                    raise ValueError(f"Unsupported type {type(value)} for complementary_info[{key}]")
+            for key, shape in layout["complementary_info_shapes"].items():
+                self.complementary_info[key] = self._allocate(
+                    f"complementary_info.{key}", (capacity, *shape), torch.float32, mode
+                )
+
+        if self.storage_dir is not None:
+            # (position, size) of the valid transitions. Only advanced once a transition is fully written.
+            self._cursor = _make_memmap_safe(
+                filename=self.storage_dir / self.CURSOR_FILE, dtype=np.dtype("int64"), mode=mode, shape=(2,)
+            )
+            self.position, self.size = (int(v) for v in self._cursor)
 
         self.initialized = True
 
+    def _open_storage(self):
+        """Reopen the memmap storage of an existing disk-backed buffer."""
+        with open(self.storage_dir / self.LAYOUT_FILE) as f:
+            layout = json.load(f)
+
+        if layout["capacity"] != self.capacity:
+            raise ValueError(
+                f"The replay buffer stored in {self.storage_dir} has a capacity of {layout['capacity']}, "
+                f"but a capacity of {self.capacity} was requested."
+            )
+        if layout["optimize_memory"] != self.optimize_memory:
+            raise ValueError(
+                f"The replay buffer stored in {self.storage_dir} was created with "
+                f"optimize_memory={layout['optimize_memory']}."
+            )
+        self._allocate_from_layout(layout, mode="r+")
+
+    def _write_cursor(self):
+        if self._cursor is not None:
+            self._cursor[:] = (self.position, self.size)
+
+    def snapshot(self):
+        """Flush a disk-backed buffer so that it can be reopened from `storage_dir` after a restart.
+
+        Unlike `to_lerobot_dataset`, nothing is re-encoded: the memmap files already are the snapshot.
+        """
+        if self.storage_dir is None:
+            raise RuntimeError("Only a disk-backed replay buffer (`storage_dir`) can be snapshotted.")
+        if not self.initialized:
+            return
+
+        for memmap in self._memmaps:
+            memmap.flush()
+        # The cursor is flushed last, so it never points to transitions that are not on disk yet.
+        self._write_cursor()
+        self._cursor.flush()
+
     def __len__(self):
         return self.size
 
@@ -201,6 +307,11 @@ class ReplayBuffer:
         if not self.initialized:
             self._initialize_storage(state=state, action=action, complementary_info=complementary_info)
 
+        if self.size == self.capacity and self._cursor is not None:
+            # The oldest transition is about to be overwritten: drop it from the persisted cursor first so
+            # that a crash in the middle of the write never exposes a half-written transition.
+            self._cursor[1] = self.capacity - 1
+
         # Store the transition in pre-allocated tensors
         for key in self.states:
             self.states[key][self.position].copy_(state[key].squeeze(dim=0))
@@ -227,6 +338,85 @@ class ReplayBuffer:
 
         self.position = (self.position + 1) % self.capacity
         self.size = min(self.size + 1, self.capacity)
+        self._write_cursor()
+
+    def add_batch(
+        self,
+        state: dict[str, torch.Tensor],
+        action: torch.Tensor,
+        reward: torch.Tensor,
+        next_state: dict[str, torch.Tensor],
+        done: torch.Tensor,
+        truncated: torch.Tensor,
+        complementary_info: dict[str, torch.Tensor] | None = None,
+    ):
+        """Saves a batch of transitions at once, e.g. as decoded by `TransitionsDecoder`.
+
+        Every value has a leading batch dimension of size N and the transitions are stored in order, as if
+        `add` had been called N times, but with a single indexed write per storage tensor.
+        """
+        num_transitions = len(action)
+        if num_transitions == 0:
+            return
+
+        if not self.initialized:
+            self._initialize_storage(
+                state={key: val[0] for key, val in state.items()},
+                action=action[0],
+                complementary_info=(
+                    {key: val[0] for key, val in complementary_info.items()}
+                    if complementary_info is not None
+                    else None
+                ),
+            )
+
+        overwritten = max(0, self.size + num_transitions - self.capacity)
+        if overwritten > 0 and self._cursor is not None:
+            # Same as in `add`: never expose the slots that are about to be overwritten after a crash.
+            self._cursor[1] = max(0, self.size - overwritten)
+
+        if num_transitions > self.capacity:
+            # Only the most recent transitions would survive the wrap-around
+            skipped = num_transitions - self.capacity
+            self.position = (self.position + skipped) % self.capacity
+            self.size = min(self.size + skipped, self.capacity)
+            state = {key: val[skipped:] for key, val in state.items()}
+            next_state = {key: val[skipped:] for key, val in next_state.items()}
+            action, reward, done, truncated = (
+                action[skipped:],
+                reward[skipped:],
+                done[skipped:],
+                truncated[skipped:],
+            )
+            if complementary_info is not None:
+                complementary_info = {key: val[skipped:] for key, val in complementary_info.items()}
+            num_transitions = self.capacity
+
+        indices = (self.position + torch.arange(num_transitions)) % self.capacity
+        indices = indices.to(self.storage_device)
+
+        def write(storage: torch.Tensor, values: torch.Tensor):
+            values = torch.as_tensor(values).to(self.storage_device, dtype=storage.dtype)
+            storage[indices] = values.reshape(num_transitions, *storage.shape[1:])
+
+        for key in self.states:
+            write(self.states[key], state[key])
+            if not self.optimize_memory:
+                write(self.next_states[key], next_state[key])
+
+        write(self.actions, action)
+        write(self.rewards, reward)
+        write(self.dones, done)
+        write(self.truncateds, truncated)
+
+        if complementary_info is not None and self.has_complementary_info:
+            for key in self.complementary_info_keys:
+                if key in complementary_info:
+                    write(self.complementary_info[key], complementary_info[key])
+
+        self.position = (self.position + num_transitions) % self.capacity
+        self.size = min(self.size + num_transitions, self.capacity)
+        self._write_cursor()
 
     def sample(self, batch_size: int) -> BatchTransition:
         """Sample a random batch of transitions and collate them into batched tensors."""
@@ -238,6 +428,10 @@ class ReplayBuffer:
 
         # Random indices for sampling - create on the same device as storage
         idx = torch.randint(low=0, high=high, size=(batch_size,), device=self.storage_device)
+        if self.size < self.capacity and self.position != self.size:
+            # Only happens when a disk-backed buffer is reopened after a crash during an overwrite:
+            # the valid transitions are the `size` slots preceding `position`.
+            idx = (idx + self.position - self.size) % self.capacity
 
         # Identify image keys that need augmentation
         image_keys = [k for k in self.states if k.startswith("observation.image")] if self.use_drq else []
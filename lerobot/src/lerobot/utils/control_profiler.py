@@ -0,0 +1,212 @@
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Per-stage latency profiling of control loops (record, teleoperate).
+
+Every stage of an iteration (`get_observation`, `predict_action`, `send_action`, `add_frame`, ...) is timed
+with a `TimerManager` whose history is a bounded ring buffer, so that profiling can stay on for a whole
+recording session. The spans can be exported as a Chrome trace (`chrome://tracing` or https://ui.perfetto.dev),
+and summarized at the end of an episode: per-stage latency percentiles, jitter of the loop period and number
+of missed deadlines.
+
+Example:
+    ```python
+    profiler = ControlLoopProfiler(fps=30)
+    while recording:
+        profiler.start_iteration()
+        with profiler.span("get_observation"):
+            observation = robot.get_observation()
+        ...
+        profiler.end_of_work()
+        busy_wait(1 / fps - dt_s)
+    profiler.end_iteration()
+
+    logging.info(profiler.format_summary())
+    profiler.export_chrome_trace("trace.json")
+    ```
+"""
+
+import functools
+import json
+import os
+import time
+from contextlib import nullcontext
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+from lerobot.utils.utils import TimerManager
+
+LOOP_SPAN = "loop"
+WORK_SPAN = "work"
+JITTER_BINS_MS = (-np.inf, -5, -2, -1, -0.5, 0.5, 1, 2, 5, 10, 20, np.inf)
+
+
+class ControlLoopProfiler:
+    """Records per-stage spans of a control loop running at `fps`.
+
+    Two spans are recorded for every iteration started with `start_iteration()`: `"loop"`, its full period up
+    to the start of the next iteration, and `"work"`, until `end_of_work()` is called before waiting for the
+    next tick. A deadline is missed when the work takes longer than the period `1 / fps`.
+
+    Args:
+        fps (float): Target frequency of the loop.
+        capacity (int): Number of spans kept per stage. Defaults to 36_000 (20min at 30 fps).
+        enabled (bool): When `False`, every method is a no-op, so that loops can be instrumented
+            unconditionally. Defaults to `True`.
+    """
+
+    def __init__(self, fps: float, capacity: int = 36_000, enabled: bool = True):
+        self.fps = fps
+        self.capacity = capacity
+        self.enabled = enabled
+        self.timers: dict[str, TimerManager] = {}
+        self._loop_timer: TimerManager | None = None
+        self._work_timer: TimerManager | None = None
+        # perf_counter() has an arbitrary origin, the trace is relative to the creation of the profiler
+        self._origin = time.perf_counter()
+
+    def timer(self, name: str) -> TimerManager:
+        if name not in self.timers:
+            self.timers[name] = TimerManager(name, log=False, capacity=self.capacity)
+        return self.timers[name]
+
+    def span(self, name: str) -> TimerManager | nullcontext:
+        """Context manager timing the stage `name`."""
+        return self.timer(name) if self.enabled else nullcontext()
+
+    def start_iteration(self) -> None:
+        """Marks the start of an iteration of the control loop, and the end of the previous one."""
+        if not self.enabled:
+            return
+        self.end_iteration()
+        self._loop_timer = self.timer(LOOP_SPAN).start()
+        self._work_timer = self.timer(WORK_SPAN).start()
+
+    def end_of_work(self) -> None:
+        """Marks the end of the work of the current iteration, before waiting for the next one."""
+        if self._work_timer is not None:
+            self._work_timer.stop()
+            self._work_timer = None
+
+    def end_iteration(self) -> None:
+        """Marks the end of the current iteration, e.g. when exiting the control loop."""
+        # Iterations skipped with `continue` have no wait, all their time is work
+        self.end_of_work()
+        if self._loop_timer is not None:
+            self._loop_timer.stop()
+            self._loop_timer = None
+
+    def instrument(self, obj: Any, method_name: str, span_name: str | None = None) -> None:
+        """Time every call to `obj.method_name`, e.g. the `async_read` of a camera, as the stage `span_name`."""
+        if not self.enabled:
+            return
+        method = getattr(obj, method_name)
+        timer = self.timer(span_name or f"{type(obj).__name__}.{method_name}")
+
+        @functools.wraps(method)
+        def timed_method(*args, **kwargs):
+            with timer:
+                return method(*args, **kwargs)
+
+        setattr(obj, method_name, timed_method)
+
+    def reset(self) -> None:
+        for timer in self.timers.values():
+            timer.reset()
+
+    def deadline_misses(self) -> int:
+        if WORK_SPAN not in self.timers:
+            return 0
+        return int(np.sum(np.asarray(self.timers[WORK_SPAN].history) > 1 / self.fps))
+
+    def summary(self) -> dict[str, Any]:
+        """Latency percentiles (ms) per stage, jitter histogram of the loop period (ms) and deadline misses."""
+        stages = {}
+        for name, timer in self.timers.items():
+            if timer.count == 0:
+                continue
+            durations_ms = np.asarray(timer.history) * 1e3
+            stages[name] = {
+                "count": timer.count,
+                "mean": float(durations_ms.mean()),
+                "p50": float(np.percentile(durations_ms, 50)),
+                "p90": float(np.percentile(durations_ms, 90)),
+                "p99": float(np.percentile(durations_ms, 99)),
+                "max": float(durations_ms.max()),
+            }
+
+        summary = {"fps": self.fps, "stages": stages, "deadline_misses": self.deadline_misses()}
+        if LOOP_SPAN in self.timers and self.timers[LOOP_SPAN].count > 0:
+            jitter_ms = (np.asarray(self.timers[LOOP_SPAN].history) - 1 / self.fps) * 1e3
+            counts, _ = np.histogram(jitter_ms, bins=JITTER_BINS_MS)
+            summary["jitter"] = {
+                "std": float(jitter_ms.std()),
+                "max": float(np.abs(jitter_ms).max()),
+                "histogram": dict(zip(_format_bins(JITTER_BINS_MS), counts.tolist(), strict=True)),
+            }
+        return summary
+
+    def format_summary(self) -> str:
+        summary = self.summary()
+        lines = [
+            f"{'STAGE':<24} | {'COUNT':>6} | {'MEAN':>7} | {'P50':>7} | {'P90':>7} | {'P99':>7} | {'MAX':>7}"
+        ]
+        for name, stats in summary["stages"].items():
+            lines.append(
+                f"{name:<24} | {stats['count']:>6} | {stats['mean']:>7.2f} | {stats['p50']:>7.2f} | "
+                f"{stats['p90']:>7.2f} | {stats['p99']:>7.2f} | {stats['max']:>7.2f}"
+            )
+        num_loops = summary["stages"].get(WORK_SPAN, {}).get("count", 0)
+        lines.append(f"Deadline misses ({1e3 / self.fps:.2f} ms): {summary['deadline_misses']}/{num_loops}")
+        if "jitter" in summary:
+            jitter = summary["jitter"]
+            lines.append(f"Loop period jitter (ms): std={jitter['std']:.2f} max={jitter['max']:.2f}")
+            for bin_name, count in jitter["histogram"].items():
+                if count:
+                    lines.append(f"  {bin_name:>14} | {count}")
+        return "\n".join(lines)
+
+    def to_chrome_trace(self) -> dict[str, Any]:
+        """Spans as complete ("X") events of the Chrome trace event format, also read by Perfetto."""
+        pid = os.getpid()
+        events = []
+        # One track per stage, as nested spans would otherwise need to be strictly stacked on a track
+        for tid, (name, timer) in enumerate(self.timers.items()):
+            events.append({"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": name}})
+            for start, elapsed in timer.spans:
+                events.append(
+                    {
+                        "name": name,
+                        "cat": "control_loop",
+                        "ph": "X",
+                        "ts": (start - self._origin) * 1e6,
+                        "dur": elapsed * 1e6,
+                        "pid": pid,
+                        "tid": tid,
+                    }
+                )
+        return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": self.summary()}
+
+    def export_chrome_trace(self, path: str | Path) -> None:
+        path = Path(path)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, "w") as f:
+            json.dump(self.to_chrome_trace(), f)
+
+
+def _format_bins(bins: tuple[float, ...]) -> list[str]:
+    return [f"[{low:g}, {high:g})" for low, high in zip(bins[:-1], bins[1:], strict=True)]
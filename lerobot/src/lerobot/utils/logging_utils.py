@@ -15,6 +15,8 @@
 # limitations under the License.
 from typing import Any
 
+import torch
+
 from lerobot.utils.utils import format_big_number
 
 
@@ -22,28 +24,59 @@ class AverageMeter:
     """
     Computes and stores the average and current value
     Adapted from https://github.com/pytorch/examples/blob/main/imagenet/main.py
+
+    Values which are not python numbers (tensors, or anything supporting `float()` such as a `DeviceTimer`) are
+    only converted when the value or the average are read, so that updating the meter with e.g. a loss on the
+    GPU does not synchronize with the device at every training step.
     """
 
+    # Maximum number of values waiting to be converted, bounding the memory when the meter is never read
+    max_pending: int = 1024
+
     def __init__(self, name: str, fmt: str = ":f"):
         self.name = name
         self.fmt = fmt
         self.reset()
 
     def reset(self) -> None:
-        self.val = 0.0
-        self.avg = 0.0
-        self.sum = 0.0
+        self._val = 0.0
+        self._sum = 0.0
+        self._pending = []
         self.count = 0.0
 
-    def update(self, val: float, n: int = 1) -> None:
-        self.val = val
-        self.sum += val * n
+    def update(self, val: Any, n: int = 1) -> None:
+        if isinstance(val, torch.Tensor):
+            val = val.detach()
+        if isinstance(val, (int, float)):
+            self._sum += val * n
+        else:
+            self._pending.append((val, n))
+            if len(self._pending) >= self.max_pending:
+                self._reduce()
+        self._val = val
         self.count += n
-        self.avg = self.sum / self.count
+
+    def _reduce(self) -> None:
+        for val, n in self._pending:
+            self._sum += float(val) * n
+        self._pending.clear()
+
+    @property
+    def val(self) -> float:
+        return float(self._val)
+
+    @property
+    def sum(self) -> float:
+        self._reduce()
+        return self._sum
+
+    @property
+    def avg(self) -> float:
+        return self.sum / self.count if self.count else 0.0
 
     def __str__(self):
         fmtstr = "{name}:{avg" + self.fmt + "}"
-        return fmtstr.format(**self.__dict__)
+        return fmtstr.format(name=self.name, avg=self.avg)
 
 
 class MetricsTracker:
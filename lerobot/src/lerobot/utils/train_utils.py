@@ -14,9 +14,19 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import logging
+import os
+import shutil
+import threading
+from collections.abc import Callable
+from concurrent.futures import Future, ThreadPoolExecutor
 from pathlib import Path
+from typing import Any
 
+import torch
+from huggingface_hub.constants import SAFETENSORS_SINGLE_FILE
+from safetensors.torch import save_model
 from termcolor import colored
+from torch import nn
 from torch.optim import Optimizer
 from torch.optim.lr_scheduler import LRScheduler
 
@@ -25,14 +35,15 @@ from lerobot.constants import (
     CHECKPOINTS_DIR,
     LAST_CHECKPOINT_LINK,
     PRETRAINED_MODEL_DIR,
+    SCHEDULER_STATE,
     TRAINING_STATE_DIR,
     TRAINING_STEP,
 )
 from lerobot.datasets.utils import load_json, write_json
-from lerobot.optim.optimizers import load_optimizer_state, save_optimizer_state
+from lerobot.optim.optimizers import load_optimizer_state, save_optimizer_state, save_optimizer_state_dict
 from lerobot.optim.schedulers import load_scheduler_state, save_scheduler_state
 from lerobot.policies.pretrained import PreTrainedPolicy
-from lerobot.utils.random_utils import load_rng_state, save_rng_state
+from lerobot.utils.random_utils import load_rng_state, save_rng_state, serialize_rng_state
 
 
 def log_output_dir(out_dir):
@@ -61,10 +72,13 @@ def load_training_step(save_dir: Path) -> int:
 
 def update_last_checkpoint(checkpoint_dir: Path) -> Path:
     last_checkpoint_dir = checkpoint_dir.parent / LAST_CHECKPOINT_LINK
-    if last_checkpoint_dir.is_symlink():
-        last_checkpoint_dir.unlink()
+    # The new link replaces the previous one atomically, so that it always points to a checkpoint
+    tmp_link = checkpoint_dir.parent / f".{LAST_CHECKPOINT_LINK}.tmp"
+    if tmp_link.is_symlink():
+        tmp_link.unlink()
     relative_target = checkpoint_dir.relative_to(checkpoint_dir.parent)
-    last_checkpoint_dir.symlink_to(relative_target)
+    tmp_link.symlink_to(relative_target)
+    os.replace(tmp_link, last_checkpoint_dir)
 
 
 def save_checkpoint(
@@ -159,3 +173,207 @@ def load_training_state(
         scheduler = load_scheduler_state(scheduler, training_state_dir)
 
     return step, optimizer, scheduler
+
+
+def _to_cpu(obj: Any, copies: dict | None = None) -> Any:
+    """Copies the tensors of a (nested) state dict to the cpu, so that they are not updated by training.
+
+    Tensors viewing the same memory (e.g. tied weights) share the same copy.
+    """
+    copies = {} if copies is None else copies
+    if isinstance(obj, torch.Tensor):
+        key = (obj.untyped_storage().data_ptr(), obj.storage_offset(), obj.shape, obj.stride(), obj.dtype)
+        if key not in copies:
+            copies[key] = obj.detach().to("cpu", copy=True)
+        return copies[key]
+    if isinstance(obj, dict):
+        return {key: _to_cpu(value, copies) for key, value in obj.items()}
+    if isinstance(obj, (list, tuple)):
+        return type(obj)(_to_cpu(value, copies) for value in obj)
+    return obj
+
+
+class _StateDictSnapshot(nn.Module):
+    """Module whose state dict is a snapshot, to save it with `safetensors.torch.save_model`."""
+
+    def __init__(self, state_dict: dict[str, torch.Tensor]):
+        super().__init__()
+        self.snapshot = state_dict
+
+    def state_dict(self, *args, **kwargs) -> dict[str, torch.Tensor]:
+        return dict(self.snapshot)
+
+
+def _fsync_tree(root: Path) -> None:
+    for dirpath, _, filenames in os.walk(root):
+        for filename in filenames:
+            with open(os.path.join(dirpath, filename), "rb") as f:
+                os.fsync(f.fileno())
+
+
+class AsyncCheckpointer:
+    """Saves checkpoints in a background thread, with the same layout as `save_checkpoint`.
+
+    `save()` only blocks training for the time it takes to copy the policy weights, optimizer state and rng
+    state to the cpu; the (small) configs and scheduler state are written right away. The snapshot is then
+    serialized by a worker thread in a staging directory next to `checkpoint_dir`, which is renamed to
+    `checkpoint_dir` once complete before `update_last_checkpoint()` is called. A crash mid-write thus
+    leaves a stale staging directory at worst, and the "last" checkpoint always points to a complete one.
+
+    Checkpoints are written in the order they are saved. Each snapshot holds a copy of the training state
+    in cpu memory until it is written, so `save()` waits for a previous save to complete when
+    `max_in_flight` of them are pending.
+
+    Example:
+        ```python
+        checkpointer = AsyncCheckpointer()
+        for step in range(steps):
+            ...
+            if step % save_freq == 0:
+                checkpointer.save(checkpoint_dir, step, cfg, policy, optimizer, lr_scheduler)
+        checkpointer.close()
+        ```
+
+    Args:
+        max_in_flight (int): Maximum number of snapshots waiting to be written or being written. Defaults
+            to 1.
+    """
+
+    def __init__(self, max_in_flight: int = 1):
+        if max_in_flight < 1:
+            raise ValueError(f"max_in_flight must be at least 1, got {max_in_flight}.")
+        self.max_in_flight = max_in_flight
+        self._slots = threading.BoundedSemaphore(max_in_flight)
+        self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="checkpointer")
+        self._futures: list[Future] = []
+
+    def save(
+        self,
+        checkpoint_dir: Path,
+        step: int,
+        cfg: TrainPipelineConfig,
+        policy: PreTrainedPolicy,
+        optimizer: Optimizer | dict[str, Optimizer],
+        scheduler: LRScheduler | None = None,
+        on_saved: Callable[[Path], None] | None = None,
+    ) -> Future:
+        """Snapshots the training state and schedules the checkpoint to be written in the background.
+
+        Args:
+            checkpoint_dir (Path): The checkpoint directory, published once the checkpoint is complete.
+            step (int): The training step at that checkpoint.
+            cfg (TrainPipelineConfig): The training config used for this run.
+            policy (PreTrainedPolicy): The policy to save.
+            optimizer (Optimizer | dict[str, Optimizer]): The optimizer(s) to save the state from.
+            scheduler (LRScheduler | None, optional): The scheduler to save the state from. Defaults to None.
+            on_saved (Callable[[Path], None] | None, optional): Called from the worker thread with
+                `checkpoint_dir` once it is published, e.g. to upload it. Defaults to None.
+
+        Raises:
+            Exception: The error raised by a previous save, if it failed.
+
+        Returns:
+            Future: Completed once the checkpoint is published.
+        """
+        self._raise_failed_saves()
+        self._slots.acquire()
+        try:
+            staged = self._stage(checkpoint_dir, step, cfg, policy, optimizer, scheduler)
+            future = self._executor.submit(self._write, staged, checkpoint_dir, on_saved)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        self._futures.append(future)
+        return future
+
+    def _stage(
+        self,
+        checkpoint_dir: Path,
+        step: int,
+        cfg: TrainPipelineConfig,
+        policy: PreTrainedPolicy,
+        optimizer: Optimizer | dict[str, Optimizer],
+        scheduler: LRScheduler | None,
+    ) -> tuple[Path, dict[str, Any]]:
+        """Writes the configs and copies the tensors to the cpu, returns the staging dir and the snapshot."""
+        staging_dir = checkpoint_dir.with_name(f".{checkpoint_dir.name}.tmp")
+        if staging_dir.exists():
+            # Left over by a crashed run
+            shutil.rmtree(staging_dir)
+
+        pretrained_dir = staging_dir / PRETRAINED_MODEL_DIR
+        policy.config.save_pretrained(pretrained_dir)
+        cfg.save_pretrained(pretrained_dir)
+        training_state_dir = staging_dir / TRAINING_STATE_DIR
+        training_state_dir.mkdir(parents=True)
+        save_training_step(step, training_state_dir)
+        if scheduler is not None:
+            write_json(scheduler.state_dict(), training_state_dir / SCHEDULER_STATE)
+
+        model = policy.module if hasattr(policy, "module") else policy
+        if isinstance(optimizer, dict):
+            optimizer_state = {name: opt.state_dict() for name, opt in optimizer.items()}
+        else:
+            optimizer_state = optimizer.state_dict()
+
+        snapshot = {
+            # Tied weights are still tied in the copy, for `save_model` to save them once
+            "model": _to_cpu(model.state_dict()),
+            "optimizer": _to_cpu(optimizer_state),
+            "optimizer_dict": isinstance(optimizer, dict),
+            "rng": serialize_rng_state(),
+        }
+        return staging_dir, snapshot
+
+    @staticmethod
+    def _write(
+        staged: tuple[Path, dict[str, Any]],
+        checkpoint_dir: Path,
+        on_saved: Callable[[Path], None] | None,
+    ) -> Path:
+        staging_dir, snapshot = staged
+        model_path = staging_dir / PRETRAINED_MODEL_DIR / SAFETENSORS_SINGLE_FILE
+        save_model(_StateDictSnapshot(snapshot["model"]), str(model_path), metadata={"format": "pt"})
+        training_state_dir = staging_dir / TRAINING_STATE_DIR
+        save_rng_state(training_state_dir, snapshot["rng"])
+        if snapshot["optimizer_dict"]:
+            for name, state in snapshot["optimizer"].items():
+                (training_state_dir / name).mkdir()
+                save_optimizer_state_dict(state, training_state_dir / name)
+        else:
+            save_optimizer_state_dict(snapshot["optimizer"], training_state_dir)
+        _fsync_tree(staging_dir)
+
+        # Publish the checkpoint, replacing the one of a previous run saved at the same step
+        previous_dir = checkpoint_dir.with_name(f".{checkpoint_dir.name}.old")
+        if previous_dir.exists():
+            # Left over by a run which crashed while publishing
+            shutil.rmtree(previous_dir)
+        if checkpoint_dir.exists():
+            os.replace(checkpoint_dir, previous_dir)
+        os.replace(staging_dir, checkpoint_dir)
+        shutil.rmtree(previous_dir, ignore_errors=True)
+        update_last_checkpoint(checkpoint_dir)
+
+        if on_saved is not None:
+            on_saved(checkpoint_dir)
+        return checkpoint_dir
+
+    def _raise_failed_saves(self) -> None:
+        failed = [future for future in self._futures if future.done() and future.exception() is not None]
+        self._futures = [future for future in self._futures if not future.done()]
+        if failed:
+            raise failed[0].exception()
+
+    def wait(self) -> None:
+        """Blocks until every scheduled checkpoint is written, raising the error of a failed save if any."""
+        futures, self._futures = self._futures, []
+        for future in futures:
+            future.result()
+
+    def close(self) -> None:
+        try:
+            self.wait()
+        finally:
+            self._executor.shutdown(wait=True)
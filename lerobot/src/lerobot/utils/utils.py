@@ -21,7 +21,8 @@ import select
 import subprocess
 import sys
 import time
-from copy import copy, deepcopy
+from collections import deque
+from copy import copy
 from datetime import datetime, timezone
 from pathlib import Path
 from statistics import mean
@@ -297,6 +298,10 @@ class TimerManager:
     timer.stop()
     print(timer.last, timer.fps_avg, timer.percentile(90))  # Prints: 0.01 100.0 0.01
     ```
+
+    With `capacity` set, only the last `capacity` measurements are kept, in a ring buffer, so that a timer can
+    run for as long as a control loop without its memory growing. The start time of each measurement is kept
+    along its duration, see `spans`.
     """
 
     def __init__(
@@ -304,12 +309,14 @@ class TimerManager:
         label: str = "Elapsed-time",
         log: bool = True,
         logger: logging.Logger | None = None,
+        capacity: int | None = None,
     ):
         self.label = label
         self.log = log
         self.logger = logger
         self._start: float | None = None
-        self._history: list[float] = []
+        self._history: deque[float] = deque(maxlen=capacity)
+        self._starts: deque[float] = deque(maxlen=capacity)
 
     def __enter__(self):
         return self.start()
@@ -326,6 +333,7 @@ class TimerManager:
             raise RuntimeError("Timer was never started.")
         elapsed = time.perf_counter() - self._start
         self._history.append(elapsed)
+        self._starts.append(self._start)
         self._start = None
         if self.log:
             if self.logger is not None:
@@ -336,6 +344,7 @@ class TimerManager:
 
     def reset(self):
         self._history.clear()
+        self._starts.clear()
 
     @property
     def last(self) -> float:
@@ -355,7 +364,12 @@ class TimerManager:
 
     @property
     def history(self) -> list[float]:
-        return deepcopy(self._history)
+        return list(self._history)
+
+    @property
+    def spans(self) -> list[tuple[float, float]]:
+        """(start, elapsed) of the recorded measurements, with `time.perf_counter()` start times."""
+        return list(zip(self._starts, self._history, strict=True))
 
     @property
     def fps_history(self) -> list[float]:
@@ -383,3 +397,49 @@ class TimerManager:
         """
         val = self.percentile(p)
         return 0.0 if val == 0 else 1.0 / val
+
+
+class DeviceTimer:
+    """
+    Measures the duration of the work queued on a device between `start()` and `stop()`.
+
+    On CUDA, where the work runs asynchronously, the duration is measured with events and only read (waiting
+    for the work to be done) when the timer is converted with `float()`, e.g. when logging an `AverageMeter`.
+    On other devices, it is the elapsed host time.
+
+    Example:
+        ```python
+        timer = DeviceTimer(device).start()
+        loss = policy.forward(batch)
+        train_tracker.update_s = timer.stop()  # Not synchronized until the metrics are logged
+        ```
+    """
+
+    def __init__(self, device: torch.device):
+        self.device = device
+        self._start = None
+        self._end = None
+
+    def start(self) -> "DeviceTimer":
+        if self.device.type == "cuda":
+            self._start = torch.cuda.Event(enable_timing=True)
+            self._start.record()
+        else:
+            self._start = time.perf_counter()
+        return self
+
+    def stop(self) -> "DeviceTimer":
+        if self.device.type == "cuda":
+            self._end = torch.cuda.Event(enable_timing=True)
+            self._end.record()
+        else:
+            self._end = time.perf_counter()
+        return self
+
+    def __float__(self) -> float:
+        if self._start is None or self._end is None:
+            raise RuntimeError("DeviceTimer must be started and stopped before reading its duration")
+        if self.device.type == "cuda":
+            self._end.synchronize()
+            return self._start.elapsed_time(self._end) / 1e3
+        return self._end - self._start
@@ -213,3 +213,50 @@ def test_predict_action_chunk(monkeypatch, policy_server):
     for i, ta in enumerate(timed_actions):
         expected_ts = obs.get_timestamp() + i * policy_server.config.environment_dt
         assert abs(ta.get_timestamp() - expected_ts) < 1e-6
+
+
+def test_observations_of_several_clients_are_batched(policy_server):
+    """Clients sharing a policy get their action chunks from a single batched forward pass."""
+    import threading
+
+    from lerobot.scripts.server.policy_server import InferenceRequest
+
+    batch_sizes = []
+    predict_action_chunk = policy_server.policy.predict_action_chunk
+
+    def _counting_predict_action_chunk(observation):
+        batch_sizes.append(len(observation["observation.state"]))
+        return predict_action_chunk(observation)
+
+    policy_server.policy.predict_action_chunk = _counting_predict_action_chunk
+
+    sessions = [policy_server._get_session(client_id) for client_id in ("client_a", "client_b")]
+    sessions[1].actions_per_chunk = 5
+    for session in sessions:
+        session.inference_latency = 5.0  # long enough to only dispatch when both clients are waiting
+        session.last_request_time = time.perf_counter()
+
+    results = {}
+
+    def _request(session, timestep):
+        request = InferenceRequest(
+            session=session,
+            observation=_make_obs(torch.zeros(6), timestep=timestep),
+            deadline=time.perf_counter() + session.inference_latency,
+        )
+        results[session.client_id] = policy_server._submit_inference(request)
+
+    threads = [threading.Thread(target=_request, args=(s, i)) for i, s in enumerate(sessions)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    policy_server.stop()
+
+    assert batch_sizes == [2]
+    assert time.perf_counter() - start < 5.0
+    assert len(results["client_a"]) == 20
+    assert len(results["client_b"]) == 5
+    assert results["client_b"][0].get_timestep() == 1
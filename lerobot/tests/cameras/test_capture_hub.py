@@ -0,0 +1,184 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import time
+from typing import Any
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from lerobot.cameras.camera import Camera
+from lerobot.cameras.capture_hub import (
+    CameraCaptureHub,
+    SharedFrame,
+    SharedFrameRing,
+    StaleFrameError,
+    read_frame_ref,
+)
+from lerobot.cameras.configs import ColorMode
+from lerobot.cameras.opencv import OpenCVCameraConfig
+from lerobot.datasets.image_writer import AsyncImageWriter
+from lerobot.errors import DeviceNotConnectedError
+
+
+class FakeCamera(Camera):
+    """Camera producing frames filled with their index, at a given fps."""
+
+    def __init__(self, fps: int = 100, height: int = 12, width: int = 16):
+        super().__init__(OpenCVCameraConfig(index_or_path=0, fps=fps, width=width, height=height))
+        self.connected = False
+        self.num_frames = 0
+
+    @property
+    def is_connected(self) -> bool:
+        return self.connected
+
+    @staticmethod
+    def find_cameras() -> list[dict[str, Any]]:
+        return []
+
+    def connect(self, warmup: bool = True) -> None:
+        self.connected = True
+
+    def read(self, color_mode: ColorMode | None = None) -> np.ndarray:
+        if not self.connected:
+            raise DeviceNotConnectedError(f"{self} is not connected.")
+        time.sleep(1 / self.fps)
+        self.num_frames += 1
+        return np.full((self.height, self.width, 3), self.num_frames % 256, dtype=np.uint8)
+
+    def async_read(self, timeout_ms: float = 200) -> np.ndarray:
+        return self.read()
+
+    def disconnect(self) -> None:
+        self.connected = False
+
+
+@pytest.fixture
+def hub():
+    cameras = {"front": FakeCamera(fps=100), "wrist": FakeCamera(fps=60)}
+    for camera in cameras.values():
+        camera.connect()
+    hub = CameraCaptureHub(cameras, num_slots=8)
+    hub.start()
+    yield hub
+    if hub.is_running:
+        hub.stop()
+
+
+def test_shared_frame_ring():
+    ring = SharedFrameRing((2, 3), num_slots=4)
+    try:
+        for i in range(6):
+            assert ring.write(np.full((2, 3), i, dtype=np.uint8), timestamp=float(i)) == i
+
+        assert ring.latest_seq == 5
+        assert not ring.is_valid(1)
+        with pytest.raises(KeyError):
+            ring.frame(1)
+
+        frame = ring.frame(3)
+        assert isinstance(frame, SharedFrame)
+        assert frame.timestamp == 3.0
+        np.testing.assert_array_equal(frame, 3)
+        assert frame.is_valid()
+        # Slices are not frames of the ring
+        assert frame[:1].ref is None
+
+        np.testing.assert_array_equal(read_frame_ref(frame.ref), 3)
+        for i in range(6, 8):
+            ring.write(np.full((2, 3), i, dtype=np.uint8), timestamp=float(i))
+        assert not frame.is_valid()
+        np.testing.assert_array_equal(frame, 7)
+        with pytest.raises(StaleFrameError):
+            read_frame_ref(frame.ref)
+        del frame
+    finally:
+        ring.close()
+
+
+def test_capture_hub_frames_are_views(hub):
+    frame = hub.latest_frame("front")
+    next_frame = hub.wait_for_frame("front", frame.ref.seq)
+    assert next_frame.ref.seq > frame.ref.seq
+    assert next_frame.timestamp > frame.timestamp
+    assert np.shares_memory(next_frame, hub.rings["front"]._frames)
+
+
+def test_capture_hub_synchronized_frames(hub):
+    frames = hub.synchronized_frames(tolerance_s=0.02)
+    assert set(frames) == {"front", "wrist"}
+    assert abs(frames["front"].timestamp - frames["wrist"].timestamp) <= 0.02
+
+    with pytest.raises(TimeoutError):
+        hub.synchronized_frames(tolerance_s=-1, timeout_ms=50)
+
+
+def test_hub_cameras(hub):
+    cameras = hub.make_cameras()
+    assert all(camera.is_connected for camera in cameras.values())
+    first = cameras["wrist"].async_read()
+    second = cameras["wrist"].async_read()
+    assert isinstance(second, SharedFrame)
+    assert second.ref.seq > first.ref.seq
+
+    for camera in cameras.values():
+        camera.disconnect()
+    assert not hub.is_running
+    assert not any(camera.is_connected for camera in hub.cameras.values())
+
+
+@pytest.mark.parametrize("num_processes", [0, 1])
+def test_async_image_writer_reads_frames_from_shared_memory(hub, tmp_path, num_processes):
+    writer = AsyncImageWriter(num_processes=num_processes, num_threads=1)
+    try:
+        frame = hub.latest_frame("front")
+        expected = frame.copy()
+        writer.save_image(frame, tmp_path / "frame.png")
+        writer.wait_until_done()
+    finally:
+        writer.stop()
+
+    np.testing.assert_array_equal(np.array(Image.open(tmp_path / "frame.png")), expected)
+
+
+@pytest.mark.parametrize("num_processes", [0, 1])
+def test_async_image_writer_reports_overwritten_frames(tmp_path, num_processes):
+    ring = SharedFrameRing((2, 3, 3), num_slots=2)
+    writer = AsyncImageWriter(num_processes=num_processes, num_threads=1)
+    try:
+        ring.write(np.zeros((2, 3, 3), dtype=np.uint8), timestamp=0.0)
+        frame = ring.frame(0)
+        ring.write(np.ones((2, 3, 3), dtype=np.uint8), timestamp=1.0)
+        writer.save_image(ring.frame(1), tmp_path / "valid.png")
+        ring.write(np.ones((2, 3, 3), dtype=np.uint8), timestamp=2.0)
+        # As if enqueued while valid, then overwritten before a worker got to it
+        writer.queue.put((frame.ref, tmp_path / "lost.png"))
+        with pytest.raises(StaleFrameError, match="1 frames were overwritten"):
+            writer.wait_until_done()
+        # Lost frames are reported once
+        writer.wait_until_done()
+
+        with pytest.raises(StaleFrameError):
+            writer.save_image(frame, tmp_path / "stale.png")
+        del frame
+    finally:
+        writer.stop()
+        ring.close()
+
+    assert not (tmp_path / "lost.png").exists()
+    assert not (tmp_path / "stale.png").exists()
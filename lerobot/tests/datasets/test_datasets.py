@@ -99,6 +99,31 @@ def test_dataset_initialization(tmp_path, lerobot_dataset_factory):
     assert dataset.num_frames == len(dataset)
 
 
+@pytest.mark.parametrize("delta_timestamps", [None, {"action": [-0.1, 0.0, 0.1], "state": [-0.1, 0.0]}])
+def test_getitems_matches_getitem(tmp_path, lerobot_dataset_factory, info_factory, delta_timestamps):
+    camera_features = {
+        "laptop": {"shape": (16, 24, 3), "names": ["height", "width", "channels"], "info": None}
+    }
+    info = info_factory(
+        total_episodes=3, total_frames=90, total_tasks=1, camera_features=camera_features, use_videos=False
+    )
+    dataset = lerobot_dataset_factory(root=tmp_path / "test", info=info, delta_timestamps=delta_timestamps)
+
+    indices = [0, 1, 29, 30, 45, 89, 1]
+    items = dataset.__getitems__(indices)
+
+    assert len(items) == len(indices)
+    for idx, item in zip(indices, items, strict=True):
+        expected = dataset[idx]
+        assert item.keys() == expected.keys()
+        for key, value in expected.items():
+            if isinstance(value, torch.Tensor):
+                assert item[key].dtype == value.dtype, key
+                torch.testing.assert_close(item[key], value, msg=key)
+            else:
+                assert item[key] == value, key
+
+
 def test_add_frame_missing_feature(tmp_path, empty_lerobot_dataset_factory):
     features = {"state": {"dtype": "float32", "shape": (1,), "names": None}}
     dataset = empty_lerobot_dataset_factory(root=tmp_path / "test", features=features)
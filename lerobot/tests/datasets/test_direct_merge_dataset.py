@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+
+# Copyright 2024 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import numpy as np
+import pytest
+import torch
+
+from lerobot.datasets.direct_merge_dataset import link_or_copy, merge_datasets, plan_merge
+from lerobot.datasets.lerobot_dataset import LeRobotDataset
+from lerobot.datasets.utils import load_episodes_stats, load_stats
+
+
+@pytest.fixture
+def datasets_to_merge(tmp_path, lerobot_dataset_factory, info_factory):
+    def _create(name, total_episodes, total_frames, total_tasks):
+        info = info_factory(
+            total_episodes=total_episodes,
+            total_frames=total_frames,
+            total_tasks=total_tasks,
+            camera_features={},
+            use_videos=False,
+        )
+        return lerobot_dataset_factory(
+            root=tmp_path / name,
+            repo_id=f"dummy/{name}",
+            total_episodes=total_episodes,
+            total_frames=total_frames,
+            total_tasks=total_tasks,
+            multi_task=total_tasks > 1,
+            info=info,
+        )
+
+    return [_create("first", 3, 60, 1), _create("second", 4, 100, 2)]
+
+
+@pytest.mark.parametrize("num_workers", [1, 2])
+def test_merge_datasets(tmp_path, datasets_to_merge, num_workers):
+    first, second = datasets_to_merge
+    output_dir = tmp_path / "merged"
+    plan = merge_datasets([first.root, second.root], output_dir, chunks_size=2, num_workers=num_workers)
+
+    assert plan.info["total_episodes"] == 7
+    assert plan.info["total_frames"] == 160
+    assert plan.info["total_chunks"] == 4
+    assert (output_dir / "data/chunk-003/episode_000006.parquet").exists()
+
+    merged = LeRobotDataset("dummy/merged", root=output_dir)
+    assert merged.num_episodes == 7
+    assert merged.num_frames == 160
+    assert set(merged.meta.tasks.values()) == set(first.meta.tasks.values()) | set(second.meta.tasks.values())
+    assert torch.equal(torch.stack(merged.hf_dataset["index"]), torch.arange(160))
+
+    sources = [(first, idx) for idx in range(first.num_frames)] + [(second, idx) for idx in range(100)]
+    for merged_idx in [0, 59, 60, 61, 159]:
+        src_dataset, src_idx = sources[merged_idx]
+        item, src_item = merged[merged_idx], src_dataset[src_idx]
+        assert item["episode_index"].item() == src_item["episode_index"].item() + (
+            0 if src_dataset is first else 3
+        )
+        assert item["task"] == src_item["task"]
+        torch.testing.assert_close(item["action"], src_item["action"])
+        torch.testing.assert_close(item["state"], src_item["state"])
+
+    episodes_stats = load_episodes_stats(output_dir)
+    assert list(episodes_stats) == list(range(7))
+    src_episodes_stats = load_episodes_stats(second.root)
+    np.testing.assert_allclose(episodes_stats[3]["index"]["min"], src_episodes_stats[0]["index"]["min"] + 60)
+    np.testing.assert_allclose(episodes_stats[3]["episode_index"]["max"], [3])
+    stats = load_stats(output_dir)
+    np.testing.assert_allclose(
+        stats["action"]["max"],
+        np.maximum(first.meta.stats["action"]["max"], second.meta.stats["action"]["max"]),
+    )
+
+
+def test_plan_merge_rejects_incompatible_datasets(tmp_path, lerobot_dataset_factory, info_factory):
+    first = lerobot_dataset_factory(
+        root=tmp_path / "first", info=info_factory(total_episodes=1, total_frames=10, total_tasks=1)
+    )
+    second = lerobot_dataset_factory(
+        root=tmp_path / "second", info=info_factory(total_episodes=1, total_frames=10, total_tasks=1, fps=10)
+    )
+    with pytest.raises(ValueError, match="fps"):
+        plan_merge([first.root, second.root])
+
+
+def test_link_or_copy(tmp_path):
+    src = tmp_path / "src.mp4"
+    src.write_bytes(b"video")
+    dst = tmp_path / "videos" / "dst.mp4"
+    assert link_or_copy(src, dst) in ["hardlink", "reflink", "copy"]
+    assert dst.read_bytes() == b"video"
@@ -13,6 +13,11 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+from itertools import chain
+
+import numpy as np
+import pytest
+import torch
 from datasets import Dataset
 
 from lerobot.datasets.push_dataset_to_hub.utils import calculate_episode_data_index
@@ -88,3 +93,38 @@ def test_shuffle():
     assert sampler.indices == [0, 1, 2, 3, 4, 5]
     assert len(sampler) == 6
     assert set(sampler) == {0, 1, 2, 3, 4, 5}
+
+
+def test_shuffle_is_a_permutation():
+    episode_data_index = {"from": torch.tensor([0, 1000, 1500]), "to": torch.tensor([1000, 1500, 3001])}
+    sampler = EpisodeAwareSampler(episode_data_index, drop_n_last_frames=1, shuffle=True, seed=0)
+    samples = list(sampler)
+    assert len(samples) == len(sampler) == 2998
+    assert sorted(samples) == sampler.indices
+    assert samples != sampler.indices
+    assert list(sampler) == samples
+    sampler.set_epoch(1)
+    assert list(sampler) != samples
+
+
+@pytest.mark.parametrize("shuffle", [False, True])
+def test_distributed_sharding(shuffle):
+    episode_data_index = {"from": torch.tensor([0, 4, 7]), "to": torch.tensor([4, 7, 11])}
+    samplers = [
+        EpisodeAwareSampler(episode_data_index, shuffle=shuffle, num_replicas=3, rank=rank)
+        for rank in range(3)
+    ]
+    shards = [list(sampler) for sampler in samplers]
+    assert all(len(shard) == len(sampler) == 4 for shard, sampler in zip(shards, samplers, strict=True))
+    # 11 frames are padded to 12 so that every replica gets the same number of samples
+    assert set(chain.from_iterable(shards)) == set(range(11))
+
+
+def test_episode_weights():
+    episode_data_index = {"from": torch.tensor([0, 10]), "to": torch.tensor([10, 1000])}
+    sampler = EpisodeAwareSampler(episode_data_index, episode_weights=[1.0, 1.0], num_samples=10000, seed=0)
+    samples = np.array(list(sampler))
+    assert len(samples) == len(sampler) == 10000
+    assert ((samples >= 0) & (samples < 1000)).all()
+    # Both episodes are drawn as often, despite the first one being much shorter
+    assert 0.45 < (samples < 10).mean() < 0.55
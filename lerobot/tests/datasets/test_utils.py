@@ -14,12 +14,18 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 
+import pytest
 import torch
 from datasets import Dataset
 from huggingface_hub import DatasetCard
 
 from lerobot.datasets.push_dataset_to_hub.utils import calculate_episode_data_index
-from lerobot.datasets.utils import create_lerobot_dataset_card, hf_transform_to_torch
+from lerobot.datasets.utils import (
+    DevicePrefetcher,
+    create_lerobot_dataset_card,
+    cycle,
+    hf_transform_to_torch,
+)
 
 
 def test_default_parameters():
@@ -53,3 +59,27 @@ def test_calculate_episode_data_index():
     episode_data_index = calculate_episode_data_index(dataset)
     assert torch.equal(episode_data_index["from"], torch.tensor([0, 2, 3]))
     assert torch.equal(episode_data_index["to"], torch.tensor([2, 3, 6]))
+
+
+def test_device_prefetcher():
+    batches = [{"index": torch.tensor([i]), "task": [f"task {i}"]} for i in range(5)]
+    prefetcher = DevicePrefetcher(batches, "cpu", num_batches=2)
+    assert [batch["index"].item() for batch in prefetcher] == list(range(5))
+    assert [batch["task"] for batch in prefetcher] == []
+    prefetcher.close()
+
+    prefetcher = DevicePrefetcher(cycle(batches), "cpu", num_batches=3)
+    assert [next(prefetcher)["index"].item() for _ in range(7)] == [0, 1, 2, 3, 4, 0, 1]
+    prefetcher.close()
+
+
+def test_device_prefetcher_error():
+    def batches():
+        yield {"index": torch.tensor([0])}
+        raise ValueError("Corrupted frame")
+
+    prefetcher = DevicePrefetcher(batches(), "cpu")
+    assert next(prefetcher)["index"].item() == 0
+    with pytest.raises(ValueError, match="Corrupted frame"):
+        next(prefetcher)
+    prefetcher.close()
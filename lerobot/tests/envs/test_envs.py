@@ -16,13 +16,18 @@
 import importlib
 
 import gymnasium as gym
+import numpy as np
 import pytest
 import torch
 from gymnasium.utils.env_checker import check_env
+from torch import nn
 
 import lerobot
 from lerobot.envs.factory import make_env, make_env_config
 from lerobot.envs.utils import preprocess_observation
+from lerobot.policies.act.configuration_act import ACTConfig
+from lerobot.policies.pretrained import PreTrainedPolicy
+from lerobot.scripts.eval import eval_policy_autoreset
 from tests.utils import require_env
 
 OBS_TYPES = ["state", "pixels", "pixels_agent_pos"]
@@ -61,3 +66,84 @@ def test_factory(env_name):
         assert img.min() >= 0.0
 
     env.close()
+
+
+class CountdownEnv(gym.Env):
+    """Episodes of 2 to 5 steps with a reward of 1 per step, successful when their length is even."""
+
+    def __init__(self):
+        self.observation_space = gym.spaces.Dict(
+            {"agent_pos": gym.spaces.Box(-np.inf, np.inf, shape=(2,), dtype=np.float64)}
+        )
+        self.action_space = gym.spaces.Box(-1, 1, shape=(2,), dtype=np.float32)
+        self.task = "count down"
+
+    def reset(self, seed=None, options=None):
+        super().reset(seed=seed)
+        self.length = int(self.np_random.integers(2, 6))
+        self.steps = 0
+        return {"agent_pos": np.zeros(2)}, {}
+
+    def step(self, action):
+        self.steps += 1
+        terminated = self.steps == self.length
+        info = {"is_success": terminated and self.length % 2 == 0}
+        return {"agent_pos": np.full(2, self.steps, dtype=np.float64)}, 1.0, terminated, False, info
+
+
+class DummyPolicy(PreTrainedPolicy):
+    config_class = ACTConfig
+    name = "dummy"
+
+    def __init__(self, config):
+        super().__init__(config)
+        self.linear = nn.Linear(2, 2)
+        self.reset_masks = []
+
+    def get_optim_params(self):
+        return self.parameters()
+
+    def reset(self):
+        pass
+
+    def reset_envs(self, env_mask):
+        self.reset_masks.append(env_mask)
+
+    def forward(self, batch):
+        raise NotImplementedError
+
+    def predict_action_chunk(self, batch):
+        raise NotImplementedError
+
+    def select_action(self, batch):
+        assert list(batch["task"]) == ["count down"] * batch["observation.state"].shape[0]
+        return torch.zeros_like(batch["observation.state"])
+
+
+@pytest.mark.parametrize("vector_env_cls", [gym.vector.SyncVectorEnv, gym.vector.AsyncVectorEnv])
+def test_eval_policy_autoreset(vector_env_cls):
+    num_envs, n_episodes = 3, 8
+    env = vector_env_cls([CountdownEnv for _ in range(num_envs)])
+    policy = DummyPolicy(ACTConfig())
+    try:
+        info = eval_policy_autoreset(env, policy, n_episodes, start_seed=1000)
+    finally:
+        env.close()
+
+    episodes = info["per_episode"]
+    assert [episode["episode_ix"] for episode in episodes] == list(range(n_episodes))
+    assert [episode["seed"] for episode in episodes[:num_envs]] == [1000, 1001, 1002]
+    assert all(episode["seed"] is None for episode in episodes[num_envs:])
+    for episode in episodes:
+        assert 2 <= episode["sum_reward"] <= 5
+        assert episode["success"] == (episode["sum_reward"] % 2 == 0)
+
+    for env_ix in range(num_envs):
+        expected_env = CountdownEnv()
+        expected_env.reset(seed=1000 + env_ix)
+        assert episodes[env_ix]["sum_reward"] == expected_env.length
+
+    assert info["aggregated"]["pc_success"] == np.mean([e["success"] for e in episodes]) * 100
+    assert info["aggregated"]["eval_episodes_per_s"] > 0
+    assert len(policy.reset_masks) > 0
+    assert all(mask.shape == (num_envs,) and mask.any() for mask in policy.reset_masks)
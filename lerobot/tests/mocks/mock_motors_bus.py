@@ -122,6 +122,7 @@ class MockPortHandler:
 
 
 class MockMotorsBus(MotorsBus):
+    apply_drive_mode = True
     available_baudrates = [500_000, 1_000_000]
     default_timeout = 1000
     model_baudrate_table = DUMMY_MODEL_BAUDRATE_TABLE
@@ -15,12 +15,15 @@
 # limitations under the License.
 
 import re
+import time
 from unittest.mock import patch
 
+import numpy as np
 import pytest
 
 from lerobot.motors.motors_bus import (
     Motor,
+    MotorCalibration,
     MotorNormMode,
     assert_same_address,
     get_address,
@@ -356,3 +359,134 @@ def test_sync_write_by_value_dict(data_name, ids_values, dummy_motors):
     mock__encode_sign.assert_called_once_with(data_name, ids_values)
     if data_name in bus.normalized_data:
         mock__unnormalize.assert_called_once_with(ids_values)
+
+
+@pytest.fixture
+def dummy_calibration(dummy_motors) -> dict[str, MotorCalibration]:
+    return {
+        "dummy_1": MotorCalibration(1, drive_mode=0, homing_offset=0, range_min=100, range_max=900),
+        "dummy_2": MotorCalibration(2, drive_mode=1, homing_offset=0, range_min=1000, range_max=3000),
+        "dummy_3": MotorCalibration(3, drive_mode=1, homing_offset=0, range_min=0, range_max=1023),
+    }
+
+
+def _reference_normalize(bus: MockMotorsBus, motor: str, val: int) -> float:
+    min_ = bus.calibration[motor].range_min
+    max_ = bus.calibration[motor].range_max
+    drive_mode = bus.apply_drive_mode and bus.calibration[motor].drive_mode
+    bounded_val = min(max_, max(min_, val))
+    if bus.motors[motor].norm_mode is MotorNormMode.RANGE_M100_100:
+        norm = (((bounded_val - min_) / (max_ - min_)) * 200) - 100
+        return -norm if drive_mode else norm
+    elif bus.motors[motor].norm_mode is MotorNormMode.RANGE_0_100:
+        norm = ((bounded_val - min_) / (max_ - min_)) * 100
+        return 100 - norm if drive_mode else norm
+    max_res = bus.model_resolution_table[bus.motors[motor].model] - 1
+    return (val - (min_ + max_) / 2) * 360 / max_res
+
+
+def _reference_unnormalize(bus: MockMotorsBus, motor: str, val: float) -> int:
+    min_ = bus.calibration[motor].range_min
+    max_ = bus.calibration[motor].range_max
+    drive_mode = bus.apply_drive_mode and bus.calibration[motor].drive_mode
+    if bus.motors[motor].norm_mode is MotorNormMode.RANGE_M100_100:
+        val = -val if drive_mode else val
+        bounded_val = min(100.0, max(-100.0, val))
+        return int(((bounded_val + 100) / 200) * (max_ - min_) + min_)
+    elif bus.motors[motor].norm_mode is MotorNormMode.RANGE_0_100:
+        val = 100 - val if drive_mode else val
+        bounded_val = min(100.0, max(0.0, val))
+        return int((bounded_val / 100) * (max_ - min_) + min_)
+    max_res = bus.model_resolution_table[bus.motors[motor].model] - 1
+    return int((val * max_res / 360) + (min_ + max_) / 2)
+
+
+@pytest.mark.parametrize("apply_drive_mode", [True, False])
+def test_normalize_matches_reference(apply_drive_mode, dummy_motors, dummy_calibration):
+    dummy_motors["dummy_4"] = Motor(4, "model_3", MotorNormMode.DEGREES)
+    dummy_calibration["dummy_4"] = MotorCalibration(4, 1, 0, range_min=500, range_max=3500)
+    bus = MockMotorsBus("/dev/dummy-port", dummy_motors)
+    bus.apply_drive_mode = apply_drive_mode
+    bus.calibration = dummy_calibration
+    rng = np.random.default_rng(0)
+
+    for _ in range(100):
+        raw = {m.id: int(rng.integers(-100, 4200)) for m in dummy_motors.values()}
+        expected = {id_: _reference_normalize(bus, f"dummy_{id_}", val) for id_, val in raw.items()}
+        assert bus._normalize(raw) == expected
+
+        normalized = {m.id: float(rng.uniform(-200, 200)) for m in dummy_motors.values()}
+        expected = {id_: _reference_unnormalize(bus, f"dummy_{id_}", val) for id_, val in normalized.items()}
+        assert bus._unnormalize(normalized) == expected
+
+
+def test_calibration_arrays_are_refreshed(dummy_motors, dummy_calibration):
+    bus = MockMotorsBus("/dev/dummy-port", dummy_motors)
+    with pytest.raises(RuntimeError, match="has no calibration registered"):
+        bus._normalize({1: 500})
+
+    bus.calibration = dummy_calibration
+    assert bus._normalize({1: 500}) == {1: 0.0}
+
+    dummy_calibration["dummy_1"] = MotorCalibration(1, 0, 0, range_min=500, range_max=500)
+    bus.calibration = dummy_calibration
+    with pytest.raises(ValueError, match="min and max are equal"):
+        bus._normalize({1: 500})
+    assert bus._normalize({2: 2000}) == {2: 0.0}
+
+
+def test_sync_read_write_array(dummy_motors, dummy_calibration):
+    bus = MockMotorsBus("/dev/dummy-port", dummy_motors)
+    bus.connect(handshake=False)
+    bus.calibration = dummy_calibration
+    ids_values = {1: 500, 2: 1500, 3: 1023}
+    addr, length = DUMMY_CTRL_TABLE_2["Present_Position"]
+
+    with (
+        patch.object(MockMotorsBus, "_sync_read", return_value=(ids_values, 0)) as mock__sync_read,
+        patch.object(MockMotorsBus, "_decode_sign", return_value=ids_values),
+    ):
+        values = bus.sync_read_array("Present_Position", ["dummy_3", "dummy_1"])
+        raw_values = bus.sync_read_array("Present_Position", normalize=False)
+
+    assert mock__sync_read.call_args_list[0].args == (addr, length, [3, 1])
+    np.testing.assert_allclose(values, [0.0, 0.0])
+    np.testing.assert_array_equal(raw_values, [500, 1500, 1023])
+
+    addr, length = DUMMY_CTRL_TABLE_2["Goal_Position"]
+    with (
+        patch.object(MockMotorsBus, "_sync_write", return_value=0) as mock__sync_write,
+        patch.object(MockMotorsBus, "_encode_sign", side_effect=lambda _, ids_values: ids_values),
+    ):
+        bus.sync_write_array("Goal_Position", np.array([0.0, 50.0, 100.0]))
+
+    assert mock__sync_write.call_args.args == (addr, length, {1: 500, 2: 1500, 3: 0})
+    with pytest.raises(ValueError, match="Got 2 values for 3 motors"):
+        bus.sync_write_array("Goal_Position", np.zeros(2))
+
+
+def test_sync_read_write_array_control_loop_frequency():
+    """The bus-side overhead of a read/write cycle must stay well within a 200 Hz (5 ms) control period."""
+    motors = {f"dummy_{i}": Motor(i, "model_2", MotorNormMode.RANGE_M100_100) for i in range(1, 33)}
+    bus = MockMotorsBus("/dev/dummy-port", motors)
+    bus.connect(handshake=False)
+    bus.calibration = {
+        motor: MotorCalibration(m.id, m.id % 2, 0, range_min=100, range_max=900)
+        for motor, m in motors.items()
+    }
+    ids_values = {m.id: 450 for m in motors.values()}
+    num_cycles = 500
+
+    with (
+        patch.object(MockMotorsBus, "_sync_read", return_value=(ids_values, 0)),
+        patch.object(MockMotorsBus, "_decode_sign", return_value=ids_values),
+        patch.object(MockMotorsBus, "_sync_write", return_value=0),
+        patch.object(MockMotorsBus, "_encode_sign", side_effect=lambda _, ids_values: ids_values),
+    ):
+        start = time.perf_counter()
+        for _ in range(num_cycles):
+            positions = bus.sync_read_array("Present_Position")
+            bus.sync_write_array("Goal_Position", positions)
+        frequency = num_cycles / (time.perf_counter() - start)
+
+    assert frequency >= 200, f"{frequency=:.0f} Hz"
@@ -0,0 +1,295 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import torch
+
+pytest.importorskip("transformers")
+
+from transformers import SmolVLMConfig  # noqa: E402
+from transformers.models.auto.configuration_auto import CONFIG_MAPPING  # noqa: E402
+
+from lerobot.configs.types import FeatureType, PolicyFeature  # noqa: E402
+from lerobot.constants import ACTION, OBS_STATE  # noqa: E402
+from lerobot.policies.inference_session import make_denoising_timesteps  # noqa: E402
+from lerobot.policies.pi0 import modeling_pi0  # noqa: E402
+from lerobot.policies.pi0.configuration_pi0 import PI0Config  # noqa: E402
+from lerobot.policies.pi0.modeling_pi0 import PI0Policy  # noqa: E402
+from lerobot.policies.pi0.paligemma_with_expert import PaliGemmaWithExpertConfig  # noqa: E402
+from lerobot.policies.smolvla import modeling_smolvla, smolvlm_with_expert  # noqa: E402
+from lerobot.policies.smolvla.configuration_smolvla import SmolVLAConfig  # noqa: E402
+from lerobot.policies.smolvla.modeling_smolvla import SmolVLAPolicy  # noqa: E402
+
+BATCH_SIZE = 2
+IMAGE_KEY = "observation.images.top"
+
+
+class FakeTokenizer:
+    """Tokenizes the characters of the tasks, after the special image tokens of SmolVLM."""
+
+    fake_image_token_id = 1
+    global_image_token_id = 2
+
+    def __call__(self, tasks, padding, padding_side, max_length, return_tensors):
+        token_lists = [[ord(char) % 253 + 3 for char in task][:max_length] for task in tasks]
+        length = max_length if padding == "max_length" else max(len(tokens) for tokens in token_lists)
+        input_ids = torch.zeros(len(tasks), length, dtype=torch.long)
+        attention_mask = torch.zeros(len(tasks), length, dtype=torch.long)
+        for i, tokens in enumerate(token_lists):
+            input_ids[i, : len(tokens)] = torch.tensor(tokens)
+            attention_mask[i, : len(tokens)] = 1
+        return {"input_ids": input_ids, "attention_mask": attention_mask}
+
+
+class FakeProcessor:
+    tokenizer = FakeTokenizer()
+
+
+def tiny_paligemma_with_expert_config(**kwargs):
+    config = PaliGemmaWithExpertConfig(**kwargs)
+    config.paligemma_config = CONFIG_MAPPING["paligemma"](
+        hidden_size=64,
+        image_token_index=256,
+        projection_dim=64,
+        text_config={
+            "model_type": "gemma",
+            "hidden_size": 64,
+            "intermediate_size": 128,
+            "num_attention_heads": 2,
+            "num_hidden_layers": 2,
+            "num_key_value_heads": 1,
+            "head_dim": 16,
+            "vocab_size": 257,
+        },
+        vision_config={
+            "model_type": "siglip_vision_model",
+            "hidden_size": 32,
+            "intermediate_size": 64,
+            "num_attention_heads": 2,
+            "num_hidden_layers": 1,
+            "image_size": 32,
+            "patch_size": 8,
+            "projection_dim": 64,
+            "vision_use_head": False,
+        },
+    )
+    config.gemma_expert_config = CONFIG_MAPPING["gemma"](
+        hidden_size=32,
+        intermediate_size=64,
+        num_attention_heads=2,
+        num_hidden_layers=2,
+        num_key_value_heads=1,
+        head_dim=16,
+        vocab_size=257,
+    )
+    return config
+
+
+def tiny_smolvlm_config(*args, **kwargs):
+    return SmolVLMConfig(
+        text_config={
+            "model_type": "llama",
+            "hidden_size": 64,
+            "intermediate_size": 128,
+            "num_attention_heads": 4,
+            "num_key_value_heads": 2,
+            "num_hidden_layers": 4,
+            "head_dim": 16,
+            "vocab_size": 256,
+        },
+        vision_config={
+            "hidden_size": 32,
+            "intermediate_size": 64,
+            "num_attention_heads": 2,
+            "num_hidden_layers": 1,
+            "image_size": 32,
+            "patch_size": 8,
+        },
+        scale_factor=2,
+    )
+
+
+@pytest.fixture
+def pi0_policy(monkeypatch):
+    monkeypatch.setattr(modeling_pi0, "PaliGemmaWithExpertConfig", tiny_paligemma_with_expert_config)
+    monkeypatch.setattr(
+        modeling_pi0.AutoTokenizer, "from_pretrained", lambda *args, **kwargs: FakeTokenizer()
+    )
+    config = PI0Config(
+        input_features={
+            IMAGE_KEY: PolicyFeature(type=FeatureType.VISUAL, shape=(3, 24, 32)),
+            OBS_STATE: PolicyFeature(type=FeatureType.STATE, shape=(6,)),
+        },
+        output_features={ACTION: PolicyFeature(type=FeatureType.ACTION, shape=(6,))},
+        chunk_size=4,
+        n_action_steps=4,
+        max_state_dim=8,
+        max_action_dim=8,
+        proj_width=32,
+        resize_imgs_with_padding=(32, 32),
+        tokenizer_max_length=12,
+        device="cpu",
+    )
+    stats = {key: {"mean": torch.zeros(6), "std": torch.ones(6)} for key in [OBS_STATE, ACTION]}
+    policy = PI0Policy(config, dataset_stats=stats)
+    policy.eval()
+    return policy
+
+
+@pytest.fixture
+def smolvla_policy(monkeypatch):
+    monkeypatch.setattr(smolvlm_with_expert.AutoConfig, "from_pretrained", tiny_smolvlm_config)
+    for module in [smolvlm_with_expert, modeling_smolvla]:
+        monkeypatch.setattr(module.AutoProcessor, "from_pretrained", lambda *args, **kwargs: FakeProcessor())
+    config = SmolVLAConfig(
+        input_features={
+            IMAGE_KEY: PolicyFeature(type=FeatureType.VISUAL, shape=(3, 24, 32)),
+            OBS_STATE: PolicyFeature(type=FeatureType.STATE, shape=(6,)),
+        },
+        output_features={ACTION: PolicyFeature(type=FeatureType.ACTION, shape=(6,))},
+        chunk_size=4,
+        n_action_steps=4,
+        max_state_dim=8,
+        max_action_dim=8,
+        resize_imgs_with_padding=(32, 32),
+        tokenizer_max_length=24,
+        num_steps=3,
+        num_vlm_layers=4,
+        device="cpu",
+    )
+    stats = {key: {"mean": torch.zeros(6), "std": torch.ones(6)} for key in [OBS_STATE, ACTION]}
+    policy = SmolVLAPolicy(config, dataset_stats=stats)
+    policy.eval()
+    return policy
+
+
+def make_batch(task: str | list[str]) -> dict:
+    return {
+        IMAGE_KEY: torch.rand(BATCH_SIZE, 3, 24, 32),
+        OBS_STATE: torch.randn(BATCH_SIZE, 6),
+        "task": [task] * BATCH_SIZE if isinstance(task, str) else task,
+    }
+
+
+@pytest.mark.parametrize("num_steps", [1, 3, 10, 20])
+def test_make_denoising_timesteps(num_steps):
+    timesteps, dt = make_denoising_timesteps(num_steps)
+    assert len(timesteps) == num_steps
+    assert timesteps[0] == 1.0
+    assert dt == torch.tensor(-1.0 / num_steps, dtype=torch.float32)
+
+
+@torch.no_grad()
+def test_pi0_inference_session_matches_sample_actions(pi0_policy):
+    policy = pi0_policy
+    config = policy.config
+    session = None
+    for task in ["pick the cube", "place the cube", "pick the cube"]:
+        batch = policy.normalize_inputs(make_batch(task))
+        noise = torch.randn(BATCH_SIZE, config.n_action_steps, config.max_action_dim)
+
+        images, img_masks = policy.prepare_images(batch)
+        state = policy.prepare_state(batch)
+        lang_tokens, lang_masks = policy.prepare_language(batch)
+        expected = policy.model.sample_actions(
+            images, img_masks, lang_tokens, lang_masks, state, noise=noise.clone()
+        )
+
+        session = policy.inference_session(batch)
+        actions = session.sample_actions(batch, noise=noise.clone())
+
+        torch.testing.assert_close(actions, expected)
+
+    assert policy.inference_session(make_batch("")) is session
+    assert len(session._prompts) == 2
+
+
+@torch.no_grad()
+def test_pi0_select_action_with_inference_session(pi0_policy):
+    policy = pi0_policy
+    batch = make_batch("pick the cube")
+    noise = torch.randn(BATCH_SIZE, policy.config.n_action_steps, policy.config.max_action_dim)
+    expected = policy.select_action(dict(batch), noise=noise.clone())
+
+    policy.config.use_inference_session = True
+    policy.reset()
+    action = policy.select_action(dict(batch), noise=noise.clone())
+    torch.testing.assert_close(action, expected)
+    assert len(policy._inference_sessions) == 1
+
+
+@torch.no_grad()
+def test_smolvla_inference_session_matches_sample_actions(smolvla_policy):
+    policy = smolvla_policy
+    config = policy.config
+    session = None
+    # Tasks of different lengths, which the session pads to `tokenizer_max_length`
+    for task in ["pick the cube", ["place the cube", "place the red cube"], "pick the cube"]:
+        batch = policy.normalize_inputs(make_batch(task))
+        noise = torch.randn(BATCH_SIZE, config.chunk_size, config.max_action_dim)
+
+        images, img_masks = policy.prepare_images(batch)
+        state = policy.prepare_state(batch)
+        lang_tokens, lang_masks = policy.prepare_language(batch)
+        expected = policy.model.sample_actions(
+            images, img_masks, lang_tokens, lang_masks, state, noise=noise.clone()
+        )
+
+        session = policy.inference_session(batch)
+        actions = session.sample_actions(batch, noise=noise.clone())
+
+        torch.testing.assert_close(actions, expected)
+
+    assert policy.inference_session(make_batch("")) is session
+    assert len(session._prompts) == 2
+
+
+@torch.no_grad()
+def test_smolvla_select_action_with_inference_session(smolvla_policy):
+    policy = smolvla_policy
+    batch = make_batch(["pick the cube", "place the red cube"])
+    noise = torch.randn(BATCH_SIZE, policy.config.chunk_size, policy.config.max_action_dim)
+    expected = policy.select_action(dict(batch), noise=noise.clone())
+
+    policy.config.use_inference_session = True
+    policy.reset()
+    action = policy.select_action(dict(batch), noise=noise.clone())
+    torch.testing.assert_close(action, expected)
+    assert len(policy._inference_sessions) == 1
+
+
+@pytest.mark.skipif(not hasattr(torch, "compile"), reason="torch.compile is not available")
+@pytest.mark.parametrize("policy_name", ["pi0", "smolvla"])
+@torch.no_grad()
+def test_compiled_inference_session_matches_sample_actions(policy_name, request):
+    policy = request.getfixturevalue(f"{policy_name}_policy")
+    config = policy.config
+    config.compile_inference_session = True
+    for task in ["pick the cube", "place the cube"]:
+        batch = policy.normalize_inputs(make_batch(task))
+        noise = torch.randn(BATCH_SIZE, config.chunk_size, config.max_action_dim)
+
+        images, img_masks = policy.prepare_images(batch)
+        state = policy.prepare_state(batch)
+        lang_tokens, lang_masks = policy.prepare_language(batch)
+        expected = policy.model.sample_actions(
+            images, img_masks, lang_tokens, lang_masks, state, noise=noise.clone()
+        )
+
+        actions = policy.inference_session(batch).sample_actions(batch, noise=noise.clone())
+
+        # The models run in bfloat16, whose operations inductor fuses and rounds differently
+        torch.testing.assert_close(actions, expected, atol=1e-2, rtol=1e-2)
@@ -0,0 +1,347 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import random
+import time
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+import torch
+from packaging import version
+
+transformers = pytest.importorskip("transformers")
+pytest.importorskip("scipy")
+
+from scipy.fft import dct  # noqa: E402
+from tokenizers import Tokenizer, decoders, models, normalizers, pre_tokenizers, processors, trainers  # noqa: E402
+from transformers import PaliGemmaForConditionalGeneration, PreTrainedTokenizerFast  # noqa: E402
+from transformers.models.auto.configuration_auto import CONFIG_MAPPING  # noqa: E402
+
+from lerobot.configs.types import FeatureType, PolicyFeature  # noqa: E402
+from lerobot.constants import ACTION, OBS_STATE  # noqa: E402
+from lerobot.policies.pi0fast import modeling_pi0fast  # noqa: E402
+from lerobot.policies.pi0fast.configuration_pi0fast import PI0FASTConfig  # noqa: E402
+from lerobot.policies.pi0fast.modeling_pi0fast import PI0FAST, FASTActionLogitsProcessor  # noqa: E402
+from lerobot.policies.pi0fast.tokenization_pi0fast import PI0FASTPromptTokenizer  # noqa: E402
+
+IMAGE_KEY = "observation.images.top"
+STATE_DIM = 14
+CHUNK_SIZE = 10
+TASKS = ["Pick up the red cube", "pick_up_the_green_cube", "  stack the blue cube  "]
+
+
+def make_paligemma_like_tokenizer(split_words: bool = True) -> PreTrainedTokenizerFast:
+    """Small BPE tokenizer trained on prompts, splitting words and digits like the PaliGemma tokenizer."""
+    tokenizer = Tokenizer(models.BPE(unk_token="<unk>"))
+    tokenizer.normalizer = normalizers.Replace(" ", "▁")
+    if split_words:
+        tokenizer.pre_tokenizer = pre_tokenizers.Sequence(
+            [
+                pre_tokenizers.Split("▁", behavior="merged_with_next"),
+                pre_tokenizers.Digits(individual_digits=True),
+            ]
+        )
+    tokenizer.decoder = decoders.Metaspace(replacement="▁", prepend_scheme="never")
+    rng = random.Random(0)
+    corpus = [
+        f"Task: {task.lower()}, State: {' '.join(str(rng.randint(-1, 255)) for _ in range(8))};\nAction: "
+        for task in TASKS
+        for _ in range(50)
+    ]
+    # Rare words filling the end of the vocabulary, where the action tokens are mapped
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    corpus += [" ".join("".join(rng.choices(letters, k=5)) for _ in range(20)) for _ in range(100)]
+    special_tokens = ["<pad>", "<eos>", "<bos>", "<unk>"]
+    tokenizer.train_from_iterator(corpus, trainers.BpeTrainer(vocab_size=300, special_tokens=special_tokens))
+    tokenizer.post_processor = processors.TemplateProcessing(single="<bos> $A", special_tokens=[("<bos>", 2)])
+    return PreTrainedTokenizerFast(
+        tokenizer_object=tokenizer, bos_token="<bos>", eos_token="<eos>", pad_token="<pad>", unk_token="<unk>"
+    )
+
+
+class FakeFASTTokenizer:
+    """FAST action tokenizer with a small BPE vocabulary trained on random action chunks."""
+
+    def __init__(self, scale: float = 10, min_token: int = -60, vocab_size: int = 64):
+        self.scale = scale
+        self.min_token = min_token
+        self.time_horizon = None
+        self.action_dim = None
+        rng = np.random.default_rng(0)
+        corpus = [self.to_text(rng.normal(size=(CHUNK_SIZE, STATE_DIM)).cumsum(0) * 0.1) for _ in range(200)]
+        tokenizer = Tokenizer(models.BPE())
+        tokenizer.decoder = decoders.Fuse()
+        tokenizer.train_from_iterator(corpus, trainers.BpeTrainer(vocab_size=vocab_size, show_progress=False))
+        self.bpe_tokenizer = PreTrainedTokenizerFast(
+            tokenizer_object=tokenizer, clean_up_tokenization_spaces=False
+        )
+
+    def to_text(self, actions: np.ndarray) -> str:
+        dct_coeff = np.around(dct(actions, axis=0, norm="ortho") * self.scale)
+        return "".join(map(chr, np.maximum(dct_coeff.flatten() - self.min_token, 0).astype(int)))
+
+    def __call__(self, action_chunks: np.ndarray) -> list[list[int]]:
+        return [
+            self.bpe_tokenizer(self.to_text(actions))["input_ids"] for actions in np.asarray(action_chunks)
+        ]
+
+
+def tiny_paligemma(config) -> PaliGemmaForConditionalGeneration:
+    tiny_config = CONFIG_MAPPING["paligemma"](
+        hidden_size=64,
+        image_token_index=config.image_token_index,
+        projection_dim=64,
+        text_config={
+            "model_type": "gemma",
+            "hidden_size": 64,
+            "intermediate_size": 128,
+            "num_attention_heads": 2,
+            "num_hidden_layers": 2,
+            "num_key_value_heads": 1,
+            "head_dim": 16,
+            "vocab_size": config.text_config.vocab_size,
+            "_attn_implementation": "eager",
+        },
+        vision_config={
+            "model_type": "siglip_vision_model",
+            "hidden_size": 32,
+            "intermediate_size": 64,
+            "num_attention_heads": 2,
+            "num_hidden_layers": 1,
+            "image_size": 32,
+            "patch_size": 8,
+            "projection_dim": 64,
+            "vision_use_head": False,
+        },
+    )
+    # Removed from the config in recent versions of transformers
+    tiny_config.ignore_index = -100
+    return PaliGemmaForConditionalGeneration(config=tiny_config)
+
+
+@pytest.fixture
+def pi0fast_model(monkeypatch):
+    tokenizer = make_paligemma_like_tokenizer()
+    monkeypatch.setattr(modeling_pi0fast.AutoTokenizer, "from_pretrained", lambda *args, **kwargs: tokenizer)
+    fast_tokenizer = FakeFASTTokenizer()
+    monkeypatch.setattr(
+        modeling_pi0fast.AutoProcessor,
+        "from_pretrained",
+        lambda path, **kwargs: fast_tokenizer if "fast" in path else SimpleNamespace(tokenizer=tokenizer),
+    )
+    monkeypatch.setattr(modeling_pi0fast, "PaliGemmaForConditionalGeneration", tiny_paligemma)
+    config = PI0FASTConfig(
+        input_features={
+            IMAGE_KEY: PolicyFeature(type=FeatureType.VISUAL, shape=(3, 32, 32)),
+            OBS_STATE: PolicyFeature(type=FeatureType.STATE, shape=(STATE_DIM,)),
+        },
+        output_features={ACTION: PolicyFeature(type=FeatureType.ACTION, shape=(STATE_DIM,))},
+        chunk_size=CHUNK_SIZE,
+        n_action_steps=CHUNK_SIZE,
+        resize_imgs_with_padding=(32, 32),
+        device="cpu",
+    )
+    model = PI0FAST(config)
+    model.eval()
+    return model
+
+
+def text_prefix_tokens(tokenizer, state: torch.Tensor, tasks: list[str]) -> tuple[torch.Tensor, torch.Tensor]:
+    """Tokenization of the prompts sample by sample, as `PI0FAST.create_input_tokens` used to do."""
+    bins = torch.linspace(-1, 1, 256 + 1)[:-1]
+    discretized = (torch.bucketize(state, bins) - 1)[:, :32]
+    prefix_texts = []
+    for txt, disc in zip(tasks, discretized, strict=False):
+        cleaned = txt.lower().strip().replace("_", " ")
+        state_str = " ".join(str(val.item()) for val in disc)
+        prefix_texts.append(f"Task: {cleaned}, State: {state_str};\n")
+    out = tokenizer(
+        prefix_texts, add_special_tokens=True, return_tensors="pt", padding="longest", truncation=False
+    )
+    batch_inputs = {"input_ids": out["input_ids"].tolist(), "attention_mask": out["attention_mask"].tolist()}
+    padded = tokenizer.pad(batch_inputs, padding="longest", max_length=180, return_tensors="pt")
+    return padded["input_ids"], padded["attention_mask"]
+
+
+def make_states(batch_size: int) -> tuple[torch.Tensor, list[str]]:
+    # Some values out of [-1, 1] to cover the first and last bins
+    state = torch.randn(batch_size, STATE_DIM) * 0.8
+    tasks = [TASKS[i % len(TASKS)] for i in range(batch_size)]
+    return state, tasks
+
+
+@pytest.mark.parametrize("split_words", [True, False])
+@pytest.mark.parametrize("padding_side", ["right", "left"])
+def test_prompt_tokenizer_matches_text_tokenization(split_words, padding_side):
+    tokenizer = make_paligemma_like_tokenizer(split_words)
+    tokenizer.padding_side = padding_side
+    prompt_tokenizer = PI0FASTPromptTokenizer(tokenizer)
+    tasks = [TASKS[i % len(TASKS)] for i in range(16)]
+    discretized_state = torch.randint(-1, 256, (16, STATE_DIM))
+    input_ids, attention_mask = prompt_tokenizer(discretized_state, tasks)
+    expected_ids, expected_mask = prompt_tokenizer.tokenize_from_text(discretized_state, tasks)
+
+    # Without pre-tokenization, BPE merges the digits of consecutive values and it falls back to the text
+    assert prompt_tokenizer._composable is split_words
+    torch.testing.assert_close(input_ids, expected_ids, rtol=0, atol=0)
+    torch.testing.assert_close(attention_mask, expected_mask, rtol=0, atol=0)
+
+
+def test_shift_padding_side(pi0fast_model):
+    batch_size, seq_len = 4, 10
+    padding_mask = torch.rand(batch_size, seq_len) > 0.4
+    tensors = [
+        torch.randn(batch_size, seq_len, 8),
+        torch.rand(batch_size, seq_len) > 0.5,
+        padding_mask,
+        torch.rand(batch_size, seq_len) > 0.5,
+        torch.randint(0, 100, (batch_size, seq_len)),
+        torch.randint(0, 2, (batch_size, seq_len)),
+    ]
+    for padding_side in ["left", "right"]:
+        shifted = pi0fast_model.shift_padding_side(*tensors, padding_side=padding_side)
+        for i in range(batch_size):
+            padding_indices = torch.where(padding_mask[i] == 0)[0]
+            non_padding_indices = torch.where(padding_mask[i] == 1)[0]
+            if padding_side == "left":
+                new_indices = torch.cat((padding_indices, non_padding_indices))
+            else:
+                new_indices = torch.cat((non_padding_indices, padding_indices))
+            for tensor, shifted_tensor in zip(tensors, shifted, strict=True):
+                torch.testing.assert_close(shifted_tensor[i], tensor[i].index_select(0, new_indices))
+
+
+@pytest.mark.parametrize("batch_size", [1, 8, 32, 128])
+def test_create_input_tokens_matches_text_tokenization(pi0fast_model, batch_size):
+    model = pi0fast_model
+    state, tasks = make_states(batch_size)
+    # The tasks and state values are tokenized on the first call
+    model.create_input_tokens(state, tasks)
+
+    start = time.perf_counter()
+    expected_ids, expected_mask = text_prefix_tokens(model.paligemma_tokenizer, state, tasks)
+    text_s = time.perf_counter() - start
+    start = time.perf_counter()
+    padded_outs = model.create_input_tokens(state, tasks)
+    tensor_s = time.perf_counter() - start
+
+    torch.testing.assert_close(padded_outs["input_ids"], expected_ids, rtol=0, atol=0)
+    torch.testing.assert_close(padded_outs["padded_mask"], expected_mask, rtol=0, atol=0)
+    assert not padded_outs["attention_mask"].any()
+    print(
+        f"batch_size={batch_size}: {batch_size / text_s:.0f} prompts/s from text, "
+        f"{batch_size / tensor_s:.0f} prompts/s from tensors"
+    )
+
+
+@pytest.mark.parametrize("relaxed_decoding", [True, False])
+def test_action_decoder_matches_decode_actions_with_fast(pi0fast_model, relaxed_decoding):
+    model = pi0fast_model
+    rng = np.random.default_rng(1)
+    tokens = [model.fast_tokenizer(rng.normal(size=(1, CHUNK_SIZE, STATE_DIM)) * 0.1)[0] for _ in range(4)]
+    # Too few and too many coefficients
+    tokens[1] = tokens[1][:5]
+    tokens[2] = tokens[2] * 3
+    tokens.append([])
+    expected = np.stack(
+        [
+            model.decode_actions_with_fast(
+                [sample_tokens],
+                time_horizon=CHUNK_SIZE,
+                action_dim=STATE_DIM,
+                relaxed_decoding=relaxed_decoding,
+            )[0]
+            for sample_tokens in tokens
+        ]
+    )
+
+    fast_tokens = torch.full((len(tokens), max(len(t) for t in tokens)), -1)
+    for i, sample_tokens in enumerate(tokens):
+        fast_tokens[i, : len(sample_tokens)] = torch.tensor(sample_tokens)
+    actions = model.action_decoder.decode(fast_tokens, CHUNK_SIZE, STATE_DIM, relaxed_decoding)
+
+    assert model.action_decoder._vectorizable
+    torch.testing.assert_close(actions, torch.from_numpy(expected).float())
+
+
+def test_fast_action_logits_processor(pi0fast_model):
+    model = pi0fast_model
+    decoder = model.action_decoder
+    eos_token_id = model.paligemma_tokenizer.eos_token_id
+    prefix_ids = model._action_prefix["input_ids"][0].tolist()
+    processor = FASTActionLogitsProcessor(prefix_ids, decoder.action_token_range, eos_token_id)
+    scores = torch.randn(2, model.paligemma_tokenizer.vocab_size)
+
+    for step, token_id in enumerate(prefix_ids):
+        masked = processor(torch.zeros(2, step, dtype=torch.long), scores)
+        assert (masked.argmax(dim=1) == token_id).all()
+        assert torch.isinf(masked).sum() == masked.numel() - 2
+
+    masked = processor(torch.zeros(2, len(prefix_ids) + 3, dtype=torch.long), scores)
+    allowed = torch.isfinite(masked[0]).nonzero().flatten().tolist()
+    first, last = decoder.action_token_range
+    assert allowed == [eos_token_id, *range(first, last + 1)]
+
+    # Tokens after EOS are ignored
+    tokens = torch.tensor([[last, first, eos_token_id, last], [last - 1, 3, last, last]])
+    expected = [[0, last - first, -1, -1], [1, -1, 0, 0]]
+    assert decoder.to_fast_tokens(tokens, eos_token_id).tolist() == expected
+
+
+@pytest.mark.skipif(
+    version.parse(transformers.__version__) >= version.parse("4.52.0"),
+    reason="PI0FAST generation relies on the internals of transformers<4.52",
+)
+@torch.no_grad()
+def test_generate_actions_constrained(pi0fast_model):
+    model = pi0fast_model
+    batch_size = 2
+    state, tasks = make_states(batch_size)
+    batch = {IMAGE_KEY: torch.rand(batch_size, 3, 32, 32), OBS_STATE: state, "task": tasks}
+
+    output_tokens = []
+    generate = model.pi0_paligemma.generate
+
+    def recording_generate(*args, **kwargs):
+        tokens = generate(*args, **kwargs)
+        output_tokens.append(tokens)
+        return tokens
+
+    model.pi0_paligemma.generate = recording_generate
+    latencies = {}
+    for constrained in [False, True]:
+        model.config.constrained_action_decoding = constrained
+        start = time.perf_counter()
+        actions = model.generate_actions(batch)
+        latencies[constrained] = time.perf_counter() - start
+        assert actions.shape == (batch_size, CHUNK_SIZE, STATE_DIM)
+        assert torch.isfinite(actions).all()
+
+    unconstrained_tokens, constrained_tokens = output_tokens
+    prefix_ids = model._action_prefix["input_ids"][0].tolist()
+    assert (constrained_tokens[:, : len(prefix_ids)] == torch.tensor(prefix_ids)).all()
+    first, last = model.action_decoder.action_token_range
+    action_tokens = constrained_tokens[:, len(prefix_ids) :]
+    eos_token_id = model.paligemma_tokenizer.eos_token_id
+    is_valid = ((action_tokens >= first) & (action_tokens <= last)) | (action_tokens == eos_token_id)
+    after_eos = (action_tokens == eos_token_id).cumsum(dim=1) > 0
+    assert (is_valid | after_eos).all()
+    assert constrained_tokens.shape[1] <= len(prefix_ids) + CHUNK_SIZE * STATE_DIM + 1
+    print(
+        f"unconstrained: {unconstrained_tokens.shape[1]} decode steps in {latencies[False] * 1e3:.0f} ms, "
+        f"constrained: {constrained_tokens.shape[1]} decode steps in {latencies[True] * 1e3:.0f} ms"
+    )
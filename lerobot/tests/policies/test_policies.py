@@ -544,3 +544,42 @@ def test_act_temporal_ensembler():
         assert torch.all(offline_avg <= einops.reduce(seq_slice, "b s 1 -> b 1", "max"))
         # Selected atol=1e-4 keeping in mind actions in [-1, 1] and excepting 0.01% error.
         torch.testing.assert_close(online_avg, offline_avg, rtol=1e-4, atol=1e-4)
+
+
+def _legacy_temporal_ensemble(temporal_ensemble_coeff, chunk_size, batch_seq):
+    """Temporal ensembling by concatenating each new action onto the running averages."""
+    weights = torch.exp(-temporal_ensemble_coeff * torch.arange(chunk_size))
+    weights_cumsum = torch.cumsum(weights, dim=0)
+    ensembled_actions, count, outputs = None, None, []
+    for actions in batch_seq.unbind(1):
+        if ensembled_actions is None:
+            ensembled_actions = actions.clone()
+            count = torch.ones((chunk_size, 1), dtype=torch.long)
+        else:
+            ensembled_actions *= weights_cumsum[count - 1]
+            ensembled_actions += actions[:, :-1] * weights[count]
+            ensembled_actions /= weights_cumsum[count]
+            count = torch.cat([torch.clamp(count + 1, max=chunk_size), torch.ones_like(count[-1:])])
+            ensembled_actions = torch.cat([ensembled_actions, actions[:, -1:]], dim=1)
+        outputs.append(ensembled_actions[:, 0])
+        ensembled_actions, count = ensembled_actions[:, 1:], count[1:]
+    return torch.stack(outputs, dim=1)
+
+
+def test_act_temporal_ensembler_per_env_reset():
+    """Check that the ring buffer matches the concatenation method, and that environments reset independently."""
+    temporal_ensemble_coeff, chunk_size, episode_length, reset_step = 0.01, 8, 20, 11
+    with seeded_context(0):
+        # (batch, episode_length, chunk_size, action_dim)
+        batch_seq = torch.rand(3, episode_length, chunk_size, 2) * 2 - 1
+    expected = _legacy_temporal_ensemble(temporal_ensemble_coeff, chunk_size, batch_seq)
+    # The second environment starts a new episode at `reset_step`.
+    expected[1, reset_step:] = _legacy_temporal_ensemble(
+        temporal_ensemble_coeff, chunk_size, batch_seq[1:2, reset_step:]
+    )[0]
+
+    ensembler = ACTTemporalEnsembler(temporal_ensemble_coeff, chunk_size)
+    for step in range(episode_length):
+        if step == reset_step:
+            ensembler.reset_envs(torch.tensor([False, True, False]))
+        assert torch.equal(ensembler.update(batch_seq[:, step]), expected[:, step])
@@ -22,7 +22,7 @@ from torch import Tensor, nn
 
 from lerobot.configs.types import FeatureType, PolicyFeature
 from lerobot.policies.sac.configuration_sac import SACConfig
-from lerobot.policies.sac.modeling_sac import MLP, SACPolicy
+from lerobot.policies.sac.modeling_sac import MLP, CriticHead, SACPolicy, StackedCriticHeads
 from lerobot.utils.random_utils import seeded_context, set_seed
 
 try:
@@ -539,3 +539,20 @@ def test_sac_policy_save_and_load(tmp_path):
         assert torch.allclose(actor_loss, loaded_actor_loss)
         assert torch.allclose(temperature_loss, loaded_temperature_loss)
         assert torch.allclose(actions, loaded_actions)
+
+
+def test_stacked_critic_heads_match_critic_heads():
+    heads = [CriticHead(input_dim=8, hidden_dims=[16, 16]) for _ in range(5)]
+    stacked = StackedCriticHeads(heads)
+    x = torch.randn(4, 8)
+
+    expected = torch.stack([head(x).squeeze(-1) for head in heads])
+    assert len(stacked) == 5
+    torch.testing.assert_close(stacked(x), expected)
+
+    # The state dict has the layout of a ModuleList of CriticHead, to stay compatible with checkpoints
+    legacy_state_dict = nn.ModuleList(heads).state_dict()
+    assert stacked.state_dict().keys() == legacy_state_dict.keys()
+    new_stacked = StackedCriticHeads([CriticHead(input_dim=8, hidden_dims=[16, 16]) for _ in range(5)])
+    new_stacked.load_state_dict(legacy_state_dict)
+    torch.testing.assert_close(new_stacked(x), expected)
@@ -0,0 +1,113 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import pytest
+import torch
+
+from lerobot.configs.types import FeatureType, PolicyFeature
+from lerobot.constants import ACTION, OBS_STATE
+from lerobot.policies.tdmpc.configuration_tdmpc import TDMPCConfig
+from lerobot.policies.tdmpc.modeling_tdmpc import TDMPCPolicy
+
+STATE_DIM = 8
+ACTION_DIM = 4
+
+
+def make_tdmpc_policy(**kwargs) -> TDMPCPolicy:
+    # Smaller networks and sample counts than the defaults, to keep the tests fast on CPU
+    kwargs = {"mlp_dim": 128, "n_gaussian_samples": 128, "n_pi_samples": 16, "n_elites": 16, **kwargs}
+    config = TDMPCConfig(
+        input_features={OBS_STATE: PolicyFeature(type=FeatureType.STATE, shape=(STATE_DIM,))},
+        output_features={ACTION: PolicyFeature(type=FeatureType.ACTION, shape=(ACTION_DIM,))},
+        device="cpu",
+        **kwargs,
+    )
+    stats = {
+        key: {
+            "mean": torch.zeros(dim),
+            "std": torch.ones(dim),
+            "min": -torch.ones(dim),
+            "max": torch.ones(dim),
+        }
+        for key, dim in [(OBS_STATE, STATE_DIM), (ACTION, ACTION_DIM)]
+    }
+    policy = TDMPCPolicy(config, dataset_stats=stats)
+    policy.eval()
+    return policy
+
+
+@torch.no_grad()
+def test_rollout_return_samples_pi_trajectories():
+    policy = make_tdmpc_policy()
+    n_pi_samples, batch_size = 3, 2
+    z = torch.randn(n_pi_samples, batch_size, policy.config.latent_dim)
+    actions = torch.empty(policy.config.horizon, n_pi_samples, batch_size, ACTION_DIM)
+
+    torch.manual_seed(0)
+    returns, final_z, running_discount = policy.rollout_return(z, actions, sample_pi=True)
+
+    # Separate rollout of π, drawing the same noise
+    torch.manual_seed(0)
+    pi_actions = torch.empty_like(actions)
+    _z = z
+    for t in range(policy.config.horizon):
+        pi_actions[t] = policy.model.pi(_z, policy.config.min_std)
+        _z = policy.model.latent_dynamics(_z, pi_actions[t])
+
+    torch.testing.assert_close(actions, pi_actions)
+    torch.testing.assert_close(final_z, _z)
+    assert running_discount == pytest.approx(policy.config.discount**policy.config.horizon)
+    # Without π samples, the actions are evaluated as is, and the value adds the terminal value to the return
+    expected_actions = actions.clone()
+    torch.manual_seed(0)
+    value = policy.estimate_value(z, actions)
+    torch.manual_seed(0)
+    torch.testing.assert_close(value, policy.terminal_value(returns, final_z, running_discount))
+    assert torch.equal(actions, expected_actions)
+
+
+@torch.no_grad()
+def test_latent_dynamics_reward_and_qs():
+    policy = make_tdmpc_policy()
+    z = torch.randn(5, 2, policy.config.latent_dim)
+    a = torch.rand(5, 2, ACTION_DIM)
+    next_z, reward, qs = policy.model.latent_dynamics_reward_and_Qs(z, a)
+    expected_z, expected_reward = policy.model.latent_dynamics_and_reward(z, a)
+    torch.testing.assert_close(next_z, expected_z)
+    torch.testing.assert_close(reward, expected_reward)
+    torch.testing.assert_close(qs, policy.model.Qs(z, a))
+    assert policy.model.latent_dynamics_reward_and_Qs(z, a, return_qs=False)[2] is None
+
+
+@pytest.mark.parametrize("n_action_steps", [1, 3])
+@torch.no_grad()
+def test_plan_warm_start(n_action_steps):
+    policy = make_tdmpc_policy(n_action_steps=n_action_steps, n_action_repeats=1)
+    horizon, batch_size = policy.config.horizon, 3
+    z = torch.randn(batch_size, policy.config.latent_dim)
+
+    actions = policy.plan(z)
+    assert actions.shape == (horizon, batch_size, ACTION_DIM)
+    assert torch.all(actions.abs() <= 1)
+    prev_mean = policy._prev_mean
+
+    mean = policy._warm_start(batch_size)
+    torch.testing.assert_close(mean[: horizon - n_action_steps], prev_mean[n_action_steps:])
+    assert torch.all(mean[horizon - n_action_steps :] == 0)
+
+    policy.reset()
+    assert policy._prev_mean is None
+    assert torch.all(policy._warm_start(batch_size) == 0)
@@ -0,0 +1,138 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import math
+import time
+
+import pytest
+import torch
+import torch.nn.functional as F  # noqa: N812
+
+from lerobot.configs.types import FeatureType, PolicyFeature
+from lerobot.constants import ACTION, OBS_IMAGES, OBS_STATE
+from lerobot.policies.vqbet.configuration_vqbet import VQBeTConfig
+from lerobot.policies.vqbet.modeling_vqbet import VQBeTPolicy
+
+BATCH_SIZE = 2
+IMAGE_KEY = "observation.images.top"
+STATE_DIM = 6
+ACTION_DIM = 2
+
+
+def make_vqbet_policy(**kwargs) -> VQBeTPolicy:
+    config = VQBeTConfig(
+        input_features={
+            IMAGE_KEY: PolicyFeature(type=FeatureType.VISUAL, shape=(3, 32, 32)),
+            OBS_STATE: PolicyFeature(type=FeatureType.STATE, shape=(STATE_DIM,)),
+        },
+        output_features={ACTION: PolicyFeature(type=FeatureType.ACTION, shape=(ACTION_DIM,))},
+        crop_shape=None,
+        vqvae_embedding_dim=32,
+        vqvae_enc_hidden_dim=32,
+        gpt_input_dim=64,
+        gpt_output_dim=64,
+        gpt_hidden_dim=64,
+        gpt_n_layer=2,
+        gpt_n_head=2,
+        mlp_hidden_dim=64,
+        device="cpu",
+        **kwargs,
+    )
+    stats = {
+        key: {
+            "mean": torch.zeros(dim),
+            "std": torch.ones(dim),
+            "min": -torch.ones(dim),
+            "max": torch.ones(dim),
+        }
+        for key, dim in [(OBS_STATE, STATE_DIM), (ACTION, ACTION_DIM)]
+    }
+    policy = VQBeTPolicy(config, dataset_stats=stats)
+    policy.eval()
+    return policy
+
+
+def make_observation() -> dict:
+    return {IMAGE_KEY: torch.rand(BATCH_SIZE, 3, 32, 32), OBS_STATE: torch.randn(BATCH_SIZE, STATE_DIM)}
+
+
+@torch.no_grad()
+def test_gpt_fused_attention():
+    policy = make_vqbet_policy()
+    attn = policy.vqbet.policy.transformer.h[0].attn
+    x = torch.randn(BATCH_SIZE, 7, policy.config.gpt_hidden_dim)
+
+    # Attention with the explicit causal mask
+    B, T, C = x.shape  # noqa: N806
+    q, k, v = (
+        t.view(B, T, attn.gpt_n_head, C // attn.gpt_n_head).transpose(1, 2)
+        for t in attn.c_attn(x).split(attn.gpt_hidden_dim, dim=2)
+    )
+    att = (q @ k.transpose(-2, -1)) * (1.0 / math.sqrt(k.size(-1)))
+    att = F.softmax(att.masked_fill(attn.bias[:, :, :T, :T] == 0, float("-inf")), dim=-1)
+    expected = attn.c_proj((att @ v).transpose(1, 2).contiguous().view(B, T, C))
+
+    torch.testing.assert_close(attn(x), expected)
+
+
+@pytest.mark.filterwarnings("ignore:To evaluate in the environment")
+@torch.no_grad()
+def test_select_action_encodes_new_observations_only():
+    # A chunk of 2 actions for a window of 3 observations: the tokens of the last observation are reused.
+    policy = make_vqbet_policy(n_obs_steps=3, action_chunk_size=2)
+    policy.reset()
+    num_encoded = []
+    encode_observations = policy.vqbet.encode_observations
+
+    def counting_encode_observations(batch):
+        num_encoded.append(batch[OBS_STATE].shape[1])
+        return encode_observations(batch)
+
+    for step in range(7):
+        observation = make_observation()
+        torch.manual_seed(step)
+        policy.vqbet.encode_observations = counting_encode_observations
+        action = policy.select_action(observation)
+        del policy.vqbet.encode_observations
+        if step % policy.config.action_chunk_size == 0:
+            # Full recomputation over the observation window
+            torch.manual_seed(step)
+            expected = policy.predict_action_chunk(dict.fromkeys([OBS_IMAGES, OBS_STATE]))
+            torch.testing.assert_close(action, expected[:, 0])
+
+    assert num_encoded == [3, 2, 2, 2]
+
+
+@pytest.mark.filterwarnings("ignore:To evaluate in the environment")
+@torch.no_grad()
+def test_select_action_latency():
+    policy = make_vqbet_policy(action_chunk_size=1)
+    observations = [make_observation() for _ in range(10)]
+    latencies = {}
+    for name, predict in [
+        ("full recomputation", lambda: policy.predict_action_chunk(dict.fromkeys([OBS_IMAGES, OBS_STATE]))),
+        ("incremental", policy._predict_action_chunk_incremental),
+    ]:
+        policy.reset()
+        policy._predict_action_chunk_incremental = predict
+        start = time.perf_counter()
+        for observation in observations:
+            policy.select_action(observation)
+        latencies[name] = (time.perf_counter() - start) / len(observations)
+        del policy._predict_action_chunk_incremental
+
+    for name, latency in latencies.items():
+        print(f"VQ-BeT select_action ({name}): {latency * 1e3:.2f} ms per step")
@@ -267,6 +267,128 @@ def test_stream_parameters():
     assert time_diff == pytest.approx(seconds_between_pushes, abs=0.1)
 
 
+@require_package("grpc")
+@pytest.mark.timeout(10)  # force cross-platform watchdog
+def test_stream_parameters_deltas():
+    import torch
+
+    from lerobot.transport import services_pb2
+    from lerobot.transport.utils import (
+        ParametersDeltaEncoder,
+        bytes_to_parameters_delta,
+        parameters_delta_to_bytes,
+    )
+
+    """Test that the deltas skipped between two pushes are merged instead of dropped."""
+    shutdown_event = Event()
+    parameters_queue = Queue()
+    transitions_queue = Queue()
+    interactions_queue = Queue()
+    seconds_between_pushes = 0.2
+
+    client, channel, server = create_learner_service_stub(
+        shutdown_event, parameters_queue, transitions_queue, interactions_queue, seconds_between_pushes
+    )
+
+    encoder = ParametersDeltaEncoder()
+    state_dict = {"a": torch.zeros(2), "b": torch.zeros(2)}
+    parameters_queue.put(parameters_delta_to_bytes(encoder.encode({"policy": state_dict})))
+    state_dict["a"] = torch.ones(2)
+    parameters_queue.put(parameters_delta_to_bytes(encoder.encode({"policy": state_dict})))
+
+    stream = client.StreamParameters(services_pb2.Empty())
+    first = bytes_to_parameters_delta(next(stream).data)
+
+    state_dict["b"] = torch.ones(2)
+    parameters_queue.put(parameters_delta_to_bytes(encoder.encode({"policy": state_dict})))
+    second = bytes_to_parameters_delta(next(stream).data)
+
+    shutdown_event.set()
+    close_learner_service_stub(channel, server)
+
+    # The first push is the full state, with the most recent version of every tensor
+    assert first["versions"]["policy"] == {"a": 2, "b": 1}
+    assert torch.equal(first["state_dicts"]["policy"]["a"], torch.ones(2))
+    # Then only what changed since
+    assert second["versions"]["policy"] == {"b": 3}
+    assert torch.equal(second["state_dicts"]["policy"]["b"], torch.ones(2))
+
+
+@require_package("grpc")
+@pytest.mark.timeout(10)  # force cross-platform watchdog
+def test_send_transitions_from_several_actors():
+    from lerobot.transport import services_pb2
+    from lerobot.transport.utils import actor_id_metadata
+
+    """Test that the transitions of several actors are all forwarded, in order for every actor."""
+    shutdown_event = Event()
+    parameters_queue = Queue()
+    transitions_queue = Queue()
+    interactions_queue = Queue()
+
+    client, channel, server = create_learner_service_stub(
+        shutdown_event, parameters_queue, transitions_queue, interactions_queue, 1
+    )
+
+    def transitions_stream(actor_id):
+        for i in range(10):
+            yield services_pb2.Transition(
+                transfer_state=services_pb2.TransferState.TRANSFER_END, data=f"{actor_id}_{i}".encode()
+            )
+
+    threads = [
+        threading.Thread(
+            target=client.SendTransitions,
+            args=(transitions_stream(actor_id),),
+            kwargs={"metadata": actor_id_metadata(actor_id)},
+        )
+        for actor_id in ("actor_a", "actor_b")
+    ]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    close_learner_service_stub(channel, server)
+
+    transitions = []
+    while not transitions_queue.empty():
+        transitions.append(transitions_queue.get().decode())
+
+    for actor_id in ("actor_a", "actor_b"):
+        assert [t for t in transitions if t.startswith(actor_id)] == [f"{actor_id}_{i}" for i in range(10)]
+
+
+@require_package("grpc")
+@pytest.mark.timeout(10)  # force cross-platform watchdog
+def test_stream_parameters_to_several_actors():
+    from lerobot.transport import services_pb2
+    from lerobot.transport.utils import actor_id_metadata
+
+    """Test that the parameters are sent to every actor, not only to the first one consuming them."""
+    shutdown_event = Event()
+    parameters_queue = Queue()
+    transitions_queue = Queue()
+    interactions_queue = Queue()
+    seconds_between_pushes = 0.2
+
+    client, channel, server = create_learner_service_stub(
+        shutdown_event, parameters_queue, transitions_queue, interactions_queue, seconds_between_pushes
+    )
+
+    parameters_queue.put(b"params")
+    stream_a = client.StreamParameters(services_pb2.Empty(), metadata=actor_id_metadata("actor_a"))
+    stream_b = client.StreamParameters(services_pb2.Empty(), metadata=actor_id_metadata("actor_b"))
+
+    received_a = next(stream_a).data
+    received_b = next(stream_b).data
+
+    shutdown_event.set()
+    close_learner_service_stub(channel, server)
+
+    assert received_a == received_b == b"params"
+
+
 @require_package("grpc")
 @pytest.mark.timeout(3)  # force cross-platform watchdog
 def test_stream_parameters_with_shutdown():
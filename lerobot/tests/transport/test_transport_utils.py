@@ -15,6 +15,7 @@
 # limitations under the License.
 
 import io
+import math
 from multiprocessing import Event, Queue
 from pickle import UnpicklingError
 
@@ -406,6 +407,93 @@ def test_state_to_bytes_various_dtypes_cuda():
             assert torch.allclose(state_dict[key], reconstructed[key])
 
 
+@require_package("grpc")
+def test_parameters_delta_only_contains_changed_tensors():
+    from lerobot.transport.utils import (
+        ParametersDeltaEncoder,
+        bytes_to_parameters_delta,
+        is_parameters_delta,
+        parameters_delta_to_bytes,
+        state_to_bytes,
+    )
+
+    """Test that only the changed, non frozen tensors are sent after the first push."""
+    module = torch.nn.Sequential(torch.nn.Linear(4, 4), torch.nn.Linear(4, 2))
+    module[0].weight.requires_grad_(False)
+    frozen_keys = {"policy": {"0.weight"}}
+    encoder = ParametersDeltaEncoder()
+
+    first = encoder.encode({"policy": module.state_dict()}, frozen_keys=frozen_keys)
+    assert set(first["state_dicts"]["policy"]) == set(module.state_dict())
+    assert set(first["versions"]["policy"].values()) == {1}
+
+    with torch.no_grad():
+        module[0].weight.add_(1.0)
+        module[1].bias.add_(1.0)
+    second = encoder.encode({"policy": module.state_dict()}, frozen_keys=frozen_keys)
+    assert list(second["state_dicts"]["policy"]) == ["1.bias"]
+    assert second["versions"]["policy"] == {"1.bias": 2}
+
+    data = parameters_delta_to_bytes(second)
+    assert is_parameters_delta(data)
+    assert not is_parameters_delta(state_to_bytes(module.state_dict()))
+    reconstructed = bytes_to_parameters_delta(data)
+    assert torch.equal(reconstructed["state_dicts"]["policy"]["1.bias"], module[1].bias)
+
+
+@require_package("grpc")
+def test_parameters_delta_dtype():
+    from lerobot.transport.utils import ParametersDeltaEncoder
+
+    """Test that floating point tensors are cast to the requested dtype."""
+    state_dict = {"weight": torch.randn(3, 3), "steps": torch.tensor(3)}
+    delta = ParametersDeltaEncoder(dtype=torch.bfloat16).encode({"policy": state_dict})
+    assert delta["state_dicts"]["policy"]["weight"].dtype == torch.bfloat16
+    assert delta["state_dicts"]["policy"]["steps"].dtype == torch.int64
+
+
+@require_package("grpc")
+def test_merge_and_apply_parameters_deltas():
+    from lerobot.transport.utils import (
+        ParametersDeltaEncoder,
+        apply_parameters_delta,
+        merge_parameters_deltas,
+        select_parameters_delta,
+    )
+
+    """Test that merged deltas bring a stale module up to date, in place."""
+    learner_module = torch.nn.Linear(4, 2)
+    actor_module = torch.nn.Linear(4, 2)
+    actor_weight = actor_module.weight
+    encoder = ParametersDeltaEncoder()
+
+    state = merge_parameters_deltas(None, encoder.encode({"policy": learner_module.state_dict()}))
+    applied_versions = {}
+    num_applied = apply_parameters_delta(
+        {"policy": actor_module}, select_parameters_delta(state, 0), applied_versions
+    )
+    assert num_applied == 2
+    assert applied_versions == {"policy": {"weight": 1, "bias": 1}}
+
+    # Two deltas are merged before the actor gets them, only the most recent tensors are kept.
+    with torch.no_grad():
+        learner_module.weight.add_(1.0)
+    state = merge_parameters_deltas(state, encoder.encode({"policy": learner_module.state_dict()}))
+    with torch.no_grad():
+        learner_module.bias.add_(1.0)
+    state = merge_parameters_deltas(state, encoder.encode({"policy": learner_module.state_dict()}))
+    assert state["versions"]["policy"] == {"weight": 2, "bias": 3}
+
+    delta = select_parameters_delta(state, since_version=1)
+    assert apply_parameters_delta({"policy": actor_module}, delta, applied_versions) == 2
+    # Already applied versions are skipped
+    assert apply_parameters_delta({"policy": actor_module}, delta, applied_versions) == 0
+
+    assert actor_module.weight is actor_weight
+    assert torch.equal(actor_module.weight, learner_module.weight)
+    assert torch.equal(actor_module.bias, learner_module.bias)
+
+
 @require_package("grpc")
 def test_python_object_to_bytes_none():
     from lerobot.transport.utils import bytes_to_python_object, python_object_to_bytes
@@ -550,6 +638,83 @@ def test_transitions_to_bytes_multiple_transitions():
         assert_transitions_equal(original, reconstructed_item)
 
 
+def make_transitions(num_transitions: int, image_shape: tuple = (3, 16, 16)) -> list[Transition]:
+    transitions = []
+    for i in range(num_transitions):
+        image = torch.linspace(0, 1, math.prod(image_shape)).reshape(1, *image_shape)
+        transitions.append(
+            Transition(
+                state={"observation.image": image, "observation.state": torch.randn(1, 6)},
+                action=torch.randn(1, 3),
+                reward=float(i),
+                next_state={"observation.image": image.flip(-1), "observation.state": torch.randn(1, 6)},
+                done=i == num_transitions - 1,
+                truncated=False,
+                complementary_info={"is_intervention": i % 2 == 0, "discrete_penalty": torch.tensor([0.5])},
+            )
+        )
+    return transitions
+
+
+@require_package("grpc")
+def test_transitions_encoder_round_trip():
+    from lerobot.transport.utils import TransitionsDecoder, TransitionsEncoder, is_framed_transitions
+
+    transitions = make_transitions(4)
+    encoder = TransitionsEncoder()
+    decoder = TransitionsDecoder()
+
+    first = encoder.encode(transitions)
+    second = encoder.encode(transitions)
+    assert is_framed_transitions(first)
+    # The schema is only sent with the first message
+    assert len(second) < len(first)
+
+    for data in (first, second):
+        batch = decoder.decode(data)
+        for key in ("observation.image", "observation.state"):
+            assert torch.equal(batch["state"][key], torch.stack([t["state"][key] for t in transitions]))
+            assert torch.equal(
+                batch["next_state"][key], torch.stack([t["next_state"][key] for t in transitions])
+            )
+        assert torch.equal(batch["action"], torch.stack([t["action"] for t in transitions]))
+        assert batch["reward"].tolist() == [0.0, 1.0, 2.0, 3.0]
+        assert batch["done"].tolist() == [False, False, False, True]
+        assert batch["truncated"].tolist() == [False] * 4
+        assert batch["complementary_info"]["is_intervention"].tolist() == [True, False, True, False]
+        assert batch["complementary_info"]["discrete_penalty"].shape == (4, 1)
+
+    assert decoder.decode(encoder.encode([])) is None
+
+
+@require_package("grpc")
+def test_transitions_decoder_unknown_schema():
+    from lerobot.transport.utils import TransitionsDecoder, TransitionsEncoder, UnknownTransitionsSchemaError
+
+    encoder = TransitionsEncoder()
+    encoder.encode(make_transitions(2))
+
+    with pytest.raises(UnknownTransitionsSchemaError):
+        TransitionsDecoder().decode(encoder.encode(make_transitions(2)))
+
+
+@require_package("grpc")
+@pytest.mark.parametrize("image_codec, atol", [("zlib", 0), ("jpeg", 0.05)])
+def test_transitions_encoder_image_codec(image_codec, atol):
+    from lerobot.transport.utils import TransitionsDecoder, TransitionsEncoder
+
+    transitions = make_transitions(3, image_shape=(3, 32, 32))
+    raw = TransitionsEncoder().encode(transitions)
+    data = TransitionsEncoder(image_codec=image_codec).encode(transitions)
+    assert len(data) < len(raw)
+
+    batch = TransitionsDecoder().decode(data)
+    images = torch.stack([t["state"]["observation.image"] for t in transitions])
+    assert batch["state"]["observation.image"].shape == images.shape
+    assert batch["state"]["observation.image"].dtype == images.dtype
+    assert torch.allclose(batch["state"]["observation.image"], images, atol=atol)
+
+
 @require_package("grpc")
 def test_receive_bytes_in_chunks_unknown_state():
     from lerobot.transport.utils import receive_bytes_in_chunks
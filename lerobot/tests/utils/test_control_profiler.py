@@ -0,0 +1,95 @@
+#!/usr/bin/env python
+
+# Copyright 2025 The HuggingFace Inc. team. All rights reserved.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import time
+
+from lerobot.record import record_loop
+from lerobot.utils.control_profiler import LOOP_SPAN, WORK_SPAN, ControlLoopProfiler
+from lerobot.utils.utils import TimerManager
+from tests.mocks.mock_robot import MockRobot, MockRobotConfig
+from tests.mocks.mock_teleop import MockTeleop, MockTeleopConfig
+
+
+def test_timer_manager_capacity():
+    timer = TimerManager(log=False, capacity=3)
+    for _ in range(5):
+        with timer:
+            pass
+
+    assert timer.count == 3
+    assert len(timer.spans) == 3
+    starts = [start for start, _ in timer.spans]
+    assert starts == sorted(starts)
+
+
+def test_control_loop_profiler_deadline_misses():
+    profiler = ControlLoopProfiler(fps=100)
+    for i in range(4):
+        profiler.start_iteration()
+        with profiler.span("stage"):
+            # Every other iteration exceeds the 10ms period
+            time.sleep(0.015 if i % 2 else 0.001)
+        profiler.end_of_work()
+        time.sleep(0.001)
+    profiler.end_iteration()
+
+    summary = profiler.summary()
+    assert summary["deadline_misses"] == 2
+    assert summary["stages"][LOOP_SPAN]["count"] == summary["stages"][WORK_SPAN]["count"] == 4
+    assert summary["stages"]["stage"]["max"] >= 15
+    assert sum(summary["jitter"]["histogram"].values()) == 4
+    assert "Deadline misses (10.00 ms): 2/4" in profiler.format_summary()
+
+    profiler.reset()
+    assert profiler.summary()["deadline_misses"] == 0
+
+
+def test_disabled_control_loop_profiler():
+    profiler = ControlLoopProfiler(fps=30, enabled=False)
+    profiler.start_iteration()
+    with profiler.span("stage"):
+        pass
+    profiler.end_iteration()
+
+    assert profiler.timers == {}
+
+
+def test_record_loop_profile(tmp_path):
+    robot = MockRobot(MockRobotConfig())
+    teleop = MockTeleop(MockTeleopConfig())
+    robot.connect()
+    teleop.connect()
+
+    profiler = ControlLoopProfiler(fps=30)
+    profiler.instrument(robot, "send_action", "robot_send_action")
+    events = {"exit_early": False}
+    record_loop(robot, events, fps=30, teleop=teleop, control_time_s=0.2, profiler=profiler)
+
+    summary = profiler.summary()
+    num_loops = summary["stages"][LOOP_SPAN]["count"]
+    assert num_loops >= 5
+    for stage in ["get_observation", "get_action", "send_action", "robot_send_action", WORK_SPAN]:
+        assert summary["stages"][stage]["count"] == num_loops
+
+    trace_path = tmp_path / "trace.json"
+    profiler.export_chrome_trace(trace_path)
+    with open(trace_path) as f:
+        trace = json.load(f)
+    spans = [event for event in trace["traceEvents"] if event["ph"] == "X"]
+    assert len([span for span in spans if span["name"] == "send_action"]) == num_loops
+    assert all(span["dur"] >= 0 and span["ts"] >= 0 for span in spans)
+    assert trace["otherData"]["fps"] == 30
@@ -12,8 +12,10 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 import pytest
+import torch
 
 from lerobot.utils.logging_utils import AverageMeter, MetricsTracker
+from lerobot.utils.utils import DeviceTimer
 
 
 @pytest.fixture
@@ -56,6 +58,29 @@ def test_average_meter_str():
     assert str(meter) == "metric:4.6"
 
 
+def test_average_meter_lazy_values():
+    meter = AverageMeter("loss", ":.2f")
+    loss = torch.tensor(2.0, requires_grad=True) * 2
+    meter.update(loss)
+    meter.update(torch.tensor(2.0), n=2)
+    assert meter._pending[0][0].requires_grad is False
+    assert meter.val == 2.0
+    assert meter.avg == pytest.approx(8 / 3)
+    assert str(meter) == "loss:2.67"
+
+    timer = DeviceTimer(torch.device("cpu")).start()
+    meter.update(timer.stop())
+    assert meter.val == float(timer) >= 0
+
+
+def test_average_meter_max_pending():
+    meter = AverageMeter("loss")
+    for _ in range(meter.max_pending + 1):
+        meter.update(torch.tensor(1.0))
+    assert len(meter._pending) == 1
+    assert meter.avg == 1.0
+
+
 def test_metrics_tracker_initialization(mock_metrics):
     tracker = MetricsTracker(
         batch_size=32, num_frames=1000, num_episodes=50, metrics=mock_metrics, initial_step=10
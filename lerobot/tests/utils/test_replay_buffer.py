@@ -17,6 +17,7 @@
 import sys
 from collections.abc import Callable
 
+import numpy as np
 import pytest
 import torch
 
@@ -680,3 +681,99 @@ def test_async_iterator_multiple_iterations():
 
     # Ensure iterator can be disposed without blocking
     del iterator
+
+
+def test_disk_backed_buffer_reopen(tmp_path):
+    storage_dir = tmp_path / "replay_buffer"
+    replay_buffer = ReplayBuffer(3, "cpu", state_dims(), use_drq=False, storage_dir=storage_dir)
+    states = [create_dummy_state() for _ in range(4)]
+    actions = [create_dummy_action() for _ in range(4)]
+    for i, (state, action) in enumerate(zip(states, actions, strict=True)):
+        replay_buffer.add(state, action, float(i), state, i == 3, False, complementary_info={"discrete": i})
+    replay_buffer.snapshot()
+
+    assert (storage_dir / ReplayBuffer.LAYOUT_FILE).exists()
+    on_disk_actions = np.memmap(storage_dir / "actions.mmap", dtype=np.float32, mode="r", shape=(3, 4))
+    assert torch.equal(torch.from_numpy(np.array(on_disk_actions)), replay_buffer.actions)
+
+    reopened = ReplayBuffer(3, "cpu", state_dims(), use_drq=False, storage_dir=storage_dir)
+    assert reopened.initialized
+    assert len(reopened) == 3
+    assert reopened.position == replay_buffer.position == 1
+    assert torch.equal(reopened.actions, replay_buffer.actions)
+    assert torch.equal(reopened.dones, replay_buffer.dones)
+    assert torch.equal(reopened.complementary_info["discrete"], torch.tensor([3.0, 1.0, 2.0]))
+    for dim in state_dims():
+        assert torch.equal(reopened.states[dim][0], states[3][dim])
+        assert torch.equal(reopened.next_states[dim], replay_buffer.next_states[dim])
+
+    batch = reopened.sample(2)
+    assert batch["action"].shape == (2, 4)
+
+
+def test_disk_backed_buffer_cursor_excludes_overwritten_slot(tmp_path):
+    storage_dir = tmp_path / "replay_buffer"
+    replay_buffer = ReplayBuffer(2, "cpu", state_dims(), use_drq=False, storage_dir=storage_dir)
+    for _ in range(2):
+        state = create_dummy_state()
+        replay_buffer.add(state, create_dummy_action(), 1.0, state, False, False)
+
+    # Simulate a crash right before overwriting the oldest transition.
+    replay_buffer._cursor[1] = replay_buffer.capacity - 1
+    replay_buffer._cursor.flush()
+
+    reopened = ReplayBuffer(2, "cpu", state_dims(), use_drq=False, storage_dir=storage_dir)
+    assert len(reopened) == 1
+    assert reopened.position == 0
+    assert torch.equal(reopened.sample(4)["action"][0], replay_buffer.actions[1])
+
+
+def test_disk_backed_buffer_capacity_mismatch(tmp_path):
+    storage_dir = tmp_path / "replay_buffer"
+    replay_buffer = ReplayBuffer(2, "cpu", state_dims(), use_drq=False, storage_dir=storage_dir)
+    state = create_dummy_state()
+    replay_buffer.add(state, create_dummy_action(), 1.0, state, False, False)
+
+    with pytest.raises(ValueError, match="capacity"):
+        ReplayBuffer(4, "cpu", state_dims(), use_drq=False, storage_dir=storage_dir)
+
+
+@pytest.mark.parametrize("storage", ["memory", "disk"])
+def test_add_batch_matches_add(tmp_path, storage):
+    storage_dir = tmp_path / "replay_buffer" if storage == "disk" else None
+    buffer_add = ReplayBuffer(5, "cpu", state_dims(), use_drq=False)
+    buffer_add_batch = ReplayBuffer(5, "cpu", state_dims(), use_drq=False, storage_dir=storage_dir)
+
+    states = [{k: v.unsqueeze(0) for k, v in create_dummy_state().items()} for _ in range(7)]
+    actions = [create_dummy_action().unsqueeze(0) for _ in range(7)]
+    for i in range(7):
+        buffer_add.add(
+            states[i], actions[i], float(i), states[i], i == 6, False, {"is_intervention": i % 2 == 0}
+        )
+
+    def stack_state(indices):
+        return {k: torch.stack([states[i][k] for i in indices]) for k in state_dims()}
+
+    # Two batches, the second one wraps around the end of the buffer
+    for indices in ([0, 1, 2], [3, 4, 5, 6]):
+        buffer_add_batch.add_batch(
+            state=stack_state(indices),
+            action=torch.stack([actions[i] for i in indices]),
+            reward=torch.tensor([float(i) for i in indices]),
+            next_state=stack_state(indices),
+            done=torch.tensor([i == 6 for i in indices]),
+            truncated=torch.tensor([False] * len(indices)),
+            complementary_info={"is_intervention": torch.tensor([i % 2 == 0 for i in indices])},
+        )
+
+    assert len(buffer_add_batch) == len(buffer_add) == 5
+    assert buffer_add_batch.position == buffer_add.position
+    for key in state_dims():
+        assert torch.equal(buffer_add_batch.states[key], buffer_add.states[key])
+    assert torch.equal(buffer_add_batch.actions, buffer_add.actions)
+    assert torch.equal(buffer_add_batch.rewards, buffer_add.rewards)
+    assert torch.equal(buffer_add_batch.dones, buffer_add.dones)
+    assert torch.equal(
+        buffer_add_batch.complementary_info["is_intervention"],
+        buffer_add.complementary_info["is_intervention"],
+    )
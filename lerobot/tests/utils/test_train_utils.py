@@ -11,20 +11,42 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+import shutil
+import threading
+import time
 from pathlib import Path
 from unittest.mock import Mock, patch
 
+import pytest
+import torch
+from huggingface_hub.constants import SAFETENSORS_SINGLE_FILE
+from safetensors import safe_open
+from safetensors.torch import load_file
+from torch import nn
+
+from lerobot.configs.default import DatasetConfig
+from lerobot.configs.train import TrainPipelineConfig
+from lerobot.configs.types import FeatureType, PolicyFeature
 from lerobot.constants import (
     CHECKPOINTS_DIR,
     LAST_CHECKPOINT_LINK,
     OPTIMIZER_PARAM_GROUPS,
     OPTIMIZER_STATE,
+    PRETRAINED_MODEL_DIR,
     RNG_STATE,
     SCHEDULER_STATE,
     TRAINING_STATE_DIR,
     TRAINING_STEP,
 )
+from lerobot.datasets.utils import DevicePrefetcher, cycle
+from lerobot.optim.optimizers import AdamConfig
+from lerobot.policies.act.configuration_act import ACTConfig
+from lerobot.policies.act.modeling_act import ACTPolicy
+from lerobot.scripts.train import update_policy
+from lerobot.utils import train_utils
+from lerobot.utils.logging_utils import AverageMeter, MetricsTracker
 from lerobot.utils.train_utils import (
+    AsyncCheckpointer,
     get_step_checkpoint_dir,
     get_step_identifier,
     load_training_state,
@@ -34,6 +56,7 @@ from lerobot.utils.train_utils import (
     save_training_step,
     update_last_checkpoint,
 )
+from tests.utils import DEVICE
 
 
 def test_get_step_identifier():
@@ -68,6 +91,12 @@ def test_update_last_checkpoint(tmp_path):
     assert last_checkpoint.is_symlink()
     assert last_checkpoint.resolve() == checkpoint
 
+    next_checkpoint = tmp_path / "0010"
+    next_checkpoint.mkdir()
+    update_last_checkpoint(next_checkpoint)
+    assert last_checkpoint.resolve() == next_checkpoint
+    assert sorted(path.name for path in tmp_path.iterdir()) == ["0005", "0010", LAST_CHECKPOINT_LINK]
+
 
 @patch("lerobot.utils.train_utils.save_training_state")
 def test_save_checkpoint(mock_save_training_state, tmp_path, optimizer):
@@ -95,3 +124,221 @@ def test_save_load_training_state(tmp_path, optimizer, scheduler):
     assert loaded_step == 10
     assert loaded_optimizer is optimizer
     assert loaded_scheduler is scheduler
+
+
+@pytest.fixture
+def act_training(tmp_path):
+    policy_cfg = ACTConfig(
+        input_features={"observation.environment_state": PolicyFeature(FeatureType.ENV, (4,))},
+        output_features={"action": PolicyFeature(FeatureType.ACTION, (2,))},
+        chunk_size=4,
+        n_action_steps=4,
+        dim_model=16,
+        n_heads=2,
+        dim_feedforward=32,
+        n_encoder_layers=1,
+        n_decoder_layers=1,
+        use_vae=False,
+        device="cpu",
+    )
+    cfg = TrainPipelineConfig(dataset=DatasetConfig(repo_id="dummy"), policy=policy_cfg, output_dir=tmp_path)
+    policy = ACTPolicy(policy_cfg)
+    optimizer = AdamConfig().build(policy.parameters())
+    loss = sum(param.sum() for param in policy.parameters())
+    loss.backward()
+    optimizer.step()
+    return cfg, policy, optimizer
+
+
+def test_async_checkpointer(tmp_path, monkeypatch, act_training):
+    cfg, policy, optimizer = act_training
+    expected_state = {key: value.clone() for key, value in policy.state_dict().items()}
+    sync_dir = tmp_path / "sync"
+    save_checkpoint(sync_dir, 10, cfg, policy, optimizer)
+
+    # Hold the worker before the checkpoint is published
+    can_publish = threading.Event()
+    fsync_tree = train_utils._fsync_tree
+
+    def wait_then_fsync_tree(root):
+        can_publish.wait(timeout=10)
+        fsync_tree(root)
+
+    monkeypatch.setattr(train_utils, "_fsync_tree", wait_then_fsync_tree)
+    checkpoint_dir = get_step_checkpoint_dir(tmp_path, 100, 10)
+    checkpointer = AsyncCheckpointer()
+    saved = []
+    future = checkpointer.save(checkpoint_dir, 10, cfg, policy, optimizer, on_saved=saved.append)
+
+    # Training goes on while the checkpoint is written
+    with torch.no_grad():
+        for param in policy.parameters():
+            param.add_(1.0)
+    assert not checkpoint_dir.exists()
+    assert not (checkpoint_dir.parent / LAST_CHECKPOINT_LINK).exists()
+
+    can_publish.set()
+    checkpointer.close()
+    assert future.result() == checkpoint_dir
+    assert saved == [checkpoint_dir]
+    assert (checkpoint_dir.parent / LAST_CHECKPOINT_LINK).resolve() == checkpoint_dir
+    assert sorted(path.name for path in checkpoint_dir.parent.iterdir()) == ["000010", LAST_CHECKPOINT_LINK]
+
+    sync_files = sorted(path.relative_to(sync_dir) for path in sync_dir.rglob("*"))
+    assert sorted(path.relative_to(checkpoint_dir) for path in checkpoint_dir.rglob("*")) == sync_files
+
+    loaded = ACTPolicy.from_pretrained(checkpoint_dir / PRETRAINED_MODEL_DIR)
+    for key, value in loaded.state_dict().items():
+        torch.testing.assert_close(value, expected_state[key])
+    with safe_open(checkpoint_dir / PRETRAINED_MODEL_DIR / SAFETENSORS_SINGLE_FILE, "pt") as f:
+        assert f.metadata() == {"format": "pt"}
+    sync_optimizer_state = load_file(sync_dir / TRAINING_STATE_DIR / OPTIMIZER_STATE)
+    optimizer_state = load_file(checkpoint_dir / TRAINING_STATE_DIR / OPTIMIZER_STATE)
+    assert optimizer_state.keys() == sync_optimizer_state.keys()
+    for key, value in optimizer_state.items():
+        torch.testing.assert_close(value, sync_optimizer_state[key])
+
+    step, _, _ = load_training_state(checkpoint_dir, optimizer, None)
+    assert step == 10
+
+
+def test_async_checkpointer_failed_save(tmp_path, monkeypatch, act_training):
+    cfg, policy, optimizer = act_training
+    first_dir = get_step_checkpoint_dir(tmp_path, 100, 10)
+    second_dir = get_step_checkpoint_dir(tmp_path, 100, 20)
+    checkpointer = AsyncCheckpointer(max_in_flight=2)
+    checkpointer.save(first_dir, 10, cfg, policy, optimizer)
+    checkpointer.wait()
+
+    def fail(*args, **kwargs):
+        raise OSError("No space left on device")
+
+    monkeypatch.setattr(train_utils, "save_model", fail)
+    checkpointer.save(second_dir, 20, cfg, policy, optimizer)
+    with pytest.raises(OSError, match="No space left"):
+        checkpointer.close()
+
+    # The last checkpoint is still the complete one
+    assert not second_dir.exists()
+    assert (tmp_path / CHECKPOINTS_DIR / LAST_CHECKPOINT_LINK).resolve() == first_dir
+    assert load_training_step(first_dir / TRAINING_STATE_DIR) == 10
+
+
+def test_async_checkpointer_recovers_from_crash_while_publishing(tmp_path, act_training):
+    cfg, policy, optimizer = act_training
+    checkpoint_dir = get_step_checkpoint_dir(tmp_path, 100, 10)
+    checkpointer = AsyncCheckpointer()
+    checkpointer.save(checkpoint_dir, 10, cfg, policy, optimizer)
+    checkpointer.wait()
+
+    # A run crashed after moving its checkpoint aside, and another one left a partial staging dir
+    previous_dir = checkpoint_dir.with_name(f".{checkpoint_dir.name}.old")
+    staging_dir = checkpoint_dir.with_name(f".{checkpoint_dir.name}.tmp")
+    shutil.copytree(checkpoint_dir, previous_dir)
+    (staging_dir / PRETRAINED_MODEL_DIR).mkdir(parents=True)
+
+    with torch.no_grad():
+        for param in policy.parameters():
+            param.add_(1.0)
+    checkpointer.save(checkpoint_dir, 10, cfg, policy, optimizer)
+    checkpointer.close()
+
+    assert sorted(path.name for path in checkpoint_dir.parent.iterdir()) == ["000010", LAST_CHECKPOINT_LINK]
+    loaded = ACTPolicy.from_pretrained(checkpoint_dir / PRETRAINED_MODEL_DIR)
+    for key, value in loaded.state_dict().items():
+        torch.testing.assert_close(value, policy.state_dict()[key])
+
+
+def test_async_checkpointer_tied_weights(tmp_path, act_training):
+    cfg, policy, optimizer = act_training
+    # Tie two weights of the same shape, like tied input and output embeddings
+    policy.model.action_head.weight = policy.model.encoder_1d_feature_pos_embed.weight
+    checkpoint_dir = get_step_checkpoint_dir(tmp_path, 100, 10)
+    checkpointer = AsyncCheckpointer()
+    checkpointer.save(checkpoint_dir, 10, cfg, policy, optimizer)
+    checkpointer.close()
+
+    model_path = checkpoint_dir / PRETRAINED_MODEL_DIR / SAFETENSORS_SINGLE_FILE
+    with safe_open(model_path, "pt") as f:
+        assert len(f.keys()) == len(policy.state_dict()) - 1
+        assert f.metadata()["format"] == "pt"
+
+
+class IndexDataset(torch.utils.data.Dataset):
+    """Synthetic dataset whose frames are derived from their index."""
+
+    def __len__(self):
+        return 100
+
+    def __getitem__(self, idx):
+        generator = torch.Generator().manual_seed(idx)
+        return {
+            "observation.state": torch.randn(16, generator=generator),
+            "action": torch.randn(4, generator=generator),
+            "index": idx,
+        }
+
+
+class MLPPolicy(nn.Module):
+    def __init__(self):
+        super().__init__()
+        self.net = nn.Sequential(nn.Linear(16, 32), nn.ReLU())
+        self.head = nn.Linear(32, 4)
+
+    def forward(self, batch):
+        loss = nn.functional.mse_loss(self.head(self.net(batch["observation.state"])), batch["action"])
+        return loss, {}
+
+
+def run_training(prefetch: bool, steps: int = 20) -> tuple[MetricsTracker, list[dict]]:
+    torch.manual_seed(0)
+    device = torch.device(DEVICE)
+    policy = MLPPolicy().to(device)
+    optimizer = torch.optim.Adam(policy.parameters(), lr=1e-4)
+    grad_scaler = torch.amp.GradScaler(device.type, enabled=False)
+    dataloader = torch.utils.data.DataLoader(IndexDataset(), batch_size=8, shuffle=False, num_workers=0)
+    dl_iter = cycle(dataloader)
+    if prefetch:
+        dl_iter = DevicePrefetcher(dl_iter, device, num_batches=2)
+
+    metrics = {
+        "loss": AverageMeter("loss", ":.3f"),
+        "grad_norm": AverageMeter("grdn", ":.3f"),
+        "lr": AverageMeter("lr", ":0.1e"),
+        "update_s": AverageMeter("updt_s", ":.3f"),
+        "dataloading_s": AverageMeter("data_s", ":.3f"),
+    }
+    tracker = MetricsTracker(8, 1000, 10, metrics)
+    batches = []
+    for _ in range(steps):
+        start_time = time.perf_counter()
+        batch = next(dl_iter)
+        tracker.dataloading_s = time.perf_counter() - start_time
+        if not prefetch:
+            batch = {k: v.to(device) if isinstance(v, torch.Tensor) else v for k, v in batch.items()}
+        batches.append(batch)
+        tracker, _ = update_policy(tracker, policy, batch, optimizer, 10.0, grad_scaler)
+        tracker.step()
+    if prefetch:
+        dl_iter.close()
+    return tracker, batches
+
+
+def test_update_policy_with_prefetcher():
+    serial, serial_batches = run_training(prefetch=False)
+    prefetched, prefetched_batches = run_training(prefetch=True)
+
+    # The same batches, in the same order, on the training device
+    assert len(prefetched_batches) == len(serial_batches) == 20
+    for serial_batch, prefetched_batch in zip(serial_batches, prefetched_batches, strict=True):
+        assert serial_batch.keys() == prefetched_batch.keys()
+        for key, value in prefetched_batch.items():
+            assert value.device.type == torch.device(DEVICE).type
+            torch.testing.assert_close(value, serial_batch[key], rtol=0, atol=0)
+
+    for tracker in [serial, prefetched]:
+        assert tracker.loss.count == tracker.update_s.count == tracker.dataloading_s.count == 20
+        assert isinstance(tracker.dataloading_s.avg, float) and tracker.dataloading_s.avg >= 0
+        assert isinstance(tracker.update_s.avg, float) and tracker.update_s.avg > 0
+    torch.testing.assert_close(prefetched.loss.avg, serial.loss.avg)
+    torch.testing.assert_close(prefetched.grad_norm.avg, serial.grad_norm.avg)
@@ -0,0 +1,96 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+"""
+Measure the cold start of the entry point scripts.
+
+Each script is run with `--help` in a fresh interpreter, which imports its modules and parses its
+arguments without loading a model or a dataset. The script reports the median and min wall time of
+the runs, and the time spent in the bodies of the gr00t modules themselves, as measured by
+`python -X importtime` (the quantity bounded by tests/test_import_time.py).
+
+Usage:
+    python scripts/benchmark_cold_start.py
+    python scripts/benchmark_cold_start.py --scripts scripts/load_dataset.py --num-runs 10
+"""
+
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+
+import tyro
+
+
+@dataclass
+class ArgsConfig:
+    """Command line arguments for the cold start benchmark."""
+
+    scripts: list[str] = field(
+        default_factory=lambda: ["scripts/load_dataset.py", "scripts/inference_service.py"]
+    )
+    """Entry point scripts to start."""
+
+    num_runs: int = 5
+    """Number of cold starts of each script."""
+
+
+def gr00t_import_time(script: str) -> float:
+    """Time spent in the bodies of the gr00t modules when starting the script, in seconds."""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", script, "--help"],
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    gr00t_import_time_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_time_us, _, module = line.removeprefix("import time:").split("|")
+        if module.strip().startswith("gr00t") and self_time_us.strip().isdigit():
+            gr00t_import_time_us += int(self_time_us)
+    return gr00t_import_time_us / 1e6
+
+
+def cold_start_times(script: str, num_runs: int) -> list[float]:
+    """Wall times of `num_runs` runs of the script with `--help`, in seconds."""
+    times = []
+    for _ in range(num_runs):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, script, "--help"],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            check=True,
+        )
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def main(config: ArgsConfig):
+    print(f"{'script':<32} {'median (s)':>10} {'min (s)':>8} {'gr00t (s)':>10}")
+    for script in config.scripts:
+        times = cold_start_times(script, config.num_runs)
+        print(
+            f"{script:<32} {statistics.median(times):>10.2f} {min(times):>8.2f} "
+            f"{gr00t_import_time(script):>10.2f}"
+        )
+
+
+if __name__ == "__main__":
+    config = tyro.cli(ArgsConfig)
+    main(config)
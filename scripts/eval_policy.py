@@ -25,7 +25,7 @@ from gr00t.data.embodiment_tags import EMBODIMENT_TAG_MAPPING
 from gr00t.eval.robot import RobotInferenceClient
 from gr00t.experiment.data_config import load_data_config
 from gr00t.model.policy import BasePolicy, Gr00tPolicy
-from gr00t.utils.eval import calc_mse_for_single_trajectory
+from gr00t.utils.eval import calc_mse_for_trajectories
 
 warnings.simplefilter("ignore", category=FutureWarning)
 
@@ -95,6 +95,12 @@ class ArgsConfig:
     plot_state: bool = False
     """Whether to plot the state."""
 
+    batch_size: int = 32
+    """Number of observations per inference call, across all the evaluated trajectories."""
+
+    num_workers: int = 8
+    """Number of processes loading the step data. 0 to load it in the main process."""
+
 
 def main(args: ArgsConfig):
     data_config = load_data_config(args.data_config)
@@ -154,22 +160,22 @@ def main(args: ArgsConfig):
     print("All trajectories:", dataset.trajectory_lengths)
     print("Running on all trajs with modality keys:", args.modality_keys)
 
-    all_mse = []
-    for traj_id in range(args.start_traj, args.start_traj + args.trajs):
-        print("Running trajectory:", traj_id)
-        mse = calc_mse_for_single_trajectory(
-            policy,
-            dataset,
-            traj_id,
-            modality_keys=args.modality_keys,
-            steps=args.steps,
-            action_horizon=args.action_horizon,
-            plot=args.plot,
-            plot_state=args.plot_state,
-            save_plot_path=args.save_plot_path,
-        )
-        print("MSE:", mse)
-        all_mse.append(mse)
+    traj_ids = list(range(args.start_traj, args.start_traj + args.trajs))
+    all_mse = calc_mse_for_trajectories(
+        policy,
+        dataset,
+        traj_ids,
+        modality_keys=args.modality_keys,
+        steps=args.steps,
+        action_horizon=args.action_horizon,
+        batch_size=args.batch_size,
+        num_workers=args.num_workers,
+        plot=args.plot,
+        plot_state=args.plot_state,
+        save_plot_path=args.save_plot_path,
+    )
+    for traj_id, mse in zip(traj_ids, all_mse, strict=True):
+        print(f"Trajectory {traj_id} MSE:", mse)
     print("Average MSE across all trajs:", np.mean(all_mse))
     print("Done")
     exit()
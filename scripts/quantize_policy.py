@@ -0,0 +1,171 @@
+# SPDX-FileCopyrightText: Copyright (c) 2025 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: Apache-2.0
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+# http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+
+import json
+import time
+import warnings
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Literal
+
+import numpy as np
+import torch
+import tyro
+
+from gr00t.data.dataset import LeRobotSingleDataset
+from gr00t.data.embodiment_tags import EMBODIMENT_TAG_MAPPING
+from gr00t.experiment.data_config import load_data_config
+from gr00t.model.policy import Gr00tPolicy
+from gr00t.model.quantization import model_size_bytes
+
+warnings.simplefilter("ignore", category=FutureWarning)
+
+"""
+Quantize a policy to int8 for CPU inference, validate it against the float policy on a local
+dataset, and export the quantized checkpoint.
+
+Example command:
+
+python scripts/quantize_policy.py --model-path nvidia/GR00T-N1.5-3B --output-dir gr00t-int8
+
+The exported checkpoint is loaded quantized by `Gr00tPolicy(model_path="gr00t-int8", ...)`, and
+the report comparing both policies is saved next to it as quantization_report.json.
+"""
+
+
+@dataclass
+class ArgsConfig:
+    """Configuration for quantizing a policy."""
+
+    model_path: str = "nvidia/GR00T-N1.5-3B"
+    """Path to the float model checkpoint."""
+
+    output_dir: str = "gr00t-int8"
+    """Directory to export the quantized checkpoint to."""
+
+    dataset_path: str = "demo_data/robot_sim.PickNPlace/"
+    """Path to the dataset the quantized policy is validated on."""
+
+    data_config: str = "fourier_gr1_arms_only"
+    """
+    Data config to use, e.g. so100, fourier_gr1_arms_only, unitree_g1, etc.
+    Or a path to a custom data config file. e.g. "module:ClassName" format.
+    See gr00t/experiment/data_config.py for more details.
+    """
+
+    embodiment_tag: Literal[tuple(EMBODIMENT_TAG_MAPPING.keys())] = "gr1"
+    """Embodiment tag to use."""
+
+    modality_keys: list[str] = field(default_factory=lambda: ["right_arm", "left_arm"])
+    """Modality keys to compare the actions on."""
+
+    trajs: int = 1
+    """Number of trajectories to validate on."""
+
+    steps: int = 64
+    """Number of steps per trajectory, with one inference every action horizon."""
+
+    denoising_steps: int = 4
+    """Number of denoising steps to use."""
+
+    video_backend: Literal["decord", "torchvision_av"] = "decord"
+    """Video backend to use for various codec options. h264: decord or av: torchvision_av"""
+
+    seed: int = 0
+    """Seed of the action noise, shared by both policies so that their actions are comparable."""
+
+
+def run_policy(
+    policy: Gr00tPolicy, observations: list[dict], modality_keys: list[str], seed: int
+) -> tuple[np.ndarray, float]:
+    """Return the concatenated actions of the policy for each observation, and the mean latency."""
+    policy.get_action(observations[0])  # warmup
+    actions, latencies = [], []
+    for obs in observations:
+        torch.manual_seed(seed)
+        start = time.perf_counter()
+        action = policy.get_action(obs)
+        latencies.append(time.perf_counter() - start)
+        actions.append(np.concatenate([action[f"action.{key}"] for key in modality_keys], axis=-1))
+    return np.stack(actions), float(np.mean(latencies))
+
+
+def main(args: ArgsConfig):
+    data_config = load_data_config(args.data_config)
+    dataset = LeRobotSingleDataset(
+        dataset_path=args.dataset_path,
+        modality_configs=data_config.modality_config(),
+        video_backend=args.video_backend,
+        video_backend_kwargs=None,
+        transforms=None,  # We'll handle transforms separately through the policy
+        embodiment_tag=args.embodiment_tag,
+    )
+    action_horizon = len(data_config.action_indices)
+    observations = [
+        dataset.get_step_data(traj_id, step)
+        for traj_id in range(args.trajs)
+        for step in range(0, args.steps, action_horizon)
+    ]
+    gt_actions = np.stack(
+        [
+            np.concatenate([obs[f"action.{key}"] for key in args.modality_keys], axis=-1)
+            for obs in observations
+        ]
+    )
+
+    # The policies are loaded one after the other, to fit hosts with memory for a single model
+    report = {}
+    for name, quantization in [("float", None), ("int8", "int8_dynamic")]:
+        policy = Gr00tPolicy(
+            model_path=args.model_path,
+            modality_config=data_config.modality_config(),
+            modality_transform=data_config.transform(),
+            embodiment_tag=args.embodiment_tag,
+            denoising_steps=args.denoising_steps,
+            device="cpu",
+            quantization=quantization,
+        )
+        actions, latency = run_policy(policy, observations, args.modality_keys, args.seed)
+        report[name] = {
+            "latency_ms": latency * 1e3,
+            "model_size_mb": model_size_bytes(policy.model) / 2**20,
+            "action_mse": float(np.mean((actions - gt_actions) ** 2)),
+        }
+        if quantization is None:
+            float_actions = actions
+        else:
+            report[name]["action_mse_vs_float"] = float(np.mean((actions - float_actions) ** 2))
+            policy.export_quantized(args.output_dir)
+        del policy
+
+    report["deltas"] = {
+        "latency_ms": report["int8"]["latency_ms"] - report["float"]["latency_ms"],
+        "model_size_mb": report["int8"]["model_size_mb"] - report["float"]["model_size_mb"],
+        "action_mse": report["int8"]["action_mse"] - report["float"]["action_mse"],
+    }
+    print(f"Validated on {len(observations)} observations of {args.dataset_path}")
+    for name in ["float", "int8"]:
+        print(f"{name}: " + ", ".join(f"{k}={v:.4f}" for k, v in report[name].items()))
+    print("int8 - float: " + ", ".join(f"{k}={v:+.4f}" for k, v in report["deltas"].items()))
+
+    with open(Path(args.output_dir) / "quantization_report.json", "w") as f:
+        json.dump(report, f, indent=4)
+    print(f"Exported the quantized checkpoint and its report to {args.output_dir}")
+
+
+if __name__ == "__main__":
+    # Parse arguments using tyro
+    config = tyro.cli(ArgsConfig)
+    main(config)
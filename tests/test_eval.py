@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from gr00t.model.policy import BasePolicy, squeeze_dict_values, unsqueeze_dict_values
+from gr00t.utils.eval import calc_mse_for_single_trajectory, calc_mse_for_trajectories
+
+MODALITY_KEYS = ["right_arm", "gripper"]
+ACTION_HORIZON = 4
+
+
+class FakeDataset:
+    """Step data computed from the trajectory and step indices, with a 1-dim gripper action."""
+
+    def get_step_data(self, trajectory_id: int, base_index: int) -> dict:
+        rng = np.random.default_rng(trajectory_id * 1000 + base_index)
+        return {
+            "video.ego_view": rng.integers(0, 255, size=(1, 8, 8, 3), dtype=np.uint8),
+            "state.right_arm": rng.normal(size=(1, 3)),
+            "state.gripper": rng.normal(size=(1, 1)),
+            "action.right_arm": rng.normal(size=(ACTION_HORIZON, 3)),
+            "action.gripper": rng.normal(size=(ACTION_HORIZON, 1)),
+            "annotation.human.task_description": [f"task {trajectory_id}"],
+        }
+
+
+class FakePolicy(BasePolicy):
+    """Deterministic per-sample policy, unbatching observations like `Gr00tPolicy`."""
+
+    def __init__(self):
+        self.batch_sizes = []
+
+    def get_action(self, observations: dict) -> dict:
+        is_batch = observations["state.right_arm"].ndim == 3
+        if not is_batch:
+            observations = unsqueeze_dict_values(observations)
+        self.batch_sizes.append(len(observations["state.right_arm"]))
+        video_mean = observations["video.ego_view"].mean(axis=(1, 2, 3, 4))[:, None, None]
+        action = {
+            "action.right_arm": observations["state.right_arm"] + 0.01 * video_mean,
+            "action.gripper": np.repeat(observations["state.gripper"], ACTION_HORIZON, axis=1),
+        }
+        action["action.right_arm"] = np.repeat(action["action.right_arm"], ACTION_HORIZON, axis=1)
+        task_ids = np.array(
+            [int(task.split()[-1]) for task in observations["annotation.human.task_description"]]
+        )
+        action["action.gripper"] = action["action.gripper"] + task_ids[:, None, None]
+        return action if is_batch else squeeze_dict_values(action)
+
+    def get_modality_config(self) -> dict:
+        return {}
+
+
+@pytest.mark.parametrize("num_workers", [0, 2])
+@pytest.mark.parametrize("plot_state", [False, True])
+def test_batched_open_loop_mse_matches_single_trajectory(num_workers, plot_state):
+    dataset, traj_ids, steps = FakeDataset(), [0, 3, 5], 10
+    expected = [
+        calc_mse_for_single_trajectory(
+            FakePolicy(),
+            dataset,
+            traj_id,
+            MODALITY_KEYS,
+            steps=steps,
+            action_horizon=ACTION_HORIZON,
+            plot_state=plot_state,
+        )
+        for traj_id in traj_ids
+    ]
+
+    policy = FakePolicy()
+    mse = calc_mse_for_trajectories(
+        policy,
+        dataset,
+        traj_ids,
+        MODALITY_KEYS,
+        steps=steps,
+        action_horizon=ACTION_HORIZON,
+        batch_size=4,
+        num_workers=num_workers,
+        plot_state=plot_state,
+    )
+
+    assert mse == expected
+    # 3 inference points per trajectory
+    assert policy.batch_sizes == [4, 4, 1]
@@ -0,0 +1,65 @@
+import os
+import subprocess
+import sys
+
+import pytest
+
+# Import time budget of the bodies of the gr00t modules, excluding their dependencies. It is about
+# 0.2 s on a 1-core CPU host, and was 1.8 s when the default Eagle processor was built at import
+# time. Slower runners can raise it with the GR00T_IMPORT_TIME_BUDGET_S environment variable.
+GR00T_IMPORT_TIME_BUDGET_S = float(os.environ.get("GR00T_IMPORT_TIME_BUDGET_S", "1.0"))
+# Video backends and transform libraries, which are imported on first use. cv2 is left out, as
+# numpydantic imports it.
+DEFERRED_MODULES = ["av", "decord", "torchvision", "albumentations", "pytorch3d"]
+
+
+def import_in_subprocess(modules: list[str]) -> tuple[float, set[str]]:
+    """
+    Import modules in a fresh interpreter, and return the import time of the gr00t modules
+    themselves and the deferred modules that were imported along.
+    """
+    code = (
+        f"import sys, {', '.join(modules)}; "
+        f"print(*[m for m in {DEFERRED_MODULES!r} if m in sys.modules])"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], capture_output=True, text=True, check=True
+    )
+    gr00t_import_time_us = 0
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        self_time_us, _, module = line.removeprefix("import time:").split("|")
+        if module.strip().startswith("gr00t") and self_time_us.strip().isdigit():
+            gr00t_import_time_us += int(self_time_us)
+    return gr00t_import_time_us / 1e6, set(result.stdout.split())
+
+
+@pytest.mark.parametrize(
+    "modules, allowed_deferred_modules",
+    [
+        (["gr00t.utils.video"], set()),
+        # scripts/load_dataset.py
+        (["gr00t.data.dataset", "gr00t.utils.misc"], set()),
+        # scripts/inference_service.py, which builds the video and state/action transforms
+        pytest.param(
+            ["gr00t.eval.robot", "gr00t.experiment.data_config", "gr00t.model.policy"],
+            {"av", "torchvision", "albumentations", "pytorch3d"},
+            id="inference_service",
+        ),
+    ],
+)
+def test_import_time_budget(modules, allowed_deferred_modules):
+    if "gr00t.eval.robot" in modules:
+        # The robot client and server exchange their messages over zmq, serialized with msgpack
+        pytest.importorskip("msgpack")
+        pytest.importorskip("zmq")
+
+    gr00t_import_time, deferred_modules = import_in_subprocess(modules)
+
+    assert deferred_modules <= allowed_deferred_modules
+    # Includes building the default Eagle processor, if it is not deferred to first use
+    assert gr00t_import_time < GR00T_IMPORT_TIME_BUDGET_S, (
+        f"Importing {modules} spent {gr00t_import_time:.2f} s in gr00t modules, over the "
+        f"{GR00T_IMPORT_TIME_BUDGET_S} s budget (GR00T_IMPORT_TIME_BUDGET_S)"
+    )
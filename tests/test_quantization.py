@@ -0,0 +1,124 @@
+import pytest
+import torch
+from torch import nn
+from transformers.feature_extraction_utils import BatchFeature
+
+from gr00t.model.action_head.flow_matching_action_head import (
+    CategorySpecificLinear,
+    FlowmatchingActionHead,
+    FlowmatchingActionHeadConfig,
+)
+from gr00t.model.quantization import (
+    Int8CategorySpecificLinear,
+    is_quantized_checkpoint,
+    load_quantized_checkpoint,
+    model_size_bytes,
+    quantize_model,
+    save_quantized_checkpoint,
+)
+
+BATCH_SIZE = 2
+BACKBONE_EMBEDDING_DIM = 48
+STATE_DIM = 8
+
+
+def make_action_head() -> nn.Module:
+    config = FlowmatchingActionHeadConfig(
+        input_embedding_dim=64,
+        backbone_embedding_dim=BACKBONE_EMBEDDING_DIM,
+        hidden_size=32,
+        max_seq_len=16,
+        action_dim=7,
+        action_horizon=4,
+        num_inference_timesteps=4,
+        max_num_embodiments=2,
+        num_target_vision_tokens=4,
+        max_state_dim=STATE_DIM,
+    )
+    # Wrapped like in `GR00T_N1_5`, so that the linear layer names match the skipped patterns
+    return nn.ModuleDict({"action_head": FlowmatchingActionHead(config)}).eval()
+
+
+def get_action(model: nn.Module, seed: int = 0) -> torch.Tensor:
+    generator = torch.Generator().manual_seed(seed)
+    backbone_output = BatchFeature(
+        data={
+            "backbone_features": torch.randn(
+                BATCH_SIZE, 10, BACKBONE_EMBEDDING_DIM, generator=generator
+            )
+        }
+    )
+    action_input = BatchFeature(
+        data={
+            "state": torch.randn(BATCH_SIZE, 1, STATE_DIM, generator=generator),
+            "embodiment_id": torch.tensor([0, 1]),
+        }
+    )
+    torch.manual_seed(seed)
+    with torch.inference_mode():
+        return model["action_head"].get_action(backbone_output, action_input)["action_pred"]
+
+
+def test_quantize_model():
+    model = make_action_head()
+    expected = get_action(model)
+    float_size = model_size_bytes(model)
+
+    quantize_model(model, modules=("action_head",))
+
+    quantized_linears = [
+        name
+        for name, module in model.named_modules()
+        if isinstance(module, torch.ao.nn.quantized.dynamic.Linear)
+    ]
+    assert "action_head.output_projection" in quantized_linears
+    assert "action_head.model.layers.0.in_proj" in quantized_linears
+    assert "action_head.vl_self_attention.layers.0.out_proj" in quantized_linears
+    assert not any(type(module) is nn.Linear for module in model.modules())
+    assert isinstance(model["action_head"].action_encoder.W2, Int8CategorySpecificLinear)
+    assert not any(isinstance(module, CategorySpecificLinear) for module in model.modules())
+    assert model_size_bytes(model) < float_size / 3
+
+    action = get_action(model)
+    assert action.shape == expected.shape
+    torch.testing.assert_close(action, expected, atol=0.05, rtol=0.05)
+
+
+def test_quantize_model_skipped_linear_layers():
+    model = nn.ModuleDict(
+        {
+            "backbone": nn.ModuleDict(
+                {"lm_head": nn.Linear(4, 4), "mixer": nn.ModuleDict({"x_proj": nn.Linear(4, 4)})}
+            ),
+            "action_head": nn.ModuleDict({"out_proj": nn.Linear(4, 4)}),
+        }
+    ).to(torch.bfloat16)
+
+    quantize_model(model)
+
+    assert type(model["backbone"]["lm_head"]) is nn.Linear
+    assert type(model["backbone"]["mixer"]["x_proj"]) is nn.Linear
+    assert model["backbone"]["lm_head"].weight.dtype == torch.float32
+    assert isinstance(model["action_head"]["out_proj"], torch.ao.nn.quantized.dynamic.Linear)
+
+
+def test_quantized_checkpoint_roundtrip(tmp_path):
+    model = quantize_model(make_action_head(), modules=("action_head",))
+    expected = get_action(model)
+    assert not is_quantized_checkpoint(tmp_path)
+
+    save_quantized_checkpoint(model, tmp_path, modules=("action_head",))
+
+    assert is_quantized_checkpoint(tmp_path)
+    torch.manual_seed(1)  # different float initialization
+    loaded = load_quantized_checkpoint(make_action_head(), tmp_path)
+    assert model_size_bytes(loaded) == model_size_bytes(model)
+    torch.testing.assert_close(get_action(loaded), expected, atol=0, rtol=0)
+
+
+def test_quantized_checkpoint_unsupported_method(tmp_path):
+    save_quantized_checkpoint(nn.ModuleDict(), tmp_path, modules=())
+    config_path = tmp_path / "quantization_config.json"
+    config_path.write_text(config_path.read_text().replace("int8_dynamic", "int4"))
+    with pytest.raises(ValueError, match="Unsupported quantization method"):
+        load_quantized_checkpoint(nn.ModuleDict(), tmp_path)
@@ -0,0 +1,85 @@
+from functools import partial
+
+import gymnasium as gym
+import numpy as np
+import pytest
+from gymnasium import spaces
+
+pytest.importorskip("robocasa")
+
+from gr00t.eval.simulation import (  # noqa: E402
+    MultiStepConfig,
+    SimulationConfig,
+    SimulationInferenceClient,
+)
+from gr00t.eval.wrappers.multistep_wrapper import MultiStepWrapper  # noqa: E402
+
+EPISODE_LENGTH = 6
+N_ACTION_STEPS = 2
+
+
+class DummyEnv(gym.Env):
+    """Episodes of fixed length, which succeed from their second step on if `succeeds`."""
+
+    def __init__(self, succeeds: bool):
+        self.succeeds = succeeds
+        self.observation_space = spaces.Dict(
+            {
+                "video.ego_view": spaces.Box(0, 255, shape=(4, 4, 3), dtype=np.uint8),
+                "state.arm": spaces.Box(-1, 1, shape=(2,), dtype=np.float32),
+            }
+        )
+        self.action_space = spaces.Dict({"action.arm": spaces.Box(-1, 1, shape=(2,))})
+        self.t = 0
+
+    def _obs(self):
+        return {
+            "video.ego_view": np.zeros((4, 4, 3), dtype=np.uint8),
+            "state.arm": np.full(2, self.t, dtype=np.float32),
+        }
+
+    def reset(self, seed=None, options=None):
+        super().reset(seed=seed)
+        self.t = 0
+        return self._obs(), {"success": False}
+
+    def step(self, action):
+        self.t += 1
+        success = self.succeeds and self.t >= 2
+        return self._obs(), float(success), self.t >= EPISODE_LENGTH, False, {"success": success}
+
+
+def make_env(succeeds: bool) -> gym.Env:
+    return MultiStepWrapper(
+        DummyEnv(succeeds),
+        video_delta_indices=np.array([0]),
+        state_delta_indices=np.array([0]),
+        n_action_steps=N_ACTION_STEPS,
+    )
+
+
+class DummySimulationClient(SimulationInferenceClient):
+    """Simulation client stepping dummy environments, with zero actions instead of a server."""
+
+    def setup_environment(self, config: SimulationConfig) -> gym.vector.VectorEnv:
+        env_fns = [partial(make_env, succeeds=i % 2 == 0) for i in range(config.n_envs)]
+        return gym.vector.SyncVectorEnv(env_fns)
+
+    def get_action(self, observations: dict) -> dict:
+        n_envs = len(observations["state.arm"])
+        return {"action.arm": np.zeros((n_envs, N_ACTION_STEPS, 2), dtype=np.float32)}
+
+
+def test_run_simulation_with_multistep_wrapper():
+    config = SimulationConfig(
+        env_name="dummy",
+        n_episodes=4,
+        n_envs=2,
+        multistep=MultiStepConfig(n_action_steps=N_ACTION_STEPS),
+    )
+
+    env_name, episode_successes = DummySimulationClient().run_simulation(config)
+
+    assert env_name == "dummy"
+    # Finished episodes are stored in the order of the environments
+    assert episode_successes == [True, False, True, False]
@@ -0,0 +1,79 @@
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from gr00t.data.stats import (
+    FeatureStatistics,
+    QuantileSketch,
+    aggregate_statistics,
+    calculate_dataset_statistics,
+    compute_episode_statistics,
+)
+
+
+@pytest.fixture
+def parquet_paths():
+    import importlib.util
+
+    package_spec = importlib.util.find_spec("gr00t", "")
+    assert package_spec is not None
+    package_root = package_spec.origin
+    assert package_root is not None
+    dataset_path = Path(package_root).parents[1] / "demo_data/robot_sim.PickNPlace"
+    return sorted(dataset_path.glob("data/*/*.parquet"))
+
+
+def test_quantile_sketch_is_exact_below_capacity():
+    values = np.random.default_rng(0).normal(size=(500, 4))
+    sketch = QuantileSketch(4, capacity=1024)
+    sketch.update(values[:200])
+    sketch.update(values[200:])
+    for q in [0.01, 0.5, 0.99]:
+        np.testing.assert_allclose(sketch.quantile(q), np.quantile(values, q, axis=0))
+
+
+def test_merged_quantile_sketches_have_bounded_rank_error():
+    values = np.random.default_rng(0).normal(size=(100_000, 3))
+    sketch = QuantileSketch(3, capacity=512, seed=0)
+    for i, chunk in enumerate(np.array_split(values, 50)):
+        chunk_sketch = QuantileSketch(3, capacity=512, seed=i)
+        chunk_sketch.update(chunk)
+        sketch.merge(chunk_sketch)
+
+    assert sum(len(items) for items in sketch.levels) < 10 * 512
+    for q in [0.01, 0.5, 0.99]:
+        ranks = (values < sketch.quantile(q)).mean(axis=0)
+        np.testing.assert_allclose(ranks, q, atol=0.01)
+
+
+def test_merged_feature_statistics_match_numpy():
+    values = np.random.default_rng(0).uniform(-2, 5, size=(1000, 2))
+    statistics = []
+    for chunk in np.array_split(values, 7):
+        feature_statistics = FeatureStatistics(2)
+        feature_statistics.update(chunk)
+        statistics.append({"feature": feature_statistics})
+
+    stats = aggregate_statistics(statistics)["feature"].to_dict()
+    np.testing.assert_allclose(stats["mean"], values.mean(axis=0), rtol=1e-5)
+    np.testing.assert_allclose(stats["std"], values.std(axis=0), rtol=1e-5)
+    np.testing.assert_allclose(stats["min"], values.min(axis=0), rtol=1e-5)
+    np.testing.assert_allclose(stats["max"], values.max(axis=0), rtol=1e-5)
+    np.testing.assert_allclose(stats["q01"], np.quantile(values, 0.01, axis=0), rtol=1e-5)
+
+
+def test_calculate_dataset_statistics(parquet_paths):
+    stats = calculate_dataset_statistics(parquet_paths, num_workers=2)
+    assert stats == calculate_dataset_statistics(parquet_paths, num_workers=1)
+    assert "annotation.human.action.task_description" in stats  # stored as integer indices
+    assert set(stats["action"]) == {"mean", "std", "min", "max", "q01", "q99"}
+
+    data = pd.concat([pd.read_parquet(path) for path in parquet_paths])
+    action = np.vstack([np.asarray(x, dtype=np.float32) for x in data["action"]])
+    np.testing.assert_allclose(stats["action"]["mean"], action.mean(axis=0), atol=1e-5)
+    np.testing.assert_allclose(stats["action"]["std"], action.std(axis=0), atol=1e-5)
+
+    episode_stats = compute_episode_statistics(parquet_paths[0])
+    assert episode_stats["action"].count == len(pd.read_parquet(parquet_paths[0]))